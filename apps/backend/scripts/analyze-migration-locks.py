@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Risco de lock e custo de reescrita das migrações (prisma/migrations/*/migration.sql)
+
+Classifica cada comando pelo lock que o PostgreSQL pega na tabela (bloqueia
+leituras, só escritas ou nada) e pelo trabalho feito com o lock preso
+(varredura, construção de índice, reescrita da tabela, backfill). Com uma
+foto da contagem de linhas estima quanto tempo cada schema de tenant fica
+bloqueado e sugere o equivalente concorrente ou em lotes.
+
+Contagem de linhas (no banco de produção, via psql):
+    \\copy (SELECT schemaname, relname, n_live_tup FROM pg_stat_user_tables) TO 'rows.csv' CSV HEADER
+
+Uso (a partir de apps/backend):
+    python3 scripts/analyze-migration-locks.py                           # comandos arriscados de todas as migrações
+    python3 scripts/analyze-migration-locks.py --rows rows.csv           # com estimativa de tempo bloqueado
+    python3 scripts/analyze-migration-locks.py 20260124                  # migrações por prefixo/nome
+    python3 scripts/analyze-migration-locks.py --since 20260119231900_add_public_token_to_contracts
+    python3 scripts/analyze-migration-locks.py --all                     # inclui comandos online e tabelas novas
+    python3 scripts/analyze-migration-locks.py --rows rows.csv --max-block 5 --strict   # CI: sai com 1 acima de 5s
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter
+from dataclasses import asdict
+
+from prisma_tools import DEFAULT_CACHE_DIR, SCHEMA_DIR, load_schema
+from prisma_tools.locks import RowCounts, analyze_migrations
+from prisma_tools.sql import MIGRATIONS_DIR
+
+SEVERITY_ICONS = {'blocks-all': '🔒', 'blocks-writes': '✋', 'online': '✅'}
+WORK_LABELS = {'rewrite': 'reescreve', 'scan': 'varre', 'index': 'indexa', 'update': 'atualiza', 'none': ''}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Risco de lock e custo de reescrita das migrações')
+    parser.add_argument('migrations', nargs='*', help='Migrações a analisar (nome ou prefixo; padrão: todas)')
+    parser.add_argument('--migrations-dir', default=MIGRATIONS_DIR, help=f'Diretório das migrações (padrão: {MIGRATIONS_DIR})')
+    parser.add_argument('--since', help='Só migrações posteriores a esta (ex: a última aplicada em produção)')
+    parser.add_argument('--rows', help='Linhas por tabela: CSV de pg_stat_user_tables ou JSON {"tabela": linhas}')
+    parser.add_argument('--speed', type=float, default=1.0, help='Multiplicador das vazões estimadas (padrão: 1.0)')
+    parser.add_argument('--schema-dir', default=SCHEMA_DIR, help=f'Diretório do schema (padrão: {SCHEMA_DIR})')
+    parser.add_argument('--no-cache', action='store_true', help='Parseia todos os arquivos, sem cache')
+    parser.add_argument('--all', action='store_true', help='Lista também comandos online e em tabelas novas')
+    parser.add_argument('--top', type=int, help='Só os N comandos com maior tempo bloqueado')
+    parser.add_argument('--json', action='store_true', help='Saída em JSON')
+    parser.add_argument('--max-block', type=float,
+                        help='Com --strict, tolera bloqueios de até N segundos (tabelas sem contagem não contam)')
+    parser.add_argument('--strict', action='store_true', help='Sai com 1 se houver comando arriscado (ou acima de --max-block)')
+    return parser.parse_args()
+
+
+def format_seconds(seconds):
+    if seconds is None:
+        return '?'
+    if seconds < 1:
+        return '<1s'
+    if seconds < 120:
+        return f'{seconds:.0f}s'
+    if seconds < 7200:
+        return f'{seconds / 60:.0f}min'
+    return f'{seconds / 3600:.1f}h'
+
+
+def describe(finding):
+    parts = [f"{SEVERITY_ICONS[finding.severity]} :{finding.line}  {finding.table}  {', '.join(finding.actions)}  "
+             f"[{finding.lock}]"]
+    if finding.new_table:
+        parts.append('tabela nova')
+    elif finding.work != 'none':
+        cost = WORK_LABELS[finding.work]
+        if finding.rows is not None:
+            cost += f' ~{format_seconds(finding.blocking_seconds)} ({finding.rows:,} linhas'.replace(',', '.')
+            if finding.schemas > 1:
+                cost += f' no maior de {finding.schemas} schemas; total ~{format_seconds(finding.total_seconds)}'
+            cost += ')'
+        parts.append(cost)
+    if finding.per_tenant:
+        parts.append('por tenant')
+    if finding.fails_if_rows:
+        parts.append('falha se a tabela tiver linhas')
+    return ' · '.join(parts)
+
+
+def select(reports, show_all, top):
+    findings = [f for report in reports for f in report.findings if show_all or f.risky]
+    if top:
+        findings = sorted(findings, key=lambda f: (-(f.blocking_seconds or 0), f.migration, f.line))[:top]
+    return findings
+
+
+def print_report(reports, findings, has_rows):
+    selected = {id(f) for f in findings}
+    for report in reports:
+        items = [f for f in report.findings if id(f) in selected]
+        if not items:
+            continue
+        print(f"\n📄 {report.name}")
+        for finding in items:
+            print(f"   {describe(finding)}")
+            print(f"      {finding.statement}")
+            for suggestion in finding.suggestions:
+                print(f"      💡 {suggestion}")
+        if report.needs_lock_timeout:
+            print("   ⏱️  Sem SET lock_timeout: um ACCESS EXCLUSIVE na fila trava todas as queries da tabela")
+
+    if not has_rows:
+        print("\nℹ️  Sem --rows: tempos não estimados (exporte n_live_tup de pg_stat_user_tables)")
+    all_findings = [f for report in reports for f in report.findings]
+    counts = Counter(f.severity for f in all_findings if not f.new_table)
+    risky = sum(1 for f in all_findings if f.risky)
+    risky_migrations = sum(1 for report in reports if any(f.risky for f in report.findings))
+    worst = max((f.blocking_seconds or 0 for f in all_findings), default=0)
+    print(f"\n📊 {len(reports)} migrações | {len(all_findings)} comandos | "
+          f"⚠️  {risky} arriscados em {risky_migrations} migrações | "
+          f"🔒 {counts['blocks-all']} bloqueiam tudo | ✋ {counts['blocks-writes']} bloqueiam escritas"
+          + (f" | maior bloqueio ~{format_seconds(worst)}" if has_rows else ''))
+
+
+def main():
+    args = parse_args()
+    schema = load_schema(args.schema_dir, cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR)
+    try:
+        rows = RowCounts.load(args.rows) if args.rows else None
+    except (OSError, ValueError) as exc:
+        print(f"❌ Não foi possível ler {args.rows}: {exc}", file=sys.stderr)
+        return 1
+    reports = analyze_migrations(schema, rows, args.migrations_dir, names=args.migrations, since=args.since,
+                                 speed=args.speed)
+    if not reports:
+        print("❌ Nenhuma migração encontrada", file=sys.stderr)
+        return 1
+
+    findings = select(reports, args.all, args.top)
+    if args.json:
+        payload = [{**asdict(f), 'severity': f.severity, 'risky': f.risky} for f in findings]
+        print(json.dumps(payload, indent=2, ensure_ascii=False))
+    else:
+        print_report(reports, findings, rows is not None)
+
+    if not args.strict:
+        return 0
+    if args.max_block is not None:
+        return 1 if any(f.fails_if_rows or (f.risky and (f.blocking_seconds or 0) > args.max_block)
+                        for r in reports for f in r.findings) else 0
+    return 1 if any(f.risky for r in reports for f in r.findings) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
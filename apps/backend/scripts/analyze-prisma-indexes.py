@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Analisa os índices do schema Prisma: redundantes, sobrepostos, pouco seletivos e FKs sem índice
+
+Uso (a partir de apps/backend):
+    python3 scripts/analyze-prisma-indexes.py                         # relatório completo
+    python3 scripts/analyze-prisma-indexes.py DailyRecord VitalSign   # só esses modelos (ou tabelas)
+    python3 scripts/analyze-prisma-indexes.py --top 15                # tabelas com maior custo de escrita
+    python3 scripts/analyze-prisma-indexes.py --json > indexes.json
+    python3 scripts/analyze-prisma-indexes.py --strict                # sai com 1 se houver redundantes
+
+O custo de escrita é uma estimativa por INSERT (heap + entradas de índice);
+use para priorizar, e confirme com pg_stat_user_indexes em produção antes de
+remover um índice.
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import asdict
+
+from prisma_tools import DEFAULT_CACHE_DIR, SCHEMA_DIR, load_schema
+from prisma_tools.indexes import analyze_indexes
+
+SECTIONS = [
+    ('redundant', '🔁 Índices redundantes'),
+    ('overlap', '🪞 Índices sobrepostos (prefixo com outra ordenação)'),
+    ('low-selectivity', '🎯 Índices pouco seletivos'),
+    ('missing-fk-index', '🔗 FKs sem índice'),
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Analisa índices do schema Prisma')
+    parser.add_argument('models', nargs='*', help='Modelos ou tabelas (padrão: todos)')
+    parser.add_argument('--schema-dir', default=SCHEMA_DIR, help=f'Diretório do schema (padrão: {SCHEMA_DIR})')
+    parser.add_argument('--no-cache', action='store_true', help='Parseia todos os arquivos, sem cache')
+    parser.add_argument('--top', type=int, default=20, help='Tabelas no ranking de custo de escrita (padrão: 20)')
+    parser.add_argument('--json', action='store_true', help='Saída em JSON')
+    parser.add_argument('--strict', action='store_true', help='Sai com 1 se houver índices redundantes')
+    return parser.parse_args()
+
+
+def print_report(report, top):
+    for kind, title in SECTIONS:
+        findings = report.of(kind)
+        print(f"\n{title} ({len(findings)})")
+        for finding in sorted(findings, key=lambda f: (f.table, f.location or '')):
+            print(f"   {finding.table:<36} {finding.message}")
+            if finding.location:
+                print(f"   {'':<36} 📍 {finding.location}")
+
+    costs = sorted(report.costs, key=lambda c: (c.removable_bytes, c.amplification), reverse=True)[:top]
+    print("\n✍️  Custo estimado de escrita por INSERT (heap + índices)")
+    print(f"   {'tabela':<36} {'índices':>7} {'bytes':>7} {'amplif.':>8} {'depois':>8}")
+    for cost in costs:
+        total = cost.heap_bytes + sum(cost.index_bytes)
+        after = f'{cost.amplification_after:.2f}x' if cost.removable else '-'
+        print(f"   {cost.table:<36} {cost.indexes:>7} {total:>7} {cost.amplification:>7.2f}x {after:>8}"
+              + (f"  (-{cost.removable} índices)" if cost.removable else ''))
+        if cost.hot_blockers:
+            print(f"   {'':<36} ⚠️  {', '.join(cost.hot_blockers)} (@updatedAt) indexado: todo UPDATE reescreve os índices")
+
+    removable = sum(c.removable for c in report.costs)
+    saved = sum(c.removable_bytes for c in report.costs)
+    print(f"\n📊 {len(report.costs)} tabelas | {sum(c.indexes for c in report.costs)} índices | "
+          f"{removable} removíveis (~{saved} bytes por linha inserida somando todas as tabelas)")
+
+
+def main():
+    args = parse_args()
+    schema = load_schema(args.schema_dir, cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR)
+    unknown = [m for m in args.models if m not in schema.models and m not in schema.by_table]
+    if unknown:
+        print(f"❌ Modelo(s) não encontrado(s): {', '.join(unknown)}", file=sys.stderr)
+        return 1
+
+    report = analyze_indexes(schema, set(args.models) or None)
+    if args.json:
+        payload = asdict(report)
+        for cost, data in zip(report.costs, payload['costs']):
+            data['amplification'] = round(cost.amplification, 3)
+            data['amplification_after'] = round(cost.amplification_after, 3)
+        print(json.dumps(payload, indent=2, ensure_ascii=False))
+    else:
+        print_report(report, args.top)
+    return 1 if args.strict and report.of('redundant') else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Relatório estático de cobertura de índices para as queries Prisma dos services
+
+Lê o where/orderBy de cada findMany/findFirst/count em src/**/*.service.ts e
+compara com os índices de prisma/schema/*.prisma. Lista as queries que nenhum
+prefixo de índice atende (seq scan quando a tabela do tenant cresce), com uma
+sugestão de @@index.
+
+Uso (a partir de apps/backend):
+    python3 scripts/analyze-query-coverage.py                      # queries sem índice
+    python3 scripts/analyze-query-coverage.py DailyRecord          # só um modelo
+    python3 scripts/analyze-query-coverage.py --all                # inclui pouco seletivas, sem filtro e não resolvidas
+    python3 scripts/analyze-query-coverage.py --json > coverage.json
+    python3 scripts/analyze-query-coverage.py --strict             # sai com 1 se houver query sem índice
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter, defaultdict
+from dataclasses import asdict
+
+from prisma_tools import DEFAULT_CACHE_DIR, SCHEMA_DIR, load_schema
+from prisma_tools.queries import SERVICE_GLOB, SRC_DIR, analyze_queries
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Cobertura de índices das queries Prisma dos services')
+    parser.add_argument('models', nargs='*', help='Modelos a analisar (padrão: todos)')
+    parser.add_argument('--src-dir', default=SRC_DIR, help=f'Código do backend (padrão: {SRC_DIR})')
+    parser.add_argument('--pattern', default=SERVICE_GLOB, help=f'Glob dos arquivos (padrão: {SERVICE_GLOB})')
+    parser.add_argument('--schema-dir', default=SCHEMA_DIR, help=f'Diretório do schema (padrão: {SCHEMA_DIR})')
+    parser.add_argument('--no-cache', action='store_true', help='Parseia todos os arquivos, sem cache')
+    parser.add_argument('--all', action='store_true', help='Lista também queries pouco seletivas, sem filtro e não resolvidas')
+    parser.add_argument('--json', action='store_true', help='Saída em JSON')
+    parser.add_argument('--strict', action='store_true', help='Sai com 1 se houver query sem índice')
+    return parser.parse_args()
+
+
+def classify(coverage):
+    query = coverage.query
+    if coverage.covered:
+        return 'covered'
+    if query.unresolved:
+        return 'unresolved'
+    if not query.predicates:
+        return 'unfiltered'
+    if coverage.low_selectivity:
+        return 'low-selectivity'
+    return 'uncovered'
+
+
+def print_report(results, show_all):
+    groups = defaultdict(list)
+    for coverage in results:
+        groups[classify(coverage)].append(coverage)
+
+    uncovered = groups['uncovered']
+    print(f"🐢 Queries sem índice aproveitável ({len(uncovered)})")
+    by_model = defaultdict(list)
+    for coverage in uncovered:
+        by_model[coverage.query.model].append(coverage)
+    for model in sorted(by_model, key=lambda m: (-len(by_model[m]), m)):
+        print(f"\n   📦 {model}")
+        for coverage in by_model[model]:
+            query = coverage.query
+            dynamic = ' (filtros condicionais)' if query.dynamic else ''
+            print(f"      {query.location}  {query.method}  {query.describe()}{dynamic}")
+            if coverage.suggestion:
+                print(f"         💡 {coverage.suggestion}")
+            if coverage.tenant_hint is not None:
+                print(f"         ⚠️  {coverage.tenant_hint.location} serviria, mas começa por tenantId "
+                      f"(não filtrado no schema do tenant)")
+
+    if show_all:
+        for kind, title in (('low-selectivity', '🎯 Só filtros pouco seletivos ou não indexáveis (índice não ajudaria)'),
+                            ('unfiltered', '📋 Sem filtro (leitura da tabela inteira)'),
+                            ('unresolved', '❔ where não resolvido estaticamente')):
+            print(f"\n{title} ({len(groups[kind])})")
+            for coverage in groups[kind]:
+                query = coverage.query
+                print(f"      {query.location}  {query.model}.{query.method}  {query.describe()}")
+
+    counts = Counter(classify(c) for c in results)
+    print(f"\n📊 {len(results)} queries | ✅ {counts['covered']} cobertas | 🐢 {counts['uncovered']} sem índice | "
+          f"🎯 {counts['low-selectivity']} pouco seletivas | 📋 {counts['unfiltered']} sem filtro | "
+          f"❔ {counts['unresolved']} não resolvidas")
+
+
+def main():
+    args = parse_args()
+    schema = load_schema(args.schema_dir, cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR)
+    unknown = [m for m in args.models if m not in schema.models]
+    if unknown:
+        print(f"❌ Modelo(s) não encontrado(s): {', '.join(unknown)}", file=sys.stderr)
+        return 1
+
+    results = [c for c in analyze_queries(schema, args.src_dir, args.pattern)
+               if not args.models or c.query.model in args.models]
+    if args.json:
+        payload = [{
+            'status': classify(c),
+            'query': asdict(c.query),
+            'index': str(c.index.location) if c.index is not None else None,
+            'usable_columns': c.usable,
+            'suggestion': c.suggestion,
+        } for c in results]
+        print(json.dumps(payload, indent=2, ensure_ascii=False))
+    else:
+        print_report(results, args.all)
+    return 1 if args.strict and any(classify(c) == 'uncovered' for c in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""
+Codemods para o código TypeScript do backend
+
+    from codemods import run_codemod
+
+    results = run_codemod('tenant-context', ['src/**/*.service.ts'], dry_run=True, options=options)
+
+Cada conjunto de regras (RULESETS) reescreve os arquivos em um único passe
+sobre os tokens; o motor distribui os arquivos entre processos e pula, pelo
+hash, os que já estão migrados.
+"""
+
+from . import tenant_context  # noqa: F401  (registra o conjunto 'tenant-context')
+from .engine import (
+    DEFAULT_CACHE_DIR,
+    RULESETS,
+    Edit,
+    FileResult,
+    Rule,
+    RuleSet,
+    apply_edits,
+    expand_paths,
+    register,
+    remove_item,
+    run_codemod,
+    transform,
+)
+from .tenant_context import TenantContextRuleSet, load_shared_models
+from .tokens import Token, TokenStream, tokenize
+
+__all__ = [
+    'DEFAULT_CACHE_DIR',
+    'RULESETS',
+    'Edit',
+    'FileResult',
+    'Rule',
+    'RuleSet',
+    'apply_edits',
+    'expand_paths',
+    'register',
+    'remove_item',
+    'run_codemod',
+    'transform',
+    'TenantContextRuleSet',
+    'load_shared_models',
+    'Token',
+    'TokenStream',
+    'tokenize',
+]
@@ -0,0 +1,285 @@
+"""
+Motor de codemods: regras sobre tokens, um passe por arquivo, em paralelo e com cache
+
+    from codemods import run_codemod
+
+    results = run_codemod('tenant-context', ['src/**/*.service.ts'], dry_run=True)
+
+- cada arquivo é tokenizado uma vez (TokenStream); todas as regras do
+  conjunto analisam o mesmo stream e devolvem edições (offset inicial, final,
+  texto novo); edições sobrepostas ficam com a regra declarada primeiro
+- os arquivos são distribuídos em um ProcessPoolExecutor; cada worker monta
+  as regras uma vez (initializer) e grava o resultado atomicamente
+- o cache (~/.cache/rafa-ilpi/codemod/<conjunto>.json) guarda o sha256 dos
+  arquivos que o conjunto de regras já deixa inalterados; nas próximas
+  execuções eles são pulados sem tokenizar. Depois de reescrever um arquivo
+  o worker aplica as regras de novo no resultado: só entra no cache se for
+  ponto fixo (regra idempotente)
+- dry-run devolve o diff unificado em vez de gravar
+"""
+
+import difflib
+import glob
+import hashlib
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .tokens import TokenStream
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'rafa-ilpi' / 'codemod'
+
+
+@dataclass
+class Edit:
+    start: int
+    end: int
+    text: str
+    rule: str = ''
+
+
+class Rule:
+    """Regra de reescrita: analisa o TokenStream e devolve [Edit]"""
+
+    name = 'rule'
+    description = ''
+
+    def edits(self, stream) -> List[Edit]:
+        raise NotImplementedError
+
+
+class RuleSet:
+    """Conjunto nomeado e versionado de regras (a versão invalida o cache)"""
+
+    name = 'ruleset'
+    version = 1
+    description = ''
+
+    def __init__(self, **options):
+        self.options = options
+
+    @classmethod
+    def default_options(cls):
+        """Opções usadas pela CLI (picklable: vão para os workers e para a chave do cache)"""
+        return {}
+
+    def rules(self) -> List[Rule]:
+        raise NotImplementedError
+
+    def applies(self, text):
+        """Filtro barato antes de tokenizar (ex: o arquivo usa TenantContextService)"""
+        return True
+
+    @property
+    def fingerprint(self):
+        payload = json.dumps({'name': self.name, 'version': self.version, 'options': self.options},
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+RULESETS = {}
+
+
+def register(ruleset_class):
+    RULESETS[ruleset_class.name] = ruleset_class
+    return ruleset_class
+
+
+# ============================================
+# Aplicação em um texto
+# ============================================
+def apply_edits(text, edits):
+    """Aplica as edições (a primeira de cada região sobreposta vence); retorna (texto, aplicadas)"""
+    applied, last_end = [], -1
+    for edit in sorted(edits, key=lambda e: e.start):
+        if edit.start < last_end:
+            continue
+        applied.append(edit)
+        last_end = max(last_end, edit.end)
+    out, cursor = [], 0
+    for edit in applied:
+        out.append(text[cursor:edit.start])
+        out.append(edit.text)
+        cursor = edit.end
+    out.append(text[cursor:])
+    return ''.join(out), applied
+
+
+def remove_item(stream, opener, position):
+    """Edit que remove o item `position` de (...)/{...}/[...] com a vírgula; sozinho na linha, remove a linha"""
+    items = stream.top_level_items(opener)
+    first, last = items[position]
+    text = stream.text
+    start, end = stream[first].start, stream[last].end
+    after = stream.next(last)
+    comma = stream.is_(after, ',')
+    line_start = text.rfind('\n', 0, start) + 1
+    line_end = text.find('\n', stream[after].end if comma else end)
+    if not text[line_start:start].strip() and line_end != -1 and \
+            not text[stream[after].end if comma else end:line_end].strip():
+        return Edit(line_start, line_end + 1, '')
+    if len(items) == 1:
+        return Edit(stream[opener].end, stream[stream.pairs[opener]].start, '')
+    if position < len(items) - 1:
+        return Edit(start, stream[items[position + 1][0]].start, '')
+    return Edit(stream[items[position - 1][1]].end, stream[after].end if comma else end, '')
+
+
+def transform(rules, text):
+    """(texto novo, Counter de edições por regra) com um único passe de tokenização"""
+    stream = TokenStream(text)
+    edits = []
+    for order, rule in enumerate(rules):
+        for edit in rule.edits(stream):
+            edit.rule = rule.name
+            edits.append((edit.start, order, edit))
+    # Mesma posição inicial: a regra declarada primeiro vence
+    ordered = [edit for _, _, edit in sorted(edits, key=lambda item: (item[0], item[1]))]
+    new_text, applied = apply_edits(text, ordered)
+    return new_text, Counter(edit.rule for edit in applied)
+
+
+# ============================================
+# Execução em paralelo
+# ============================================
+@dataclass
+class FileResult:
+    path: str
+    changed: bool = False
+    skipped: bool = False  # Hash no cache: nem tokenizado
+    counts: Dict[str, int] = field(default_factory=dict)
+    diff: Optional[str] = None
+    error: Optional[str] = None
+    sha256: Optional[str] = None  # Hash do conteúdo final, quando é ponto fixo das regras
+    idempotent: bool = True
+
+
+_worker = {}
+
+
+def _init_worker(ruleset_name, options):
+    ruleset = RULESETS[ruleset_name](**options)
+    _worker['ruleset'] = ruleset
+    _worker['rules'] = ruleset.rules()
+
+
+def _sha256(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _process(job):
+    path, display, known, dry_run = job
+    ruleset, rules = _worker['ruleset'], _worker['rules']
+    result = FileResult(display)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        digest = _sha256(text)
+        if digest == known:
+            result.skipped, result.sha256 = True, digest
+            return result
+        if not ruleset.applies(text):
+            result.sha256 = digest
+            return result
+        new_text, counts = transform(rules, text)
+        if new_text == text:
+            result.sha256 = digest
+            return result
+        result.changed, result.counts = True, dict(counts)
+        again, _ = transform(rules, new_text)
+        result.idempotent = again == new_text
+        if dry_run:
+            result.diff = ''.join(difflib.unified_diff(text.splitlines(keepends=True), new_text.splitlines(keepends=True),
+                                                       fromfile=f'a/{display}', tofile=f'b/{display}'))
+            return result
+        staging = f'{os.path.dirname(path)}/.{os.path.basename(path)}.{os.getpid()}.tmp'
+        with open(staging, 'w', encoding='utf-8') as f:
+            f.write(new_text)
+        os.replace(staging, path)
+        result.sha256 = _sha256(new_text) if result.idempotent else None
+    except (OSError, UnicodeDecodeError, ValueError) as exc:
+        result.error = str(exc)
+    return result
+
+
+def expand_paths(patterns, base_dir=BACKEND_DIR):
+    """Arquivos e globs (relativos ao diretório atual ou ao backend), sem repetição"""
+    found = []
+    for pattern in patterns:
+        matches = [p for p in glob.glob(pattern, recursive=True) if os.path.isfile(p)]
+        if not matches and not os.path.isabs(pattern):
+            matches = [p for p in glob.glob(str(Path(base_dir) / pattern), recursive=True) if os.path.isfile(p)]
+        found.extend(os.path.abspath(p) for p in sorted(matches))
+    return list(dict.fromkeys(found))
+
+
+class CodemodCache:
+    """{arquivo: sha256} dos arquivos que já são ponto fixo do conjunto de regras"""
+
+    def __init__(self, cache_dir, ruleset):
+        self.path = Path(cache_dir) / f'{ruleset.name}.json' if cache_dir else None
+        self.fingerprint = ruleset.fingerprint
+        self.files = {}
+        if self.path and self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    payload = json.load(f)
+                if payload.get('fingerprint') == self.fingerprint:
+                    self.files = payload.get('files', {})
+            except (OSError, ValueError):
+                self.files = {}
+
+    def get(self, path):
+        return self.files.get(path)
+
+    def update(self, results, paths):
+        for result, path in zip(results, paths):
+            if result.sha256 and not result.error:
+                self.files[path] = result.sha256
+            else:
+                self.files.pop(path, None)
+
+    def save(self):
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        staging = self.path.with_name(f'.{self.path.name}.{os.getpid()}.tmp')
+        with open(staging, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': self.fingerprint, 'files': self.files}, f)
+        os.replace(staging, self.path)
+
+
+def run_codemod(ruleset_name, patterns, dry_run=False, jobs=None, cache_dir=DEFAULT_CACHE_DIR, options=None,
+                base_dir=BACKEND_DIR):
+    """[FileResult] de todos os arquivos de `patterns`, processados em paralelo"""
+    options = options or {}
+    ruleset = RULESETS[ruleset_name](**options)
+    paths = expand_paths(patterns, base_dir)
+    cache = CodemodCache(cache_dir, ruleset)
+    base = str(Path(base_dir).resolve())
+
+    def display(path):
+        return os.path.relpath(path, base) if path.startswith(base + os.sep) else path
+
+    # Em dry-run nada é gravado, então o cache só pode pular arquivos já estáveis
+    job_list = [(path, display(path), cache.get(path), dry_run) for path in paths]
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(job_list) < 2:
+        _init_worker(ruleset_name, options)
+        results = [_process(job) for job in job_list]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(ruleset_name, options)) as executor:
+            results = list(executor.map(_process, job_list, chunksize=max(1, len(job_list) // (jobs * 4))))
+
+    if not dry_run:
+        cache.update(results, paths)
+    else:
+        cache.update([r for r in results if not r.changed], [p for p, r in zip(paths, results) if not r.changed])
+    cache.save()
+    return results
@@ -0,0 +1,318 @@
+"""
+Regras 'tenant-context': migração dos services para o TenantContextService
+
+Generaliza o antigo refactor-tenantid.py (regex sobre residents.service.ts)
+para qualquer service que injete o TenantContextService:
+
+- shared-client: this.tenantContext.client.<modelo SHARED> -> this.prisma.<modelo>
+  (tabelas do schema public; só quando o service injeta o PrismaService)
+- where-tenant-filter: remove tenantId do where de chamadas em modelos do
+  tenant (o schema do tenant só tem linhas dele); a linha inteira some quando
+  o filtro estava sozinho nela. Só filtros com o tenant do contexto
+  (tenantId local ou this.tenantContext.tenantId); data/create não são tocados
+- tenant-param: métodos privados com parâmetro `tenantId: string` perdem o
+  parâmetro e passam a ler this.tenantContext.tenantId; o argumento
+  correspondente some das chamadas this.metodo(...). Só quando todas as
+  chamadas no arquivo passam o tenant do contexto
+"""
+
+import re
+from pathlib import Path
+
+from prisma_tools import DEFAULT_CACHE_DIR, load_schema
+from prisma_tools.typescript import IDENT, STRING
+
+from .engine import BACKEND_DIR, Edit, Rule, RuleSet, register, remove_item
+
+MIDDLEWARE_FILE = BACKEND_DIR / 'src' / 'prisma' / 'prisma-query-logger.middleware.ts'
+CONTEXT_TENANT = 'this.tenantContext.tenantId'
+WHERE_OPERATIONS = {
+    'findUnique', 'findUniqueOrThrow', 'findFirst', 'findFirstOrThrow', 'findMany', 'count', 'aggregate',
+    'groupBy', 'update', 'updateMany', 'upsert', 'delete', 'deleteMany',
+}
+# O where destas precisa continuar apontando um registro único: tenantId sozinho fica
+UNIQUE_OPERATIONS = {'findUnique', 'findUniqueOrThrow', 'update', 'upsert', 'delete'}
+PUBLIC_RECEIVERS = ('this.prisma', 'publicClient')
+_DECLARATION_KEYWORDS = {'const', 'let', 'var'}
+_TEMPLATE_USE = re.compile(r'\$\{[^}]*\btenantId\b')
+
+
+def accessor_of(model_name):
+    return model_name[0].lower() + model_name[1:]
+
+
+def load_shared_models(path=MIDDLEWARE_FILE):
+    """Modelos do schema public, lidos do SHARED_MODELS do middleware de queries"""
+    text = Path(path).read_text(encoding='utf-8')
+    match = re.search(r'SHARED_MODELS\s*=\s*new\s+Set\(\[(.*?)\]\)', text, re.S)
+    if match is None:
+        raise ValueError(f'SHARED_MODELS não encontrado em {path}')
+    return sorted(re.findall(r"['\"](\w+)['\"]", match.group(1)))
+
+
+def _member_chain(stream, index):
+    """Texto da cadeia a.b.c que termina no identificador `index` (sem o próprio)"""
+    parts = []
+    cursor = stream.prev(index)
+    while stream.is_(cursor, '.', '?.'):
+        owner = stream.prev(cursor)
+        if owner is None or stream[owner].kind != IDENT:
+            break
+        parts.append(stream[owner].text)
+        cursor = stream.prev(owner)
+    return '.'.join(reversed(parts))
+
+
+def _item_text(stream, item):
+    first, last = item
+    return stream.text[stream[first].start:stream[last].end]
+
+
+class SharedClientRule(Rule):
+    name = 'shared-client'
+    description = 'this.tenantContext.client.<SHARED> -> this.prisma.<SHARED>'
+
+    def __init__(self, shared_accessors):
+        self.shared = set(shared_accessors)
+
+    def edits(self, stream):
+        if 'prisma: PrismaService' not in stream.text:
+            return []
+        edits = []
+        for index in stream.significant:
+            token = stream[index]
+            if token.kind != IDENT or token.text not in self.shared:
+                continue
+            dot = stream.prev(index)
+            client = stream.prev(dot)
+            if not stream.is_(dot, '.') or _member_chain(stream, index) != 'this.tenantContext.client':
+                continue
+            # this . tenantContext . client . <acc>: troca de "tenantContext" até "client"
+            context = stream.prev(client, 2)
+            edits.append(Edit(stream[context].start, stream[client].end, 'prisma'))
+        return edits
+
+
+class WhereTenantFilterRule(Rule):
+    name = 'where-tenant-filter'
+    description = 'remove tenantId do where em modelos do schema do tenant'
+
+    def __init__(self, tenant_accessors):
+        self.accessors = set(tenant_accessors)
+
+    def edits(self, stream):
+        edits = []
+        for index in stream.significant:
+            token = stream[index]
+            if token.kind != IDENT or token.text not in WHERE_OPERATIONS:
+                continue
+            paren = stream.next(index)
+            accessor = stream.prev(index, 2)
+            if not stream.is_(paren, '(') or not stream.is_(stream.prev(index), '.') or accessor is None:
+                continue
+            if stream[accessor].text not in self.accessors or _member_chain(stream, accessor) in PUBLIC_RECEIVERS:
+                continue
+            argument = stream.next(paren)
+            if not stream.is_(argument, '{'):
+                continue
+            for position, (first, last) in enumerate(stream.top_level_items(argument)):
+                if stream.text_of(first) == 'where' and stream.is_(stream.next(first), ':') \
+                        and stream.is_(stream.next(first, 2), '{'):
+                    edits.extend(self._drop_tenant(stream, argument, position, token.text))
+        return edits
+
+    @staticmethod
+    def _drop_tenant(stream, argument, where_position, operation):
+        where = stream.next(stream.top_level_items(argument)[where_position][0], 2)
+        items = stream.top_level_items(where)
+        for position, item in enumerate(items):
+            text = _item_text(stream, item)
+            key, _, value = (part.strip() for part in text.partition(':'))
+            if key != 'tenantId' or (value and value not in ('tenantId', CONTEXT_TENANT)):
+                continue
+            if len(items) > 1:
+                return [remove_item(stream, where, position)]
+            if operation in UNIQUE_OPERATIONS:
+                return []
+            # `where: { tenantId }` vira ausência de filtro: sai a entrada where inteira
+            return [remove_item(stream, argument, where_position)]
+        return []
+
+
+class TenantParamRule(Rule):
+    name = 'tenant-param'
+    description = 'métodos privados: parâmetro tenantId -> this.tenantContext.tenantId'
+
+    def edits(self, stream):
+        methods = self._candidates(stream)
+        calls = self._calls(stream, methods)
+        # Descarta métodos com alguma chamada que não passe o tenant do contexto; repete até estabilizar,
+        # porque `tenantId` só vale como argumento dentro de outro método que também será reescrito
+        while True:
+            rejected = {name for name, method in methods.items()
+                        if not calls[name] or any(not self._context_argument(stream, call, method, methods)
+                                                  for call in calls[name])}
+            if not rejected:
+                break
+            for name in rejected:
+                del methods[name]
+        edits = []
+        for name, method in methods.items():
+            edits.append(remove_item(stream, method['params'], method['position']))
+            edits.extend(self._body_edits(stream, method['body']))
+            for paren in calls[name]:
+                edits.append(remove_item(stream, paren, method['position']))
+        return edits
+
+    @staticmethod
+    def _candidates(stream):
+        methods = {}
+        for index in stream.significant:
+            token = stream[index]
+            paren = stream.next(index)
+            if token.kind != IDENT or not stream.is_(paren, '('):
+                continue
+            modifiers = {stream.text_of(stream.prev(index)), stream.text_of(stream.prev(index, 2))}
+            if 'private' not in modifiers:
+                continue
+            if paren not in stream.pairs:
+                continue
+            body = TenantParamRule._body_of(stream, stream.pairs[paren])
+            if body is None:
+                continue
+            for position, item in enumerate(stream.top_level_items(paren)):
+                if _item_text(stream, item).replace(' ', '') == 'tenantId:string':
+                    if not TenantParamRule._declares_tenant(stream, body):
+                        methods[token.text] = {'params': paren, 'position': position, 'body': body,
+                                               'count': len(stream.top_level_items(paren))}
+                    break
+        return methods
+
+    @staticmethod
+    def _body_of(stream, closer):
+        """Chave que abre o corpo depois da lista de parâmetros (pulando o tipo de retorno)"""
+        cursor = stream.next(closer)
+        if not stream.is_(cursor, ':'):
+            return cursor if stream.is_(cursor, '{') else None
+        angle, cursor = 0, stream.next(cursor)
+        while cursor is not None:
+            text = stream.text_of(cursor)
+            if text == '{' and angle == 0:
+                return cursor
+            if text == '<':
+                angle += 1
+            elif text == '>':
+                angle -= 1
+            elif text in ('(', '[', '{'):
+                cursor = stream.pairs.get(cursor, cursor)
+            elif text in (';', '}'):
+                return None
+            cursor = stream.next(cursor)
+        return None
+
+    @staticmethod
+    def _declares_tenant(stream, body):
+        """O corpo redeclara tenantId ou o usa dentro de template literal (opaco para as regras)"""
+        for index in range(body, stream.pairs[body]):
+            if stream[index].kind == STRING and _TEMPLATE_USE.search(stream[index].text):
+                return True
+            if stream[index].text != 'tenantId' or stream[index].kind != IDENT:
+                continue
+            previous, following = stream.prev(index), stream.next(index)
+            if stream.text_of(previous) in _DECLARATION_KEYWORDS or stream.is_(following, '=', '=>'):
+                return True
+            if stream.is_(following, ':', ',', ')') and stream.is_(previous, '(', ','):
+                opener = stream.parent.get(index)
+                if opener is not None and stream.is_(stream.next(stream.pairs.get(opener)), '=>'):
+                    return True  # Parâmetro de arrow function
+        return False
+
+    @staticmethod
+    def _calls(stream, methods):
+        calls = {name: [] for name in methods}
+        for index in stream.significant:
+            token = stream[index]
+            if token.kind != IDENT or token.text not in methods:
+                continue
+            paren = stream.next(index)
+            if stream.is_(paren, '(') and _member_chain(stream, index) == 'this' and paren != methods[token.text]['params']:
+                calls[token.text].append(paren)
+        return calls
+
+    @staticmethod
+    def _context_argument(stream, paren, method, methods):
+        items = stream.top_level_items(paren)
+        if len(items) != method['count']:
+            return False
+        argument = _item_text(stream, items[method['position']])
+        if argument == CONTEXT_TENANT:
+            return True
+        if argument != 'tenantId':
+            return False
+        if any(other['body'] < paren < stream.pairs[other['body']] for other in methods.values()):
+            return True
+        return TenantParamRule._bound_to_context(stream, paren)
+
+    @staticmethod
+    def _bound_to_context(stream, index):
+        """`tenantId` visível em `index` vem de `const tenantId = this.tenantContext.tenantId`"""
+        block = stream.parent.get(index)
+        while block is not None:
+            if stream.is_(block, '{'):
+                for cursor in range(block + 1, stream.pairs.get(block, block)):
+                    if stream.parent.get(cursor) == block and stream[cursor].text == 'tenantId' \
+                            and stream.is_(stream.prev(cursor), 'const') and stream.is_(stream.next(cursor), '='):
+                        value_start = stream[stream.next(cursor, 2)].start
+                        return stream.text[value_start:value_start + len(CONTEXT_TENANT)] == CONTEXT_TENANT \
+                            and not stream.is_(stream.next(cursor, 7), '.', '?.', '(', '[')
+            block = stream.parent.get(block)
+        return False
+
+    @staticmethod
+    def _body_edits(stream, body):
+        edits = []
+        for index in range(body + 1, stream.pairs[body]):
+            token = stream[index]
+            if token.kind != IDENT or token.text != 'tenantId':
+                continue
+            previous, following = stream.prev(index), stream.next(index)
+            if stream.is_(previous, '.', '?.'):
+                continue
+            in_object = stream.is_(stream.parent.get(index), '{') and stream.is_(previous, '{', ',')
+            if in_object and stream.is_(following, ':'):
+                continue  # Chave: o valor é tratado à parte
+            if in_object and stream.is_(following, ',', '}'):
+                edits.append(Edit(token.start, token.end, f'tenantId: {CONTEXT_TENANT}'))
+            else:
+                edits.append(Edit(token.start, token.end, CONTEXT_TENANT))
+        return edits
+
+
+@register
+class TenantContextRuleSet(RuleSet):
+    name = 'tenant-context'
+    version = 1
+    description = 'migra services para o TenantContextService (client do tenant, tabelas SHARED, tenantId)'
+
+    def __init__(self, shared_accessors=(), tenant_accessors=()):
+        super().__init__(shared_accessors=sorted(shared_accessors), tenant_accessors=sorted(tenant_accessors))
+
+    @classmethod
+    def default_options(cls):
+        """Acessores do schema Prisma (com cache) separados pelo SHARED_MODELS do middleware"""
+        schema = load_schema(cache_dir=DEFAULT_CACHE_DIR)
+        shared = load_shared_models()
+        return {
+            'shared_accessors': [accessor_of(name) for name in shared],
+            'tenant_accessors': [accessor_of(name) for name in schema.models if name not in shared],
+        }
+
+    def applies(self, text):
+        return 'TenantContextService' in text
+
+    def rules(self):
+        return [
+            SharedClientRule(self.options['shared_accessors']),
+            WhereTenantFilterRule(self.options['tenant_accessors']),
+            TenantParamRule(),
+        ]
@@ -0,0 +1,91 @@
+"""
+Tokenização de TypeScript para os codemods
+
+Cada arquivo é tokenizado uma vez; as regras trabalham sobre a lista de
+tokens (com offsets no texto original) e devolvem edições por offset. A
+concatenação dos tokens reproduz o texto exatamente, então o que nenhuma
+regra toca sai byte a byte igual.
+
+Strings, template literals (inteiros, com ${...}), comentários e regex
+literais são tokens opacos: as regras nunca reescrevem dentro deles. O
+tokenizador é o de prisma_tools.typescript, o mesmo das análises de queries.
+"""
+
+from typing import List
+
+from prisma_tools.typescript import PUNCT, Token, tokenize
+
+_OPENERS = {'(': ')', '[': ']', '{': '}'}
+
+
+class TokenStream:
+    """Tokens de um arquivo com navegação por tokens significativos e pares de delimitadores"""
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens: List[Token] = tokenize(text)
+        self.significant = [i for i, token in enumerate(self.tokens) if token.significant]
+        self._position = {index: n for n, index in enumerate(self.significant)}
+        self.pairs = {}
+        self.parent = {}  # Índice do token -> índice do delimitador aberto que o contém
+        stack = []
+        for index in self.significant:
+            token = self.tokens[index]
+            if stack:
+                self.parent[index] = stack[-1]
+            if token.kind == PUNCT and token.text in _OPENERS:
+                stack.append(index)
+            elif token.kind == PUNCT and token.text in _OPENERS.values() and stack:
+                opener = stack.pop()
+                if _OPENERS[self.tokens[opener].text] == token.text:
+                    self.pairs[opener] = index
+                    self.pairs[index] = opener
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def __getitem__(self, index):
+        return self.tokens[index]
+
+    def next(self, index, steps=1):
+        """Índice do n-ésimo token significativo depois de `index` (ou None)"""
+        position = self._position.get(index)
+        if position is None:
+            position = next((n - 1 for n, i in enumerate(self.significant) if i > index), len(self.significant) - 1)
+        target = position + steps
+        return self.significant[target] if 0 <= target < len(self.significant) else None
+
+    def prev(self, index, steps=1):
+        position = self._position.get(index)
+        if position is None:
+            position = next((n for n, i in enumerate(self.significant) if i > index), len(self.significant))
+        target = position - steps
+        return self.significant[target] if 0 <= target < len(self.significant) else None
+
+    def text_of(self, index):
+        return self.tokens[index].text if index is not None else None
+
+    def is_(self, index, *texts):
+        return index is not None and self.tokens[index].text in texts
+
+    def top_level_items(self, opener):
+        """[(primeiro, último)] índices significativos de cada item separado por vírgula em (...)/{...}/[...]"""
+        closer = self.pairs.get(opener)
+        if closer is None:
+            return []
+        items, first, last = [], None, None
+        index = self.next(opener)
+        while index is not None and index < closer:
+            token = self.tokens[index]
+            if token.text == ',' and self.parent.get(index) == opener:
+                if first is not None:
+                    items.append((first, last))
+                first = last = None
+            else:
+                first = index if first is None else first
+                last = self.pairs[index] if index in self.pairs and index < closer else index
+                index = last
+            index = self.next(index)
+        if first is not None:
+            items.append((first, last))
+        return items
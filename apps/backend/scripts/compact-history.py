@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Compacta as tabelas *_history de um tenant: snapshot completo a cada K versões, JSON Patch entre elas
+
+Cada edição de um modelo versionado grava previousData e newData completos;
+o histórico cresce ~2x o tamanho do registro por edição. Este script
+reescreve as linhas existentes no formato de prisma_tools/snapshots.py
+(âncora completa a cada --every versões do registro, envelopes
+{"$patch": [...]} nas demais), em lotes e com memória constante. O backend
+lê os dois formatos (middleware history-snapshot em src/prisma/middleware),
+e versões novas continuam sendo gravadas completas até a próxima execução.
+
+Uso (a partir de apps/backend):
+    python3 scripts/compact-history.py tenant_casa_sao_rafael_abc123 --dry-run        # só estima a economia
+    python3 scripts/compact-history.py tenant_x                                         # todas as *_history
+    python3 scripts/compact-history.py tenant_x --tables AllergyHistory vital_sign_history --every 20
+    python3 scripts/compact-history.py tenant_x --show AllergyHistory:<allergyId>:7    # reconstrói uma versão
+    python3 scripts/compact-history.py tenant_x --expand                                # volta tudo a JSON completo
+
+Pode ser interrompido e repetido: cada lote tem commit próprio e linhas já
+no formato certo não são reescritas. Requer psycopg 3.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from prisma_tools import DEFAULT_CACHE_DIR, SCHEMA_DIR, load_schema
+from prisma_tools.compact import DEFAULT_BATCH, HistoryCompactor, history_tables
+from prisma_tools.psql import libpq_url
+from prisma_tools.snapshots import DEFAULT_SNAPSHOT_EVERY
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Compacta o previousData/newData das tabelas de histórico de um tenant')
+    parser.add_argument('schema', help='Schema do tenant (ex: tenant_casa_sao_rafael_abc123)')
+    parser.add_argument('--tables', nargs='+', help='Modelos ou tabelas de histórico (padrão: todas as versionadas)')
+    parser.add_argument('--every', type=int, default=DEFAULT_SNAPSHOT_EVERY,
+                        help=f'Versões por snapshot completo (padrão: {DEFAULT_SNAPSHOT_EVERY})')
+    parser.add_argument('--batch', type=int, default=DEFAULT_BATCH,
+                        help=f'Linhas atualizadas por commit (padrão: {DEFAULT_BATCH})')
+    parser.add_argument('--expand', action='store_true', help='Desfaz a compactação (todas as linhas completas)')
+    parser.add_argument('--dry-run', action='store_true', help='Lê e calcula a economia sem gravar')
+    parser.add_argument('--show', metavar='MODELO:REGISTRO:VERSÃO', help='Mostra uma versão reconstruída e sai')
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL'), help='Banco (padrão: $DATABASE_URL)')
+    parser.add_argument('--schema-dir', default=SCHEMA_DIR, help=f'Diretório do schema (padrão: {SCHEMA_DIR})')
+    return parser.parse_args()
+
+
+def megabytes(size):
+    return size / (1 << 20)
+
+
+def show_version(compactor, tables, spec):
+    try:
+        name, record_id, version = spec.rsplit(':', 2)
+        version = int(version)
+    except ValueError:
+        print("❌ --show espera MODELO:REGISTRO:VERSÃO", file=sys.stderr)
+        return 1
+    table = next((t for t in tables if name in (t.model, t.table)), None)
+    if table is None:
+        print(f"❌ {name} não é uma tabela de histórico versionada", file=sys.stderr)
+        return 1
+    decoded = compactor.read_version(table, record_id, version)
+    if decoded is None:
+        print(f"❌ {table.model} {record_id} não tem a versão {version}", file=sys.stderr)
+        return 1
+    previous, new = decoded
+    print(json.dumps({'versionNumber': version, 'previousData': previous, 'newData': new},
+                     ensure_ascii=False, indent=2, default=str))
+    return 0
+
+
+def main():
+    args = parse_args()
+    if not args.database_url:
+        print("❌ Informe --database-url (ou DATABASE_URL)", file=sys.stderr)
+        return 1
+    if args.every < 1 or args.batch < 1:
+        print("❌ --every e --batch devem ser positivos", file=sys.stderr)
+        return 1
+    schema = load_schema(args.schema_dir, cache_dir=DEFAULT_CACHE_DIR)
+    tables = history_tables(schema)
+    if args.tables:
+        unknown = [name for name in args.tables if not any(name in (t.model, t.table) for t in tables)]
+        if unknown:
+            print(f"❌ Não são tabelas de histórico versionadas: {', '.join(unknown)}", file=sys.stderr)
+            return 1
+        tables = [t for t in tables if t.model in args.tables or t.table in args.tables]
+
+    every = 1 if args.expand else args.every
+    compactor = HistoryCompactor(libpq_url(args.database_url), args.schema, every=every, batch=args.batch,
+                                 dry_run=args.dry_run)
+    started = time.perf_counter()
+    try:
+        if args.show:
+            return show_version(compactor, tables, args.show)
+
+        mode = 'expandindo' if args.expand else f'snapshot a cada {every} versões'
+        print(f"🗜️  {args.schema}: {len(tables)} tabelas de histórico, {mode}{' (dry-run)' if args.dry_run else ''}")
+        totals = []
+        for table in tables:
+            stats = compactor.compact(table)
+            totals.append(stats)
+            if not stats.rows:
+                continue
+            print(f"✅ {table.table}: {stats.rows} linhas de {stats.records} registros, {stats.changed} reescritas | "
+                  f"{megabytes(stats.bytes_before):.1f} MB → {megabytes(stats.bytes_after):.1f} MB "
+                  f"({stats.ratio * 100:.0f}%) em {stats.seconds:.1f}s")
+    except Exception as exc:  # psycopg.Error, RuntimeError sem psycopg, envelope sem âncora
+        print(f"❌ {exc}", file=sys.stderr)
+        return 1
+    finally:
+        compactor.close()
+
+    before = sum(s.bytes_before for s in totals)
+    after = sum(s.bytes_after for s in totals)
+    print(f"\n📊 {sum(s.rows for s in totals)} linhas | {sum(s.changed for s in totals)} "
+          f"{'a reescrever' if args.dry_run else 'reescritas'} | JSON {megabytes(before):.1f} MB → "
+          f"{megabytes(after):.1f} MB ({after / before * 100 if before else 100:.0f}%) "
+          f"({time.perf_counter() - started:.1f}s)")
+    if not args.dry_run and before > after:
+        print("👉 O espaço volta ao disco com VACUUM (FULL) nas tabelas reescritas")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Detecta chamadas Prisma feitas por iteração (N+1) no backend
+
+Varre src/**/*.ts atrás de find*/count/create/update... dentro de for/while,
+.map/.forEach (inclusive os fan-outs com Promise.all) e de métodos da mesma
+classe chamados no loop. Para cada uma sugere o equivalente em lote e, no
+final, mostra a contagem por arquivo.
+
+Uso (a partir de apps/backend):
+    python3 scripts/detect-n-plus-one.py                               # relatório completo
+    python3 scripts/detect-n-plus-one.py --summary                     # só contagem por arquivo
+    python3 scripts/detect-n-plus-one.py --save-baseline n-plus-one.json
+    python3 scripts/detect-n-plus-one.py --baseline n-plus-one.json    # sai com 1 se algum arquivo piorou
+    python3 scripts/detect-n-plus-one.py --summary --strict            # sai com 1 se algum arquivo não foi lido
+
+Loops sobre tenants (getTenantClient a cada iteração) aparecem à parte e não
+entram na contagem: não há como agrupá-los em uma query.
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter, defaultdict
+from dataclasses import asdict
+
+from prisma_tools import DEFAULT_CACHE_DIR, SCHEMA_DIR, load_schema
+from prisma_tools.nplusone import SOURCE_GLOB, scan_all
+from prisma_tools.queries import SRC_DIR
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Detecta N+1 (chamadas Prisma por iteração) no backend')
+    parser.add_argument('--src-dir', default=SRC_DIR, help=f'Código do backend (padrão: {SRC_DIR})')
+    parser.add_argument('--pattern', default=SOURCE_GLOB, help=f'Glob dos arquivos (padrão: {SOURCE_GLOB})')
+    parser.add_argument('--schema-dir', default=SCHEMA_DIR, help=f'Diretório do schema (padrão: {SCHEMA_DIR})')
+    parser.add_argument('--summary', action='store_true', help='Só a contagem por arquivo')
+    parser.add_argument('--json', action='store_true', help='Saída em JSON')
+    parser.add_argument('--baseline', help='Compara com a contagem salva; sai com 1 se algum arquivo piorou')
+    parser.add_argument('--strict', action='store_true', help='Sai com 1 se algum arquivo não puder ser analisado')
+    parser.add_argument('--save-baseline', help='Salva a contagem por arquivo (JSON) para comparações futuras')
+    return parser.parse_args()
+
+
+def print_findings(findings):
+    by_file = defaultdict(list)
+    for finding in findings:
+        by_file[finding.file].append(finding)
+    for file in sorted(by_file):
+        print(f"\n📄 {file}")
+        for finding in by_file[file]:
+            call = f"{finding.model}.{finding.operation}"
+            via = f" via this.{finding.via}()" if finding.via else ''
+            print(f"   :{finding.line:<5} {call}{via} em {finding.loop} (linha {finding.loop_line})")
+            print(f"          💡 {finding.suggestion}")
+
+
+def save_counts(path, counts):
+    staging = f'{path}.{os.getpid()}.tmp'
+    with open(staging, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(counts.items())), f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    os.replace(staging, path)
+
+
+def compare(counts, baseline):
+    """(pioraram, melhoraram): [(arquivo, antes, depois)]"""
+    worse, better = [], []
+    for file in sorted(set(counts) | set(baseline)):
+        before, after = baseline.get(file, 0), counts.get(file, 0)
+        if after > before:
+            worse.append((file, before, after))
+        elif after < before:
+            better.append((file, before, after))
+    return worse, better
+
+
+def main():
+    args = parse_args()
+    schema = load_schema(args.schema_dir, cache_dir=DEFAULT_CACHE_DIR)
+    errors = []
+    findings = scan_all(schema, args.src_dir, args.pattern, errors=errors)
+    for file, error in errors:
+        print(f"⚠️  {file}: não analisado ({error})", file=sys.stderr)
+    batchable = [f for f in findings if not f.per_tenant]
+    per_tenant = [f for f in findings if f.per_tenant]
+    counts = Counter(f.file for f in batchable)
+
+    if args.json:
+        print(json.dumps({'findings': [asdict(f) for f in findings], 'counts': dict(counts)},
+                         indent=2, ensure_ascii=False))
+    else:
+        if not args.summary:
+            print(f"🔁 Chamadas Prisma por iteração ({len(batchable)})")
+            print_findings(batchable)
+            if per_tenant:
+                print(f"\n🏢 Em loops por tenant ({len(per_tenant)}, fora da contagem)")
+                print_findings(per_tenant)
+        print("\n📊 Por arquivo")
+        for file, count in counts.most_common():
+            print(f"   {count:>4}  {file}")
+        print(f"   {sum(counts.values()):>4}  total em {len(counts)} arquivos")
+
+    if args.save_baseline:
+        save_counts(args.save_baseline, counts)
+        print(f"💾 Baseline salvo em {args.save_baseline}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        worse, better = compare(counts, baseline)
+        for file, before, after in better:
+            print(f"🎉 {file}: {before} → {after}", file=sys.stderr)
+        for file, before, after in worse:
+            print(f"❌ {file}: {before} → {after}", file=sys.stderr)
+        if worse:
+            return 1
+        print(f"✅ Nenhum arquivo piorou em relação a {args.baseline}", file=sys.stderr)
+    if args.strict and errors:
+        print(f"❌ {len(errors)} arquivos não analisados", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
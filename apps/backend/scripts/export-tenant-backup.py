@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Exporta o backup CSV de um tenant: partes comprimidas (gzip/zstd) + manifest.json
+
+Contraparte do import-tenant-backup.py. Todas as tabelas do schema do
+tenant (e as linhas do tenant em public) saem por COPY ... TO STDOUT direto
+para o compressor, em partes de tamanho limitado exportadas em paralelo
+num mesmo snapshot. O manifest registra linhas, bytes e sha256 de cada
+parte; se a exportação for interrompida, rodar o mesmo comando de novo
+retoma a partir das partes que faltam.
+
+Uso (a partir de apps/backend):
+    python3 scripts/export-tenant-backup.py tenant_casa_sao_rafael_abc123           # backups/<schema>_<AAAAMMDD>
+    python3 scripts/export-tenant-backup.py tenant_x -o backups/x --compression zstd -j 8
+    python3 scripts/export-tenant-backup.py tenant_x -o backups/x --chunk-mb 64      # partes menores
+
+Requer psycopg 3; --compression zstd requer zstandard.
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+from prisma_tools.backup import COMPRESSIONS
+from prisma_tools.export import DEFAULT_CHUNK_BYTES, TenantExport
+from prisma_tools.psql import libpq_url
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Exporta o backup CSV comprimido de um tenant')
+    parser.add_argument('schema', help='Schema do tenant (ex: tenant_casa_sao_rafael_abc123)')
+    parser.add_argument('-o', '--output', help='Diretório do backup (padrão: backups/<schema>_<AAAAMMDD>)')
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL'), help='Banco (padrão: $DATABASE_URL)')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 4,
+                        help='Conexões em paralelo (padrão: núcleos da máquina)')
+    parser.add_argument('--compression', choices=sorted(COMPRESSIONS), default='gzip', help='Compressão (padrão: gzip)')
+    parser.add_argument('--level', type=int, help='Nível de compressão (padrão: 6 no gzip, 3 no zstd)')
+    parser.add_argument('--chunk-mb', type=int, default=DEFAULT_CHUNK_BYTES >> 20,
+                        help=f'CSV descomprimido por parte, em MB (padrão: {DEFAULT_CHUNK_BYTES >> 20})')
+    return parser.parse_args()
+
+
+def megabytes(size):
+    return size / (1 << 20)
+
+
+def main():
+    args = parse_args()
+    if not args.database_url:
+        print("❌ Informe --database-url (ou DATABASE_URL)", file=sys.stderr)
+        return 1
+    output = args.output or f'backups/{args.schema}_{datetime.now(timezone.utc):%Y%m%d}'
+    export = TenantExport(libpq_url(args.database_url), args.schema, output, args.compression, args.level,
+                          args.chunk_mb << 20)
+    started = time.perf_counter()
+    try:
+        manifest = export.prepare(args.jobs)
+        if not manifest.tables:
+            print(f"❌ Nenhuma tabela em {args.schema}", file=sys.stderr)
+            return 1
+        chunks = [chunk for entry in manifest.tables for chunk in entry.chunks]
+        pending = [chunk for chunk in chunks if not chunk.done]
+        if export.resumed:
+            print(f"🔁 Retomando {output}: {len(chunks) - len(pending)}/{len(chunks)} partes prontas")
+        else:
+            print(f"📦 {len(manifest.tables)} tabelas em {len(chunks)} partes → {output}")
+        if manifest.tenant_id is None:
+            print(f"⚠️  {args.schema} não está em public.tenants: linhas de public não exportadas", file=sys.stderr)
+
+        def done(result):
+            rate = megabytes(result.raw_bytes) / result.seconds if result.seconds else 0
+            print(f"✅ {result.file}: {result.rows} linhas, {megabytes(result.raw_bytes):.1f} MB → "
+                  f"{megabytes(result.bytes):.1f} MB em {result.seconds:.1f}s ({rate:.1f} MB/s)")
+
+        results = export.run(args.jobs, on_done=done)
+    except Exception as exc:  # psycopg.Error, RuntimeError sem psycopg/zstandard, manifest de outro schema
+        print(f"❌ {exc}", file=sys.stderr)
+        return 1
+    finally:
+        export.close()
+
+    failures = {name: error for name, (_, error) in results.items() if error}
+    for name, error in failures.items():
+        print(f"❌ {name}: {error}", file=sys.stderr)
+    if failures:
+        print(f"👉 Rode o mesmo comando de novo para retomar ({output})", file=sys.stderr)
+
+    raw = sum(result.raw_bytes for result, _ in results.values() if result)
+    written = sum(chunk.bytes or 0 for chunk in chunks)
+    rows = sum(entry.rows for entry in manifest.tables)
+    elapsed = time.perf_counter() - started
+    print(f"\n📊 {rows} linhas | {megabytes(written):.1f} MB comprimidos | "
+          f"{megabytes(raw) / elapsed if elapsed else 0:.1f} MB/s de CSV com {args.jobs} conexões | "
+          f"{'✅ completo' if manifest.done else f'❌ {len(failures)} partes com erro'}"
+          f"{'' if manifest.consistent else ' (retomado: partes de snapshots diferentes)'} ({elapsed:.1f}s)")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Gera o SQL de migração a partir do diff entre duas versões do schema Prisma
+
+Alternativa offline ao `prisma migrate dev` para rascunhos de migração: em
+vez de replayar as migrações em um banco de sombra, compara o schema de uma
+revisão do git (ou de outro diretório) com prisma/schema/*.prisma e emite o
+DDL no formato do Prisma (enums, tabelas, colunas, índices, FKs).
+
+Uso (a partir de apps/backend):
+    python3 scripts/generate-versioning.py Allergy                     # altera o schema
+    python3 scripts/generate-migration-sql.py                          # SQL de HEAD -> schema em disco
+    python3 scripts/generate-migration-sql.py --name add_allergy_history
+        # grava prisma/migrations/<timestamp>_add_allergy_history/migration.sql
+    python3 scripts/generate-migration-sql.py --from origin/main       # desde outra revisão
+    python3 scripts/generate-migration-sql.py --from-dir /tmp/antes    # entre dois diretórios
+
+Renomear coluna/tabela aparece como remoção + criação (com aviso no topo do
+SQL): revise o rascunho antes de aplicar.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from prisma_tools import DEFAULT_CACHE_DIR, SCHEMA_DIR, load_schema
+from prisma_tools.ddl import diff_schemas, schema_at_revision
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[1] / 'prisma' / 'migrations'
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='SQL de migração a partir do diff do schema Prisma (sem banco de sombra)')
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--from', dest='revision', default='HEAD', help='Revisão do git com o schema anterior (padrão: HEAD)')
+    source.add_argument('--from-dir', help='Diretório com o schema anterior (*.prisma)')
+    parser.add_argument('--schema-dir', default=SCHEMA_DIR, help=f'Schema novo (padrão: {SCHEMA_DIR})')
+    parser.add_argument('--name', help='Grava em prisma/migrations/<timestamp>_<name>/migration.sql')
+    parser.add_argument('--migrations-dir', default=MIGRATIONS_DIR, help=f'Diretório das migrações (padrão: {MIGRATIONS_DIR})')
+    parser.add_argument('--strict', action='store_true', help='Sai com 1 se houver avisos (perda de dados, NOT NULL, ...)')
+    return parser.parse_args()
+
+
+def write_migration(migrations_dir, name, sql):
+    slug = re.sub(r'[^a-z0-9_]+', '_', name.lower()).strip('_')
+    directory = Path(migrations_dir) / f"{datetime.now().strftime('%Y%m%d%H%M%S')}_{slug}"
+    directory.mkdir(parents=True)
+    path = directory / 'migration.sql'
+    staging = directory / f'.migration.sql.{os.getpid()}.tmp'
+    staging.write_text(sql, encoding='utf-8')
+    os.replace(staging, path)
+    return path
+
+
+def main():
+    args = parse_args()
+    try:
+        if args.from_dir:
+            before = load_schema(args.from_dir, cache_dir=None)
+        else:
+            before = schema_at_revision(args.revision, args.schema_dir)
+    except subprocess.CalledProcessError as exc:
+        print(f"❌ Não foi possível ler o schema de {args.revision}: {exc.stderr.decode().strip()}", file=sys.stderr)
+        return 1
+    after = load_schema(args.schema_dir, cache_dir=DEFAULT_CACHE_DIR)
+    errors = before.errors + after.errors
+    for file, line, message in errors:
+        print(f"❌ {file}:{line}: {message}", file=sys.stderr)
+    if errors:
+        return 1
+
+    migration = diff_schemas(before, after)
+    if migration.empty:
+        print("✅ Nenhuma diferença entre os schemas", file=sys.stderr)
+        return 0
+
+    sql = migration.render()
+    if args.name:
+        path = write_migration(args.migrations_dir, args.name, sql)
+        print(f"💾 {path}", file=sys.stderr)
+    else:
+        sys.stdout.write(sql)
+    for warning in migration.warnings:
+        print(f"⚠️  {warning}", file=sys.stderr)
+    print(f"📊 {len(migration.statements)} comandos, {len(migration.warnings)} avisos", file=sys.stderr)
+    return 1 if args.strict and migration.warnings else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Gera o versionamento (padrão Medication/Allergy/Vaccination) para uma lista de modelos
+
+Substitui os antigos update-schema.py / update-vaccination-schema.py: em vez de
+um script de replace por modelo, uma passada pelo schema modularizado adiciona,
+para todos os modelos pedidos, os campos de versionamento, o modelo XHistory,
+as back-relations em Tenant/User e os índices. Só os arquivos alterados são
+gravados, e rodar de novo não muda nada.
+
+Uso (a partir de apps/backend):
+    python3 scripts/generate-versioning.py Building Floor Room --dry-run   # mostra o diff
+    python3 scripts/generate-versioning.py Building Floor Room             # aplica
+    python3 scripts/generate-versioning.py DailyRecord:recordedBy          # campo "criado por" explícito
+    python3 scripts/generate-versioning.py --check Allergy Condition       # sai com 1 se faltar algo
+    python3 scripts/generate-versioning.py --partitioned Allergy Condition # XHistory particionado por mês
+
+Depois de aplicar: npx prisma format && npx prisma migrate dev --name add_<modelo>_versioning
+
+Com --partitioned a migração vem do generate-migration-sql.py (o Prisma não
+conhece PARTITION BY) e as partições futuras do maintain-history-partitions.py.
+"""
+
+import argparse
+import sys
+
+from prisma_tools import DEFAULT_CACHE_DIR, SCHEMA_DIR, load_schema
+from prisma_tools.versioning import VersioningGenerator, VersioningSpec
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Gera versionamento (XHistory) para modelos do schema Prisma')
+    parser.add_argument('models', nargs='*', help='Modelos a versionar (Modelo ou Modelo:campoCriadoPor)')
+    parser.add_argument('--from-file', help='Arquivo com um modelo por linha (linhas # são ignoradas)')
+    parser.add_argument('--schema-dir', default=SCHEMA_DIR, help=f'Diretório do schema (padrão: {SCHEMA_DIR})')
+    parser.add_argument('--partitioned', action='store_true',
+                        help='XHistory particionado por mês em changedAt, com índice BRIN (também converte os existentes)')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--dry-run', action='store_true', help='Mostra o diff sem gravar')
+    mode.add_argument('--check', action='store_true', help='Não grava; sai com 1 se algum modelo precisar de alteração')
+    args = parser.parse_args()
+
+    if args.from_file:
+        with open(args.from_file, 'r', encoding='utf-8') as f:
+            args.models += [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    if not args.models:
+        parser.error('informe ao menos um modelo')
+    return args
+
+
+def main():
+    args = parse_args()
+    schema = load_schema(args.schema_dir, cache_dir=DEFAULT_CACHE_DIR)
+    generator = VersioningGenerator(schema, partitioned=args.partitioned)
+    plans = generator.plan([VersioningSpec.parse(m) for m in args.models])
+
+    for plan in plans:
+        if plan.skipped:
+            print(f"⚠️  {plan.model}: ignorado ({plan.skipped})")
+        elif plan.added:
+            print(f"🆕 {plan.model}: {', '.join(plan.added)}")
+        else:
+            print(f"✅ {plan.model}: já versionado")
+        for warning in plan.warnings:
+            print(f"⚠️  {plan.model}: {warning}")
+
+    pending = any(plan.added for plan in plans)
+    if args.check:
+        return 1 if pending else 0
+    if args.dry_run:
+        sys.stdout.write(generator.diff())
+        return 0
+
+    written = generator.save()
+    if written:
+        print(f"📁 Arquivos atualizados: {', '.join(written)}")
+        if args.partitioned:
+            print("👉 Revise com git diff e gere a migração: python3 scripts/generate-migration-sql.py --name <nome>")
+        else:
+            print("👉 Revise com git diff e rode: npx prisma format && npx prisma migrate dev")
+    else:
+        print("✅ Nenhuma alteração necessária")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
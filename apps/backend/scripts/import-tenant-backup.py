@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Importa um backup CSV de tenant (um ou mais arquivos por tabela) para o schema do tenant
+
+Substitui o antigo scripts/import-tenant-sql.sh (diretório, banco e usuário
+fixos, um \\COPY por vez e um session_replication_role que não valia para
+as sessões do COPY). As tabelas do backup são carregadas em paralelo, cada
+arquivo em streaming (.csv, .csv.gz ou .csv.zst), sem índices nem constraints; no
+final eles são recriados em paralelo e as FKs validadas. Se a importação
+for interrompida, rodar o mesmo comando de novo retoma de onde parou.
+
+Uso (a partir de apps/backend):
+    python3 scripts/import-tenant-backup.py backups/casa_sao_rafael tenant_casa_sao_rafael_abc123
+    python3 scripts/import-tenant-backup.py backups/x tenant_x --provision --register   # cria schema e registra
+    python3 scripts/import-tenant-backup.py backups/x tenant_x --truncate -j 8          # substitui os dados
+    python3 scripts/import-tenant-backup.py backups/x tenant_x --keep-constraints       # ordem das FKs, sem DROP
+    python3 scripts/import-tenant-backup.py backups/x tenant_x --dry-run                # só mostra o plano
+
+Arquivos: os do export-tenant-backup.py (pelo manifest.json, conferindo
+sha256 e linhas) ou, em backups antigos, <tabela>.csv, NN_<tabela>.csv ou
+<modelo em snake_case>.csv, com cabeçalho (nomes das colunas no banco).
+As linhas do tenant em tabelas de public não são importadas; --register
+recria a de public.tenants. Requer psycopg 3.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+from prisma_tools import DEFAULT_CACHE_DIR, SCHEMA_DIR, load_schema
+from prisma_tools.ddl import build_tables
+from prisma_tools.psql import libpq_url, run_psql
+from prisma_tools.restore import CHUNK_SIZE, DEFAULT_STATE_DIR, TenantRestore, backup_files, dependencies
+from prisma_tools.sql import MIGRATIONS_DIR
+from prisma_tools.squash import DEFAULT_TEMPLATE_DIR, build_template, provision_sql
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Importa um backup CSV de tenant em paralelo')
+    parser.add_argument('backup_dir', help='Diretório com um CSV por tabela')
+    parser.add_argument('schema', help='Schema de destino (ex: tenant_casa_sao_rafael_abc123)')
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL'), help='Banco (padrão: $DATABASE_URL)')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 4,
+                        help='Conexões em paralelo (padrão: núcleos da máquina)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help=f'Bytes por envio do COPY (padrão: {CHUNK_SIZE})')
+    parser.add_argument('--maintenance-work-mem', default='512MB',
+                        help='maintenance_work_mem ao recriar os índices (padrão: 512MB)')
+    parser.add_argument('--truncate', action='store_true', help='Esvazia as tabelas do backup antes de carregar')
+    parser.add_argument('--keep-constraints', action='store_true',
+                        help='Não remove índices/constraints; carrega na ordem das FKs (mais lento)')
+    parser.add_argument('--provision', action='store_true', help='Cria o schema pelo template se ele não existir')
+    parser.add_argument('--register', action='store_true', help='Copia a linha de tenants para public.tenants')
+    parser.add_argument('--no-analyze', action='store_true', help='Não roda ANALYZE nas tabelas carregadas')
+    parser.add_argument('--state-dir', default=DEFAULT_STATE_DIR, help=f'Estado para retomar (padrão: {DEFAULT_STATE_DIR})')
+    parser.add_argument('--schema-dir', default=SCHEMA_DIR, help=f'Diretório do schema (padrão: {SCHEMA_DIR})')
+    parser.add_argument('--dry-run', action='store_true', help='Só mostra os arquivos e a ordem de carga')
+    return parser.parse_args()
+
+
+def megabytes(size):
+    return size / (1 << 20)
+
+
+def main():
+    args = parse_args()
+    if not Path(args.backup_dir).is_dir():
+        print(f"❌ Diretório não encontrado: {args.backup_dir}", file=sys.stderr)
+        return 1
+    schema = load_schema(args.schema_dir, cache_dir=DEFAULT_CACHE_DIR)
+    tables = build_tables(schema)
+    try:
+        files, unmatched = backup_files(args.backup_dir, tables, schema)
+    except ValueError as exc:
+        print(f"❌ {exc}", file=sys.stderr)
+        return 1
+    for path in unmatched:
+        reason = 'linhas do tenant em public, não importadas' if path.name.startswith('public.') else \
+            'nenhuma tabela correspondente'
+        print(f"⚠️  {path.name}: {reason} (ignorado)", file=sys.stderr)
+    if not files:
+        print("❌ Nenhum CSV de tabela no backup", file=sys.stderr)
+        return 1
+    requires = dependencies(tables, files)
+    total = sum(f.size for f in files)
+    print(f"📦 {len({f.table for f in files})} tabelas, {len(files)} arquivos, {megabytes(total):.1f} MB "
+          f"em {args.backup_dir}")
+
+    if args.dry_run:
+        for f in sorted(files, key=lambda f: -f.size):
+            after = sorted(requires.get(f.table, ()))
+            order = f" (--keep-constraints: depois de {', '.join(after)})" if after else ''
+            print(f"   {f.name:<48} {megabytes(f.size):>9.1f} MB  {len(f.columns)} colunas{order}")
+        return 0
+    if not args.database_url:
+        print("❌ Informe --database-url (ou DATABASE_URL)", file=sys.stderr)
+        return 1
+
+    url = libpq_url(args.database_url)
+    restore = TenantRestore(url, args.schema, files, requires, keep_constraints=args.keep_constraints,
+                            state_dir=args.state_dir, chunk_size=args.chunk_size,
+                            maintenance_work_mem=args.maintenance_work_mem)
+    started = time.perf_counter()
+    try:
+        if args.provision and not restore.schema_exists():
+            template = build_template(MIGRATIONS_DIR, DEFAULT_TEMPLATE_DIR)
+            run_psql(url, provision_sql(args.schema, template))
+            print(f"🆕 Schema {args.schema} criado pelo template {template.fingerprint[:12]}")
+        errors = restore.check()
+        for error in errors:
+            print(f"❌ {error}", file=sys.stderr)
+        if errors:
+            return 1
+
+        resuming = restore.state_path.exists()
+        if not resuming:
+            busy = restore.non_empty()
+            if busy and not args.truncate:
+                print(f"❌ Tabelas com dados em {args.schema}: {', '.join(busy)} (use --truncate para substituir)",
+                      file=sys.stderr)
+                return 1
+        state = restore.prepare(truncate=args.truncate and not resuming)
+        if resuming:
+            print(f"🔁 Retomando: {len(state.loaded)} arquivos já carregados ({restore.state_path})")
+        elif state.deferred:
+            print(f"⏸️  {len(state.deferred)} índices/constraints adiados até o fim da carga")
+
+        def done(result):
+            rate = megabytes(result.size) / result.seconds if result.seconds else 0
+            print(f"✅ {result.file}: {result.rows} linhas, {megabytes(result.size):.1f} MB em "
+                  f"{result.seconds:.1f}s ({rate:.1f} MB/s)")
+
+        load_started = time.perf_counter()
+        results = restore.load(args.jobs, on_done=done)
+        failures = {name: error for name, (_, error) in results.items() if error}
+        for name, error in failures.items():
+            print(f"❌ {name}: {error}", file=sys.stderr)
+        loaded = time.perf_counter() - load_started
+        if failures:
+            print(f"👉 Corrija e rode o mesmo comando de novo para retomar ({restore.state_path})", file=sys.stderr)
+            return 1
+
+        finish_started = time.perf_counter()
+        warnings = restore.finish(args.jobs, analyze=not args.no_analyze)
+        for warning in warnings:
+            print(f"⚠️  {warning}", file=sys.stderr)
+        if args.register:
+            print(f"🏷️  public.tenants: {restore.register()} linha(s) inserida(s)")
+    except Exception as exc:  # psycopg.Error, RuntimeError sem psycopg, falha do psql
+        stderr = getattr(exc, 'stderr', None)
+        print(f"❌ {stderr.decode().strip() if stderr else exc}", file=sys.stderr)
+        if restore.state_path.exists():
+            print(f"👉 Rode o mesmo comando de novo para retomar ({restore.state_path})", file=sys.stderr)
+        return 1
+    finally:
+        restore.close()
+
+    rows = sum(state.loaded.values())
+    print(f"\n📊 {len(restore.tables)} tabelas ({len(state.loaded)} arquivos), {rows} linhas | carga {loaded:.1f}s "
+          f"({megabytes(total) / loaded if loaded else 0:.1f} MB/s, {args.jobs} conexões) | "
+          f"índices/constraints {time.perf_counter() - finish_started:.1f}s | "
+          f"total {time.perf_counter() - started:.1f}s")
+    return 1 if warnings else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
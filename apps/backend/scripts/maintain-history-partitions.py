@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Manutenção das partições mensais das tabelas *_history (@partitioned)
+
+Cria as partições do mês atual e dos próximos meses em todos os schemas
+(public e tenant_*), tira da partição DEFAULT as linhas de meses que ganham
+partição e, com --keep-months, desanexa as partições antigas (viram tabelas
+comuns no mesmo schema; nada é apagado). Idempotente: rodar de novo só faz
+o que ainda falta. Agendar diariamente (cron / job do deploy), para que a
+DEFAULT fique vazia e o INSERT no histórico caia sempre numa partição mensal.
+
+Uso (a partir de apps/backend):
+    python3 scripts/maintain-history-partitions.py --dry-run              # mostra o SQL ($DATABASE_URL)
+    python3 scripts/maintain-history-partitions.py                        # aplica
+    python3 scripts/maintain-history-partitions.py --ahead 6 --keep-months 24
+    python3 scripts/maintain-history-partitions.py --schema tenant_ilpi_exemplo_abc123 --table allergy_history
+
+As tabelas passam a ser particionadas com generate-versioning.py --partitioned
+e a migração do generate-migration-sql.py.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+
+from prisma_tools.partitions import DEFAULT_MONTHS_AHEAD, load_partitioned, maintenance_sql, plan_maintenance
+from prisma_tools.psql import libpq_url, run_psql
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Cria partições futuras e desanexa as antigas das tabelas *_history')
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL'), help='Banco (padrão: $DATABASE_URL)')
+    parser.add_argument('--schema', action='append', help='Schema (padrão LIKE; repetível; padrão: public e tenant_*)')
+    parser.add_argument('--table', action='append', help='Só esta tabela particionada (repetível)')
+    parser.add_argument('--ahead', type=int, default=DEFAULT_MONTHS_AHEAD,
+                        help=f'Meses à frente com partição pronta (padrão: {DEFAULT_MONTHS_AHEAD})')
+    parser.add_argument('--keep-months', type=int, help='Desanexa partições que terminam antes de N meses atrás')
+    parser.add_argument('--today', type=date.fromisoformat, help='Data de referência AAAA-MM-DD (padrão: hoje, UTC)')
+    parser.add_argument('--lock-timeout', default='5s', help='lock_timeout de cada transação (padrão: 5s)')
+    parser.add_argument('-j', '--jobs', type=int, default=4, help='Schemas alterados em paralelo (padrão: 4)')
+    parser.add_argument('--dry-run', action='store_true', help='Só mostra o SQL')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not args.database_url:
+        print("❌ Informe --database-url (ou DATABASE_URL)", file=sys.stderr)
+        return 1
+    url = libpq_url(args.database_url)
+    started = time.perf_counter()
+    try:
+        tables = load_partitioned(url, args.schema, args.table)
+    except (OSError, subprocess.CalledProcessError) as exc:
+        stderr = getattr(exc, 'stderr', None)
+        print(f"❌ Falha ao ler as partições: {stderr.decode().strip() if stderr else exc}", file=sys.stderr)
+        return 1
+    if not tables:
+        print("ℹ️  Nenhuma tabela particionada encontrada")
+        return 0
+
+    today = args.today or datetime.now(timezone.utc).date()
+    plans = [plan_maintenance(t, today, args.ahead, args.keep_months) for t in tables]
+    pending = [plan for plan in plans if not plan.empty]
+    by_schema = defaultdict(list)
+    for plan in pending:
+        by_schema[plan.table.schema].append(plan)
+
+    for plan in pending:
+        table = plan.table
+        if plan.create:
+            print(f"🆕 {table.schema}.{table.name}: {', '.join(f'{m:%Y-%m}' for m in plan.create)}")
+        if plan.rescue:
+            print(f"🛟 {table.schema}.{table.name}: linhas de {', '.join(f'{m:%Y-%m}' for m in plan.rescue)} "
+                  f"saem da DEFAULT")
+        if plan.detach:
+            print(f"📦 {table.schema}.{table.name}: desanexa {', '.join(p.name for p in plan.detach)}")
+
+    if args.dry_run:
+        sys.stdout.write(maintenance_sql(pending))
+        failures = []
+    else:
+        def apply(schema):
+            try:
+                run_psql(url, maintenance_sql(by_schema[schema]), options={'lock_timeout': args.lock_timeout})
+                return schema, None
+            except (OSError, subprocess.CalledProcessError) as exc:
+                stderr = getattr(exc, 'stderr', None)
+                return schema, stderr.decode().strip() if stderr else str(exc)
+
+        with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+            failures = [(schema, error) for schema, error in pool.map(apply, sorted(by_schema)) if error]
+        for schema, error in failures:
+            print(f"❌ {schema}: {error}", file=sys.stderr)
+
+    created = sum(len(plan.create) for plan in pending)
+    detached = sum(len(plan.detach) for plan in pending)
+    stuck = sum(1 for table in tables if table.default_months)
+    print(f"\n📊 {len(tables)} tabelas particionadas em {len({t.schema for t in tables})} schemas | "
+          f"🆕 {created} partições | 📦 {detached} desanexadas | 🛟 {stuck} com linhas na DEFAULT | "
+          f"{'🔍 dry-run' if args.dry_run else f'❌ {len(failures)} schemas com erro'} "
+          f"({time.perf_counter() - started:.1f}s)")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Consulta o schema Prisma modularizado (prisma/schema/*.prisma)
+
+Uso (a partir de apps/backend):
+    python3 scripts/prisma-schema.py                     # resumo: arquivos, modelos, enums, índices
+    python3 scripts/prisma-schema.py Allergy             # campos, relações e índices do modelo
+    python3 scripts/prisma-schema.py Allergy.createdBy   # arquivo:linha da declaração
+    python3 scripts/prisma-schema.py allergies --json    # pelo nome da tabela, em JSON
+
+O schema parseado fica em cache (~/.cache/rafa-ilpi/prisma-schema); só os
+arquivos alterados desde a última execução são parseados de novo.
+"""
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict
+
+from prisma_tools import DEFAULT_CACHE_DIR, SCHEMA_DIR, LoadStats, Model, load_schema
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Consulta o schema Prisma modularizado')
+    parser.add_argument('name', nargs='?', help='Modelo, Modelo.campo, enum, Enum.VALOR ou nome de tabela')
+    parser.add_argument('--schema-dir', default=SCHEMA_DIR, help=f'Diretório do schema (padrão: {SCHEMA_DIR})')
+    parser.add_argument('--no-cache', action='store_true', help='Parseia todos os arquivos, sem cache')
+    parser.add_argument('--json', action='store_true', help='Saída em JSON')
+    return parser.parse_args()
+
+
+def print_model(schema, model):
+    print(f"📦 {model.name} → tabela {model.table} ({model.location}-{model.location.end_line})")
+    for field in model.fields.values():
+        attributes = ' '.join(str(a) for a in field.attributes)
+        print(f"   {field.name:<28} {field.type_signature:<24} {attributes}")
+    relations = schema.relations_of(model.name)
+    if relations:
+        print("🔗 Relações:")
+        for relation in relations:
+            fk = f" ({', '.join(relation.fields)} → {', '.join(relation.references)})" if relation.fields else ''
+            print(f"   {relation.field} → {relation.target}{'[]' if relation.list else ''}{fk}")
+    print("📇 Índices:")
+    for index in model.indexes:
+        columns = ', '.join(f.name + (f' {f.sort}' if f.sort else '') for f in index.fields)
+        declaration = f'@{index.kind}' if index.inline else f'@@{index.kind}([{columns}])'
+        print(f"   {declaration:<60} {index.location}")
+
+
+def main():
+    args = parse_args()
+    stats = LoadStats()
+    started = time.perf_counter()
+    schema = load_schema(args.schema_dir, cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR, stats=stats)
+    elapsed = time.perf_counter() - started
+
+    for file, line, message in schema.errors:
+        print(f"⚠️  {file}:{line}: {message}", file=sys.stderr)
+
+    if not args.name:
+        indexes = sum(len(m.indexes) for m in schema.models.values())
+        print(f"✅ Schema carregado em {elapsed * 1000:.0f} ms "
+              f"({stats.parsed} arquivos parseados, {stats.reused + stats.rehashed} do cache)")
+        print(f"📁 {len(schema.files)} arquivos | 📦 {len(schema.models)} modelos | "
+              f"🏷️  {len(schema.enums)} enums | 🔗 {len(schema.relations)} relações | 📇 {indexes} índices")
+        return 1 if schema.errors else 0
+
+    try:
+        location = schema.locate(args.name)
+    except KeyError as exc:
+        print(f"❌ {exc.args[0]}", file=sys.stderr)
+        return 1
+
+    target = schema.models.get(args.name) or schema.by_table.get(args.name)
+    if args.json:
+        payload = asdict(target) if target else {'name': args.name, 'location': asdict(location)}
+        print(json.dumps(payload, indent=2, ensure_ascii=False, default=str))
+    elif isinstance(target, Model):
+        print_model(schema, target)
+    else:
+        print(f"📍 {args.name}: {schema.path(location)}:{location.line}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Ferramentas Python sobre o schema Prisma modularizado (prisma/schema/*.prisma)
+
+    from prisma_tools import load_schema
+
+    schema = load_schema()              # parseado uma vez; execuções seguintes usam o cache
+    schema.model('Allergy').fields      # campos, atributos, relações e índices
+    schema.locate('Allergy.createdBy')  # arquivo e linha da declaração
+"""
+
+from .backup import Manifest
+from .cache import DEFAULT_CACHE_DIR, LoadStats, load_schema
+from .catalog import Catalog, replay_migrations
+from .compact import CompactStats, HistoryCompactor, HistoryTable, history_tables
+from .ddl import Migration, diff_schemas, schema_at_revision
+from .edit import BlockEditor, SchemaEditor
+from .export import TenantExport
+from .indexes import IndexFinding, IndexReport, TableCost, analyze_indexes
+from .locks import LockFinding, MigrationReport, RowCounts, analyze_migrations
+from .nplusone import NPlusOneFinding, scan_all, scan_source
+from .partitions import MaintenancePlan, PartitionedTable, load_partitioned, maintenance_sql, plan_maintenance
+from .queries import Coverage, QueryShape, analyze_queries, extract_queries
+from .restore import BackupFile, RestoreState, TenantRestore, backup_files
+from .schema import (
+    SCHEMA_DIR,
+    Attribute,
+    ConfigBlock,
+    Enum,
+    EnumValue,
+    Field,
+    Index,
+    IndexField,
+    Location,
+    Model,
+    Relation,
+    Schema,
+    SchemaFile,
+    parse_file,
+)
+from .snapshots import SnapshotChain, apply_patch, is_patch, json_diff
+from .sql import MigrationFile, SqlStatement, block_statements, list_migrations, split_statements
+from .squash import TenantTemplate, build_template, provision_sql, render_baseline, verify_baseline
+from .versioning import VersioningGenerator, VersioningPlan, VersioningSpec
+
+__all__ = [
+    'Manifest',
+    'DEFAULT_CACHE_DIR',
+    'LoadStats',
+    'load_schema',
+    'Catalog',
+    'replay_migrations',
+    'CompactStats',
+    'HistoryCompactor',
+    'HistoryTable',
+    'history_tables',
+    'Migration',
+    'diff_schemas',
+    'schema_at_revision',
+    'BlockEditor',
+    'SchemaEditor',
+    'TenantExport',
+    'IndexFinding',
+    'IndexReport',
+    'TableCost',
+    'analyze_indexes',
+    'LockFinding',
+    'MigrationReport',
+    'RowCounts',
+    'analyze_migrations',
+    'NPlusOneFinding',
+    'scan_all',
+    'scan_source',
+    'MaintenancePlan',
+    'PartitionedTable',
+    'load_partitioned',
+    'maintenance_sql',
+    'plan_maintenance',
+    'Coverage',
+    'QueryShape',
+    'analyze_queries',
+    'extract_queries',
+    'BackupFile',
+    'RestoreState',
+    'TenantRestore',
+    'backup_files',
+    'SCHEMA_DIR',
+    'Attribute',
+    'ConfigBlock',
+    'Enum',
+    'EnumValue',
+    'Field',
+    'Index',
+    'IndexField',
+    'Location',
+    'Model',
+    'Relation',
+    'Schema',
+    'SchemaFile',
+    'parse_file',
+    'SnapshotChain',
+    'apply_patch',
+    'is_patch',
+    'json_diff',
+    'MigrationFile',
+    'SqlStatement',
+    'block_statements',
+    'list_migrations',
+    'split_statements',
+    'TenantTemplate',
+    'build_template',
+    'provision_sql',
+    'render_baseline',
+    'verify_baseline',
+    'VersioningGenerator',
+    'VersioningPlan',
+    'VersioningSpec',
+]
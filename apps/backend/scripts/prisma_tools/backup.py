@@ -0,0 +1,174 @@
+"""
+Formato dos backups de tenant: arquivos CSV comprimidos em partes e o manifest.json
+
+    <diretório>/
+        manifest.json
+        residents.00001.csv.gz          # tabela do schema do tenant, parte 1
+        vital_signs.00001.csv.zst
+        public.subscriptions.00001.csv.gz  # linhas do tenant em tabelas de public
+
+Cada parte é um CSV completo (com cabeçalho), de modo que pode ser carregada
+sozinha por COPY ... FROM STDIN. O manifest guarda, por tabela, as colunas,
+a chave usada para dividir as partes e, por parte, o intervalo de chave,
+linhas, bytes e o sha256 do arquivo comprimido: quem gera (export.py) retoma
+a partir dele, quem importa (restore.py) confere os arquivos contra ele.
+
+gzip vem da biblioteca padrão; zstd requer zstandard (pip install zstandard).
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+COMPRESSIONS = {'gzip': '.gz', 'zstd': '.zst'}
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise RuntimeError('Arquivos .zst requerem zstandard: pip install zstandard') from exc
+    return zstandard
+
+
+def open_backup(path, fileobj=None):
+    """Arquivo do backup em modo binário (descomprime .gz/.zst em streaming)
+
+    Com fileobj, lê dele em vez de abrir o caminho (que só define a compressão).
+    """
+    path = Path(path)
+    if path.suffix == '.gz':
+        return gzip.GzipFile(fileobj=fileobj, mode='rb') if fileobj else gzip.open(path, 'rb')
+    if path.suffix == '.zst':
+        return _zstandard().ZstdDecompressor().stream_reader(fileobj or open(path, 'rb'), closefd=fileobj is None)
+    return fileobj or open(path, 'rb')
+
+
+class HashingReader:
+    """Lê de `raw` atualizando o sha256 `digest` com o que foi lido"""
+
+    def __init__(self, raw, digest):
+        self.raw = raw
+        self.digest = digest
+
+    def read(self, size=-1):
+        data = self.raw.read(size)
+        self.digest.update(data)
+        return data
+
+    def readable(self):
+        return True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class HashingWriter:
+    """Repassa as escritas para `raw` contando bytes e calculando o sha256 do que foi gravado"""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.size = 0
+        self.sha256 = hashlib.sha256()
+
+    def write(self, data):
+        self.raw.write(data)
+        self.sha256.update(data)
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        self.raw.flush()
+
+
+def compressed_writer(raw, compression, level=None):
+    """Escritor que comprime para `raw` (fechá-lo não fecha `raw`)"""
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6 if level is None else level, mtime=0)
+    if compression == 'zstd':
+        compressor = _zstandard().ZstdCompressor(level=3 if level is None else level)
+        return compressor.stream_writer(raw, closefd=False)
+    raise ValueError(f'Compressão desconhecida: {compression}')
+
+
+def chunk_file(source, table, index, compression):
+    prefix = 'public.' if source == 'public' else ''
+    return f'{prefix}{table}.{index:05d}.csv{COMPRESSIONS[compression]}'
+
+
+@dataclass
+class Chunk:
+    file: str
+    lower: Optional[List[str]] = None  # Chave (texto) exclusiva; None = início da tabela
+    upper: Optional[List[str]] = None  # Chave inclusiva; None = fim da tabela
+    rows: Optional[int] = None
+    bytes: Optional[int] = None
+    sha256: Optional[str] = None
+
+    @property
+    def done(self):
+        return self.sha256 is not None
+
+
+@dataclass
+class TableEntry:
+    source: str  # 'tenant' (schema do tenant) | 'public' (linhas do tenant em public)
+    table: str
+    columns: List[str]
+    key: List[str]
+    key_types: List[str]
+    chunks: List[Chunk] = field(default_factory=list)
+
+    @property
+    def done(self):
+        return all(chunk.done for chunk in self.chunks)
+
+    @property
+    def rows(self):
+        return sum(chunk.rows or 0 for chunk in self.chunks)
+
+
+@dataclass
+class Manifest:
+    version: int
+    schema: str
+    tenant_id: Optional[str]
+    compression: str
+    started_at: str
+    finished_at: Optional[str] = None
+    consistent: bool = True  # False se a exportação foi retomada (partes de snapshots diferentes)
+    tables: List[TableEntry] = field(default_factory=list)
+
+    @property
+    def done(self):
+        return all(table.done for table in self.tables)
+
+    @classmethod
+    def load(cls, directory):
+        """Manifest do diretório, ou None se não houver (ou for de outra versão)"""
+        try:
+            with open(Path(directory) / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        if data.get('version') != MANIFEST_VERSION:
+            return None
+        data['tables'] = [TableEntry(**{**table, 'chunks': [Chunk(**chunk) for chunk in table['chunks']]})
+                          for table in data.get('tables', [])]
+        return cls(**data)
+
+    def save(self, directory):
+        path = Path(directory) / MANIFEST_NAME
+        staging = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+        with open(staging, 'w', encoding='utf-8') as f:
+            json.dump(asdict(self), f, ensure_ascii=False, indent=2)
+        os.replace(staging, path)
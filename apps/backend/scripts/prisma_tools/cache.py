@@ -0,0 +1,99 @@
+"""
+Cache do schema parseado
+
+Cada arquivo .prisma fica no cache junto com seu mtime, tamanho e SHA-256.
+Na próxima execução:
+
+- mtime e tamanho iguais: reaproveita sem sequer ler o arquivo
+- mtime mudou mas o hash é o mesmo (checkout, touch): reaproveita e atualiza o mtime
+- conteúdo mudou: parseia só esse arquivo
+
+O cache é um pickle por diretório de schema em ~/.cache/rafa-ilpi/prisma-schema,
+versionado por PARSER_VERSION (mudanças no parser invalidam tudo).
+"""
+
+import hashlib
+import os
+import pickle
+from dataclasses import dataclass
+from pathlib import Path
+
+from .schema import SCHEMA_DIR, Schema, SchemaFile, parse_file
+
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'rafa-ilpi' / 'prisma-schema'
+
+PARSER_VERSION = 1  # Incrementar ao mudar a estrutura de SchemaFile ou o parser
+
+
+@dataclass
+class _CachedFile:
+    mtime_ns: int
+    size: int
+    parsed: SchemaFile
+
+
+@dataclass
+class LoadStats:
+    parsed: int = 0        # Arquivos parseados nesta execução
+    reused: int = 0        # Reaproveitados pelo mtime
+    rehashed: int = 0      # Reaproveitados pelo hash (mtime mudou, conteúdo não)
+
+
+def _cache_path(cache_dir, schema_dir):
+    digest = hashlib.sha256(str(schema_dir).encode('utf-8')).hexdigest()[:16]
+    return Path(cache_dir) / f'{digest}.pickle'
+
+
+def _read_cache(path):
+    try:
+        with open(path, 'rb') as f:
+            version, entries = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, ValueError):
+        return {}
+    return entries if version == PARSER_VERSION else {}
+
+
+def _write_cache(path, entries):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    with open(staging, 'wb') as f:
+        pickle.dump((PARSER_VERSION, entries), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(staging, path)
+
+
+def load_schema(schema_dir=SCHEMA_DIR, cache_dir=DEFAULT_CACHE_DIR, stats=None):
+    """
+    Carrega todos os arquivos *.prisma de schema_dir (com cache em cache_dir;
+    None desativa). Se `stats` (LoadStats) for informado, registra o que foi
+    parseado e o que veio do cache.
+    """
+    schema_dir = Path(schema_dir).resolve()
+    stats = stats if stats is not None else LoadStats()
+    cache_path = _cache_path(cache_dir, schema_dir) if cache_dir else None
+    cached = _read_cache(cache_path) if cache_path else {}
+
+    entries, files, dirty = {}, [], False
+    for path in sorted(schema_dir.glob('*.prisma')):
+        st = path.stat()
+        entry = cached.get(path.name)
+        if entry and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+            stats.reused += 1
+        else:
+            data = path.read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+            if entry and entry.parsed.sha256 == digest:
+                stats.rehashed += 1
+                entry = _CachedFile(st.st_mtime_ns, st.st_size, entry.parsed)
+            else:
+                stats.parsed += 1
+                entry = _CachedFile(st.st_mtime_ns, st.st_size, parse_file(path.name, data.decode('utf-8'), digest))
+            dirty = True
+        entries[path.name] = entry
+        files.append(entry.parsed)
+
+    if cache_path and (dirty or entries.keys() != cached.keys()):
+        _write_cache(cache_path, entries)
+
+    if not files:
+        raise FileNotFoundError(f'Nenhum arquivo .prisma em {schema_dir}')
+    return Schema(schema_dir, files)
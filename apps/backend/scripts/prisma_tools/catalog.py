@@ -0,0 +1,749 @@
+"""
+Estrutura do banco reconstruída a partir das migrações (replay offline)
+
+    from prisma_tools.catalog import replay_migrations
+
+    catalog = replay_migrations(role='tenant')
+    catalog.tables['residents'].columns['cpf'].type   # 'TEXT'
+    catalog.unhandled                                  # comandos que o replay não entendeu
+
+Aplica cada comando DDL de migration.sql (inclusive os de blocos DO e de
+EXECUTE format(...)) a um modelo em memória de um único schema: extensões,
+enums, tabelas (colunas e constraints), índices, funções, triggers e
+comentários. O papel escolhe qual schema é simulado:
+
+- 'tenant': o search_path é o schema do tenant; os blocos que percorrem os
+  schemas tenant_* valem para ele, os comandos em "public".x não
+- 'public': o contrário
+
+Tabelas particionadas guardam só a cláusula PARTITION BY: as partições
+dependem dos dados de cada schema (ver ddl.create_partitions_sql) e não
+fazem parte da estrutura.
+
+A semântica é tolerante como as próprias migrações (os blocos DO usam IF
+NOT EXISTS): criar o que já existe e remover o que não existe não fazem
+nada. INSERT/UPDATE/DELETE não mudam a estrutura e só são contados (nas
+nossas migrações todos são backfills de dados já existentes).
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .ddl import MAX_IDENTIFIER, constraint_name, quote
+from .sql import (
+    MIGRATIONS_DIR,
+    block_statements,
+    closing_paren,
+    list_migrations,
+    loops_over_tenants,
+    skip_sql_token,
+    split_sql_list,
+    split_statements,
+    sql_words,
+    string_value,
+)
+
+ROLES = ('tenant', 'public')
+
+_NAME = r'(?:"(?:[^"]|"")*"|[%\w$]+)(?:\s*\.\s*(?:"(?:[^"]|"")*"|[%\w$]+))*'
+_NAMES = rf'{_NAME}(?:\s*,\s*{_NAME})*'
+_QUALIFIER_RE = re.compile(r'\.(?=(?:[^"]*"[^"]*")*[^"]*$)')
+COLUMN_KEYWORDS = {'NOT', 'NULL', 'DEFAULT', 'PRIMARY', 'UNIQUE', 'REFERENCES', 'CHECK', 'CONSTRAINT', 'GENERATED',
+                   'COLLATE'}
+CONSTRAINT_STARTS = ('CONSTRAINT', 'PRIMARY', 'UNIQUE', 'FOREIGN', 'CHECK', 'EXCLUDE')
+CONSTRAINT_KINDS = {'PRIMARY': 'primary', 'UNIQUE': 'unique', 'FOREIGN': 'foreign', 'CHECK': 'check',
+                    'EXCLUDE': 'exclude'}
+CONSTRAINT_SUFFIXES = {'primary': 'pkey', 'unique': 'key', 'foreign': 'fkey', 'check': 'check', 'exclude': 'excl'}
+DATA_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE', 'WITH', 'SELECT', 'TRUNCATE', 'ANALYZE', 'VACUUM', 'REFRESH')
+SESSION_STATEMENTS = ('BEGIN', 'COMMIT', 'START', 'END', 'SET', 'RESET')
+
+
+def squeeze(text):
+    """Colapsa espaços fora de strings/identificadores (forma canônica para comparar e renderizar)"""
+    out, i = [], 0
+    while i < len(text):
+        end = skip_sql_token(text, i)
+        if end is not None:
+            out.append(text[i:end])
+            i = end
+        elif text[i].isspace():
+            while i < len(text) and text[i].isspace():
+                i += 1
+            out.append(' ')
+        else:
+            out.append(text[i])
+            i += 1
+    return ''.join(out).strip()
+
+
+def identifier(word):
+    """
+    '"userId"' -> 'userId'; 'Residents' -> 'residents' (sem aspas o PostgreSQL
+    usa minúsculas); nomes longos são truncados em 63 bytes, como no banco
+    """
+    word = word.strip()
+    if word.startswith('"') and word.endswith('"'):
+        name = word[1:-1].replace('""', '"')
+    else:
+        name = word.lower() if not word.startswith('%') else word
+    return name.encode('utf-8')[:MAX_IDENTIFIER].decode('utf-8', 'ignore')
+
+
+def qualified(name):
+    """'"public"."users"' -> ('public', 'users'); 'users' -> (None, 'users')"""
+    parts = [part.strip() for part in _QUALIFIER_RE.split(name.strip())]
+    schema = identifier(parts[-2]) if len(parts) > 1 else None
+    return schema, identifier(parts[-1])
+
+
+def column_list(group):
+    """'("a", b DESC)' -> ['a', 'b']"""
+    return [identifier(sql_words(item)[0][2]) for item in split_sql_list(group.strip()[1:-1])]
+
+
+def replace_identifier(text, old, new):
+    """Troca o identificador old por new fora de strings ("old" e, se for minúsculo, old sem aspas)"""
+    plain_name = re.compile(r'[a-z_][a-z0-9_$]*')
+    bare = re.compile(rf'(?<![\w$.]){re.escape(old)}(?![\w$])') if plain_name.fullmatch(old) else None
+    replacement = new if plain_name.fullmatch(new) else quote(new)
+    out, i, start = [], 0, 0
+
+    def flush(until):
+        chunk = text[start:until]
+        out.append(bare.sub(lambda _: replacement, chunk) if bare else chunk)
+
+    while i < len(text):
+        end = skip_sql_token(text, i)
+        if end is None:
+            i += 1
+            continue
+        flush(i)
+        token = text[i:end]
+        out.append(quote(new) if token.startswith('"') and identifier(token) == old else token)
+        i = start = end
+    flush(len(text))
+    return ''.join(out)
+
+
+@dataclass
+class CatalogColumn:
+    name: str
+    type: str
+    not_null: bool = False
+    default: Optional[str] = None
+    extra: Optional[str] = None  # GENERATED ..., COLLATE ...
+
+    def definition(self):
+        parts = [quote(self.name), self.type]
+        if self.extra:
+            parts.append(self.extra)
+        if self.not_null:
+            parts.append('NOT NULL')
+        if self.default is not None:
+            parts.append(f'DEFAULT {self.default}')
+        return ' '.join(parts)
+
+
+@dataclass
+class Constraint:
+    name: str
+    kind: str        # primary | unique | foreign | check | exclude
+    definition: str  # 'PRIMARY KEY ("id")', 'FOREIGN KEY ("userId") REFERENCES "users"("id") ...'
+
+    @property
+    def references(self):
+        """Tabela referenciada por uma FK (sem schema)"""
+        match = re.search(rf'\bREFERENCES\s+({_NAME})', self.definition, re.I)
+        return qualified(match.group(1))[1] if match else None
+
+
+@dataclass
+class CatalogTable:
+    name: str
+    columns: Dict[str, CatalogColumn] = field(default_factory=dict)
+    constraints: Dict[str, Constraint] = field(default_factory=dict)
+    partition_by: Optional[str] = None  # 'RANGE ("changedAt")' em tabelas particionadas
+
+    @property
+    def partition_column(self):
+        match = re.match(r'^RANGE\s*\(\s*("(?:[^"]|"")+"|\w+)\s*\)$', self.partition_by or '', re.I)
+        return identifier(match.group(1)) if match else None
+
+
+@dataclass
+class CatalogIndex:
+    name: str
+    table: str
+    unique: bool
+    definition: str  # Tudo depois de ON "tabela": '("a", "b" DESC)', 'USING gin ("tags")', '... WHERE ...'
+
+    def create(self):
+        separator = '' if self.definition.startswith('(') else ' '
+        unique = 'UNIQUE ' if self.unique else ''
+        return f'CREATE {unique}INDEX {quote(self.name)} ON {quote(self.table)}{separator}{self.definition}'
+
+
+@dataclass
+class Catalog:
+    role: str = 'tenant'
+    extensions: Dict[str, str] = field(default_factory=dict)
+    enums: Dict[str, List[str]] = field(default_factory=dict)
+    tables: Dict[str, CatalogTable] = field(default_factory=dict)
+    indexes: Dict[str, CatalogIndex] = field(default_factory=dict)
+    functions: Dict[str, str] = field(default_factory=dict)
+    triggers: Dict[Tuple[str, str], str] = field(default_factory=dict)  # (tabela, trigger) -> comando
+    comments: Dict[Tuple[str, ...], str] = field(default_factory=dict)  # ('COLUMN', tabela, coluna) -> comando
+    migrations: List[str] = field(default_factory=list)
+    data_statements: int = 0
+    unhandled: List[Tuple[str, int, str]] = field(default_factory=list)  # (migração, linha, comando)
+    notes: List[Tuple[str, int, str]] = field(default_factory=list)      # Alvos inexistentes, etc.
+
+    # ============================================
+    # Replay
+    # ============================================
+    def apply_sql(self, text, name='<sql>'):
+        for statement in split_statements(text):
+            self.apply_statement(statement.sql, location=(name, statement.line))
+        self.migrations.append(name)
+
+    def apply_statement(self, sql, location=('<sql>', 0), dynamic=True):
+        """
+        Aplica um comando; `dynamic` diz se %I (schema vindo de variável num
+        bloco DO) é o schema simulado
+        """
+        sql = sql.strip()
+        first = sql.split(None, 1)[0].upper() if sql else ''
+        if first in DATA_STATEMENTS:
+            self.data_statements += 1
+            return
+        if first in SESSION_STATEMENTS:
+            return
+        try:
+            for regex, handler in self._handlers():
+                match = regex.match(sql)
+                if match:
+                    if handler(match, sql, location, dynamic) is not False:
+                        return
+                    break
+        except (ValueError, IndexError) as exc:
+            self.unhandled.append((*location, f'{squeeze(sql)[:100]} ({exc})'))
+            return
+        self.unhandled.append((*location, squeeze(sql)[:120]))
+
+    def _handlers(self):
+        return (
+            (_DO_RE, self._do),
+            (_CREATE_EXTENSION_RE, self._create_extension),
+            (_CREATE_ENUM_RE, self._create_enum),
+            (_ALTER_TYPE_RE, self._alter_type),
+            (_DROP_TYPE_RE, self._drop_type),
+            (_CREATE_TABLE_RE, self._create_table),
+            (_CREATE_PARTITION_RE, self._create_partition),
+            (_ALTER_TABLE_RE, self._alter_table),
+            (_DROP_TABLE_RE, self._drop_table),
+            (_CREATE_INDEX_RE, self._create_index),
+            (_DROP_INDEX_RE, self._drop_index),
+            (_ALTER_INDEX_RE, self._alter_index),
+            (_CREATE_FUNCTION_RE, self._create_function),
+            (_DROP_FUNCTION_RE, self._drop_function),
+            (_CREATE_TRIGGER_RE, self._create_trigger),
+            (_DROP_TRIGGER_RE, self._drop_trigger),
+            (_COMMENT_RE, self._comment),
+        )
+
+    def _target(self, name, dynamic):
+        """Nome sem schema se o objeto é do schema simulado; None se é de outro"""
+        schema, bare = qualified(name)
+        if schema is None:
+            return bare
+        if schema.startswith('%'):
+            return bare if dynamic else None
+        return bare if schema == self.role == 'public' else None
+
+    def _note(self, location, message):
+        self.notes.append((*location, message))
+
+    def _do(self, match, sql, location, dynamic):
+        body = match.group(2)
+        inner_dynamic = self.role == 'tenant' if loops_over_tenants(body) else dynamic
+        for statement in block_statements(body):
+            self.apply_statement(statement.sql, (location[0], location[1] + statement.line - 1), inner_dynamic)
+
+    def _create_extension(self, match, sql, location, dynamic):
+        name = identifier(match.group(1))
+        rest = squeeze(match.group(2))
+        self.extensions.setdefault(name, f'CREATE EXTENSION IF NOT EXISTS {match.group(1)}{" " + rest if rest else ""}')
+
+    # ---------- enums ----------
+    def _create_enum(self, match, sql, location, dynamic):
+        name = self._target(match.group(1), dynamic)
+        if name is not None and name not in self.enums:
+            group = sql[match.end() - 1:closing_paren(sql, match.end() - 1)]
+            self.enums[name] = [string_value(value) for value in split_sql_list(group[1:-1])]
+
+    def _alter_type(self, match, sql, location, dynamic):
+        name = self._target(match.group(1), dynamic)
+        rest = match.group(2).strip()
+        if name is None:
+            return
+        if name not in self.enums:
+            self._note(location, f'ALTER TYPE em enum inexistente: {name}')
+            return
+        values = self.enums[name]
+        add = re.match(r"^ADD\s+VALUE\s+(?:IF\s+NOT\s+EXISTS\s+)?('(?:[^']|'')*')(?:\s+(BEFORE|AFTER)\s+"
+                       r"('(?:[^']|'')*'))?$", rest, re.I | re.S)
+        rename_value = re.match(r"^RENAME\s+VALUE\s+('(?:[^']|'')*')\s+TO\s+('(?:[^']|'')*')$", rest, re.I | re.S)
+        rename = re.match(rf'^RENAME\s+TO\s+({_NAME})$', rest, re.I | re.S)
+        if add:
+            value = string_value(add.group(1))
+            if value not in values:
+                anchor = string_value(add.group(3)) if add.group(3) else None
+                if anchor in values:
+                    values.insert(values.index(anchor) + (add.group(2).upper() == 'AFTER'), value)
+                else:
+                    values.append(value)
+        elif rename_value:
+            old, new = string_value(rename_value.group(1)), string_value(rename_value.group(2))
+            if old in values:
+                values[values.index(old)] = new
+        elif rename:
+            new = identifier(rename.group(1))
+            self.enums = {new if key == name else key: value for key, value in self.enums.items()}
+            for table in self.tables.values():
+                for column in table.columns.values():
+                    column.type = replace_identifier(column.type, name, new)
+        elif not re.match(r'^OWNER\s+TO\b', rest, re.I):
+            return False
+
+    def _drop_type(self, match, sql, location, dynamic):
+        for raw in split_sql_list(match.group(1)):
+            name = self._target(raw, dynamic)
+            if name is not None:
+                self.enums.pop(name, None)
+
+    # ---------- tabelas ----------
+    def _create_table(self, match, sql, location, dynamic):
+        name = self._target(match.group(1), dynamic)
+        if name is None or name in self.tables:
+            return
+        start = match.end() - 1
+        end = closing_paren(sql, start)
+        table = CatalogTable(name)
+        partitioning = re.match(r'^\s*PARTITION\s+BY\s+(.+)$', sql[end:], re.I | re.S)
+        if partitioning:
+            table.partition_by = squeeze(partitioning.group(1))
+        for item in split_sql_list(sql[start + 1:end - 1]):
+            if item.split(None, 1)[0].upper() in CONSTRAINT_STARTS:
+                constraint = parse_constraint(name, item)
+                table.constraints[constraint.name] = constraint
+            elif item.split(None, 1)[0].upper() == 'LIKE':
+                raise ValueError('CREATE TABLE ... LIKE não suportado')
+            else:
+                column, constraints = parse_column(name, item)
+                table.columns[column.name] = column
+                table.constraints.update((c.name, c) for c in constraints)
+        self.tables[name] = table
+
+    def _create_partition(self, match, sql, location, dynamic):
+        parent = self._target(match.group(2), dynamic)
+        if parent is not None and parent not in self.tables:
+            self._note(location, f'Partição de tabela inexistente: {parent}')
+
+    def _drop_table(self, match, sql, location, dynamic):
+        for raw in split_sql_list(match.group(1)):
+            name = self._target(raw, dynamic)
+            if name is None or name not in self.tables:
+                continue
+            del self.tables[name]
+            self.indexes = {key: index for key, index in self.indexes.items() if index.table != name}
+            self.triggers = {key: value for key, value in self.triggers.items() if key[0] != name}
+            self.comments = {key: value for key, value in self.comments.items() if key[1:2] != (name,)}
+            for table in self.tables.values():
+                table.constraints = {key: c for key, c in table.constraints.items() if c.references != name}
+
+    def _alter_table(self, match, sql, location, dynamic):
+        name = self._target(match.group(1), dynamic)
+        rest = match.group(2).strip()
+        if name is None:
+            return
+        if name not in self.tables:
+            self._note(location, f'ALTER TABLE em tabela inexistente: {name}')
+            return
+        rename_table = re.match(rf'^RENAME\s+TO\s+({_NAME})$', rest, re.I | re.S)
+        rename_column = re.match(rf'^RENAME\s+(?:COLUMN\s+)?(?!CONSTRAINT\b|TO\b)({_NAME})\s+TO\s+({_NAME})$', rest,
+                                 re.I | re.S)
+        rename_constraint = re.match(rf'^RENAME\s+CONSTRAINT\s+({_NAME})\s+TO\s+({_NAME})$', rest, re.I | re.S)
+        if rename_table:
+            self._rename_table(name, identifier(rename_table.group(1)))
+        elif rename_column:
+            self._rename_column(name, identifier(rename_column.group(1)), identifier(rename_column.group(2)))
+        elif rename_constraint:
+            old, new = identifier(rename_constraint.group(1)), identifier(rename_constraint.group(2))
+            table = self.tables[name]
+            if old in table.constraints:
+                table.constraints = {(new if key == old else key): c for key, c in table.constraints.items()}
+                table.constraints[new].name = new
+        else:
+            for clause in split_sql_list(rest):
+                if not self._alter_clause(self.tables[name], clause, location):
+                    self.unhandled.append((*location, f'ALTER TABLE {name} {squeeze(clause)[:100]}'))
+
+    def _alter_clause(self, table, clause, location):
+        upper = squeeze(clause).upper()
+        words = upper.split()
+        if words[0] == 'ADD' and (len(words) < 2 or words[1] not in CONSTRAINT_STARTS):
+            text = re.sub(r'^ADD\s+(?:COLUMN\s+)?(?:IF\s+NOT\s+EXISTS\s+)?', '', clause.strip(), flags=re.I)
+            column, constraints = parse_column(table.name, text)
+            if column.name not in table.columns:
+                table.columns[column.name] = column
+                table.constraints.update((c.name, c) for c in constraints)
+            return True
+        if words[0] == 'ADD':
+            constraint = parse_constraint(table.name, re.sub(r'^ADD\s+', '', clause.strip(), flags=re.I))
+            if re.search(r'\bUSING\s+INDEX\b', constraint.definition, re.I):
+                index = self.indexes.pop(identifier(constraint.definition.split()[-1]), None)
+                if index is None:
+                    return False
+                constraint.definition = f'{constraint.definition.split()[0].upper()} {index.definition}'
+            table.constraints.setdefault(constraint.name, constraint)
+            return True
+        drop_constraint = re.match(rf'^DROP\s+CONSTRAINT\s+(?:IF\s+EXISTS\s+)?({_NAME})', clause.strip(), re.I)
+        if drop_constraint:
+            table.constraints.pop(identifier(drop_constraint.group(1)), None)
+            return True
+        drop_column = re.match(rf'^DROP\s+(?:COLUMN\s+)?(?:IF\s+EXISTS\s+)?({_NAME})', clause.strip(), re.I)
+        if drop_column:
+            self._drop_column(table, identifier(drop_column.group(1)))
+            return True
+        alter = re.match(rf'^ALTER\s+(?:COLUMN\s+)?({_NAME})\s+(.*)$', clause.strip(), re.I | re.S)
+        if alter:
+            column = table.columns.get(identifier(alter.group(1)))
+            if column is None:
+                self._note(location, f'ALTER COLUMN em coluna inexistente: {table.name}.{identifier(alter.group(1))}')
+                return True
+            return self._alter_column(column, alter.group(2).strip())
+        return words[0] in ('ENABLE', 'DISABLE', 'OWNER', 'VALIDATE', 'SET', 'RESET', 'FORCE', 'NO')
+
+    def _alter_column(self, column, action):
+        upper = squeeze(action).upper()
+        type_change = re.match(r'^(?:SET\s+DATA\s+)?TYPE\s+(.*)$', action, re.I | re.S)
+        if type_change:
+            text = type_change.group(1)
+            stop = next((start for start, _, word in sql_words(text) if word.upper() in ('USING', 'COLLATE')), len(text))
+            column.type = squeeze(text[:stop])
+        elif upper == 'SET NOT NULL':
+            column.not_null = True
+        elif upper == 'DROP NOT NULL':
+            column.not_null = False
+        elif upper.startswith('SET DEFAULT'):
+            column.default = squeeze(action.strip()[len('SET DEFAULT'):])
+        elif upper == 'DROP DEFAULT':
+            column.default = None
+        elif not upper.startswith(('SET STATISTICS', 'SET STORAGE', 'SET (', 'RESET')):
+            return False
+        return True
+
+    def _drop_column(self, table, name):
+        if table.columns.pop(name, None) is None:
+            return
+        for index_name, index in list(self.indexes.items()):
+            if index.table == table.name and _mentions(index.definition, name):
+                del self.indexes[index_name]
+        table.constraints = {key: c for key, c in table.constraints.items()
+                             if not _mentions(c.definition.split(' REFERENCES ')[0], name)}
+        for other in self.tables.values():
+            other.constraints = {key: c for key, c in other.constraints.items()
+                                 if not (c.references == table.name and _mentions(_referenced_columns(c), name))}
+        self.comments.pop(('COLUMN', table.name, name), None)
+
+    def _rename_table(self, old, new):
+        self.tables = {(new if key == old else key): table for key, table in self.tables.items()}
+        self.tables[new].name = new
+        for index in self.indexes.values():
+            if index.table == old:
+                index.table = new
+        self.triggers = {((new, key[1]) if key[0] == old else key): replace_identifier(text, old, new)
+                         if key[0] == old else text for key, text in self.triggers.items()}
+        self.comments = {(key[:1] + (new,) + key[2:] if key[1:2] == (old,) else key): text
+                         for key, text in self.comments.items()}
+        for table in self.tables.values():
+            for constraint in table.constraints.values():
+                if constraint.references == old:
+                    head, tail = constraint.definition.split(' REFERENCES ', 1)
+                    constraint.definition = f'{head} REFERENCES {replace_identifier(tail, old, new)}'
+
+    def _rename_column(self, table_name, old, new):
+        table = self.tables[table_name]
+        if old not in table.columns:
+            return
+        table.columns = {(new if key == old else key): column for key, column in table.columns.items()}
+        table.columns[new].name = new
+        for index in self.indexes.values():
+            if index.table == table_name:
+                index.definition = replace_identifier(index.definition, old, new)
+        for constraint in table.constraints.values():
+            head, *tail = constraint.definition.split(' REFERENCES ', 1)
+            constraint.definition = ' REFERENCES '.join([replace_identifier(head, old, new), *tail])
+        for other in self.tables.values():
+            for constraint in other.constraints.values():
+                if constraint.references == table_name:
+                    head, tail = constraint.definition.split(' REFERENCES ', 1)
+                    constraint.definition = f'{head} REFERENCES {_rename_referenced(tail, old, new)}'
+        if ('COLUMN', table_name, old) in self.comments:
+            self.comments[('COLUMN', table_name, new)] = self.comments.pop(('COLUMN', table_name, old))
+
+    # ---------- índices ----------
+    def _create_index(self, match, sql, location, dynamic):
+        unique, raw_name, raw_table, rest = match.group(1), match.group(2), match.group(3), match.group(4)
+        table = self._target(raw_table, dynamic)
+        if table is None:
+            return
+        if not raw_name or raw_name.startswith('%'):
+            raise ValueError('índice sem nome')
+        name = identifier(raw_name)
+        if table not in self.tables:
+            self._note(location, f'CREATE INDEX {name} em tabela inexistente: {table}')
+            return
+        if name not in self.indexes and not any(name in t.constraints for t in self.tables.values()):
+            self.indexes[name] = CatalogIndex(name, table, bool(unique), squeeze(rest))
+
+    def _drop_index(self, match, sql, location, dynamic):
+        for raw in split_sql_list(match.group(1)):
+            name = self._target(raw, dynamic)
+            if name is not None:
+                self.indexes.pop(name, None)
+
+    def _alter_index(self, match, sql, location, dynamic):
+        old, new = self._target(match.group(1), dynamic), identifier(match.group(2))
+        if old is None:
+            return
+        if old in self.indexes:
+            self.indexes = {(new if key == old else key): index for key, index in self.indexes.items()}
+            self.indexes[new].name = new
+            return
+        for table in self.tables.values():  # Índice de constraint (pkey/unique): renomeia a constraint
+            if old in table.constraints:
+                table.constraints = {(new if key == old else key): c for key, c in table.constraints.items()}
+                table.constraints[new].name = new
+                return
+
+    # ---------- funções, triggers, comentários ----------
+    def _create_function(self, match, sql, location, dynamic):
+        name = self._target(match.group(1), dynamic)
+        if name is not None:
+            body = sql[match.end():].strip()
+            self.functions[name] = f'CREATE OR REPLACE FUNCTION {quote(name) if name != name.lower() else name}{body}'
+
+    def _drop_function(self, match, sql, location, dynamic):
+        name = self._target(match.group(1), dynamic)
+        if name is not None:
+            self.functions.pop(name, None)
+            if re.search(r'\bCASCADE\s*$', sql, re.I):
+                self.triggers = {key: text for key, text in self.triggers.items()
+                                 if not re.search(rf'\bFUNCTION\s+"?{re.escape(name)}"?\s*\(', text, re.I)}
+
+    def _create_trigger(self, match, sql, location, dynamic):
+        name, table = identifier(match.group(1)), self._target(match.group(2), dynamic)
+        if table is not None and table in self.tables:
+            text = squeeze(re.sub(r'^CREATE\s+(?:OR\s+REPLACE\s+)?TRIGGER', 'CREATE TRIGGER', sql, flags=re.I))
+            self.triggers[(table, name)] = text
+
+    def _drop_trigger(self, match, sql, location, dynamic):
+        table = self._target(match.group(2), dynamic)
+        if table is not None:
+            self.triggers.pop((table, identifier(match.group(1))), None)
+
+    def _comment(self, match, sql, location, dynamic):
+        kind, raw = match.group(1).upper(), match.group(2)
+        parts = [part.strip() for part in _QUALIFIER_RE.split(raw.strip())]
+        if kind == 'COLUMN':
+            if len(parts) == 3 and self._target(f'{parts[0]}.x', dynamic) is None:
+                return
+            key = ('COLUMN', identifier(parts[-2]), identifier(parts[-1]))
+            table = self.tables.get(key[1])
+            if table is None or key[2] not in table.columns:
+                return
+            target = f'{quote(key[1])}.{quote(key[2])}'
+        else:
+            name = self._target(raw, dynamic)
+            if name is None:
+                return
+            key = (kind, name)
+            target = quote(name)
+        if match.group(3).strip().upper() == 'NULL':
+            self.comments.pop(key, None)
+        else:
+            self.comments[key] = f'COMMENT ON {kind} {target} IS {squeeze(match.group(3))}'
+
+    # ============================================
+    # Comparação
+    # ============================================
+    def snapshot(self):
+        """Forma canônica da estrutura (o que um pg_dump --schema-only mostraria)"""
+        return {
+            'extensions': sorted(self.extensions),
+            'enums': dict(sorted(self.enums.items())),
+            'tables': {name: {
+                'columns': [(c.name, c.type.upper() if '"' not in c.type else c.type, c.not_null, c.default, c.extra)
+                            for c in table.columns.values()],
+                'constraints': {key: (c.kind, squeeze(c.definition)) for key, c in sorted(table.constraints.items())},
+                'partition_by': table.partition_by,
+            } for name, table in sorted(self.tables.items())},
+            'indexes': {key: (i.table, i.unique, i.definition) for key, i in sorted(self.indexes.items())},
+            'functions': {key: squeeze(text) for key, text in sorted(self.functions.items())},
+            'triggers': {'.'.join(key): text for key, text in sorted(self.triggers.items())},
+            'comments': {'.'.join(key): text for key, text in sorted(self.comments.items())},
+        }
+
+    def differences(self, other):
+        """Diferenças estruturais em relação a outro catálogo (lista vazia = equivalentes)"""
+        return _diff_values('', self.snapshot(), other.snapshot())
+
+
+def _diff_values(path, mine, theirs):
+    if isinstance(mine, dict) and isinstance(theirs, dict):
+        found = []
+        for key in list(mine) + [k for k in theirs if k not in mine]:
+            where = f'{path}.{key}' if path else key
+            if key not in theirs:
+                found.append(f'{where}: só no primeiro')
+            elif key not in mine:
+                found.append(f'{where}: só no segundo')
+            else:
+                found.extend(_diff_values(where, mine[key], theirs[key]))
+        return found
+    return [] if mine == theirs else [f'{path}: {mine!r} != {theirs!r}']
+
+
+def _mentions(text, column):
+    return any(identifier(word) == column for _, _, word in sql_words(re.sub(r'[(),]', ' ', text)))
+
+
+def _referenced_columns(constraint):
+    match = re.search(rf'\bREFERENCES\s+{_NAME}\s*(\([^)]*\))', constraint.definition, re.I)
+    return match.group(1) if match else ''
+
+
+def _rename_referenced(text, old, new):
+    """'"users"("id") ON DELETE ...' com a coluna old renomeada só dentro dos parênteses"""
+    match = re.match(rf'^(\s*{_NAME}\s*)(\([^)]*\))(.*)$', text, re.S)
+    if not match:
+        return text
+    return match.group(1) + replace_identifier(match.group(2), old, new) + match.group(3)
+
+
+# ============================================
+# Parsing de colunas e constraints
+# ============================================
+def parse_column(table, text):
+    """'"id" UUID NOT NULL DEFAULT gen_random_uuid() PRIMARY KEY' -> (CatalogColumn, [Constraint])"""
+    words = sql_words(text)
+    name = identifier(words[0][2])
+    end = next((i for i in range(1, len(words)) if words[i][2].upper() in COLUMN_KEYWORDS), len(words))
+    column = CatalogColumn(name, squeeze(text[words[1][0]:words[end - 1][1]]))
+    constraints, pending_name, i = [], None, end
+    while i < len(words):
+        word = words[i][2].upper()
+        if word == 'NOT' and i + 1 < len(words) and words[i + 1][2].upper() == 'NULL':
+            column.not_null, i = True, i + 2
+        elif word == 'NULL':
+            i += 1
+        elif word == 'DEFAULT':
+            stop = next((j for j in range(i + 1, len(words)) if words[j][2].upper() in COLUMN_KEYWORDS - {'NULL'}),
+                        len(words))
+            value = squeeze(text[words[i + 1][0]:words[stop - 1][1]])
+            column.default = None if value.upper() == 'NULL' else value
+            i = stop
+        elif word == 'CONSTRAINT':
+            pending_name, i = identifier(words[i + 1][2]), i + 2
+        elif word == 'PRIMARY':
+            column.not_null = True
+            constraints.append(Constraint(pending_name or f'{table}_pkey', 'primary', f'PRIMARY KEY ({quote(name)})'))
+            pending_name, i = None, i + 2
+        elif word == 'UNIQUE':
+            constraints.append(Constraint(pending_name or constraint_name(table, [name], 'key'), 'unique',
+                                          f'UNIQUE ({quote(name)})'))
+            pending_name, i = None, i + 1
+        elif word == 'CHECK':
+            constraints.append(Constraint(pending_name or constraint_name(table, [name], 'check'), 'check',
+                                          f'CHECK {squeeze(words[i + 1][2])}'))
+            pending_name, i = None, i + 2
+        elif word == 'REFERENCES':
+            j = i + 2
+            if j < len(words) and words[j][2].startswith('('):
+                j += 1
+            while j + 2 < len(words) and words[j][2].upper() == 'ON':
+                j += 4 if words[j + 2][2].upper() in ('SET', 'NO') else 3
+            definition = f'FOREIGN KEY ({quote(name)}) {squeeze(text[words[i][0]:words[j - 1][1]])}'
+            constraints.append(Constraint(pending_name or constraint_name(table, [name], 'fkey'), 'foreign',
+                                          definition))
+            pending_name, i = None, j
+        else:  # GENERATED ..., COLLATE ...
+            column.extra = squeeze(text[words[i][0]:])
+            break
+    return column, constraints
+
+
+def parse_constraint(table, text):
+    """'CONSTRAINT "x_pkey" PRIMARY KEY ("id")' / 'UNIQUE ("a", "b")' -> Constraint"""
+    words = sql_words(text)
+    name = None
+    if words[0][2].upper() == 'CONSTRAINT':
+        name = identifier(words[1][2])
+        words = words[2:]
+    kind = CONSTRAINT_KINDS[words[0][2].upper()]
+    definition = squeeze(re.sub(r'\s+NOT\s+VALID\s*$', '', text[words[0][0]:], flags=re.I))
+    if name is None:
+        if kind == 'primary':
+            name = f'{table}_pkey'
+        elif kind == 'check':
+            name = f'{table}_check'
+        else:
+            group = next(word for _, _, word in words if word.startswith('('))
+            name = constraint_name(table, column_list(group), CONSTRAINT_SUFFIXES[kind])
+    return Constraint(name, kind, definition)
+
+
+_DO_RE = re.compile(r'^DO\s+(\$\w*\$)(.*)\1(?:\s+LANGUAGE\s+\w+)?$', re.I | re.S)
+_CREATE_EXTENSION_RE = re.compile(rf'^CREATE\s+EXTENSION\s+(?:IF\s+NOT\s+EXISTS\s+)?({_NAME})(.*)$', re.I | re.S)
+_CREATE_ENUM_RE = re.compile(rf'^CREATE\s+TYPE\s+({_NAME})\s+AS\s+ENUM\s*\(', re.I | re.S)
+_ALTER_TYPE_RE = re.compile(rf'^ALTER\s+TYPE\s+({_NAME})\s+(.*)$', re.I | re.S)
+_DROP_TYPE_RE = re.compile(rf'^DROP\s+TYPE\s+(?:IF\s+EXISTS\s+)?({_NAMES})(?:\s+(?:CASCADE|RESTRICT))?$', re.I | re.S)
+_CREATE_TABLE_RE = re.compile(rf'^CREATE\s+(?:UNLOGGED\s+)?TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?({_NAME})\s*\(',
+                              re.I | re.S)
+_CREATE_PARTITION_RE = re.compile(rf'^CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?({_NAME})\s+PARTITION\s+OF\s+({_NAME})\s',
+                                  re.I | re.S)
+_ALTER_TABLE_RE = re.compile(rf'^ALTER\s+TABLE\s+(?:IF\s+EXISTS\s+)?(?:ONLY\s+)?({_NAME})\s+(.*)$', re.I | re.S)
+_DROP_TABLE_RE = re.compile(rf'^DROP\s+TABLE\s+(?:IF\s+EXISTS\s+)?({_NAMES})(?:\s+(?:CASCADE|RESTRICT))?$', re.I | re.S)
+_CREATE_INDEX_RE = re.compile(rf'^CREATE\s+(UNIQUE\s+)?INDEX\s+(?:CONCURRENTLY\s+)?(?:IF\s+NOT\s+EXISTS\s+)?'
+                              rf'(?:({_NAME})\s+)?ON\s+(?:ONLY\s+)?({_NAME})\s*(.*)$', re.I | re.S)
+_DROP_INDEX_RE = re.compile(rf'^DROP\s+INDEX\s+(?:CONCURRENTLY\s+)?(?:IF\s+EXISTS\s+)?({_NAMES})'
+                            rf'(?:\s+(?:CASCADE|RESTRICT))?$', re.I | re.S)
+_ALTER_INDEX_RE = re.compile(rf'^ALTER\s+INDEX\s+(?:IF\s+EXISTS\s+)?({_NAME})\s+RENAME\s+TO\s+({_NAME})$', re.I | re.S)
+_CREATE_FUNCTION_RE = re.compile(rf'^CREATE\s+(?:OR\s+REPLACE\s+)?FUNCTION\s+({_NAME})', re.I | re.S)
+_DROP_FUNCTION_RE = re.compile(rf'^DROP\s+FUNCTION\s+(?:IF\s+EXISTS\s+)?({_NAME})', re.I | re.S)
+_CREATE_TRIGGER_RE = re.compile(rf'^CREATE\s+(?:OR\s+REPLACE\s+)?TRIGGER\s+({_NAME})\s+.*?\bON\s+({_NAME})', re.I | re.S)
+_DROP_TRIGGER_RE = re.compile(rf'^DROP\s+TRIGGER\s+(?:IF\s+EXISTS\s+)?({_NAME})\s+ON\s+({_NAME})', re.I | re.S)
+_COMMENT_RE = re.compile(rf'^COMMENT\s+ON\s+(TABLE|COLUMN|INDEX|TYPE|FUNCTION)\s+({_NAME})\s+IS\s+(.*)$', re.I | re.S)
+
+
+def replay_sql(text, role='tenant', name='<sql>'):
+    """Catálogo resultante de um único arquivo SQL (ex: um baseline gerado)"""
+    if role not in ROLES:
+        raise ValueError(f'Papel desconhecido: {role} (use {", ".join(ROLES)})')
+    catalog = Catalog(role)
+    catalog.apply_sql(text, name)
+    return catalog
+
+
+def replay_migrations(role='tenant', migrations_dir=MIGRATIONS_DIR, until=None):
+    """Catálogo resultante de aplicar as migrações em ordem (até `until`, inclusive)"""
+    if role not in ROLES:
+        raise ValueError(f'Papel desconhecido: {role} (use {", ".join(ROLES)})')
+    catalog = Catalog(role)
+    for migration in list_migrations(migrations_dir):
+        catalog.apply_sql(migration.sql, migration.name)
+        if until and migration.name.startswith(until):
+            break
+    return catalog
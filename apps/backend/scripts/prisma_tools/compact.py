@@ -0,0 +1,187 @@
+"""
+Compactação em streaming das tabelas *_history de um tenant (formato de snapshots.py)
+
+    from prisma_tools.compact import HistoryCompactor, history_tables
+
+    tables = history_tables(load_schema())
+    compactor = HistoryCompactor(url, 'tenant_casa_sao_rafael_abc123', every=10)
+    for table in tables:
+        stats = compactor.compact(table)         # reescreve previousData/newData em lotes
+    compactor.read_version(tables[0], record_id, 7)
+    compactor.close()
+
+As linhas são lidas por um cursor nomeado em ordem de (registro,
+versionNumber, id) e reescritas por uma segunda conexão, em lotes com
+commit próprio: a memória fica constante (uma cadeia por vez, um lote
+pendente) e uma execução interrompida pode ser repetida. Só linhas cujo
+conteúdo muda são atualizadas, então rodar de novo sobre uma tabela
+compactada não escreve nada além das versões novas gravadas pelo backend.
+
+O histórico é só de inserção; a compactação supõe que linhas do meio de
+uma cadeia não são apagadas (um envelope depende da linha anterior).
+
+Requer psycopg 3 (pip install "psycopg[binary]").
+"""
+
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .ddl import partition_key, quote
+from .restore import connect
+from .snapshots import DEFAULT_SNAPSHOT_EVERY, PATCH_KEY, SnapshotChain, decode_chain, json_equal, json_size
+
+DEFAULT_BATCH = 1000  # Linhas atualizadas por commit
+FETCH_SIZE = 5000  # Linhas trazidas por ida ao cursor nomeado
+VERSIONED_FIELDS = ('versionNumber', 'previousData', 'newData')
+
+
+@dataclass
+class HistoryTable:
+    model: str
+    table: str
+    record_column: str  # Chave estrangeira do registro versionado (ex: allergyId)
+    partition_column: Optional[str] = None  # Particionada por mês (@partitioned): entra no WHERE do UPDATE
+
+
+def history_tables(schema, names=None):
+    """Tabelas de histórico versionadas (versionNumber + previousData/newData), opcionalmente filtradas"""
+    tables = []
+    for model in schema.models.values():
+        if not model.name.endswith('History') or any(f not in model.fields for f in VERSIONED_FIELDS):
+            continue
+        if names and model.name not in names and model.table not in names:
+            continue
+        target = model.name[:-len('History')]
+        relation = next((r for r in schema.relations_of(model.name)
+                         if r.target == target and len(r.fields) == 1 and r.fields != ['changedBy']), None)
+        if relation is None:
+            continue
+        partition = partition_key(model)
+        tables.append(HistoryTable(
+            model=model.name,
+            table=model.table,
+            record_column=model.fields[relation.fields[0]].column,
+            partition_column=model.fields[partition].column if partition in model.fields else None,
+        ))
+    return sorted(tables, key=lambda t: t.table)
+
+
+@dataclass
+class CompactStats:
+    table: str
+    rows: int = 0
+    records: int = 0
+    anchors: int = 0  # Linhas que ficaram com o JSON completo
+    changed: int = 0  # Linhas reescritas
+    bytes_before: int = 0  # JSON de previousData + newData
+    bytes_after: int = 0
+    seconds: float = 0.0
+
+    @property
+    def ratio(self):
+        return self.bytes_after / self.bytes_before if self.bytes_before else 1.0
+
+
+def _size(value):
+    return 0 if value is None else json_size(value)
+
+
+class HistoryCompactor:
+    """Reescreve o previousData/newData das tabelas de histórico de um schema de tenant"""
+
+    def __init__(self, database_url, schema, every=DEFAULT_SNAPSHOT_EVERY, batch=DEFAULT_BATCH, dry_run=False):
+        if every < 1 or batch < 1:
+            raise ValueError('every e batch devem ser >= 1')
+        self.database_url = database_url
+        self.schema = schema
+        self.every = every
+        self.batch = batch
+        self.dry_run = dry_run
+        self._read = None
+        self._write = None
+
+    def _connections(self):
+        if self._read is None:
+            self._read = connect(self.database_url)
+            self._write = connect(self.database_url)
+        return self._read, self._write
+
+    def close(self):
+        for conn in (self._read, self._write):
+            if conn is not None:
+                conn.close()
+        self._read = self._write = None
+
+    def _qualified(self, table):
+        return f'{quote(self.schema)}.{quote(table.table)}'
+
+    def _flush(self, conn, sql, pending):
+        if not pending or self.dry_run:
+            pending.clear()
+            return
+        from psycopg.types.json import Jsonb
+
+        params = [(None if previous is None else Jsonb(previous), Jsonb(new), *key)
+                  for previous, new, key in pending]
+        with conn.transaction():
+            with conn.cursor() as cur:
+                cur.executemany(sql, params)
+        pending.clear()
+
+    def compact(self, table, on_batch=None):
+        """Recodifica a tabela inteira; on_batch(stats) é chamado a cada lote gravado"""
+        read, write = self._connections()
+        stats = CompactStats(table.table)
+        started = time.perf_counter()
+        record = quote(table.record_column)
+        partition = quote(table.partition_column) if table.partition_column else None
+        select = (f'SELECT id, {record}, "previousData", "newData"{f", {partition}" if partition else ""} '
+                  f'FROM {self._qualified(table)} ORDER BY {record}, "versionNumber", id')
+        update = (f'UPDATE {self._qualified(table)} SET "previousData" = %s, "newData" = %s WHERE id = %s'
+                  f'{f" AND {partition} = %s" if partition else ""}')
+
+        pending = []
+        chain, current = None, object()
+        with read.transaction():
+            with read.cursor(name=f'compact_{table.table}') as cur:
+                cur.itersize = FETCH_SIZE
+                cur.execute(select)
+                for row in cur:
+                    row_id, record_id, previous, new = row[:4]
+                    if record_id != current:
+                        chain, current = SnapshotChain(self.every), record_id
+                        stats.records += 1
+                    step = chain.step(previous, new)
+                    stats.rows += 1
+                    stats.anchors += step.anchor
+                    stats.bytes_before += _size(previous) + _size(new)
+                    stats.bytes_after += _size(step.encoded_previous) + _size(step.encoded_new)
+                    if not json_equal(step.encoded_previous, previous) or not json_equal(step.encoded_new, new):
+                        stats.changed += 1
+                        pending.append((step.encoded_previous, step.encoded_new, (row_id, *row[4:])))
+                    if len(pending) >= self.batch:
+                        self._flush(write, update, pending)
+                        if on_batch:
+                            on_batch(stats)
+        self._flush(write, update, pending)
+        stats.seconds = time.perf_counter() - started
+        return stats
+
+    def read_version(self, table, record_id, version):
+        """(previousData, newData) completos de uma versão, a partir da última âncora (ou None)"""
+        read, _ = self._connections()
+        record = quote(table.record_column)
+        qualified = self._qualified(table)
+        sql = (f'SELECT "versionNumber", "previousData", "newData" FROM {qualified} '
+               f'WHERE {record} = %(record)s AND "versionNumber" <= %(version)s AND "versionNumber" >= COALESCE('
+               f'(SELECT max("versionNumber") FROM {qualified} WHERE {record} = %(record)s '
+               f'AND "versionNumber" <= %(version)s AND "newData" -> %(key)s IS NULL '
+               f'AND "previousData" -> %(key)s IS NULL), 0) '
+               f'ORDER BY "versionNumber", id')
+        with read.cursor() as cur:
+            cur.execute(sql, {'record': record_id, 'version': version, 'key': PATCH_KEY})
+            rows: List[tuple] = cur.fetchall()
+        if not rows or rows[-1][0] != version:
+            return None
+        return decode_chain((previous, new) for _, previous, new in rows)[-1]
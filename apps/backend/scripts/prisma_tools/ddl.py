@@ -0,0 +1,548 @@
+"""
+Diff entre duas versões do schema Prisma -> SQL de migração (PostgreSQL)
+
+    from prisma_tools.ddl import diff_schemas, schema_at_revision
+
+    before = schema_at_revision('HEAD')         # schema commitado
+    after = load_schema()                        # schema em disco
+    migration = diff_schemas(before, after)
+    print(migration.render())
+
+Compara as duas árvores parseadas (sem banco de sombra) e gera o DDL no
+mesmo formato do `prisma migrate dev`: tipos, defaults e nomes de
+constraints/índices seguem as convenções do Prisma para PostgreSQL (nomes
+truncados em 63 caracteres, onDelete padrão SetNull/Restrict, uuid() sem
+default no banco). Cobre o que mudamos no dia a dia: enums e valores,
+tabelas novas (inclusive as *_history do generate-versioning.py), colunas,
+nulidade, defaults, chaves primárias, índices e FKs.
+
+Modelos com `/// @partitioned(coluna)` viram tabelas particionadas por mês
+nessa coluna (PARTITION BY RANGE, partição DEFAULT e as partições do
+primeiro mês com dados até PARTITION_MONTHS_AHEAD meses à frente). Marcar
+um modelo existente gera a reconstrução da tabela (RebuildTable): a antiga é
+renomeada, copiada para a particionada e removida.
+
+Limitações: renomear coluna ou tabela aparece como remoção + criação (com
+aviso), como no Prisma; views e `type` não geram DDL.
+"""
+
+import json
+import re
+import subprocess
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .schema import SCHEMA_DIR, Schema, parse_file, unquote
+
+MAX_IDENTIFIER = 63  # NAMEDATALEN - 1 do PostgreSQL
+
+SCALAR_SQL = {'String': 'TEXT', 'Boolean': 'BOOLEAN', 'Int': 'INTEGER', 'BigInt': 'BIGINT',
+              'Float': 'DOUBLE PRECISION', 'Decimal': 'DECIMAL(65,30)', 'DateTime': 'TIMESTAMP(3)',
+              'Json': 'JSONB', 'Bytes': 'BYTEA'}
+NATIVE_SQL = {'Uuid': 'UUID', 'Text': 'TEXT', 'VarChar': 'VARCHAR', 'Char': 'CHAR', 'Timestamptz': 'TIMESTAMPTZ',
+              'Timestamp': 'TIMESTAMP', 'Date': 'DATE', 'Time': 'TIME', 'Timetz': 'TIMETZ', 'SmallInt': 'SMALLINT',
+              'Integer': 'INTEGER', 'BigInt': 'BIGINT', 'Real': 'REAL', 'DoublePrecision': 'DOUBLE PRECISION',
+              'Decimal': 'DECIMAL', 'Money': 'MONEY', 'Boolean': 'BOOLEAN', 'Json': 'JSON', 'JsonB': 'JSONB',
+              'ByteA': 'BYTEA', 'Inet': 'INET', 'Citext': 'CITEXT', 'Xml': 'XML', 'Bit': 'BIT', 'VarBit': 'VARBIT',
+              'Oid': 'OID'}
+SERIAL_SQL = {'INTEGER': 'SERIAL', 'BIGINT': 'BIGSERIAL', 'SMALLINT': 'SMALLSERIAL'}
+REFERENTIAL_ACTIONS = {'Cascade': 'CASCADE', 'Restrict': 'RESTRICT', 'NoAction': 'NO ACTION',
+                       'SetNull': 'SET NULL', 'SetDefault': 'SET DEFAULT'}
+# Gerados pelo Prisma Client, não pelo banco
+CLIENT_DEFAULTS = ('uuid(', 'cuid(', 'nanoid(', 'ulid(')
+
+# Ordem das seções no migration.sql (a mesma do prisma migrate)
+SECTIONS = ('CreateEnum', 'AlterEnum', 'DropForeignKey', 'DropIndex', 'AlterTable', 'DropTable', 'DropEnum',
+            'CreateTable', 'RebuildTable', 'CreatePartitions', 'CreateIndex', 'AddForeignKey', 'RenameIndex')
+
+# Tabelas particionadas por mês: marcador no comentário /// do modelo (ver generate-versioning.py --partitioned)
+PARTITION_MARKER_RE = re.compile(r'@partitioned\((\w+)\)')
+PARTITION_MONTHS_AHEAD = 3  # Partições futuras criadas pela migração (depois, maintain-history-partitions.py)
+
+
+def quote(identifier):
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def sql_literal(value):
+    return "'" + value.replace("'", "''") + "'"
+
+
+def constraint_name(table, columns, suffix):
+    """Nome padrão do Prisma: <tabela>_<colunas>_<sufixo>, truncado para caber em 63 caracteres"""
+    base = '_'.join([table, *columns])
+    return base[:MAX_IDENTIFIER - len(suffix) - 1] + '_' + suffix
+
+
+def partition_key(model):
+    """Campo do marcador `/// @partitioned(campo)` do modelo (None se não for particionado)"""
+    match = PARTITION_MARKER_RE.search(model.doc or '')
+    return match.group(1) if match else None
+
+
+def partition_prefix(table):
+    """Prefixo das partições mensais: <tabela>_pAAAAMM, com a tabela truncada para caber em 63 caracteres"""
+    return table[:MAX_IDENTIFIER - len('_p000000')] + '_p'
+
+
+def default_partition(table):
+    return constraint_name(table, [], 'default')
+
+
+def create_partitions_sql(table, column, source=None, months_ahead=PARTITION_MONTHS_AHEAD):
+    """Partição DEFAULT e partições mensais (UTC) do primeiro mês de `source` (ou do atual) até meses à frente
+
+    Roda em um bloco DO porque o intervalo depende do banco em que a
+    migração é aplicada (cada schema de tenant tem os próprios dados).
+    """
+    column = quote(column)
+    first = f'coalesce((SELECT min({column}) FROM {quote(source)}), now())' if source else 'now()'
+    return '\n'.join([
+        f'CREATE TABLE {quote(default_partition(table))} PARTITION OF {quote(table)} DEFAULT;',
+        'DO $$',
+        'DECLARE',
+        f"    first_month TIMESTAMP := date_trunc('month', {first} AT TIME ZONE 'UTC');",
+        '    month TIMESTAMP;',
+        'BEGIN',
+        '    FOR month IN SELECT generate_series(first_month,',
+        f"            date_trunc('month', now() AT TIME ZONE 'UTC') + interval '{months_ahead} months', interval '1 month')",
+        '    LOOP',
+        "        EXECUTE format('CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',",
+        f"                       {sql_literal(partition_prefix(table))} || to_char(month, 'YYYYMM'), "
+        f"{sql_literal(table)},",
+        "                       month AT TIME ZONE 'UTC', (month + interval '1 month') AT TIME ZONE 'UTC');",
+        '    END LOOP;',
+        'END $$;',
+    ])
+
+
+# ============================================
+# Modelo relacional (o que o schema vira no banco)
+# ============================================
+@dataclass
+class Column:
+    name: str
+    type: str
+    not_null: bool
+    default: Optional[str] = None
+    enum: Optional[str] = None  # Nome do tipo no banco, se a coluna for enum
+
+    def definition(self):
+        parts = [quote(self.name), self.type]
+        if self.not_null:
+            parts.append('NOT NULL')
+        if self.default is not None:
+            parts.append(f'DEFAULT {self.default}')
+        return ' '.join(parts)
+
+
+@dataclass
+class IndexDef:
+    name: str
+    table: str
+    columns: List[Tuple[str, Optional[str]]]  # (coluna, 'Asc' | 'Desc' | None)
+    unique: bool = False
+    using: Optional[str] = None
+
+    @property
+    def signature(self):
+        return (tuple(self.columns), self.unique, (self.using or 'BTree').lower())
+
+    def create(self):
+        columns = ', '.join(quote(c) + (' DESC' if sort == 'Desc' else '') for c, sort in self.columns)
+        using = f' USING {self.using.upper()} ({columns})' if self.using and self.using != 'BTree' else f'({columns})'
+        unique = 'UNIQUE ' if self.unique else ''
+        return f'CREATE {unique}INDEX {quote(self.name)} ON {quote(self.table)}{using};'
+
+
+@dataclass
+class ForeignKey:
+    name: str
+    table: str
+    columns: List[str]
+    target: str
+    references: List[str]
+    on_delete: str
+    on_update: str
+
+    @property
+    def signature(self):
+        return (tuple(self.columns), self.target, tuple(self.references), self.on_delete, self.on_update)
+
+    def add(self):
+        return (f'ALTER TABLE {quote(self.table)} ADD CONSTRAINT {quote(self.name)} '
+                f'FOREIGN KEY ({", ".join(map(quote, self.columns))}) '
+                f'REFERENCES {quote(self.target)}({", ".join(map(quote, self.references))}) '
+                f'ON DELETE {self.on_delete} ON UPDATE {self.on_update};')
+
+
+@dataclass
+class Table:
+    name: str
+    model: str
+    columns: Dict[str, Column] = field(default_factory=dict)
+    primary_key: Optional[Tuple[str, List[str]]] = None  # (nome da constraint, colunas)
+    indexes: Dict[str, IndexDef] = field(default_factory=dict)
+    foreign_keys: Dict[str, ForeignKey] = field(default_factory=dict)
+    partition_by: Optional[str] = None  # Coluna do particionamento mensal (@partitioned)
+
+    def create(self):
+        lines = [f'    {column.definition()}' for column in self.columns.values()]
+        body = ',\n'.join(lines)
+        if self.primary_key:
+            name, columns = self.primary_key
+            body += f',\n\n    CONSTRAINT {quote(name)} PRIMARY KEY ({", ".join(map(quote, columns))})'
+        partitioning = f' PARTITION BY RANGE ({quote(self.partition_by)})' if self.partition_by else ''
+        return f'CREATE TABLE {quote(self.name)} (\n{body}\n){partitioning};'
+
+    def create_partitions(self, source=None, months_ahead=PARTITION_MONTHS_AHEAD):
+        return create_partitions_sql(self.name, self.partition_by, source, months_ahead)
+
+
+@dataclass
+class EnumType:
+    name: str
+    values: List[str]
+
+    def create(self):
+        return f'CREATE TYPE {quote(self.name)} AS ENUM ({", ".join(map(sql_literal, self.values))});'
+
+
+def column_type(schema, field_):
+    native = next((a for a in field_.attributes if a.name.startswith('db.')), None)
+    if native is not None:
+        base = native.name[3:]
+        sql = NATIVE_SQL.get(base, base.upper()) + (f'({native.raw_args})' if native.raw_args else '')
+    elif field_.type in schema.enums:
+        sql = quote(schema.enums[field_.type].db_name)
+    elif field_.type.startswith('Unsupported('):
+        sql = unquote(field_.type[len('Unsupported('):-1])
+    else:
+        sql = SCALAR_SQL.get(field_.type, 'TEXT')
+    if field_.default == 'autoincrement()':
+        sql = SERIAL_SQL.get(sql, sql)
+    return sql + ('[]' if field_.list else '')
+
+
+def column_default(schema, field_, sql_type):
+    value = field_.default
+    if value is None or value == 'autoincrement()' or value.startswith(CLIENT_DEFAULTS):
+        return None
+    if value == 'now()':
+        return 'CURRENT_TIMESTAMP'
+    match = re.match(r'^dbgenerated\((.*)\)$', value, re.S)
+    if match:
+        expression = match.group(1).strip()
+        return json.loads(expression) if expression.startswith('"') else (expression or None)
+    if field_.list:
+        items = [v.strip() for v in value.strip()[1:-1].split(',') if v.strip()] if value.startswith('[') else [value]
+        rendered = [_scalar_default(schema, field_, item) for item in items]
+        return f'ARRAY[{", ".join(rendered)}]::{sql_type}'
+    return _scalar_default(schema, field_, value)
+
+
+def _scalar_default(schema, field_, value):
+    if value.startswith('"'):
+        return sql_literal(json.loads(value))
+    if field_.type in schema.enums:
+        enum_value = schema.enums[field_.type].values.get(value)
+        mapped = enum_value and next((a for a in enum_value.attributes if a.name == 'map'), None)
+        return sql_literal(unquote(mapped.arg('name', 0)) if mapped else value)
+    return value
+
+
+def enum_values(enum):
+    values = []
+    for value in enum.values.values():
+        mapped = next((a for a in value.attributes if a.name == 'map'), None)
+        values.append(unquote(mapped.arg('name', 0)) if mapped else value.name)
+    return values
+
+
+def _columns_of(model, names):
+    return [model.field(name).column if model.field(name) else name for name in names]
+
+
+def build_tables(schema):
+    """{tabela: Table} com colunas, PK, índices e FKs como o Prisma os cria"""
+    tables = {}
+    for model in schema.models.values():
+        if model.kind != 'model':
+            continue
+        table = Table(model.table, model.name)
+        key = partition_key(model)
+        if key is not None:
+            table.partition_by = model.field(key).column if model.field(key) else key
+        for field_ in model.fields.values():
+            if schema.is_relation(field_):
+                continue
+            sql_type = column_type(schema, field_)
+            enum = schema.enums[field_.type].db_name if field_.type in schema.enums else None
+            table.columns[field_.column] = Column(field_.column, sql_type, not field_.optional and not field_.list,
+                                                  column_default(schema, field_, sql_type), enum)
+        for index in model.indexes:
+            columns = _columns_of(model, index.columns)
+            if index.kind == 'id':
+                table.primary_key = (index.map or constraint_name(table.name, [], 'pkey'), columns)
+                continue
+            suffix = 'key' if index.kind == 'unique' else 'idx'
+            name = index.map or constraint_name(table.name, columns, suffix)
+            sorts = [f.sort for f in index.fields]
+            table.indexes[name] = IndexDef(name, table.name, list(zip(columns, sorts)), index.kind == 'unique',
+                                           index.type)
+        tables[table.name] = table
+
+    for relation in schema.relations:
+        model = schema.models[relation.model]
+        if not relation.owns_foreign_key or model.kind != 'model' or model.table not in tables:
+            continue
+        target = schema.models[relation.target]
+        columns = _columns_of(model, relation.fields)
+        mapped = model.field(relation.field).attribute('relation').kwargs.get('map')
+        name = unquote(mapped) if mapped else constraint_name(model.table, columns, 'fkey')
+        optional = all(model.field(f) is not None and model.field(f).optional for f in relation.fields)
+        on_delete = REFERENTIAL_ACTIONS.get(relation.on_delete or ('SetNull' if optional else 'Restrict'))
+        on_update = REFERENTIAL_ACTIONS.get(relation.on_update or 'Cascade')
+        tables[model.table].foreign_keys[name] = ForeignKey(name, model.table, columns, target.table,
+                                                            _columns_of(target, relation.references),
+                                                            on_delete, on_update)
+    return tables
+
+
+def build_enums(schema):
+    return {enum.db_name: EnumType(enum.db_name, enum_values(enum)) for enum in schema.enums.values()}
+
+
+# ============================================
+# Diff
+# ============================================
+@dataclass
+class Statement:
+    section: str  # Uma de SECTIONS (vira o comentário -- <seção>)
+    sql: str
+
+
+@dataclass
+class Migration:
+    statements: List[Statement] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+
+    def add(self, section, sql):
+        self.statements.append(Statement(section, sql))
+
+    @property
+    def empty(self):
+        return not self.statements
+
+    def render(self):
+        parts = []
+        if self.warnings:
+            lines = '\n'.join(f'  - {warning}' for warning in self.warnings)
+            parts.append(f'/*\n  Warnings:\n\n{lines}\n\n*/')
+        order = {section: position for position, section in enumerate(SECTIONS)}
+        for statement in sorted(self.statements, key=lambda s: order[s.section]):
+            parts.append(f'-- {statement.section}\n{statement.sql}')
+        return '\n\n'.join(parts) + '\n' if parts else ''
+
+
+def _diff_enums(migration, before, after, after_tables):
+    for name, enum in after.items():
+        if name not in before:
+            migration.add('CreateEnum', enum.create())
+            continue
+        old = before[name]
+        removed = [v for v in old.values if v not in enum.values]
+        if removed:
+            migration.warnings.append(f'Os valores {removed} do enum `{name}` serão removidos. '
+                                      f'Se ainda estiverem em uso no banco, a migração vai falhar.')
+            migration.add('AlterEnum', _recreate_enum(enum, after_tables))
+            continue
+        for value in enum.values:
+            if value not in old.values:
+                migration.add('AlterEnum', f'ALTER TYPE {quote(name)} ADD VALUE {sql_literal(value)};')
+    for name in before:
+        if name not in after:
+            migration.add('DropEnum', f'DROP TYPE {quote(name)};')
+
+
+def _recreate_enum(enum, tables):
+    """Valores removidos não têm ALTER TYPE: cria o tipo novo, converte as colunas e troca os nomes"""
+    new_name = f'{enum.name}_new'
+    lines = ['BEGIN;', EnumType(new_name, enum.values).create()]
+    users = [(table, column) for table in tables.values() for column in table.columns.values()
+             if column.enum == enum.name]
+    for table, column in users:
+        if column.default is not None:
+            lines.append(f'ALTER TABLE {quote(table.name)} ALTER COLUMN {quote(column.name)} DROP DEFAULT;')
+        array = '[]' if column.type.endswith('[]') else ''
+        lines.append(f'ALTER TABLE {quote(table.name)} ALTER COLUMN {quote(column.name)} TYPE {quote(new_name)}{array} '
+                     f'USING ({quote(column.name)}::text{array}::{quote(new_name)}{array});')
+    lines.append(f'ALTER TYPE {quote(enum.name)} RENAME TO {quote(enum.name + "_old")};')
+    lines.append(f'ALTER TYPE {quote(new_name)} RENAME TO {quote(enum.name)};')
+    lines.append(f'DROP TYPE {quote(enum.name + "_old")};')
+    for table, column in users:
+        if column.default is not None:
+            lines.append(f'ALTER TABLE {quote(table.name)} ALTER COLUMN {quote(column.name)} SET DEFAULT {column.default};')
+    lines.append('COMMIT;')
+    return '\n'.join(lines)
+
+
+def _alter_table(migration, old, new):
+    """Cláusulas do ALTER TABLE na ordem do Prisma: PK, DROP/ADD/ALTER COLUMN, nova PK"""
+    clauses, adds, alters = [], [], []
+    if old.primary_key != new.primary_key and old.primary_key:
+        clauses.append(f'DROP CONSTRAINT {quote(old.primary_key[0])}')
+    for name in old.columns:
+        if name not in new.columns:
+            clauses.append(f'DROP COLUMN {quote(name)}')
+            migration.warnings.append(f'A coluna `{name}` da tabela `{new.name}` será removida. '
+                                      f'Todos os dados da coluna serão perdidos.')
+    for name, column in new.columns.items():
+        previous = old.columns.get(name)
+        if previous is None:
+            adds.append(f'ADD COLUMN     {column.definition()}')
+            if column.not_null and column.default is None:
+                migration.warnings.append(f'Coluna obrigatória `{name}` adicionada à tabela `{new.name}` sem default. '
+                                          f'Não é possível se a tabela não estiver vazia.')
+            continue
+        target = quote(name)
+        if previous.type != column.type:
+            using = f' USING ({target}::text::{column.type})' if column.enum else ''
+            alters.append(f'ALTER COLUMN {target} SET DATA TYPE {column.type}{using}')
+            migration.warnings.append(f'O tipo de `{name}` na tabela `{new.name}` muda de {previous.type} para '
+                                      f'{column.type}. Confira se os valores existentes podem ser convertidos.')
+        if previous.not_null != column.not_null:
+            alters.append(f'ALTER COLUMN {target} {"SET" if column.not_null else "DROP"} NOT NULL')
+            if column.not_null:
+                migration.warnings.append(f'A coluna `{name}` da tabela `{new.name}` passa a ser obrigatória; '
+                                          f'a migração falha se houver NULLs.')
+        if previous.default != column.default:
+            alters.append(f'ALTER COLUMN {target} SET DEFAULT {column.default}' if column.default is not None
+                          else f'ALTER COLUMN {target} DROP DEFAULT')
+    clauses += adds + alters
+    if new.primary_key != old.primary_key and new.primary_key:
+        name, columns = new.primary_key
+        clauses.append(f'ADD CONSTRAINT {quote(name)} PRIMARY KEY ({", ".join(map(quote, columns))})')
+    if clauses:
+        migration.add('AlterTable', f'ALTER TABLE {quote(new.name)} ' + ',\n'.join(clauses) + ';')
+
+
+def _diff_indexes(migration, old, new):
+    renamed = set()
+    for name, index in old.indexes.items():
+        if name in new.indexes and new.indexes[name].signature == index.signature:
+            continue
+        same = next((n for n, i in new.indexes.items() if n not in old.indexes and n not in renamed
+                     and i.signature == index.signature), None)
+        if same is not None:
+            renamed.add(same)
+            migration.add('RenameIndex', f'ALTER INDEX {quote(name)} RENAME TO {quote(same)};')
+            continue
+        migration.add('DropIndex', f'DROP INDEX {quote(name)};')
+    for name, index in new.indexes.items():
+        if name in renamed or (name in old.indexes and old.indexes[name].signature == index.signature):
+            continue
+        migration.add('CreateIndex', index.create())
+        if index.unique:
+            columns = ','.join(c for c, _ in index.columns)
+            migration.warnings.append(f'Será criada uma restrição única nas colunas `[{columns}]` da tabela '
+                                      f'`{new.name}`. Se houver valores duplicados, a migração vai falhar.')
+
+
+def _diff_foreign_keys(migration, old, new):
+    for name, foreign_key in old.foreign_keys.items():
+        if name not in new.foreign_keys or new.foreign_keys[name].signature != foreign_key.signature:
+            migration.add('DropForeignKey', f'ALTER TABLE {quote(old.name)} DROP CONSTRAINT {quote(name)};')
+    for name, foreign_key in new.foreign_keys.items():
+        if name not in old.foreign_keys or old.foreign_keys[name].signature != foreign_key.signature:
+            migration.add('AddForeignKey', foreign_key.add())
+
+
+def _rebuild_table(migration, old, new):
+    """Particionar (ou desparticionar) não tem ALTER TABLE: recria a tabela e copia as linhas
+
+    Os índices e FKs da antiga somem com ela; os da nova entram nas seções
+    CreateIndex/AddForeignKey, depois da cópia (carga sem índices).
+    """
+    staging = constraint_name(new.name, [], 'unpartitioned' if new.partition_by else 'partitioned')
+    lines = [f'ALTER TABLE {quote(old.name)} RENAME TO {quote(staging)};']
+    if old.primary_key:
+        lines.append(f'ALTER TABLE {quote(staging)} RENAME CONSTRAINT {quote(old.primary_key[0])} '
+                     f'TO {quote(constraint_name(staging, [], "pkey"))};')
+    lines.extend(f'DROP INDEX {quote(name)};' for name in old.indexes)
+    lines.append(new.create())
+    if new.partition_by:
+        lines.append(new.create_partitions(source=staging))
+    columns = ', '.join(quote(name) for name in new.columns if name in old.columns)
+    lines.append(f'INSERT INTO {quote(new.name)} ({columns}) SELECT {columns} FROM {quote(staging)};')
+    lines.append(f'DROP TABLE {quote(staging)};')
+    migration.add('RebuildTable', '\n'.join(lines))
+    for index in new.indexes.values():
+        migration.add('CreateIndex', index.create())
+    for foreign_key in new.foreign_keys.values():
+        migration.add('AddForeignKey', foreign_key.add())
+
+    action = f'particionada por mês em `{new.partition_by}`' if new.partition_by else 'desparticionada'
+    migration.warnings.append(f'A tabela `{new.name}` será recriada {action}: todas as linhas são copiadas com a '
+                              f'tabela bloqueada. Em tabelas grandes, aplique fora do horário de uso.')
+    for name, column in new.columns.items():
+        if name not in old.columns and column.not_null and column.default is None:
+            migration.warnings.append(f'Coluna obrigatória `{name}` adicionada à tabela `{new.name}` sem default. '
+                                      f'Não é possível se a tabela não estiver vazia.')
+
+
+def diff_schemas(before, after):
+    """Migration com o DDL que leva o banco de `before` para `after` (dois Schema parseados)"""
+    migration = Migration()
+    old_tables, new_tables = build_tables(before), build_tables(after)
+    _diff_enums(migration, build_enums(before), build_enums(after), new_tables)
+
+    # FKs e índices da tabela removida somem com ela; as FKs de outras tabelas que apontavam
+    # para ela aparecem no diff dessas tabelas (DropForeignKey vem antes do DropTable)
+    for name in old_tables:
+        if name not in new_tables:
+            migration.add('DropTable', f'DROP TABLE {quote(name)};')
+            migration.warnings.append(f'A tabela `{name}` será removida. '
+                                      f'Se não estiver vazia, todos os dados serão perdidos.')
+    for name, new in new_tables.items():
+        old = old_tables.get(name)
+        if old is None:
+            migration.add('CreateTable', new.create())
+            if new.partition_by:
+                migration.add('CreatePartitions', new.create_partitions())
+            for index in new.indexes.values():
+                migration.add('CreateIndex', index.create())
+            for foreign_key in new.foreign_keys.values():
+                migration.add('AddForeignKey', foreign_key.add())
+            continue
+        if old.partition_by != new.partition_by:
+            _rebuild_table(migration, old, new)
+            continue
+        _alter_table(migration, old, new)
+        _diff_indexes(migration, old, new)
+        _diff_foreign_keys(migration, old, new)
+    return migration
+
+
+# ============================================
+# Schema de uma revisão do git
+# ============================================
+def schema_at_revision(revision='HEAD', schema_dir=SCHEMA_DIR):
+    """Schema parseado a partir dos *.prisma de `revision` (sem tocar no diretório de trabalho)"""
+    schema_dir = Path(schema_dir).resolve()
+
+    def git(*args, cwd=schema_dir):
+        return subprocess.run(['git', '-C', str(cwd), *args], check=True, capture_output=True).stdout
+
+    root = Path(git('rev-parse', '--show-toplevel').decode().strip())
+    git = partial(git, cwd=root)  # ls-tree filtra pelo diretório atual: roda da raiz
+    prefix = schema_dir.relative_to(root).as_posix()
+    names = [line for line in git('ls-tree', '--name-only', f'{revision}:{prefix}').decode().splitlines()
+             if line.endswith('.prisma')]
+    files = []
+    for name in sorted(names):
+        data = git('show', f'{revision}:{prefix}/{name}')
+        files.append(parse_file(name, data.decode('utf-8')))
+    return Schema(schema_dir, files)
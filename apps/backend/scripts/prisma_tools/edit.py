@@ -0,0 +1,188 @@
+"""
+Edição estrutural dos arquivos .prisma
+
+As ferramentas geradoras não fazem replace no texto: editam blocos
+localizados pelo parser (Schema.locate) e, ao final, cada arquivo é
+remontado uma única vez e gravado somente se o conteúdo mudou.
+
+    editor = SchemaEditor(schema)
+    block = editor.block('Allergy')                # linhas do modelo, editáveis
+    block.insert(block.field_index('createdAt'), ['  versionNumber Int @default(1)'])
+    editor.append_after('Allergy', history_lines)  # novo bloco logo após o modelo
+    written = editor.save()                        # só grava os arquivos que mudaram
+
+Linhas inseridas são realinhadas com o grupo de campos onde caem, no mesmo
+formato do `prisma format` (nome e tipo em colunas; atributos alinhados só
+quando presentes).
+"""
+
+import difflib
+import os
+import re
+
+from .schema import _FIELD_RE, split_comment
+
+INDENT = '  '
+
+
+def _field_parts(line):
+    """(nome, tipo, atributos, comentário) de uma linha de campo; None se não for campo"""
+    code, comment = split_comment(line.strip())
+    if not code or code.startswith('@@') or code.endswith(('{', '}')):
+        return None
+    match = _FIELD_RE.match(code)
+    if not match:
+        return None
+    name, type_, is_list, optional, rest = match.groups()
+    return name, type_ + (is_list or '') + (optional or ''), (rest or '').strip(), comment
+
+
+def format_field_group(lines):
+    """Alinha um grupo contíguo de linhas de campo como o `prisma format`"""
+    parts = [_field_parts(line) for line in lines]
+    name_width = max(len(p[0]) for p in parts)
+    type_width = max(len(p[1]) for p in parts)
+    formatted = []
+    for name, type_, attributes, comment in parts:
+        line = f'{INDENT}{name.ljust(name_width)} '
+        line += f'{type_.ljust(type_width)} {attributes}' if attributes else type_
+        if comment is not None:
+            line += f' // {comment}'
+        formatted.append(line.rstrip())
+    return formatted
+
+
+class BlockEditor:
+    """Linhas de um bloco (model/enum) com as inserções pendentes marcadas"""
+
+    def __init__(self, lines):
+        self.entries = [[line, False] for line in lines]
+
+    @property
+    def lines(self):
+        return [text for text, _ in self.entries]
+
+    @property
+    def changed(self):
+        return any(touched for _, touched in self.entries)
+
+    def field_index(self, name):
+        for i, (text, _) in enumerate(self.entries):
+            parts = _field_parts(text)
+            if parts and parts[0] == name:
+                return i
+        return None
+
+    def field_indexes(self, predicate=None):
+        """Índices das linhas de campo (opcionalmente filtradas por predicate(nome, tipo, atributos))"""
+        indexes = []
+        for i, (text, _) in enumerate(self.entries):
+            parts = _field_parts(text)
+            if parts and (predicate is None or predicate(*parts[:3])):
+                indexes.append(i)
+        return indexes
+
+    def attribute_indexes(self, name):
+        """Índices das linhas @@name(...) (ex: 'index', 'map')"""
+        pattern = re.compile(rf'^\s*@@{re.escape(name)}\b')
+        return [i for i, (text, _) in enumerate(self.entries) if pattern.match(text)]
+
+    @property
+    def closing_index(self):
+        return len(self.entries) - 1
+
+    def insert(self, index, lines):
+        self.entries[index:index] = [[line, True] for line in lines]
+
+    def replace(self, index, line):
+        self.entries[index] = [line, True]
+
+    def render(self):
+        """Linhas finais, com os grupos de campos que receberam inserções realinhados"""
+        lines = self.lines
+        output, group, group_touched = [], [], False
+
+        def flush():
+            nonlocal group, group_touched
+            output.extend(format_field_group(group) if group_touched else group)
+            group, group_touched = [], False
+
+        for text, touched in self.entries:
+            if _field_parts(text):
+                group.append(text)
+                group_touched = group_touched or touched
+            else:
+                flush()
+                output.append(text)
+        flush()
+        assert len(output) == len(lines)
+        return output
+
+
+class SchemaEditor:
+    """Acumula edições em vários blocos/arquivos e grava cada arquivo uma vez"""
+
+    def __init__(self, schema):
+        self.schema = schema
+        self._sources = {}   # arquivo -> linhas originais
+        self._blocks = {}    # nome do bloco -> BlockEditor
+        self._appended = {}  # nome do bloco -> [linhas de novos blocos]
+
+    def _lines(self, file):
+        if file not in self._sources:
+            with open(self.schema.directory / file, 'r', encoding='utf-8') as f:
+                self._sources[file] = f.read().split('\n')
+        return self._sources[file]
+
+    def block(self, name):
+        if name not in self._blocks:
+            location = self.schema.locate(name)
+            lines = self._lines(location.file)
+            self._blocks[name] = BlockEditor(lines[location.line - 1:location.end_line])
+        return self._blocks[name]
+
+    def append_after(self, name, lines):
+        """Novo bloco inserido após o bloco `name` (separado por uma linha em branco)"""
+        self.schema.locate(name)  # Valida o nome
+        self._appended.setdefault(name, []).extend([''] + list(lines))
+
+    def render(self):
+        """{arquivo: (texto original, texto novo)} dos arquivos com edições"""
+        per_file = {}
+        for name in set(self._blocks) | set(self._appended):
+            location = self.schema.locate(name)
+            per_file.setdefault(location.file, []).append((location, name))
+
+        results = {}
+        for file, targets in per_file.items():
+            lines = list(self._lines(file))
+            for location, name in sorted(targets, key=lambda t: t[0].line, reverse=True):
+                block = self._blocks.get(name)
+                new_lines = block.render() if block else lines[location.line - 1:location.end_line]
+                new_lines = new_lines + self._appended.get(name, [])
+                lines[location.line - 1:location.end_line] = new_lines
+            results[file] = ('\n'.join(self._sources[file]), '\n'.join(lines))
+        return results
+
+    def diff(self):
+        """Diff unificado de todas as alterações pendentes"""
+        chunks = []
+        for file, (before, after) in sorted(self.render().items()):
+            if before != after:
+                chunks.extend(difflib.unified_diff(before.splitlines(keepends=True), after.splitlines(keepends=True),
+                                                   fromfile=f'a/{file}', tofile=f'b/{file}'))
+        return ''.join(chunks)
+
+    def save(self):
+        """Grava (atomicamente) só os arquivos cujo conteúdo mudou; retorna os nomes gravados"""
+        written = []
+        for file, (before, after) in sorted(self.render().items()):
+            if before == after:
+                continue
+            path = self.schema.directory / file
+            staging = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+            with open(staging, 'w', encoding='utf-8') as f:
+                f.write(after)
+            os.replace(staging, path)
+            written.append(file)
+        return written
@@ -0,0 +1,253 @@
+"""
+Exportação paralela de um tenant para CSV comprimido em partes (formato de backup.py)
+
+    from prisma_tools.export import TenantExport
+
+    export = TenantExport(url, 'tenant_casa_sao_rafael_abc123', 'backups/casa_sao_rafael', compression='zstd')
+    manifest = export.prepare(jobs=8)   # descobre tabelas e divide em partes (ou retoma o manifest)
+    export.run(jobs=8)                  # COPY ... TO STDOUT de cada parte, comprimindo em streaming
+    export.close()
+
+Exporta todas as tabelas do schema do tenant e, de public, a linha do
+tenant em tenants e as linhas com "tenantId" do tenant nas demais tabelas.
+Cada tabela é dividida pela chave primária em intervalos de ~chunk_bytes
+(tamanho médio da linha pelo pg_class); cada intervalo vira um arquivo
+independente, então uma tabela grande é exportada por vários workers ao
+mesmo tempo. O COPY vai direto para o compressor e dele para o disco, sem
+CSV intermediário.
+
+Todas as conexões usam o mesmo snapshot (pg_export_snapshot, como o
+pg_dump -j), então o backup é um retrato do mesmo instante. O manifest é
+gravado a cada parte concluída; rodar de novo no mesmo diretório retoma das
+partes que faltam, com os mesmos intervalos de chave, mas num snapshot novo
+(o manifest fica com consistent=false).
+
+Requer psycopg 3 (pip install "psycopg[binary]").
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from .backup import MANIFEST_VERSION, Chunk, HashingWriter, Manifest, TableEntry, chunk_file, compressed_writer
+from .ddl import quote, sql_literal
+from .restore import connect, run_in_order
+
+DEFAULT_CHUNK_BYTES = 256 << 20  # CSV (descomprimido) por parte, estimado pelo tamanho médio da linha
+DEFAULT_CHUNK_ROWS = 500_000  # Sem estatísticas (tabela nunca analisada)
+SKIPPED_TABLES = ('_prisma_migrations',)
+
+
+@dataclass
+class ChunkResult:
+    file: str
+    table: str
+    rows: int
+    raw_bytes: int  # CSV descomprimido
+    bytes: int  # Arquivo comprimido
+    seconds: float
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+class TenantExport:
+    """Exporta um schema de tenant (e suas linhas em public) para um diretório de backup"""
+
+    def __init__(self, database_url, schema, directory, compression='gzip', level=None,
+                 chunk_bytes=DEFAULT_CHUNK_BYTES):
+        self.database_url = database_url
+        self.schema = schema
+        self.directory = Path(directory)
+        self.compression = compression
+        self.level = level
+        self.chunk_bytes = chunk_bytes
+        self.manifest: Optional[Manifest] = None
+        self.resumed = False
+        self.tenant_id = None
+        self._snapshot = None
+        self._owner = None  # Conexão que exportou o snapshot: fica aberta até close()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._connections = []
+
+    # -- conexões -----------------------------------------------------------
+    def _connection(self):
+        """Uma conexão por thread, numa transação somente leitura no snapshot exportado"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = connect(self.database_url)
+            conn.execute('BEGIN ISOLATION LEVEL REPEATABLE READ READ ONLY')
+            conn.execute(f'SET TRANSACTION SNAPSHOT {sql_literal(self._snapshot)}')
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _begin(self):
+        self._owner = connect(self.database_url)
+        self._owner.execute('BEGIN ISOLATION LEVEL REPEATABLE READ READ ONLY')
+        self._snapshot = self._owner.execute('SELECT pg_export_snapshot()').fetchone()[0]
+
+    def close(self):
+        for conn in self._connections + ([self._owner] if self._owner else []):
+            conn.close()
+        self._connections, self._owner = [], None
+        self._local = threading.local()
+
+    def _rows(self, sql, params=None):
+        return self._connection().execute(sql, params).fetchall()
+
+    # -- descoberta e divisão -----------------------------------------------
+    def _tables(self):
+        """[(origem, schema, tabela, colunas, chave, tipos da chave, filtro SQL)] a exportar"""
+        found = self._rows('SELECT id::text FROM public.tenants WHERE "schemaName" = %s', (self.schema,))
+        self.tenant_id = found[0][0] if found else None
+        rows = self._rows(
+            'SELECT n.nspname, c.relname, '
+            '  array_agg(a.attname::text ORDER BY a.attnum), '
+            '  array_agg(a.attname::text ORDER BY array_position(i.indkey::int2[], a.attnum)) '
+            '    FILTER (WHERE a.attnum = ANY(i.indkey)), '
+            '  array_agg(format_type(a.atttypid, a.atttypmod) ORDER BY array_position(i.indkey::int2[], a.attnum)) '
+            '    FILTER (WHERE a.attnum = ANY(i.indkey)) '
+            'FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace '
+            'JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped AND a.attgenerated = %s '
+            'LEFT JOIN pg_index i ON i.indrelid = c.oid AND i.indisprimary '
+            'WHERE c.relkind IN (%s, %s) AND NOT c.relispartition AND n.nspname IN (%s, %s) '
+            'AND NOT (c.relname = ANY(%s)) GROUP BY 1, 2 ORDER BY 1, 2',
+            ('', 'r', 'p', self.schema, 'public', list(SKIPPED_TABLES)))
+        tables = []
+        for schema, table, columns, key, key_types in rows:
+            if schema == self.schema:
+                tables.append(('tenant', schema, table, columns, key or [], key_types or [], None))
+            elif self.tenant_id is None:
+                continue
+            elif table == 'tenants':
+                tables.append(('public', schema, table, columns, key or [], key_types or [],
+                               f'"id" = {sql_literal(self.tenant_id)}'))
+            elif 'tenantId' in columns:
+                tables.append(('public', schema, table, columns, key or [], key_types or [],
+                               f'"tenantId" = {sql_literal(self.tenant_id)}'))
+        return tables
+
+    def _chunk_rows(self, schema, table):
+        """Linhas por parte para ~chunk_bytes, pelo tamanho médio da linha (soma das partições)"""
+        size, tuples = self._rows(
+            'SELECT coalesce(sum(pg_relation_size(t.relid)), 0), coalesce(sum(greatest(c.reltuples, 0)), 0) '
+            'FROM pg_partition_tree(%s::regclass) t JOIN pg_class c ON c.oid = t.relid',
+            (f'{quote(schema)}.{quote(table)}',))[0]
+        if not tuples:
+            return DEFAULT_CHUNK_ROWS
+        return max(1000, int(self.chunk_bytes / max(1.0, float(size) / float(tuples))))
+
+    def _plan(self, item):
+        """TableEntry com as partes da tabela: limites de chave a cada chunk_rows linhas"""
+        source, schema, table, columns, key, key_types, where = item
+        entry = TableEntry(source, table, columns, key, key_types)
+        boundaries = []
+        if key:
+            keys = ', '.join(quote(column) for column in key)
+            texts = ', '.join(f'{quote(column)}::text' for column in key)
+            every = self._chunk_rows(schema, table)
+            boundaries = [list(row) for row in self._rows(
+                f'SELECT {texts} FROM (SELECT {keys}, row_number() OVER (ORDER BY {keys}) AS n '
+                f'FROM {quote(schema)}.{quote(table)}{f" WHERE {where}" if where else ""}) s '
+                f'WHERE n %% %s = 0 ORDER BY n', (every,))]
+        for index, (lower, upper) in enumerate(zip([None] + boundaries, boundaries + [None]), start=1):
+            entry.chunks.append(Chunk(chunk_file(source, table, index, self.compression), lower, upper))
+        return entry
+
+    def prepare(self, jobs=4):
+        """Retoma o manifest do diretório ou descobre as tabelas e grava um novo; retorna o manifest"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._begin()
+        self.manifest = Manifest.load(self.directory)
+        if self.manifest is not None:
+            if self.manifest.schema != self.schema:
+                raise ValueError(f'{self.directory} tem o backup de {self.manifest.schema}, não de {self.schema}')
+            self.compression = self.manifest.compression
+            self.resumed = True
+            if not self.manifest.done:
+                self.manifest.consistent = False
+                self.manifest.finished_at = None
+            return self.manifest
+
+        items = self._tables()
+        results = run_in_order(list(range(len(items))), {}, jobs, lambda position: self._plan(items[position]))
+        for position, (_, error) in sorted(results.items()):
+            if error:
+                raise error
+        self.manifest = Manifest(MANIFEST_VERSION, self.schema, self.tenant_id, self.compression, _now(),
+                                 tables=[results[position][0] for position in range(len(items))])
+        self.manifest.save(self.directory)
+        return self.manifest
+
+    # -- exportação -----------------------------------------------------------
+    def _query(self, entry, chunk):
+        schema = self.schema if entry.source == 'tenant' else 'public'
+        conditions = []
+        if entry.source == 'public':
+            column = 'id' if entry.table == 'tenants' else 'tenantId'
+            conditions.append(f'{quote(column)} = {sql_literal(self.manifest.tenant_id)}')
+        keys = ', '.join(map(quote, entry.key))
+
+        def bound(values):
+            return ', '.join(f'CAST({sql_literal(value)} AS {type_})' for value, type_ in zip(values, entry.key_types))
+
+        if chunk.lower is not None:
+            conditions.append(f'({keys}) > ({bound(chunk.lower)})')
+        if chunk.upper is not None:
+            conditions.append(f'({keys}) <= ({bound(chunk.upper)})')
+        where = f' WHERE {" AND ".join(conditions)}' if conditions else ''
+        return (f'COPY (SELECT {", ".join(map(quote, entry.columns))} FROM {quote(schema)}.{quote(entry.table)}'
+                f'{where}) TO STDOUT WITH (FORMAT csv, HEADER true)')
+
+    def _export(self, entry, chunk):
+        started = time.perf_counter()
+        path = self.directory / chunk.file
+        staging = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+        raw_bytes = 0
+        try:
+            with open(staging, 'wb') as raw:
+                written = HashingWriter(raw)
+                with compressed_writer(written, self.compression, self.level) as out, \
+                        self._connection().cursor() as cursor:
+                    with cursor.copy(self._query(entry, chunk)) as copy:
+                        for block in copy:
+                            out.write(block)
+                            raw_bytes += len(block)
+                    rows = cursor.rowcount
+                raw.flush()
+                os.fsync(raw.fileno())
+            os.replace(staging, path)
+        except BaseException:
+            staging.unlink(missing_ok=True)
+            raise
+        with self._lock:
+            chunk.rows, chunk.bytes, chunk.sha256 = rows, written.size, written.sha256.hexdigest()
+            self.manifest.save(self.directory)
+        return ChunkResult(chunk.file, entry.table, rows, raw_bytes, written.size, time.perf_counter() - started)
+
+    def run(self, jobs=4, on_done=None):
+        """Exporta as partes que faltam; {arquivo: (ChunkResult, exceção)}"""
+        pending = {chunk.file: (entry, chunk) for entry in self.manifest.tables for chunk in entry.chunks
+                   if not chunk.done}
+        # Tabelas com mais partes primeiro: as grandes não ficam sozinhas no fim
+        parts = {entry.table: len(entry.chunks) for entry in self.manifest.tables}
+
+        def work(name):
+            result = self._export(*pending[name])
+            if on_done:
+                on_done(result)
+            return result
+
+        results = run_in_order(list(pending), {}, jobs, work, priority=lambda name: -parts[pending[name][0].table])
+        if self.manifest.done:
+            self.manifest.finished_at = _now()
+            self.manifest.save(self.directory)
+        return results
@@ -0,0 +1,231 @@
+"""
+Análise de índices do schema Prisma: redundantes, sobrepostos, pouco seletivos e FKs sem índice
+
+Cada índice extra é mais uma entrada escrita (e mais WAL) em todo INSERT, e
+impede HOT updates quando a coluna indexada muda. A análise é estática, só
+sobre o schema:
+
+- redundante: índice comum cujas colunas são prefixo (ou igual) de outro
+  índice/unique/PK do mesmo tipo e com a mesma ordenação (ou toda invertida,
+  que o btree percorre ao contrário)
+- sobreposto: mesmo prefixo de outro índice, mas com ordenação diferente;
+  só é removível se as colunas anteriores forem sempre filtradas por
+  igualdade (o btree percorre a última ao contrário), então não entra na
+  estimativa de ganho
+- pouco seletivo: índice comum de uma coluna Boolean ou enum com até
+  LOW_CARDINALITY_MAX valores (ex: @@index([changeType]) nos XHistory)
+- FK sem índice: relação dona de chave estrangeira sem índice que comece
+  pelas colunas da FK (ON DELETE CASCADE e joins viram seq scan)
+
+O custo de escrita por tabela é estimado com larguras típicas do PostgreSQL
+(cabeçalho de tupla + colunas alinhadas a 8 bytes); serve para comparar
+tabelas e o ganho de remover índices, não como medida exata.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+LOW_CARDINALITY_MAX = 8
+
+# Larguras aproximadas (bytes) por tipo nativo / escalar; varlena com tamanho médio estimado
+NATIVE_WIDTHS = {'Uuid': 16, 'Date': 4, 'Time': 8, 'Timestamptz': 8, 'Timestamp': 8, 'Text': 64, 'JsonB': 128,
+                 'SmallInt': 2, 'Integer': 4, 'BigInt': 8, 'Real': 4, 'DoublePrecision': 8, 'Inet': 8}
+SCALAR_WIDTHS = {'String': 32, 'Boolean': 1, 'Int': 4, 'BigInt': 8, 'Float': 8, 'Decimal': 12,
+                 'DateTime': 8, 'Json': 128, 'Bytes': 64}
+ENUM_WIDTH = 4
+HEAP_TUPLE_OVERHEAD = 24 + 4   # Cabeçalho da tupla + line pointer
+INDEX_TUPLE_OVERHEAD = 8 + 4   # IndexTupleData + line pointer
+
+
+@dataclass
+class IndexFinding:
+    model: str
+    table: str
+    kind: str  # 'redundant' | 'overlap' | 'low-selectivity' | 'missing-fk-index'
+    columns: List[str]
+    message: str
+    location: Optional[str] = None  # arquivo:linha do índice (ou do campo de relação, para FK sem índice)
+    covered_by: Optional[str] = None
+    row_bytes: int = 0  # Bytes escritos por INSERT neste índice (estimativa)
+
+
+@dataclass
+class TableCost:
+    """Escritas por INSERT: 1 tupla no heap + 1 entrada por índice"""
+
+    model: str
+    table: str
+    heap_bytes: int
+    index_bytes: List[int] = field(default_factory=list)
+    removable_bytes: int = 0
+    removable: int = 0
+    hot_blockers: List[str] = field(default_factory=list)  # Colunas @updatedAt indexadas
+
+    @property
+    def indexes(self):
+        return len(self.index_bytes)
+
+    @property
+    def amplification(self):
+        """(heap + índices) / heap"""
+        return (self.heap_bytes + sum(self.index_bytes)) / self.heap_bytes
+
+    @property
+    def amplification_after(self):
+        return (self.heap_bytes + sum(self.index_bytes) - self.removable_bytes) / self.heap_bytes
+
+
+@dataclass
+class IndexReport:
+    findings: List[IndexFinding] = field(default_factory=list)
+    costs: List[TableCost] = field(default_factory=list)
+
+    def of(self, kind):
+        return [f for f in self.findings if f.kind == kind]
+
+
+def _align(size):
+    return (size + 7) // 8 * 8
+
+
+def column_width(schema, field_):
+    if field_ is None:
+        return 8
+    native = field_.db_type
+    if native:
+        base = native.split('(')[0]
+        if base in NATIVE_WIDTHS:
+            return NATIVE_WIDTHS[base]
+        if base in ('VarChar', 'Char') and '(' in native:
+            return min(int(native.split('(')[1].rstrip(')') or 32), 64)
+    if field_.type in schema.enums:
+        return ENUM_WIDTH
+    return SCALAR_WIDTHS.get(field_.type, 8)
+
+
+def index_row_bytes(schema, model, index):
+    data = sum(column_width(schema, model.field(column)) for column in index.columns)
+    return INDEX_TUPLE_OVERHEAD + _align(data)
+
+
+def heap_row_bytes(schema, model):
+    data = sum(column_width(schema, f) for f in model.fields.values()
+               if not f.list and not schema.is_relation(f))
+    return HEAP_TUPLE_OVERHEAD + _align(data)
+
+
+def _describe(index):
+    columns = ', '.join(f.name + (f'(sort: {f.sort})' if f.sort else '') for f in index.fields)
+    return f'@{index.kind}' if index.inline else f'@@{index.kind}([{columns}])'
+
+
+def _directions(index, length):
+    return [(f.sort or 'Asc') for f in index.fields[:length]]
+
+
+def _shares_prefix(longer, shorter):
+    """Mesmas colunas iniciais e mesmo tipo de índice (ignorando a ordenação)"""
+    if longer is shorter or (longer.type or 'BTree') != (shorter.type or 'BTree'):
+        return False
+    size = len(shorter.fields)
+    if len(longer.fields) < size or longer.columns[:size] != shorter.columns:
+        return False
+    # ops/length específicos: não dá para garantir
+    return not any(f.options for f in shorter.fields) and not any(f.options for f in longer.fields[:size])
+
+
+def _covers(longer, shorter):
+    """`longer` atende todas as buscas de `shorter` (prefixo, mesmo tipo e ordenação compatível)"""
+    if not _shares_prefix(longer, shorter):
+        return False
+    size = len(shorter.fields)
+    mine, theirs = _directions(shorter, size), _directions(longer, size)
+    return mine == theirs or all(a != b for a, b in zip(mine, theirs))
+
+
+def is_low_cardinality(schema, field_):
+    if field_ is None or field_.list:
+        return False
+    if field_.type == 'Boolean':
+        return True
+    enum = schema.enums.get(field_.type)
+    return enum is not None and len(enum.values) <= LOW_CARDINALITY_MAX
+
+
+def analyze_model(schema, model):
+    """([IndexFinding], TableCost) de um modelo"""
+    findings = []
+    cost = TableCost(model.name, model.table, heap_row_bytes(schema, model))
+    sized = [(index, index_row_bytes(schema, model, index)) for index in model.indexes]
+    cost.index_bytes = [size for _, size in sized]
+
+    removed = set()
+    for position, (index, size) in enumerate(sized):
+        if index.kind != 'index':
+            continue  # unique/PK são restrições, não só otimização
+        cover = None
+        for other_position, (other, _) in enumerate(sized):
+            if other_position in removed or not _covers(other, index):
+                continue
+            # Índices idênticos: mantém o primeiro declarado
+            if other.kind == 'index' and len(other.fields) == len(index.fields) and other_position > position:
+                continue
+            cover = other
+            break
+        if cover is not None:
+            reason = 'pela restrição' if cover.kind in ('unique', 'id') else 'pelo índice'
+            findings.append(IndexFinding(
+                model.name, model.table, 'redundant', index.columns,
+                f'{_describe(index)} é coberto {reason} {_describe(cover)}',
+                location=str(index.location), covered_by=str(cover.location), row_bytes=size))
+            removed.add(position)
+            continue
+        if len(index.fields) == 1 and is_low_cardinality(schema, model.field(index.columns[0])):
+            column = model.field(index.columns[0])
+            values = '2' if column.type == 'Boolean' else str(len(schema.enums[column.type].values))
+            findings.append(IndexFinding(
+                model.name, model.table, 'low-selectivity', index.columns,
+                f'{_describe(index)} em {column.type} ({values} valores): o planner raramente usa; '
+                f'prefira compor com tenantId ou um índice parcial',
+                location=str(index.location), row_bytes=size))
+            removed.add(position)
+            continue
+        overlap = next((other for other, _ in sized if _shares_prefix(other, index)), None)
+        if overlap is not None:
+            findings.append(IndexFinding(
+                model.name, model.table, 'overlap', index.columns,
+                f'{_describe(index)} repete o prefixo de {_describe(overlap)} com outra ordenação; '
+                f'redundante se as colunas anteriores forem sempre filtradas por igualdade',
+                location=str(index.location), covered_by=str(overlap.location), row_bytes=size))
+
+    for relation in schema.relations_of(model.name):
+        if not relation.owns_foreign_key:
+            continue
+        wanted = set(relation.fields)
+        if any(set(index.columns[:len(wanted)]) == wanted for index in model.indexes):
+            continue
+        findings.append(IndexFinding(
+            model.name, model.table, 'missing-fk-index', list(relation.fields),
+            f'FK {relation.field} ({", ".join(relation.fields)} → {relation.target}) sem índice'
+            + (f' (onDelete: {relation.on_delete})' if relation.on_delete else ''),
+            location=str(model.field(relation.field).location)))
+
+    cost.removable = len(removed)
+    cost.removable_bytes = sum(sized[position][1] for position in removed)
+    cost.hot_blockers = sorted({column for index, _ in sized for column in index.columns
+                                if model.field(column) is not None and model.field(column).has('updatedAt')})
+    return findings, cost
+
+
+def analyze_indexes(schema, models=None):
+    """IndexReport do schema inteiro (ou só dos modelos/tabelas em `models`)"""
+    report = IndexReport()
+    for model in schema.models.values():
+        if model.kind != 'model':
+            continue
+        if models and model.name not in models and model.table not in models:
+            continue
+        findings, cost = analyze_model(schema, model)
+        report.findings.extend(findings)
+        report.costs.append(cost)
+    return report
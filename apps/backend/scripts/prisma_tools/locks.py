@@ -0,0 +1,351 @@
+"""
+Risco de lock e custo de reescrita dos comandos das migrações (PostgreSQL)
+
+    from prisma_tools.locks import RowCounts, analyze_migrations
+
+    reports = analyze_migrations(schema, RowCounts.load('rows.csv'))
+    for report in reports:
+        for finding in report.findings:
+            print(report.name, finding.line, finding.table, finding.lock, finding.blocking_seconds)
+
+Cada comando de migration.sql (inclusive os de blocos DO, com ou sem
+EXECUTE format(...)) é classificado pelo lock que o PostgreSQL pega na
+tabela e pelo trabalho feito enquanto o lock está preso:
+
+- none: só catálogo (ADD COLUMN nullable, DROP COLUMN, DEFAULT constante)
+- scan: varre a tabela para validar (SET NOT NULL, FK/CHECK sem NOT VALID)
+- index: constrói índice (CREATE INDEX, UNIQUE/PRIMARY KEY)
+- rewrite: reescreve a tabela e todos os índices (ALTER COLUMN TYPE,
+  ADD COLUMN com default volátil)
+- update: backfill que trava cada linha tocada até o commit (UPDATE/DELETE)
+
+Com a contagem de linhas por tabela (pg_stat_user_tables) estima o tempo
+bloqueado usando as vazões abaixo, que são ordens de grandeza para o nosso
+hardware (ajuste com --speed na CLI), e sugere o equivalente concorrente ou
+em lotes. As migrações rodam em cada schema de tenant: o bloqueio é estimado
+pelo maior schema e o tempo total pela soma deles.
+"""
+
+import csv
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .ddl import build_tables
+from .sql import (
+    MIGRATIONS_DIR,
+    block_statements,
+    list_migrations,
+    loops_over_tenants,
+    split_sql_list,
+    split_statements,
+    unquote_identifier,
+)
+
+LOCK_LEVELS = ('ACCESS SHARE', 'ROW SHARE', 'ROW EXCLUSIVE', 'SHARE UPDATE EXCLUSIVE', 'SHARE',
+               'SHARE ROW EXCLUSIVE', 'EXCLUSIVE', 'ACCESS EXCLUSIVE')
+WORKS = ('none', 'update', 'scan', 'index', 'rewrite')
+
+# Linhas por segundo (ordem de grandeza)
+SCAN_ROWS_PER_SECOND = 1_000_000
+INDEX_ROWS_PER_SECOND = 250_000
+REWRITE_ROWS_PER_SECOND = 100_000
+UPDATE_ROWS_PER_SECOND = 50_000
+REWRITE_INDEX_FACTOR = 0.5  # Cada índice da tabela é reconstruído na reescrita
+
+_IDENT = r'(?:"(?:[^"]|"")*"|[%\w$]+)(?:\s*\.\s*(?:"(?:[^"]|"")*"|[%\w$]+))*'
+_CREATE_INDEX_RE = re.compile(rf'^CREATE\s+(UNIQUE\s+)?INDEX\s+(CONCURRENTLY\s+)?(?:IF\s+NOT\s+EXISTS\s+)?'
+                              rf'(?:{_IDENT}\s+)?ON\s+(?:ONLY\s+)?({_IDENT})', re.I | re.S)
+_DROP_INDEX_RE = re.compile(rf'^DROP\s+INDEX\s+(CONCURRENTLY\s+)?(?:IF\s+EXISTS\s+)?({_IDENT})', re.I | re.S)
+_ALTER_TABLE_RE = re.compile(rf'^ALTER\s+TABLE\s+(?:IF\s+EXISTS\s+)?(?:ONLY\s+)?({_IDENT})\s+(.*)$', re.I | re.S)
+_CREATE_TABLE_RE = re.compile(rf'^CREATE\s+(?:UNLOGGED\s+)?TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?({_IDENT})', re.I | re.S)
+_DROP_TABLE_RE = re.compile(rf'^DROP\s+TABLE\s+(?:IF\s+EXISTS\s+)?({_IDENT})', re.I | re.S)
+_UPDATE_RE = re.compile(rf'^UPDATE\s+(?:ONLY\s+)?({_IDENT})', re.I | re.S)
+_DELETE_RE = re.compile(rf'^DELETE\s+FROM\s+(?:ONLY\s+)?({_IDENT})', re.I | re.S)
+_TRUNCATE_RE = re.compile(rf'^TRUNCATE\s+(?:TABLE\s+)?(?:ONLY\s+)?({_IDENT})', re.I | re.S)
+_TRIGGER_RE = re.compile(rf'^CREATE\s+(?:OR\s+REPLACE\s+)?TRIGGER\s+.*?\bON\s+({_IDENT})', re.I | re.S)
+_DO_RE = re.compile(r'^DO\s+(\$\w*\$)(.*)\1', re.I | re.S)
+_VOLATILE_RE = re.compile(r'\b(gen_random_uuid|uuid_generate_v\d\w*|random|clock_timestamp|timeofday|nextval)\s*\(',
+                          re.I)
+_SERIAL_RE = re.compile(r'\b(SMALL|BIG)?SERIAL\b', re.I)
+_TEXT_TYPES_RE = re.compile(r'^(TEXT|VARCHAR|CHARACTER\s+VARYING|CITEXT)\b', re.I)
+
+
+@dataclass
+class Operation:
+    table: str
+    action: str
+    lock: str
+    work: str = 'none'
+    suggestion: Optional[str] = None
+    fails_if_rows: bool = False  # Ex: ADD COLUMN NOT NULL sem default
+
+
+def _lock_rank(lock):
+    return LOCK_LEVELS.index(lock)
+
+
+def blocks_writes(lock):
+    return _lock_rank(lock) >= _lock_rank('SHARE')
+
+
+def blocks_reads(lock):
+    return lock == 'ACCESS EXCLUSIVE'
+
+
+# ============================================
+# Classificação
+# ============================================
+def _clause_operation(table, clause):
+    upper = ' '.join(clause.upper().split())
+    if upper.startswith('ADD COLUMN') or (upper.startswith('ADD ') and not upper.startswith('ADD CONSTRAINT')
+                                          and not upper.startswith(('ADD PRIMARY', 'ADD UNIQUE', 'ADD FOREIGN',
+                                                                    'ADD CHECK'))):
+        not_null = 'NOT NULL' in upper
+        has_default = ' DEFAULT ' in f' {upper} '
+        if _SERIAL_RE.search(clause) or (has_default and _VOLATILE_RE.search(clause)):
+            return Operation(table, 'ADD COLUMN com default volátil', 'ACCESS EXCLUSIVE', 'rewrite',
+                             'adicione a coluna sem default, preencha em lotes e só então SET DEFAULT')
+        if not_null and not has_default:
+            return Operation(table, 'ADD COLUMN NOT NULL sem default', 'ACCESS EXCLUSIVE', 'none',
+                             'adicione nullable, preencha em lotes e torne NOT NULL via CHECK NOT VALID',
+                             fails_if_rows=True)
+        return Operation(table, 'ADD COLUMN', 'ACCESS EXCLUSIVE')
+    if upper.startswith('DROP COLUMN'):
+        return Operation(table, 'DROP COLUMN', 'ACCESS EXCLUSIVE')
+    match = re.match(r'^ALTER\s+(?:COLUMN\s+)?\S+\s+(?:SET\s+DATA\s+)?TYPE\s+(.*)$', clause.strip(), re.I | re.S)
+    if match:
+        new_type = match.group(1)
+        if _TEXT_TYPES_RE.match(new_type) and 'USING' not in upper:
+            return Operation(table, 'ALTER COLUMN TYPE (texto)', 'ACCESS EXCLUSIVE', 'scan',
+                             'varchar maior ou text não reescreve; reduzir o tamanho varre a tabela inteira')
+        return Operation(table, 'ALTER COLUMN TYPE', 'ACCESS EXCLUSIVE', 'rewrite',
+                         'nova coluna + backfill em lotes + troca de nomes (ou janela de manutenção)')
+    if re.match(r'^ALTER\s+(?:COLUMN\s+)?\S+\s+SET\s+NOT\s+NULL', upper):
+        return Operation(table, 'SET NOT NULL', 'ACCESS EXCLUSIVE', 'scan',
+                         'ADD CONSTRAINT ... CHECK (col IS NOT NULL) NOT VALID; VALIDATE CONSTRAINT; '
+                         'depois SET NOT NULL (PG12+ aproveita o CHECK e não varre) e DROP CONSTRAINT')
+    if re.match(r'^ALTER\s+(?:COLUMN\s+)?\S+\s+(?:DROP\s+NOT\s+NULL|SET\s+DEFAULT|DROP\s+DEFAULT|SET\s+STATISTICS)',
+                upper):
+        return Operation(table, 'ALTER COLUMN', 'ACCESS EXCLUSIVE')
+    if upper.startswith('ADD') and ('FOREIGN KEY' in upper or ' REFERENCES ' in upper):
+        if 'NOT VALID' in upper:
+            return Operation(table, 'ADD FOREIGN KEY NOT VALID', 'SHARE ROW EXCLUSIVE')
+        return Operation(table, 'ADD FOREIGN KEY', 'SHARE ROW EXCLUSIVE', 'scan',
+                         'ADD CONSTRAINT ... NOT VALID e depois VALIDATE CONSTRAINT (não bloqueia escritas)')
+    if upper.startswith('ADD') and ' CHECK' in f' {upper}':
+        if 'NOT VALID' in upper:
+            return Operation(table, 'ADD CHECK NOT VALID', 'ACCESS EXCLUSIVE')
+        return Operation(table, 'ADD CHECK', 'ACCESS EXCLUSIVE', 'scan',
+                         'ADD CONSTRAINT ... NOT VALID e depois VALIDATE CONSTRAINT')
+    if upper.startswith('ADD') and ('UNIQUE' in upper or 'PRIMARY KEY' in upper):
+        if 'USING INDEX' in upper:
+            return Operation(table, 'ADD CONSTRAINT USING INDEX', 'ACCESS EXCLUSIVE')
+        return Operation(table, 'ADD UNIQUE/PRIMARY KEY', 'ACCESS EXCLUSIVE', 'index',
+                         'CREATE UNIQUE INDEX CONCURRENTLY e depois ADD CONSTRAINT ... USING INDEX')
+    if upper.startswith('VALIDATE CONSTRAINT'):
+        return Operation(table, 'VALIDATE CONSTRAINT', 'SHARE UPDATE EXCLUSIVE', 'scan')
+    if upper.startswith(('ENABLE', 'DISABLE')):
+        return Operation(table, clause.split()[0].upper() + ' TRIGGER', 'SHARE ROW EXCLUSIVE')
+    return Operation(table, ' '.join(clause.split()[:2]).upper(), 'ACCESS EXCLUSIVE')
+
+
+def classify(sql, tables=()):
+    """[Operation] de um comando SQL (blocos DO são analisados por dentro); `tables` ajuda a achar a tabela de um índice"""
+    sql = sql.strip()
+    match = _CREATE_INDEX_RE.match(sql)
+    if match:
+        table = unquote_identifier(match.group(3))
+        kind = 'CREATE UNIQUE INDEX' if match.group(1) else 'CREATE INDEX'
+        if match.group(2):
+            return [Operation(table, f'{kind} CONCURRENTLY', 'SHARE UPDATE EXCLUSIVE', 'index')]
+        return [Operation(table, kind, 'SHARE', 'index',
+                          f'{kind} CONCURRENTLY (em uma migração só com esse comando: não roda em transação)')]
+    match = _DROP_INDEX_RE.match(sql)
+    if match:
+        index = unquote_identifier(match.group(2))
+        owner = max((t for t in tables if index.startswith(t + '_')), key=len, default=f'(índice {index})')
+        if match.group(1):
+            return [Operation(owner, 'DROP INDEX CONCURRENTLY', 'SHARE UPDATE EXCLUSIVE')]
+        return [Operation(owner, 'DROP INDEX', 'ACCESS EXCLUSIVE', suggestion='DROP INDEX CONCURRENTLY')]
+    match = _ALTER_TABLE_RE.match(sql)
+    if match:
+        table, rest = unquote_identifier(match.group(1)), match.group(2)
+        if re.match(r'^RENAME\b', rest.strip(), re.I):
+            return [Operation(table, 'RENAME', 'ACCESS EXCLUSIVE')]
+        return [_clause_operation(table, clause) for clause in split_sql_list(rest) if clause.strip()]
+    match = _CREATE_TABLE_RE.match(sql)
+    if match:
+        return [Operation(unquote_identifier(match.group(1)), 'CREATE TABLE', 'ACCESS EXCLUSIVE')]
+    match = _DROP_TABLE_RE.match(sql)
+    if match:
+        return [Operation(unquote_identifier(match.group(1)), 'DROP TABLE', 'ACCESS EXCLUSIVE')]
+    for regex, action in ((_UPDATE_RE, 'UPDATE'), (_DELETE_RE, 'DELETE')):
+        match = regex.match(sql)
+        if match:
+            return [Operation(unquote_identifier(match.group(1)), action, 'ROW EXCLUSIVE', 'update',
+                              'backfill em lotes por chave primária (ex: 5 mil linhas por transação), fora da migração')]
+    match = _TRUNCATE_RE.match(sql)
+    if match:
+        return [Operation(unquote_identifier(match.group(1)), 'TRUNCATE', 'ACCESS EXCLUSIVE')]
+    match = _TRIGGER_RE.match(sql)
+    if match:
+        return [Operation(unquote_identifier(match.group(1)), 'CREATE TRIGGER', 'SHARE ROW EXCLUSIVE')]
+    match = _DO_RE.match(sql)
+    if match:
+        return _classify_block(match.group(2), tables)
+    return []
+
+
+def _classify_block(body, tables):
+    return [operation for statement in block_statements(body) for operation in classify(statement.sql, tables)]
+
+
+# ============================================
+# Contagem de linhas e estimativa
+# ============================================
+class RowCounts:
+    """Linhas por tabela; com vários schemas (um por tenant), guarda todas as contagens"""
+
+    def __init__(self, counts=None):
+        self.counts: Dict[str, List[int]] = counts or {}
+
+    @classmethod
+    def load(cls, path):
+        """
+        JSON {"tabela": linhas} / {"schema.tabela": linhas} ou CSV de
+        pg_stat_user_tables (schemaname, relname, n_live_tup; o schema é opcional)
+        """
+        path = Path(path)
+        counts = {}
+        if path.suffix == '.json':
+            with open(path, 'r', encoding='utf-8') as f:
+                items = json.load(f).items()
+        else:
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                rows = [row for row in csv.reader(f) if row]
+            if rows and not rows[0][-1].strip().isdigit():
+                rows = rows[1:]  # Cabeçalho
+            items = [('.'.join(row[:-1]), row[-1]) for row in rows]
+        for name, rows in items:
+            counts.setdefault(unquote_identifier(name), []).append(int(float(rows)))
+        return cls(counts)
+
+    def max(self, table):
+        return max(self.counts[table]) if table in self.counts else None
+
+    def total(self, table):
+        return sum(self.counts[table]) if table in self.counts else None
+
+    def schemas(self, table):
+        return len(self.counts.get(table, []))
+
+
+def seconds_for(work, rows, indexes=0, speed=1.0):
+    if rows is None:
+        return None
+    per_second = {
+        'none': None,
+        'scan': SCAN_ROWS_PER_SECOND,
+        'index': INDEX_ROWS_PER_SECOND,
+        'update': UPDATE_ROWS_PER_SECOND,
+        'rewrite': REWRITE_ROWS_PER_SECOND / (1 + REWRITE_INDEX_FACTOR * indexes),
+    }[work]
+    return 0.0 if per_second is None else rows / (per_second * speed)
+
+
+@dataclass
+class LockFinding:
+    migration: str
+    line: int
+    statement: str
+    table: str
+    actions: List[str]
+    lock: str
+    work: str
+    suggestions: List[str] = field(default_factory=list)
+    new_table: bool = False  # Criada na mesma migração (vazia)
+    per_tenant: bool = False  # Dentro de bloco DO que percorre os schemas tenant_*
+    fails_if_rows: bool = False
+    rows: Optional[int] = None  # Maior schema
+    schemas: int = 0
+    blocking_seconds: Optional[float] = None  # Tempo com leituras/escritas bloqueadas (maior schema)
+    total_seconds: Optional[float] = None  # Somando todos os schemas
+
+    @property
+    def severity(self):
+        if self.new_table:
+            return 'online'
+        if blocks_reads(self.lock):
+            return 'blocks-all'
+        if blocks_writes(self.lock) or self.work == 'update':
+            return 'blocks-writes'
+        return 'online'
+
+    @property
+    def risky(self):
+        """Merece atenção: bloqueia com trabalho proporcional à tabela ou falha com dados"""
+        return not self.new_table and (self.fails_if_rows or (self.severity != 'online' and self.work != 'none'))
+
+
+@dataclass
+class MigrationReport:
+    name: str
+    findings: List[LockFinding]
+    needs_lock_timeout: bool = False  # ACCESS EXCLUSIVE em tabela existente sem SET lock_timeout
+
+
+def _finding(migration, statement, table, operations, created, per_tenant, rows, indexes, speed):
+    lock = max((o.lock for o in operations), key=_lock_rank)
+    work = max((o.work for o in operations), key=WORKS.index)
+    finding = LockFinding(migration, statement.line, statement.head[:120], table, [o.action for o in operations],
+                          lock, work, list(dict.fromkeys(o.suggestion for o in operations if o.suggestion)),
+                          new_table=table in created, per_tenant=per_tenant,
+                          fails_if_rows=any(o.fails_if_rows for o in operations))
+    if finding.new_table:
+        finding.blocking_seconds = finding.total_seconds = 0.0
+        return finding
+    finding.rows, finding.schemas = rows.max(table), rows.schemas(table)
+    if finding.rows is not None:
+        index_works = sum(1 for o in operations if o.work == 'index')
+        cost = seconds_for(work, finding.rows, indexes.get(table, 0), speed)
+        if work == 'index':
+            cost *= index_works
+        finding.blocking_seconds = cost if finding.severity != 'online' else 0.0
+        finding.total_seconds = cost * rows.total(table) / finding.rows if finding.rows else cost
+    return finding
+
+
+def analyze_migration(name, text, tables, rows, indexes, speed=1.0):
+    created, findings = set(), []
+    for statement in split_statements(text):
+        operations = classify(statement.sql, tables)
+        per_tenant = bool(_DO_RE.match(statement.sql)) and loops_over_tenants(statement.sql)
+        by_table = {}
+        for operation in operations:
+            by_table.setdefault(operation.table, []).append(operation)
+        for table, table_operations in by_table.items():
+            if any(o.action == 'CREATE TABLE' for o in table_operations):
+                created.add(table)
+            findings.append(_finding(name, statement, table, table_operations, created, per_tenant, rows, indexes,
+                                     speed))
+    needs_timeout = 'lock_timeout' not in text and any(not f.new_table and blocks_reads(f.lock) for f in findings)
+    return MigrationReport(name, findings, needs_timeout)
+
+
+def analyze_migrations(schema, rows=None, migrations_dir=MIGRATIONS_DIR, names=None, since=None, speed=1.0):
+    """[MigrationReport] das migrações (todas, as de `names`/prefixos ou as posteriores a `since`)"""
+    rows = rows or RowCounts()
+    relational = build_tables(schema)
+    indexes = {name: len(t.indexes) + (1 if t.primary_key else 0) for name, t in relational.items()}
+    tables = set(relational) | set(rows.counts)
+    reports = []
+    for migration in list_migrations(migrations_dir):
+        if since and migration.name <= since:
+            continue
+        if names and not any(migration.name.startswith(n) or n in migration.name for n in names):
+            continue
+        reports.append(analyze_migration(migration.name, migration.sql, tables, rows, indexes, speed))
+    return reports
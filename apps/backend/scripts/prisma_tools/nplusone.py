@@ -0,0 +1,300 @@
+"""
+Detector estático de N+1: chamadas Prisma feitas a cada iteração
+
+Procura, em src/**/*.ts, chamadas `<cliente>.<modelo>.<operação>(...)` dentro de:
+
+- for / for...of / for await / while / do
+- callbacks de .map / .forEach / .flatMap / .reduce (o caso clássico
+  `Promise.all(items.map(async (item) => prisma.x.findFirst(...)))`)
+
+e também chamadas indiretas: `this.metodo(...)` dentro do loop, quando o
+método da mesma classe faz uma chamada Prisma (um nível só).
+
+Para cada chamada sugere o equivalente em lote a partir da operação e do
+where: `{ campo: { in: ids } }` + Map, `include` da relação (quando o where
+usa `item.<relação>Id`), `groupBy` para count/aggregate, createMany /
+updateMany / deleteMany para escritas.
+
+Loops sobre tenants (o corpo chama getTenantClient) são marcados à parte:
+cada iteração fala com outro schema, então `in:` não se aplica. Chamadas ao
+schema public (this.prisma, publicClient) dentro deles continuam agrupáveis.
+"""
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from .queries import SRC_DIR
+from .typescript import balanced, find_calls, line_of, object_entries, resolve_object, strip_comments
+
+SOURCE_GLOB = '**/*.ts'
+IGNORED_SUFFIXES = ('.spec.ts', '.e2e-spec.ts', '.d.ts')
+
+PRISMA_OPERATIONS = (
+    'findUnique', 'findUniqueOrThrow', 'findFirst', 'findFirstOrThrow', 'findMany', 'count', 'aggregate',
+    'groupBy', 'create', 'createMany', 'update', 'updateMany', 'upsert', 'delete', 'deleteMany',
+)
+LOOP_CALLBACKS = ('map', 'forEach', 'flatMap', 'reduce')
+
+_LOOP_RE = re.compile(r'\b(for|while)\s*(?:await\s*)?\(|\bdo\s*\{')
+_CALLBACK_RE = re.compile(r'\.(' + '|'.join(LOOP_CALLBACKS) + r')\s*\(')
+_METHOD_RE = re.compile(r'\n[ \t]*(?:(?:private|public|protected|static|async|readonly|override)\s+)*'
+                        r'([A-Za-z_$][\w$]*)\s*(?:<[^>()]*>)?\s*\(')
+_NOT_METHODS = {'if', 'for', 'while', 'switch', 'catch', 'function', 'return', 'await', 'constructor', 'super'}
+_THIS_CALL_RE = re.compile(r'\bthis\.([A-Za-z_$][\w$]*)\s*\(')
+_LOOP_VALUE_RE = re.compile(r'^([A-Za-z_$][\w$]*)\.([A-Za-z_$][\w$]*)$')
+_TENANT_CLIENT_RE = re.compile(r'\bgetTenantClient\s*\(')
+_RECEIVER_RE = re.compile(r'([\w$.]+)$')
+PUBLIC_CLIENTS = ('this.prisma', 'publicClient')  # Schema public: agrupável mesmo dentro de loop por tenant
+TENANT_LOOP_SUGGESTION = ('loop por tenant (um schema por iteração): limitar a concorrência '
+                          'e/ou mover para job/cache como o TenantStats')
+
+
+@dataclass
+class Loop:
+    kind: str  # 'for' | 'while' | 'do' | '.map' | '.forEach' ...
+    start: int
+    end: int
+    line: int
+
+
+@dataclass
+class NPlusOneFinding:
+    file: str
+    line: int
+    model: str
+    operation: str
+    loop: str
+    loop_line: int
+    suggestion: str
+    via: Optional[str] = None  # Método chamado no loop (chamada indireta)
+    per_tenant: bool = False   # Loop sobre tenants (getTenantClient): um schema por iteração, não dá para agrupar
+
+    @property
+    def location(self):
+        return f'{self.file}:{self.line}'
+
+
+def _statement_end(code, start):
+    """Fim do corpo sem chaves (`for (...) stmt;`)"""
+    i = start
+    while i < len(code) and code[i] != ';':
+        i = balanced(code, i) if code[i] in '([{' else i + 1
+    return i + 1
+
+
+def find_loops(code):
+    loops = []
+    for match in _LOOP_RE.finditer(code):
+        try:
+            if match.group(1):
+                body_start = balanced(code, match.end() - 1)
+                while body_start < len(code) and code[body_start].isspace():
+                    body_start += 1
+                if code.startswith('{', body_start):
+                    end = balanced(code, body_start)
+                elif match.group(1) == 'while' and code.startswith(';', body_start):
+                    continue  # while (...) de um do { } while
+                else:
+                    end = _statement_end(code, body_start)
+                kind = match.group(1)
+            else:
+                end = balanced(code, match.end() - 1)
+                kind = 'do'
+        except ValueError:
+            continue
+        loops.append(Loop(kind, match.start(), end, line_of(code, match.start())))
+    for match in _CALLBACK_RE.finditer(code):
+        try:
+            end = balanced(code, match.end() - 1)
+        except ValueError:
+            continue
+        body = code[match.end():end]
+        if '=>' in body or 'function' in body:
+            loops.append(Loop(f'.{match.group(1)}', match.start(), end, line_of(code, match.start())))
+    return loops
+
+
+def find_methods(code):
+    """{nome: (início do corpo, fim do corpo)} dos métodos de classe do arquivo"""
+    methods = {}
+    for match in _METHOD_RE.finditer(code):
+        name = match.group(1)
+        if name in _NOT_METHODS:
+            continue
+        try:
+            i = balanced(code, match.end() - 1)
+        except ValueError:
+            continue
+        angle = 0
+        while i < len(code):
+            char = code[i]
+            if char == '<':
+                angle += 1
+            elif char == '>' and code[i - 1] != '=':
+                angle -= 1
+            elif char in ';=' and angle == 0:
+                i = -1  # Chamada ou atribuição, não declaração
+                break
+            elif char == '{' and angle == 0:
+                break
+            i += 1
+        if i < 0 or i >= len(code):
+            continue
+        try:
+            methods.setdefault(name, (i, balanced(code, i)))
+        except ValueError:
+            continue
+    return methods
+
+
+_OPERATORS = {'equals', 'in', 'gt', 'gte', 'lt', 'lte', 'not'}
+_LITERALS = ('null', 'true', 'false', 'undefined')
+
+
+def _is_literal(value):
+    value = value.strip()
+    return value in _LITERALS or value[:1] in '\'"`[' or value[:1].isdigit()
+
+
+def _loop_variable_key(where_entries, prefix=''):
+    """(campo, valor, 'eq' | 'range') do primeiro filtro que não é literal (o que varia
+    por iteração); filtros de relação viram 'relacao.campo'"""
+    for key, value in where_entries or []:
+        if key in ('AND', 'OR', 'NOT', '...'):
+            continue
+        value = value.strip()
+        nested = object_entries(value)
+        if nested is None:
+            if not _is_literal(value):
+                return prefix + key, value, 'eq'
+            continue
+        operators = [(op, operand) for op, operand in nested if op in _OPERATORS and not _is_literal(operand)]
+        if operators:
+            op, operand = operators[0]
+            return prefix + key, operand, 'eq' if op in ('equals', 'in') else 'range'
+        found = _loop_variable_key(nested, f'{prefix}{key}.')
+        if found:
+            return found
+    return None
+
+
+def _in_filter(column):
+    """'room.floorId' -> 'room: { floorId: { in: [...] } }'"""
+    path = column.split('.')
+    text = f'{path[-1]}: {{ in: [...] }}'
+    for part in reversed(path[:-1]):
+        text = f'{part}: {{ {text} }}'
+    return text
+
+
+def suggest_batch(schema, model_name, operation, argument, code=None, position=None):
+    """Sugestão do equivalente em lote para uma chamada feita por iteração
+
+    Com `code`/`position`, um where passado como variável local é resolvido no arquivo.
+    """
+    entries = object_entries(argument) or []
+    where = next((value for key, value in entries if key == 'where'), None)
+    if where and where.isidentifier() and code is not None:
+        resolved = resolve_object(code, where, position)
+        where = resolved[0] if resolved else None
+    key = _loop_variable_key(object_entries(where) if where else None)
+    column, value, kind = key if key else ('<campo>', '', 'eq')
+    accessor = model_name[0].lower() + model_name[1:]
+
+    if kind == 'range' and operation in ('count', 'aggregate', 'groupBy', 'findMany'):
+        return (f"um {accessor}.findMany com o intervalo total de {column} (menor..maior valor do loop) "
+                f"e agregação em memória por período")
+    if '.' in column and operation in ('count', 'aggregate', 'groupBy'):
+        return (f"{accessor}.findMany({{ where: {{ {_in_filter(column)} }} }}) "
+                f"uma vez e contar por {column} em memória (ou _count na query pai)")
+    if operation in ('findUnique', 'findUniqueOrThrow', 'findFirst', 'findFirstOrThrow'):
+        match = _LOOP_VALUE_RE.match(value)
+        if match and match.group(2).endswith('Id') and column in ('id',):
+            relation = match.group(2)[:-2]
+            return (f"include: {{ {relation}: true }} na query que carrega os itens "
+                    f"(ou {accessor}.findMany({{ where: {{ id: {{ in: ids }} }} }}) + Map)")
+        return f"{accessor}.findMany({{ where: {{ {_in_filter(column)} }} }}) antes do loop + Map por {column}"
+    if operation == 'findMany':
+        return (f"{accessor}.findMany({{ where: {{ {_in_filter(column)} }} }}) uma vez e agrupar por {column} "
+                f"(ou include na query pai)")
+    if operation == 'count':
+        return f"{accessor}.groupBy({{ by: ['{column}'], where: {{ {_in_filter(column)} }}, _count: {{ _all: true }} }})"
+    if operation in ('aggregate', 'groupBy'):
+        return f"{accessor}.groupBy({{ by: ['{column}'], where: {{ {_in_filter(column)} }}, ... }}) uma vez"
+    if operation == 'create':
+        return f"{accessor}.createMany({{ data: [...] }}) (ou $transaction com as operações, se precisar dos ids)"
+    if operation in ('update', 'upsert'):
+        return (f"{accessor}.updateMany({{ where: {{ {_in_filter(column)} }}, data }}) se os dados forem iguais; "
+                f"senão $transaction([...]) em lote")
+    if operation == 'delete':
+        return f"{accessor}.deleteMany({{ where: {{ {_in_filter(column)} }} }})"
+    if operation == 'createMany':
+        return f"acumular os registros no loop e um único {accessor}.createMany({{ data }}) depois dele"
+    if operation in ('updateMany', 'deleteMany'):
+        return f"um único {accessor}.{operation} depois do loop, com {_in_filter(column)}"
+    return f"uma chamada {accessor}.{operation} fora do loop, com {_in_filter(column)}"
+
+
+def scan_source(schema, text, file_name):
+    """[NPlusOneFinding] de um arquivo"""
+    accessors = {name[0].lower() + name[1:]: name for name in schema.models}
+    code = strip_comments(text)
+    calls = [(position, accessors[accessor], operation, argument)
+             for position, accessor, operation, argument in find_calls(code, PRISMA_OPERATIONS)
+             if accessor in accessors]
+    if not calls:
+        return []
+    loops = find_loops(code)
+    methods = find_methods(code)
+
+    def innermost(position):
+        enclosing = [loop for loop in loops if loop.start < position < loop.end]
+        return max(enclosing, key=lambda loop: loop.start) if enclosing else None
+
+    def finding(position, loop, call, via=None):
+        call_position, model_name, operation, argument = call
+        receiver = _RECEIVER_RE.search(code, max(0, call_position - 80), call_position)
+        public = receiver is not None and receiver.group(1).endswith(PUBLIC_CLIENTS)
+        per_tenant = not public and _TENANT_CLIENT_RE.search(code, loop.start, loop.end) is not None
+        suggestion = (TENANT_LOOP_SUGGESTION if per_tenant
+                      else suggest_batch(schema, model_name, operation, argument, code, call_position))
+        return NPlusOneFinding(file_name, line_of(code, position), model_name, operation, loop.kind, loop.line,
+                               suggestion, via=via, per_tenant=per_tenant)
+
+    findings = []
+    for call in calls:
+        loop = innermost(call[0])
+        if loop is not None:
+            findings.append(finding(call[0], loop, call))
+
+    # Um nível de indireção: this.metodo(...) no loop, com chamada Prisma no corpo do método
+    queried = {}
+    for name, (start, end) in methods.items():
+        inside = [call for call in calls if start < call[0] < end]
+        if inside:
+            queried[name] = inside[0]
+    for match in _THIS_CALL_RE.finditer(code):
+        target = queried.get(match.group(1))
+        loop = innermost(match.start()) if target else None
+        if loop is None:
+            continue
+        findings.append(finding(match.start(), loop, target, via=match.group(1)))
+    return sorted(findings, key=lambda f: f.line)
+
+
+def scan_all(schema, src_dir=SRC_DIR, pattern=SOURCE_GLOB, errors=None):
+    """Achados de todos os arquivos; arquivos que não dá para ler vão para errors [(arquivo, mensagem)]"""
+    src_dir = Path(src_dir)
+    findings = []
+    for path in sorted(src_dir.glob(pattern)):
+        if path.name.endswith(IGNORED_SUFFIXES):
+            continue
+        name = str(path.relative_to(src_dir))
+        try:
+            findings.extend(scan_source(schema, path.read_text(encoding='utf-8'), name))
+        except ValueError as exc:  # Delimitadores que a leitura leve não entende: só este arquivo fica de fora
+            if errors is not None:
+                errors.append((name, str(exc)))
+    return findings
@@ -0,0 +1,211 @@
+"""
+Manutenção das tabelas particionadas por mês (*_history com @partitioned)
+
+    from prisma_tools.partitions import load_partitioned, maintenance_sql, plan_maintenance
+
+    tables = load_partitioned(url)                            # todas as particionadas de public e tenant_*
+    plans = [plan_maintenance(t, today, ahead=3, keep_months=24) for t in tables]
+    print(maintenance_sql([p for p in plans if not p.empty]))
+
+A migração (ddl.create_partitions_sql) cria as partições até alguns meses à
+frente; daqui em diante este módulo mantém a janela: cria as partições dos
+próximos meses, tira da DEFAULT as linhas de um mês que ganhou partição
+(senão o CREATE ... PARTITION OF falha) e, com keep_months, desanexa as
+partições antigas. Desanexar não apaga nada: a partição vira uma tabela
+comum no mesmo schema (prontuário tem guarda obrigatória), só sai das
+consultas e do vacuum da tabela viva.
+
+Limites de mês em UTC, como na migração. Cada tabela é alterada na própria
+transação; com lock_timeout curto uma tabela ocupada falha sozinha e é
+retomada na próxima execução.
+"""
+
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from .ddl import partition_prefix, quote
+from .psql import query_psql
+
+DEFAULT_MONTHS_AHEAD = 3
+DEFAULT_SCHEMA_PATTERNS = ('public', 'tenant\\_%')
+UNBOUNDED_START = datetime.min.replace(tzinfo=timezone.utc)
+UNBOUNDED_END = datetime.max.replace(tzinfo=timezone.utc)
+DEFAULT_BATCH = 200  # Partições DEFAULT consultadas por comando
+
+_BOUND_RE = re.compile(r"^FOR VALUES FROM \((.+)\) TO \((.+)\)$")
+_TIMESTAMP_RE = re.compile(r"^'(\d{4})-(\d{2})-(\d{2})(?: (\d{2}):(\d{2}):(\d{2}))?")
+
+
+@dataclass
+class Partition:
+    name: str
+    start: Optional[datetime] = None  # None na partição DEFAULT
+    end: Optional[datetime] = None
+
+    @property
+    def default(self):
+        return self.start is None
+
+
+@dataclass
+class PartitionedTable:
+    schema: str
+    name: str
+    column: str
+    partitions: List[Partition] = field(default_factory=list)
+    default_months: List[datetime] = field(default_factory=list)  # Meses com linhas na DEFAULT
+
+    @property
+    def qualified(self):
+        return f'{quote(self.schema)}.{quote(self.name)}'
+
+    @property
+    def default(self):
+        return next((p for p in self.partitions if p.default), None)
+
+    def covers(self, month):
+        """Alguma partição já cobre (mesmo que em parte) o mês?"""
+        end = add_months(month, 1)
+        return any(p.start < end and month < p.end for p in self.partitions if not p.default)
+
+
+@dataclass
+class MaintenancePlan:
+    table: PartitionedTable
+    create: List[datetime] = field(default_factory=list)
+    rescue: List[datetime] = field(default_factory=list)  # Meses de create com linhas a tirar da DEFAULT
+    detach: List[Partition] = field(default_factory=list)
+
+    @property
+    def empty(self):
+        return not (self.create or self.detach)
+
+
+def month_start(value):
+    return datetime(value.year, value.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(table, month):
+    """Mesmo nome que a migração dá: <tabela>_pAAAAMM"""
+    return f'{partition_prefix(table)}{month:%Y%m}'
+
+
+def timestamp_literal(value):
+    return f"'{value:%Y-%m-%d %H:%M:%S}+00'"
+
+
+def parse_bound(value):
+    """Limite de pg_get_expr (sessão em UTC) -> datetime; MINVALUE/MAXVALUE -> extremos"""
+    value = value.strip()
+    if value.upper() == 'MINVALUE':
+        return UNBOUNDED_START
+    if value.upper() == 'MAXVALUE':
+        return UNBOUNDED_END
+    match = _TIMESTAMP_RE.match(value)
+    if not match:
+        raise ValueError(f'Limite de partição não suportado: {value}')
+    return datetime(*(int(part or 0) for part in match.groups()), tzinfo=timezone.utc)
+
+
+# ============================================
+# Estado atual (catálogo do PostgreSQL)
+# ============================================
+def _schema_filter(schemas):
+    patterns = schemas or DEFAULT_SCHEMA_PATTERNS
+    return '(' + ' OR '.join(f"n.nspname LIKE '{pattern.replace(chr(39), chr(39) * 2)}'"
+                             for pattern in patterns) + ')'
+
+
+def load_partitioned(database_url, schemas=None, tables=None, batch=DEFAULT_BATCH):
+    """[PartitionedTable] das tabelas particionadas por intervalo (uma coluna) nos schemas pedidos"""
+    table_filter = ''
+    if tables:
+        names = ', '.join("'" + name.replace("'", "''") + "'" for name in tables)
+        table_filter = f' AND p.relname IN ({names})'
+    rows = query_psql(database_url, f'''
+        SELECT n.nspname, p.relname, a.attname, coalesce(c.relname, ''), coalesce(pg_get_expr(c.relpartbound, c.oid), '')
+        FROM pg_partitioned_table pt
+        JOIN pg_class p ON p.oid = pt.partrelid
+        JOIN pg_namespace n ON n.oid = p.relnamespace
+        JOIN pg_attribute a ON a.attrelid = p.oid AND a.attnum = pt.partattrs[0]
+        LEFT JOIN pg_inherits i ON i.inhparent = p.oid
+        LEFT JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE pt.partstrat = 'r' AND pt.partnatts = 1 AND NOT p.relispartition
+          AND {_schema_filter(schemas)}{table_filter}
+        ORDER BY 1, 2, 4''', options={'TimeZone': 'UTC'})
+
+    found = {}
+    for schema, name, column, partition, bound in rows:
+        table = found.setdefault((schema, name), PartitionedTable(schema, name, column))
+        if not partition:
+            continue
+        if bound == 'DEFAULT':
+            table.partitions.append(Partition(partition))
+            continue
+        match = _BOUND_RE.match(bound)
+        if match:
+            table.partitions.append(Partition(partition, parse_bound(match.group(1)), parse_bound(match.group(2))))
+
+    with_default = [table for table in found.values() if table.default is not None]
+    for start in range(0, len(with_default), batch):
+        chunk = with_default[start:start + batch]
+        selects = [f"SELECT {position}, to_char(date_trunc('month', {quote(t.column)} AT TIME ZONE 'UTC'), 'YYYY-MM') "
+                   f"FROM {quote(t.schema)}.{quote(t.default.name)} GROUP BY 2"
+                   for position, t in enumerate(chunk)]
+        for position, month in query_psql(database_url, ' UNION ALL '.join(selects), options={'TimeZone': 'UTC'}):
+            year, number = month.split('-')
+            chunk[int(position)].default_months.append(datetime(int(year), int(number), 1, tzinfo=timezone.utc))
+    return list(found.values())
+
+
+# ============================================
+# Plano e SQL
+# ============================================
+def plan_maintenance(table, today, ahead=DEFAULT_MONTHS_AHEAD, keep_months=None):
+    """Partições a criar (mês atual e `ahead` à frente, mais os meses presos na DEFAULT) e a desanexar"""
+    current = month_start(today)
+    wanted = [add_months(current, offset) for offset in range(ahead + 1)] + table.default_months
+    plan = MaintenancePlan(table)
+    plan.create = sorted({month for month in wanted if not table.covers(month)})
+    plan.rescue = [month for month in plan.create if month in table.default_months]
+    if keep_months is not None:
+        cutoff = add_months(current, -keep_months)
+        plan.detach = [p for p in table.partitions if not p.default and p.end <= cutoff]
+    return plan
+
+
+def maintenance_sql(plans):
+    """Script com uma transação por tabela (psql com ON_ERROR_STOP)"""
+    parts = []
+    for plan in plans:
+        table = plan.table
+        default = table.default
+        column = quote(table.column)
+        lines = [f'-- {table.schema}.{table.name}', 'BEGIN;']
+        if plan.rescue:
+            lines.append(f'ALTER TABLE {table.qualified} DETACH PARTITION {quote(table.schema)}.{quote(default.name)};')
+        for month in plan.create:
+            name = f'{quote(table.schema)}.{quote(partition_name(table.name, month))}'
+            start, end = timestamp_literal(month), timestamp_literal(add_months(month, 1))
+            lines.append(f'CREATE TABLE {name} PARTITION OF {table.qualified} FOR VALUES FROM ({start}) TO ({end});')
+            if month in plan.rescue:
+                source = f'{quote(table.schema)}.{quote(default.name)}'
+                where = f'{column} >= {start} AND {column} < {end}'
+                lines.append(f'INSERT INTO {name} SELECT * FROM {source} WHERE {where};')
+                lines.append(f'DELETE FROM {source} WHERE {where};')
+        if plan.rescue:
+            lines.append(f'ALTER TABLE {table.qualified} ATTACH PARTITION {quote(table.schema)}.{quote(default.name)} '
+                         f'DEFAULT;')
+        # Com partição DEFAULT o PostgreSQL não aceita DETACH ... CONCURRENTLY; o lock é curto (sem varredura)
+        lines.extend(f'ALTER TABLE {table.qualified} DETACH PARTITION {quote(table.schema)}.{quote(p.name)};'
+                     for p in plan.detach)
+        lines.append('COMMIT;')
+        parts.append('\n'.join(lines))
+    return '\n\n'.join(parts) + '\n' if parts else ''
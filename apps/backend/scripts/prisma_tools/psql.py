@@ -0,0 +1,63 @@
+"""
+Acesso ao PostgreSQL pelo psql/pg_dump (sem driver Python)
+
+    from prisma_tools.psql import libpq_url, query_psql, run_psql
+
+    url = libpq_url(os.environ['DATABASE_URL'])     # tira os parâmetros só do Prisma
+    run_psql(url, 'CREATE SCHEMA x;')
+    rows = query_psql(url, 'SELECT nspname FROM pg_namespace')   # [['public'], ...]
+
+As ferramentas rodam onde o backend roda (containers e máquinas de dev já
+têm o cliente do PostgreSQL); erros do servidor sobem como
+subprocess.CalledProcessError com o stderr do psql.
+"""
+
+import os
+import subprocess
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .ddl import quote
+
+# Parâmetros da DATABASE_URL que só o Prisma entende (libpq recusa)
+PRISMA_ONLY_PARAMS = {'schema', 'connection_limit', 'pool_timeout', 'pgbouncer', 'statement_cache_size',
+                      'socket_timeout', 'sslaccept', 'sslidentity', 'sslpassword'}
+
+
+def libpq_url(database_url):
+    """DATABASE_URL do Prisma -> URL aceita por psql/pg_dump (sem ?schema=, connection_limit, ...)"""
+    parts = urlsplit(database_url)
+    query = [(key, value) for key, value in parse_qsl(parts.query) if key not in PRISMA_ONLY_PARAMS]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _env(schema=None, options=None):
+    env = dict(os.environ)
+    settings = [f'-c search_path={schema}'] if schema else []
+    settings += [f'-c {key}={value}' for key, value in (options or {}).items()]
+    if settings:
+        env['PGOPTIONS'] = ' '.join([env.get('PGOPTIONS', ''), *settings]).strip()
+    return env
+
+
+def run_psql(database_url, sql, schema=None, options=None):
+    """Executa um script (para no primeiro erro); options viram -c chave=valor da sessão"""
+    subprocess.run(['psql', database_url, '-X', '-q', '-v', 'ON_ERROR_STOP=1', '-f', '-'], input=sql.encode('utf-8'),
+                   env=_env(schema, options), check=True, capture_output=True)
+
+
+def query_psql(database_url, sql, options=None):
+    """Linhas de uma consulta, como listas de texto (NULL vira '')"""
+    output = subprocess.run(['psql', database_url, '-X', '-q', '-A', '-t', '-F', '\t', '-v', 'ON_ERROR_STOP=1',
+                             '-c', sql], env=_env(options=options), check=True, capture_output=True).stdout
+    return [line.split('\t') for line in output.decode('utf-8').splitlines() if line]
+
+
+def dump_structure(database_url, schema):
+    """pg_dump --schema-only de um schema, sem o nome do schema e em ordem estável"""
+    output = subprocess.run(['pg_dump', database_url, '--schema-only', '--no-owner', '--no-privileges',
+                             '--schema', schema], check=True, capture_output=True).stdout.decode('utf-8')
+    lines = [line for line in output.splitlines()
+             if line.strip() and not line.startswith(('--', 'SET ', 'SELECT pg_catalog.', '\\'))]
+    text = '\n'.join(lines).replace(f'{quote(schema)}.', '').replace(f'{schema}.', '')
+    return sorted(block.strip() for block in text.split(';\n') if block.strip()
+                  and not block.strip().startswith('CREATE SCHEMA'))
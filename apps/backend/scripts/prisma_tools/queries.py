@@ -0,0 +1,279 @@
+"""
+Cobertura de índices das queries Prisma dos services do backend
+
+Extrai o formato (where / orderBy) de cada findMany / findFirst / count em
+src/**/*.service.ts e procura, entre os índices do schema, o que atende o
+maior prefixo:
+
+- colunas com igualdade (`campo: valor`, `null`, `{ in: [...] }`, `{ equals }`)
+  consomem o prefixo em qualquer ordem
+- se a query tem alguma coluna seletiva, o prefixo aproveitado precisa
+  incluí-la (um @@index([deletedAt]) não cobre `where: { code, deletedAt: null }`)
+- uma coluna com intervalo (gt/gte/lt/lte) fecha o prefixo
+- sem filtro utilizável, um índice que comece pela primeira coluna do orderBy
+  atende findMany com take (varredura ordenada com LIMIT)
+
+A query sem nenhum índice aproveitável vira seq scan, que é o que a
+ferramenta lista, com a sugestão de @@index; quando só há filtros pouco
+seletivos (deletedAt, Boolean, enums pequenos, ver indexes.py) ou que não
+usam btree (contains, not, notIn) um índice não ajudaria e a query fica em
+uma seção à parte. Filtros de relação e OR/NOT são ignorados. Objetos montados em variável (`const where = {...}`
+seguido de `where.campo = ...`) são resolvidos no mesmo arquivo; filtros
+atribuídos condicionalmente entram como se estivessem presentes.
+
+Os services usam `tenantContext.client`, conectado ao schema do tenant, então
+as queries não filtram tenantId: um índice que começa por tenantId não é
+aproveitado por elas, e isso é indicado na sugestão.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .indexes import is_low_cardinality
+from .typescript import array_items, find_calls, line_of, object_entries, resolve_object, strip_comments, unquote
+
+SRC_DIR = Path(__file__).resolve().parents[2] / 'src'
+SERVICE_GLOB = '**/*.service.ts'
+QUERY_METHODS = ('findMany', 'findFirst', 'findFirstOrThrow', 'count')
+
+_EQUALITY_OPERATORS = {'equals', 'in'}
+_RANGE_OPERATORS = {'gt', 'gte', 'lt', 'lte'}
+_OP_PRIORITY = ('eq', 'range', 'other')  # Mesmo campo filtrado mais de uma vez: vale o mais útil ao índice
+
+
+@dataclass
+class Predicate:
+    column: str
+    op: str  # 'eq' | 'range' | 'other'
+
+
+@dataclass
+class QueryShape:
+    file: str
+    line: int
+    model: str
+    method: str
+    predicates: List[Predicate] = field(default_factory=list)
+    order_by: List[Tuple[str, str]] = field(default_factory=list)
+    take: bool = False
+    dynamic: bool = False     # Spread ou filtros atribuídos depois da declaração
+    unresolved: bool = False  # where vindo de parâmetro / expressão não literal
+
+    @property
+    def location(self):
+        return f'{self.file}:{self.line}'
+
+    def columns(self, op):
+        return [p.column for p in self.predicates if p.op == op]
+
+    @property
+    def filtered(self):
+        return bool(self.predicates) or self.unresolved
+
+    def describe(self):
+        symbols = {'eq': '=', 'range': ' ∈ intervalo', 'other': ' ~'}
+        where = ', '.join(f'{p.column}{symbols[p.op]}' for p in self.predicates) or '-'
+        text = f'where: {where}'
+        if self.order_by:
+            text += ' | orderBy: ' + ', '.join(f'{c} {d}' for c, d in self.order_by)
+        return text
+
+
+@dataclass
+class Coverage:
+    query: QueryShape
+    index: Optional[object] = None  # Index usado (ou None)
+    usable: int = 0                 # Colunas do índice aproveitadas
+    via_order: bool = False
+    suggestion: Optional[str] = None
+    tenant_hint: Optional[object] = None  # Índice que serviria se não começasse por tenantId
+    low_selectivity: bool = False         # Só filtros pouco seletivos: um índice não ajudaria
+
+    @property
+    def covered(self):
+        return self.index is not None
+
+
+# ============================================
+# Extração
+# ============================================
+def _classify(value):
+    entries = object_entries(value)
+    if entries is None:
+        return 'eq'  # Literal, variável ou null
+    keys = {key for key, _ in entries}
+    if keys & _EQUALITY_OPERATORS:
+        return 'eq'
+    if keys & _RANGE_OPERATORS:
+        return 'range'
+    return 'other'
+
+
+def _collect_predicates(entries, model, schema, shape):
+    for key, value in entries:
+        if key == '...':
+            shape.dynamic = True
+            continue
+        if key == 'AND':
+            items = array_items(value) or [value]
+            for item in items:
+                nested = object_entries(item)
+                if nested is not None:
+                    _collect_predicates(nested, model, schema, shape)
+            continue
+        column = model.field(key)
+        if column is None or schema.is_relation(column) or column.list:
+            continue
+        op = _classify(value)
+        existing = next((p for p in shape.predicates if p.column == key), None)
+        if existing is None:
+            shape.predicates.append(Predicate(key, op))
+        elif _OP_PRIORITY.index(op) < _OP_PRIORITY.index(existing.op):
+            existing.op = op
+
+
+def _literal(text, value, position, shape):
+    """Objeto literal de `value` (resolvendo variável local); None se não for possível"""
+    if object_entries(value) is not None:
+        return value, []
+    if not value.isidentifier():
+        return None
+    resolved = resolve_object(text, value, position)
+    if resolved is None:
+        return None
+    literal, assignments = resolved
+    if assignments:
+        shape.dynamic = True
+    return literal, assignments
+
+
+def _parse_order_by(value, model):
+    items = array_items(value)
+    items = items if items is not None else [value]
+    order = []
+    for item in items:
+        for key, direction in object_entries(item) or []:
+            if model.field(key) is not None and unquote(direction) in ('asc', 'desc'):
+                order.append((key, unquote(direction)))
+    return order
+
+
+def extract_queries(schema, text, file_name):
+    """[QueryShape] das chamadas find*/count de um arquivo TypeScript"""
+    accessors = {name[0].lower() + name[1:]: model for name, model in schema.models.items()}
+    code = strip_comments(text)
+    shapes = []
+    for position, accessor, method, argument in find_calls(code, QUERY_METHODS):
+        model = accessors.get(accessor)
+        if model is None:
+            continue
+        shape = QueryShape(file_name, line_of(code, position), model.name, method)
+        shapes.append(shape)
+        if not argument:
+            continue
+        entries = object_entries(argument)
+        if entries is None:
+            shape.unresolved = True  # Argumento inteiro vindo de variável
+            continue
+        for key, value in entries:
+            if key == '...':
+                shape.dynamic = True
+            elif key == 'where':
+                resolved = _literal(code, value, position, shape)
+                if resolved is None:
+                    shape.unresolved = True
+                    continue
+                literal, assignments = resolved
+                _collect_predicates(object_entries(literal) + assignments, model, schema, shape)
+            elif key == 'orderBy':
+                resolved = _literal(code, value, position, shape) if value.isidentifier() else (value, [])
+                if resolved is not None:
+                    shape.order_by = _parse_order_by(resolved[0], model)
+            elif key == 'take':
+                shape.take = True
+    return shapes
+
+
+def extract_all(schema, src_dir=SRC_DIR, pattern=SERVICE_GLOB):
+    src_dir = Path(src_dir)
+    shapes = []
+    for path in sorted(src_dir.glob(pattern)):
+        shapes.extend(extract_queries(schema, path.read_text(encoding='utf-8'), str(path.relative_to(src_dir))))
+    return shapes
+
+
+# ============================================
+# Cobertura
+# ============================================
+def usable_prefix(columns, equalities, ranges):
+    count = 0
+    for column in columns:
+        if column in equalities:
+            count += 1
+        elif column in ranges:
+            return count + 1
+        else:
+            break
+    return count
+
+
+def selective_columns(schema, shape):
+    """Colunas de igualdade que valem um índice (sem deletedAt, Boolean e enums pequenos)"""
+    model = schema.models[shape.model]
+    return [c for c in shape.columns('eq')
+            if c != 'deletedAt' and not is_low_cardinality(schema, model.field(c))]
+
+
+def suggest_index(schema, shape):
+    """@@index que atenderia a query; None se só houver filtros pouco seletivos"""
+    equalities = selective_columns(schema, shape)
+    ranges = shape.columns('range')
+    columns = list(equalities)
+    if ranges:
+        columns.append(ranges[0])
+    elif shape.order_by and (equalities or shape.take):
+        columns.extend(f'{c}(sort: Desc)' if d == 'desc' else c
+                       for c, d in shape.order_by if c not in equalities)
+    return f'@@index([{", ".join(columns)}])' if columns else None
+
+
+def check_coverage(schema, shape):
+    model = schema.models[shape.model]
+    equalities, ranges = set(shape.columns('eq')), set(shape.columns('range'))
+    selective = set(selective_columns(schema, shape)) | ranges
+    coverage = Coverage(shape)
+
+    def useful(columns):
+        """Prefixo aproveitável, desde que inclua alguma coluna seletiva (se a query tiver uma)"""
+        usable = usable_prefix(columns, equalities, ranges)
+        return usable if usable and (not selective or selective & set(columns[:usable])) else 0
+
+    best = None
+    for index in model.indexes:
+        if (index.type or 'BTree') != 'BTree':
+            continue
+        usable = useful(index.columns)
+        if usable and (best is None or (usable, -len(index.columns)) > (best[1], -len(best[0].columns))):
+            best = (index, usable)
+    if best is not None:
+        coverage.index, coverage.usable = best
+        return coverage
+
+    if shape.order_by and shape.take:
+        first = shape.order_by[0][0]
+        ordered = next((i for i in model.indexes if i.columns and i.columns[0] == first), None)
+        if ordered is not None:
+            coverage.index, coverage.usable, coverage.via_order = ordered, 1, True
+            return coverage
+
+    coverage.suggestion = suggest_index(schema, shape)
+    coverage.low_selectivity = coverage.suggestion is None
+    coverage.tenant_hint = next((i for i in model.indexes
+                                 if i.columns[:1] == ['tenantId'] and useful(i.columns[1:])), None)
+    return coverage
+
+
+def analyze_queries(schema, src_dir=SRC_DIR, pattern=SERVICE_GLOB):
+    """[Coverage] de todas as queries encontradas"""
+    return [check_coverage(schema, shape) for shape in extract_all(schema, src_dir, pattern)]
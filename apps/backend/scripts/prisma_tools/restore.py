@@ -0,0 +1,491 @@
+"""
+Importação paralela de um backup CSV de tenant para o schema do tenant
+
+    from prisma_tools.restore import TenantRestore, backup_files
+
+    schema = load_schema()
+    files, unmatched = backup_files('backups/casa_sao_rafael', build_tables(schema), schema)
+    restore = TenantRestore(url, 'tenant_casa_sao_rafael_abc123', files, dependencies(tables, files))
+    restore.prepare()              # guarda e remove índices/constraints das tabelas do backup
+    restore.load(jobs=8)           # COPY em paralelo, cada arquivo em streaming
+    restore.finish(jobs=8)         # recria índices, PK/unique, FKs (NOT VALID + VALIDATE) e ANALYZE
+
+Cada arquivo <tabela>.csv (ou NN_<tabela>.csv, <modelo>.csv, .csv.gz) vai
+para a tabela de mesmo nome no schema alvo, com as colunas do cabeçalho. O
+COPY de cada arquivo é uma transação numa conexão própria (uma por worker) e
+o arquivo é enviado em blocos de CHUNK_SIZE, sem carregar tudo em memória.
+Backups do export-tenant-backup.py (manifest.json, partes <tabela>.NNNNN
+.csv.gz/.zst) são lidos pelo manifest: as partes de uma tabela carregam em
+paralelo e cada uma é conferida contra o sha256 e as linhas registradas.
+
+Por padrão as tabelas do backup são carregadas sem índices nem constraints
+(PK, unique e FKs, inclusive as de outras tabelas que apontam para elas):
+as definições são lidas do próprio banco, gravadas no arquivo de estado e
+recriadas no final, cada tabela em paralelo. As FKs voltam como NOT VALID e
+são validadas depois, sem bloquear as tabelas referenciadas. Com
+keep_constraints=True nada é removido e a ordem segue o grafo de FKs do
+schema Prisma: uma tabela só começa quando as que ela referencia terminaram.
+
+Triggers de usuário ficam desabilitados durante a carga (ALTER TABLE ...
+DISABLE TRIGGER USER, que vale para todas as conexões, ao contrário de
+session_replication_role). O arquivo de estado (~/.cache/rafa-ilpi/
+tenant-restore/<schema>.json) permite retomar uma importação interrompida:
+as tabelas já carregadas não são repetidas e o que foi removido é recriado.
+
+Requer psycopg 3 (pip install "psycopg[binary]").
+"""
+
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .backup import HashingReader, Manifest, open_backup
+from .ddl import quote, sql_literal
+from .versioning import snake_case
+
+CHUNK_SIZE = 1 << 20  # Bytes enviados por write() do COPY
+DEFAULT_STATE_DIR = Path.home() / '.cache' / 'rafa-ilpi' / 'tenant-restore'
+STATE_VERSION = 1
+
+_FILE_RE = re.compile(r'^(?:\d+_)?(.+?)(?:\.\d{5})?\.csv(?:\.gz|\.zst)?$')
+
+
+def connect(database_url):
+    try:
+        import psycopg
+    except ImportError as exc:
+        raise RuntimeError('A conexão direta ao banco requer psycopg: pip install "psycopg[binary]"') from exc
+    return psycopg.connect(database_url, autocommit=True)
+
+
+# ============================================
+# Arquivos do backup
+# ============================================
+@dataclass
+class BackupFile:
+    path: Path
+    table: str
+    columns: List[str]
+    size: int
+    sha256: Optional[str] = None  # Do manifest, conferido durante a carga
+    rows: Optional[int] = None
+
+    @property
+    def name(self):
+        return self.path.name
+
+
+def read_header(path):
+    with open_backup(path) as f:
+        line = f.readline().decode('utf-8-sig')
+    return next(csv.reader(io.StringIO(line)), [])
+
+
+def backup_files(directory, tables, schema=None):
+    """([BackupFile], [arquivos sem tabela]) de um diretório de backup
+
+    Com manifest.json (export-tenant-backup.py) os arquivos e tabelas vêm
+    dele, só das tabelas do schema do tenant; falha se a exportação não
+    terminou. Sem manifest, o nome do arquivo (sem prefixo numérico nem
+    número da parte) pode ser a tabela ('users') ou o modelo em snake_case
+    ('tenant' -> tenants), como nos backups antigos.
+    """
+    directory = Path(directory)
+    manifest = Manifest.load(directory)
+    if manifest is not None:
+        if not manifest.done:
+            raise ValueError(f'exportação incompleta em {directory} (rode export-tenant-backup.py de novo)')
+        files, unmatched = [], []
+        for entry in manifest.tables:
+            paths = [directory / chunk.file for chunk in entry.chunks]
+            if entry.source != 'tenant' or entry.table not in tables:
+                unmatched.extend(paths)
+                continue
+            files.extend(BackupFile(path, entry.table, entry.columns, chunk.bytes, chunk.sha256, chunk.rows)
+                         for path, chunk in zip(paths, entry.chunks))
+        return files, unmatched
+
+    aliases = {name: name for name in tables}
+    if schema is not None:
+        for model in schema.models.values():
+            if model.kind == 'model' and model.table in tables:
+                aliases.setdefault(snake_case(model.name), model.table)
+    files, unmatched = [], []
+    for path in sorted(directory.iterdir()):
+        match = _FILE_RE.match(path.name)
+        if not match or not path.is_file():
+            continue
+        table = aliases.get(match.group(1))
+        if table is None:
+            unmatched.append(path)
+            continue
+        files.append(BackupFile(path, table, read_header(path), path.stat().st_size))
+    return files, unmatched
+
+
+def dependencies(tables, files):
+    """{tabela: tabelas do backup que ela referencia} pelo grafo de FKs do schema Prisma"""
+    names = {f.table for f in files}
+    return {name: {fk.target for fk in tables[name].foreign_keys.values() if fk.target in names and fk.target != name}
+            for name in names if name in tables}
+
+
+def run_in_order(names, requires, jobs, work, priority=None):
+    """Executa work(nome) em até `jobs` threads; cada nome só começa depois dos que ele requer
+
+    Retorna {nome: (resultado, exceção)}. Quem depende de um nome que falhou
+    não roda; o que sobrar num ciclo também não.
+    """
+    pending = {name: set(requires.get(name, ())) & set(names) for name in names}
+    results = {}
+
+    def fail(name, reason):
+        results[name] = (None, RuntimeError(reason))
+        for other in [n for n, needs in pending.items() if name in needs]:
+            del pending[other]
+            fail(other, f'depende de {name}, que falhou')
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        running = {}
+        while pending or running:
+            ready = sorted((n for n, needs in pending.items() if not needs), key=priority)
+            for name in ready:
+                del pending[name]
+                running[pool.submit(work, name)] = name
+            if not running:
+                for name in list(pending):
+                    if name in pending:
+                        del pending[name]
+                        fail(name, 'ciclo de dependências')
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    fail(name, str(error))
+                    results[name] = (None, error)
+                    continue
+                results[name] = (future.result(), None)
+                for needs in pending.values():
+                    needs.discard(name)
+    return results
+
+
+# ============================================
+# Estado (o que foi removido e o que já foi carregado)
+# ============================================
+@dataclass
+class DeferredObject:
+    table: str
+    name: str
+    kind: str  # 'primary' | 'unique' | 'foreign' | 'index'
+    definition: str  # pg_get_constraintdef / pg_get_indexdef
+
+    def drop(self, schema):
+        if self.kind == 'index':
+            return f'DROP INDEX {quote(schema)}.{quote(self.name)}'
+        return f'ALTER TABLE {quote(schema)}.{quote(self.table)} DROP CONSTRAINT {quote(self.name)}'
+
+    def create(self, schema):
+        if self.kind == 'index':
+            return self.definition
+        suffix = ' NOT VALID' if self.kind == 'foreign' and not self.definition.endswith('NOT VALID') else ''
+        return (f'ALTER TABLE {quote(schema)}.{quote(self.table)} ADD CONSTRAINT {quote(self.name)} '
+                f'{self.definition}{suffix}')
+
+
+@dataclass
+class RestoreState:
+    version: int
+    schema: str
+    keep_constraints: bool
+    deferred: List[DeferredObject] = field(default_factory=list)
+    triggers: List[str] = field(default_factory=list)  # Tabelas com triggers de usuário desabilitados
+    loaded: Dict[str, int] = field(default_factory=dict)  # Arquivo -> linhas
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != STATE_VERSION:
+            return None
+        data['deferred'] = [DeferredObject(**item) for item in data.get('deferred', [])]
+        return cls(**data)
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+        with open(staging, 'w', encoding='utf-8') as f:
+            json.dump(asdict(self), f, ensure_ascii=False, indent=2)
+        os.replace(staging, path)
+
+
+@dataclass
+class LoadResult:
+    file: str
+    table: str
+    rows: int
+    size: int
+    seconds: float
+
+
+# ============================================
+# Importação
+# ============================================
+class TenantRestore:
+    """Prepara, carrega e finaliza a importação de um backup num schema de tenant"""
+
+    def __init__(self, database_url, schema, files, requires=None, keep_constraints=False,
+                 state_dir=DEFAULT_STATE_DIR, chunk_size=CHUNK_SIZE, maintenance_work_mem='512MB'):
+        self.database_url = database_url
+        self.schema = schema
+        self.files = {f.name: f for f in files}
+        self.tables = list(dict.fromkeys(f.table for f in files))
+        self.requires = requires or {}
+        self.keep_constraints = keep_constraints
+        self.state_path = Path(state_dir) / f'{schema}.json'
+        self.chunk_size = chunk_size
+        self.maintenance_work_mem = maintenance_work_mem
+        self.state: Optional[RestoreState] = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._connections = []
+
+    # -- conexões -----------------------------------------------------------
+    def _connection(self):
+        """Uma conexão por thread (o pool é o conjunto de workers)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = connect(self.database_url)
+            conn.execute(f'SET maintenance_work_mem = {sql_literal(self.maintenance_work_mem)}')
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        for conn in self._connections:
+            conn.close()
+        self._connections = []
+        self._local = threading.local()
+
+    def _rows(self, sql, params=None):
+        return self._connection().execute(sql, params).fetchall()
+
+    # -- preparação ---------------------------------------------------------
+    def schema_exists(self):
+        return bool(self._rows('SELECT 1 FROM pg_namespace WHERE nspname = %s', (self.schema,)))
+
+    def check(self):
+        """Erros que impedem a importação (schema ou tabela inexistente, coluna desconhecida)"""
+        if not self.schema_exists():
+            return [f'schema {self.schema} não existe (crie com provision-tenant-schema.py ou use --provision)']
+        columns = {}
+        for table, column in self._rows(
+                'SELECT c.relname, a.attname FROM pg_attribute a JOIN pg_class c ON c.oid = a.attrelid '
+                'WHERE c.relnamespace = %s::regnamespace AND c.relkind IN (%s, %s) AND a.attnum > 0 '
+                'AND NOT a.attisdropped', (quote(self.schema), 'r', 'p')):
+            columns.setdefault(table, set()).add(column)
+        errors = []
+        for backup in self.files.values():
+            table = backup.table
+            if table not in columns:
+                errors.append(f'{backup.name}: tabela {self.schema}.{table} não existe')
+                continue
+            unknown = [c for c in backup.columns if c not in columns[table]]
+            if unknown:
+                errors.append(f'{backup.name}: colunas inexistentes em {table}: {", ".join(unknown)}')
+        return errors
+
+    def non_empty(self):
+        loaded = {self.files[name].table for name in (self.state.loaded if self.state else {}) if name in self.files}
+        tables = [t for t in self.tables if t not in loaded]
+        return [t for t in tables
+                if self._rows(f'SELECT EXISTS (SELECT 1 FROM {quote(self.schema)}.{quote(t)})')[0][0]]
+
+    def _capture(self):
+        """Constraints e índices a adiar: das tabelas do backup e FKs de outras tabelas que apontam para elas"""
+        tables = self.tables
+        kinds = {'p': 'primary', 'u': 'unique', 'f': 'foreign'}
+        deferred = [DeferredObject(table, name, kinds[kind], definition) for table, name, kind, definition in self._rows(
+            'SELECT c.relname, con.conname, con.contype, pg_get_constraintdef(con.oid) '
+            'FROM pg_constraint con JOIN pg_class c ON c.oid = con.conrelid '
+            'LEFT JOIN pg_class r ON r.oid = con.confrelid '
+            'WHERE con.connamespace = %s::regnamespace AND con.contype IN (%s, %s, %s) AND con.conparentid = 0 '
+            'AND (c.relname = ANY(%s) OR (con.contype = %s AND r.relname = ANY(%s))) ORDER BY 1, 2',
+            (quote(self.schema), 'p', 'u', 'f', tables, 'f', tables))]
+        deferred += [DeferredObject(table, name, 'index', definition) for table, name, definition in self._rows(
+            'SELECT t.relname, i.relname, pg_get_indexdef(i.oid) FROM pg_index x '
+            'JOIN pg_class i ON i.oid = x.indexrelid JOIN pg_class t ON t.oid = x.indrelid '
+            'WHERE t.relnamespace = %s::regnamespace AND t.relname = ANY(%s) AND NOT i.relispartition '
+            'AND NOT EXISTS (SELECT 1 FROM pg_constraint con WHERE con.conindid = i.oid) ORDER BY 1, 2',
+            (quote(self.schema), tables))]
+        return deferred
+
+    def prepare(self, truncate=False):
+        """Retoma o estado salvo ou remove índices/constraints e desabilita triggers; retorna o estado"""
+        self.state = RestoreState.load(self.state_path)
+        if self.state is not None and self.state.schema == self.schema:
+            self.keep_constraints = self.state.keep_constraints
+            return self.state
+        self.state = RestoreState(STATE_VERSION, self.schema, self.keep_constraints)
+        self.state.triggers = [table for (table,) in self._rows(
+            'SELECT DISTINCT c.relname FROM pg_trigger t JOIN pg_class c ON c.oid = t.tgrelid '
+            'WHERE c.relnamespace = %s::regnamespace AND c.relname = ANY(%s) AND NOT t.tgisinternal ORDER BY 1',
+            (quote(self.schema), self.tables))]
+        if not self.keep_constraints:
+            self.state.deferred = self._capture()
+        self.state.save(self.state_path)  # Antes de remover qualquer coisa: o estado é o backup das definições
+
+        conn = self._connection()
+        with conn.transaction():
+            order = {'foreign': 0, 'primary': 1, 'unique': 1, 'index': 2}
+            for item in sorted(self.state.deferred, key=lambda d: order[d.kind]):
+                conn.execute(item.drop(self.schema))
+            for table in self.state.triggers:
+                conn.execute(f'ALTER TABLE {quote(self.schema)}.{quote(table)} DISABLE TRIGGER USER')
+            if truncate:
+                targets = ', '.join(f'{quote(self.schema)}.{quote(t)}' for t in self.tables)
+                conn.execute(f'TRUNCATE {targets}')
+        return self.state
+
+    # -- carga --------------------------------------------------------------
+    def _copy(self, name):
+        backup = self.files[name]
+        started = time.perf_counter()
+        columns = ', '.join(map(quote, backup.columns))
+        digest = hashlib.sha256()
+        conn = self._connection()
+        with conn.transaction(), conn.cursor() as cursor:
+            with cursor.copy(f'COPY {quote(self.schema)}.{quote(backup.table)} ({columns}) '
+                             f'FROM STDIN WITH (FORMAT csv, HEADER true)') as copy, open(backup.path, 'rb') as raw:
+                # O sha256 do manifest é do arquivo comprimido: calcula sobre os bytes lidos do disco
+                reader = HashingReader(raw, digest)
+                with open_backup(backup.path, fileobj=reader) as f:
+                    while True:
+                        chunk = f.read(self.chunk_size)
+                        if not chunk:
+                            break
+                        copy.write(chunk)
+                while reader.read(self.chunk_size):  # Resto do arquivo que o descompressor não pediu
+                    pass
+                # Exceção dentro do bloco do COPY aborta o COPY e a transação
+                if backup.sha256 and digest.hexdigest() != backup.sha256:
+                    raise ValueError(f'{name}: sha256 diferente do manifest (arquivo corrompido?)')
+            rows = cursor.rowcount
+            if backup.rows is not None and rows != backup.rows:
+                raise ValueError(f'{name}: {rows} linhas carregadas, manifest diz {backup.rows}')
+        with self._lock:
+            self.state.loaded[name] = rows
+            self.state.save(self.state_path)
+        return LoadResult(name, backup.table, rows, backup.size, time.perf_counter() - started)
+
+    def _requires(self):
+        """Dependências por arquivo (keep_constraints): as tabelas referenciadas e a parte anterior da tabela"""
+        by_table = {}
+        for name, backup in self.files.items():
+            by_table.setdefault(backup.table, []).append(name)
+        requires = {}
+        for table, names in by_table.items():
+            parents = {other for target in self.requires.get(table, ()) for other in by_table.get(target, ())}
+            for previous, name in zip([None] + names, names):
+                requires[name] = parents | ({previous} if previous else set())
+        return requires
+
+    def load(self, jobs=4, on_done=None):
+        """COPY dos arquivos ainda não carregados; {arquivo: (LoadResult, exceção)}"""
+        names = [name for name in self.files if name not in self.state.loaded]
+        requires = self._requires() if self.keep_constraints else {}
+
+        def work(name):
+            result = self._copy(name)
+            if on_done:
+                on_done(result)
+            return result
+
+        return run_in_order(names, requires, jobs, work, priority=lambda name: -self.files[name].size)
+
+    # -- finalização --------------------------------------------------------
+    def _existing(self):
+        constraints = {(t, n) for t, n in self._rows(
+            'SELECT c.relname, con.conname FROM pg_constraint con JOIN pg_class c ON c.oid = con.conrelid '
+            'WHERE con.connamespace = %s::regnamespace', (quote(self.schema),))}
+        indexes = {n for (n,) in self._rows(
+            'SELECT relname FROM pg_class WHERE relnamespace = %s::regnamespace AND relkind IN (%s, %s)',
+            (quote(self.schema), 'i', 'I'))}
+        return constraints, indexes
+
+    def finish(self, jobs=4, analyze=True):
+        """Recria o que foi adiado, reabilita triggers e analisa; retorna [avisos]"""
+        constraints, indexes = self._existing()
+        missing = [d for d in self.state.deferred
+                   if (d.name not in indexes if d.kind == 'index' else (d.table, d.name) not in constraints)]
+        by_table = {}
+        for item in missing:
+            if item.kind != 'foreign':
+                by_table.setdefault(item.table, []).append(item)
+
+        def build(table):
+            conn = self._connection()
+            for item in sorted(by_table[table], key=lambda d: d.kind == 'index'):  # PK/unique antes dos índices
+                conn.execute(item.create(self.schema))
+
+        warnings = [f'{table}: {error}' for table, (_, error) in
+                    run_in_order(list(by_table), {}, jobs, build).items() if error]
+
+        foreign = [d for d in missing if d.kind == 'foreign']
+        conn = self._connection()
+        with conn.transaction():
+            for item in foreign:
+                conn.execute(item.create(self.schema))
+        to_validate = [(d.table, d.name) for d in self.state.deferred if d.kind == 'foreign'] + [
+            (table, name) for table, name in self._rows(
+                'SELECT c.relname, con.conname FROM pg_constraint con JOIN pg_class c ON c.oid = con.conrelid '
+                'WHERE con.connamespace = %s::regnamespace AND NOT con.convalidated AND con.contype = %s '
+                'AND c.relname = ANY(%s)', (quote(self.schema), 'f', self.tables))]
+        to_validate = list(dict.fromkeys(to_validate))
+
+        def validate(key):
+            table, name = key
+            self._connection().execute(f'ALTER TABLE {quote(self.schema)}.{quote(table)} '
+                                       f'VALIDATE CONSTRAINT {quote(name)}')
+
+        results = run_in_order(to_validate, {}, jobs, validate)
+        warnings += [f'{table}: FK {name} ficou NOT VALID ({error})' for (table, name), (_, error) in results.items()
+                     if error]
+
+        for table in self.state.triggers:
+            conn.execute(f'ALTER TABLE {quote(self.schema)}.{quote(table)} ENABLE TRIGGER USER')
+        if analyze:
+            run_in_order(self.tables, {}, jobs,
+                         lambda table: self._connection().execute(f'ANALYZE {quote(self.schema)}.{quote(table)}'))
+        if not warnings:
+            self.state_path.unlink(missing_ok=True)
+        return warnings
+
+    def register(self):
+        """Copia a linha do tenant (tabela tenants local) para public.tenants, apontando para este schema"""
+        columns = [c for (c,) in self._rows(
+            'SELECT a.attname FROM pg_attribute a WHERE a.attrelid = %s::regclass AND a.attnum > 0 '
+            'AND NOT a.attisdropped AND a.attname IN (SELECT attname FROM pg_attribute WHERE attrelid = '
+            '%s::regclass AND attnum > 0 AND NOT attisdropped) ORDER BY a.attnum',
+            ('public.tenants', f'{quote(self.schema)}.tenants'))]
+        source = ', '.join(sql_literal(self.schema) if c == 'schemaName' else quote(c) for c in columns)
+        cursor = self._connection().execute(
+            f'INSERT INTO public.tenants ({", ".join(map(quote, columns))}) '
+            f'SELECT {source} FROM {quote(self.schema)}.tenants ON CONFLICT (id) DO NOTHING')
+        return cursor.rowcount
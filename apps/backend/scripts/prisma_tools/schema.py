@@ -0,0 +1,571 @@
+"""
+Parser do schema Prisma modularizado (prisma/schema/*.prisma)
+
+Cada arquivo é lido uma vez e convertido em uma árvore de blocos:
+modelos (campos, atributos, relações, índices), enums, generator e
+datasource. O Schema monta um índice nome -> localização para consultas
+diretas, sem varrer o texto:
+
+    schema = load_schema()                       # prisma_tools.cache
+    allergy = schema.model('Allergy')
+    allergy.field('createdBy').location          # Location(file='clinical.prisma', line=..)
+    schema.locate('Allergy.substance')
+    schema.by_table['allergies']                 # Model pelo nome da tabela (@@map)
+
+O parser cobre a sintaxe usada neste repositório (uma declaração por linha,
+comentários // e ///, atributos @ e @@ com argumentos aninhados). Linhas que
+não reconhece são registradas em SchemaFile.errors, em vez de ignoradas.
+"""
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# apps/backend/prisma/schema
+SCHEMA_DIR = Path(__file__).resolve().parents[2] / 'prisma' / 'schema'
+
+SCALAR_TYPES = {'String', 'Boolean', 'Int', 'BigInt', 'Float', 'Decimal', 'DateTime', 'Json', 'Bytes'}
+
+_BLOCK_RE = re.compile(r'^(model|enum|view|type|generator|datasource)\s+(\w+)\s*\{\s*$')
+_FIELD_RE = re.compile(r'^(\w+)\s+(Unsupported\("[^"]*"\)|\w+)(\[\])?(\?)?(?:\s+(.*))?$')
+_ENUM_VALUE_RE = re.compile(r'^(\w+)(?:\s+(.*))?$')
+_PROPERTY_RE = re.compile(r'^(\w+)\s*=\s*(.+)$')
+_ATTRIBUTE_NAME_RE = re.compile(r'@@?[\w.]+')
+
+
+@dataclass(frozen=True)
+class Location:
+    file: str  # Nome do arquivo dentro do diretório do schema
+    line: int  # 1-based
+    end_line: int
+
+    def __str__(self):
+        return f'{self.file}:{self.line}'
+
+
+# ============================================
+# Tokenização
+# ============================================
+def split_comment(line):
+    """Separa código e comentário // (ignorando // dentro de strings)"""
+    in_string = False
+    for i, char in enumerate(line):
+        if char == '"' and (i == 0 or line[i - 1] != '\\'):
+            in_string = not in_string
+        elif not in_string and line.startswith('//', i):
+            return line[:i].rstrip(), line[i + 2:].lstrip('/').strip()
+    return line.rstrip(), None
+
+
+def _balanced(text, start):
+    """Índice logo após o ')' que fecha o '(' em text[start]"""
+    depth, in_string = 0, False
+    for i in range(start, len(text)):
+        char = text[i]
+        if char == '"' and text[i - 1] != '\\':
+            in_string = not in_string
+        elif in_string:
+            continue
+        elif char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    raise ValueError(f'Parênteses não balanceados: {text}')
+
+
+def split_top_level(text, separator=','):
+    """Divide text em separator fora de (), [] e strings"""
+    parts, depth, in_string, current = [], 0, False, []
+    for i, char in enumerate(text):
+        if char == '"' and (i == 0 or text[i - 1] != '\\'):
+            in_string = not in_string
+        elif not in_string:
+            if char in '([':
+                depth += 1
+            elif char in ')]':
+                depth -= 1
+            elif char == separator and depth == 0:
+                parts.append(''.join(current).strip())
+                current = []
+                continue
+        current.append(char)
+    tail = ''.join(current).strip()
+    if tail:
+        parts.append(tail)
+    return parts
+
+
+def parse_list(value):
+    """'[a, b(sort: Desc)]' -> ['a', 'b(sort: Desc)']"""
+    value = value.strip()
+    if value.startswith('[') and value.endswith(']'):
+        return split_top_level(value[1:-1])
+    return [value]
+
+
+def unquote(value):
+    value = value.strip()
+    return value[1:-1] if len(value) >= 2 and value[0] == value[-1] == '"' else value
+
+
+@dataclass
+class Attribute:
+    """Atributo de campo (@id, @db.Uuid, @relation(...)) ou de bloco (@@index(...))"""
+
+    name: str  # Sem os @: 'id', 'db.Uuid', 'relation', 'index'
+    raw_args: Optional[str] = None  # Conteúdo entre parênteses, sem eles
+    block: bool = False
+
+    @property
+    def args(self) -> List[str]:
+        """Argumentos posicionais (valores brutos)"""
+        return [a for a in split_top_level(self.raw_args or '') if not re.match(r'^\w+\s*:', a)]
+
+    @property
+    def kwargs(self) -> Dict[str, str]:
+        """Argumentos nomeados (valores brutos)"""
+        named = {}
+        for arg in split_top_level(self.raw_args or ''):
+            match = re.match(r'^(\w+)\s*:\s*(.*)$', arg, re.S)
+            if match:
+                named[match.group(1)] = match.group(2).strip()
+        return named
+
+    def arg(self, name, position=None):
+        """Argumento nomeado ou, se ausente, o posicional em `position`"""
+        kwargs = self.kwargs
+        if name in kwargs:
+            return kwargs[name]
+        args = self.args
+        if position is not None and position < len(args):
+            return args[position]
+        return None
+
+    def __str__(self):
+        prefix = '@@' if self.block else '@'
+        return f'{prefix}{self.name}' + (f'({self.raw_args})' if self.raw_args is not None else '')
+
+
+def parse_attributes(text):
+    """'@id @default(uuid()) @db.Uuid' -> [Attribute('id'), Attribute('default', 'uuid()'), ...]"""
+    attributes, i = [], 0
+    text = text.strip()
+    while i < len(text):
+        if text[i].isspace():
+            i += 1
+            continue
+        match = _ATTRIBUTE_NAME_RE.match(text, i)
+        if not match:
+            raise ValueError(f'Atributo inválido: {text[i:]}')
+        token = match.group(0)
+        i = match.end()
+        raw_args = None
+        if i < len(text) and text[i] == '(':
+            end = _balanced(text, i)
+            raw_args = text[i + 1:end - 1].strip()
+            i = end
+        attributes.append(Attribute(token.lstrip('@'), raw_args, block=token.startswith('@@')))
+    return attributes
+
+
+# ============================================
+# Árvore do schema
+# ============================================
+@dataclass
+class Field:
+    name: str
+    type: str
+    optional: bool
+    list: bool
+    attributes: List[Attribute]
+    location: Location
+    comment: Optional[str] = None
+    doc: Optional[str] = None  # Comentários /// imediatamente acima
+
+    def attribute(self, name):
+        return next((a for a in self.attributes if a.name == name), None)
+
+    def has(self, name):
+        return self.attribute(name) is not None
+
+    @property
+    def is_scalar(self):
+        return self.type in SCALAR_TYPES
+
+    @property
+    def column(self):
+        """Nome da coluna no banco (@map ou o próprio nome)"""
+        mapped = self.attribute('map')
+        return unquote(mapped.arg('name', 0)) if mapped else self.name
+
+    @property
+    def db_type(self):
+        """Ex: 'Uuid', 'Timestamptz(3)', 'VarChar(10)' (ou None)"""
+        native = next((a for a in self.attributes if a.name.startswith('db.')), None)
+        if native is None:
+            return None
+        return native.name[3:] + (f'({native.raw_args})' if native.raw_args is not None else '')
+
+    @property
+    def default(self):
+        attribute = self.attribute('default')
+        return attribute.arg('value', 0) if attribute else None
+
+    @property
+    def type_signature(self):
+        return self.type + ('[]' if self.list else '') + ('?' if self.optional else '')
+
+
+@dataclass
+class IndexField:
+    name: str
+    sort: Optional[str] = None
+    options: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class Index:
+    """@@index, @@unique ou @@id de um modelo (ou @unique / @id de campo)"""
+
+    kind: str  # 'index' | 'unique' | 'id'
+    fields: List[IndexField]
+    location: Location
+    map: Optional[str] = None
+    name: Optional[str] = None
+    type: Optional[str] = None  # BTree, Gin, Brin, ...
+    comment: Optional[str] = None
+    inline: bool = False  # Declarado no campo (@unique / @id)
+
+    @property
+    def columns(self):
+        return [f.name for f in self.fields]
+
+    @classmethod
+    def from_attribute(cls, attribute, location, comment=None):
+        kwargs = attribute.kwargs
+        fields = []
+        for item in parse_list(attribute.arg('fields', 0) or '[]'):
+            match = re.match(r'^(\w+)(?:\((.*)\))?$', item, re.S)
+            if not match:
+                raise ValueError(f'Campo de índice inválido: {item}')
+            options = Attribute('', match.group(2)).kwargs if match.group(2) else {}
+            fields.append(IndexField(match.group(1), options.pop('sort', None), options))
+        return cls(
+            kind=attribute.name,
+            fields=fields,
+            location=location,
+            map=unquote(kwargs['map']) if 'map' in kwargs else None,
+            name=unquote(kwargs['name']) if 'name' in kwargs else None,
+            type=kwargs.get('type'),
+            comment=comment,
+        )
+
+
+@dataclass
+class Relation:
+    """Lado de uma relação declarado em um campo de modelo"""
+
+    model: str
+    field: str
+    target: str
+    name: Optional[str]
+    fields: List[str]  # Chaves estrangeiras neste modelo (lado dono)
+    references: List[str]
+    on_delete: Optional[str]
+    on_update: Optional[str]
+    list: bool
+    optional: bool
+
+    @property
+    def owns_foreign_key(self):
+        return bool(self.fields)
+
+
+@dataclass
+class Model:
+    name: str
+    fields: Dict[str, Field]
+    attributes: List[Attribute]  # Atributos de bloco (@@map, @@index, ...)
+    indexes: List[Index]
+    location: Location
+    doc: Optional[str] = None
+    kind: str = 'model'  # 'model' | 'view' | 'type'
+
+    def field(self, name):
+        return self.fields.get(name)
+
+    def attribute(self, name):
+        return next((a for a in self.attributes if a.name == name), None)
+
+    @property
+    def table(self):
+        """Nome da tabela (@@map ou o nome do modelo)"""
+        mapped = self.attribute('map')
+        return unquote(mapped.arg('name', 0)) if mapped else self.name
+
+    @property
+    def primary_key(self):
+        return next((index for index in self.indexes if index.kind == 'id'), None)
+
+
+@dataclass
+class EnumValue:
+    name: str
+    location: Location
+    attributes: List[Attribute] = field(default_factory=list)
+    comment: Optional[str] = None
+
+
+@dataclass
+class Enum:
+    name: str
+    values: Dict[str, EnumValue]
+    attributes: List[Attribute]
+    location: Location
+    doc: Optional[str] = None
+
+    @property
+    def db_name(self):
+        mapped = next((a for a in self.attributes if a.name == 'map'), None)
+        return unquote(mapped.arg('name', 0)) if mapped else self.name
+
+
+@dataclass
+class ConfigBlock:
+    """generator / datasource"""
+
+    kind: str
+    name: str
+    properties: Dict[str, str]
+    location: Location
+
+
+@dataclass
+class SchemaFile:
+    name: str
+    sha256: str
+    line_count: int
+    models: List[Model] = field(default_factory=list)
+    enums: List[Enum] = field(default_factory=list)
+    blocks: List[ConfigBlock] = field(default_factory=list)
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+
+
+# ============================================
+# Parser
+# ============================================
+def _parse_model_line(model, code, comment, doc, location, errors):
+    if code.startswith('@@'):
+        try:
+            attributes = parse_attributes(code)
+        except ValueError as exc:
+            errors.append((location.line, str(exc)))
+            return
+        for attribute in attributes:
+            model.attributes.append(attribute)
+            if attribute.name in ('index', 'unique', 'id'):
+                model.indexes.append(Index.from_attribute(attribute, location, comment))
+        return
+
+    match = _FIELD_RE.match(code)
+    if not match:
+        errors.append((location.line, f'Linha não reconhecida em {model.name}: {code}'))
+        return
+    name, type_, is_list, optional, rest = match.groups()
+    try:
+        attributes = parse_attributes(rest or '')
+    except ValueError as exc:
+        errors.append((location.line, str(exc)))
+        return
+    model.fields[name] = Field(name, type_, bool(optional), bool(is_list), attributes, location, comment, doc)
+
+    for attribute in attributes:
+        if attribute.name in ('id', 'unique'):
+            kwargs = attribute.kwargs
+            model.indexes.append(Index(
+                kind=attribute.name,
+                fields=[IndexField(name, unquote(kwargs['sort']) if 'sort' in kwargs else None)],
+                location=location,
+                map=unquote(kwargs['map']) if 'map' in kwargs else None,
+                comment=comment,
+                inline=True,
+            ))
+
+
+def parse_file(name, text, sha256=''):
+    """Converte o texto de um arquivo .prisma em SchemaFile"""
+    lines = text.splitlines()
+    parsed = SchemaFile(name=name, sha256=sha256, line_count=len(lines))
+
+    block = None       # Model | Enum | ConfigBlock em construção
+    block_start = 0
+    doc_lines = []     # Comentários /// pendentes
+
+    for number, raw in enumerate(lines, start=1):
+        stripped = raw.strip()
+        if stripped.startswith('///'):
+            doc_lines.append(stripped[3:].strip())
+            continue
+        code, comment = split_comment(stripped)
+        if not code:
+            if not stripped:
+                doc_lines = []
+            continue
+        doc = '\n'.join(doc_lines) or None
+        doc_lines = []
+
+        if block is None:
+            match = _BLOCK_RE.match(code)
+            if not match:
+                parsed.errors.append((number, f'Linha fora de bloco: {code}'))
+                continue
+            kind, block_name = match.groups()
+            block_start = number
+            location = Location(name, number, number)
+            if kind in ('model', 'view', 'type'):
+                block = Model(block_name, {}, [], [], location, doc, kind)
+            elif kind == 'enum':
+                block = Enum(block_name, {}, [], location, doc)
+            else:
+                block = ConfigBlock(kind, block_name, {}, location)
+            continue
+
+        if code == '}':
+            block.location = Location(name, block_start, number)
+            if isinstance(block, Model):
+                parsed.models.append(block)
+            elif isinstance(block, Enum):
+                parsed.enums.append(block)
+            else:
+                parsed.blocks.append(block)
+            block = None
+            continue
+
+        location = Location(name, number, number)
+        if isinstance(block, Model):
+            _parse_model_line(block, code, comment, doc, location, parsed.errors)
+        elif isinstance(block, Enum):
+            if code.startswith('@@'):
+                block.attributes.extend(parse_attributes(code))
+                continue
+            match = _ENUM_VALUE_RE.match(code)
+            if not match:
+                parsed.errors.append((number, f'Valor de enum inválido em {block.name}: {code}'))
+                continue
+            block.values[match.group(1)] = EnumValue(match.group(1), location,
+                                                     parse_attributes(match.group(2) or ''), comment)
+        else:
+            match = _PROPERTY_RE.match(code)
+            if match:
+                block.properties[match.group(1)] = match.group(2).strip()
+            else:
+                parsed.errors.append((number, f'Propriedade inválida em {block.name}: {code}'))
+
+    if block is not None:
+        parsed.errors.append((block_start, f'Bloco {block.name} sem "}}" de fechamento'))
+    return parsed
+
+
+class Schema:
+    """Schema completo (todos os arquivos) com índices de busca por nome"""
+
+    def __init__(self, directory, files):
+        self.directory = Path(directory)
+        self.files = {f.name: f for f in files}
+        self.models: Dict[str, Model] = {}
+        self.enums: Dict[str, Enum] = {}
+        self.blocks: Dict[str, ConfigBlock] = {}
+        self.locations: Dict[str, Location] = {}
+        self.by_table: Dict[str, Model] = {}
+        self._relations = None
+
+        for schema_file in files:
+            for model in schema_file.models:
+                self.models[model.name] = model
+                self.by_table[model.table] = model
+                self.locations[model.name] = model.location
+                for field_ in model.fields.values():
+                    self.locations[f'{model.name}.{field_.name}'] = field_.location
+            for enum in schema_file.enums:
+                self.enums[enum.name] = enum
+                self.locations[enum.name] = enum.location
+                for value in enum.values.values():
+                    self.locations[f'{enum.name}.{value.name}'] = value.location
+            for config in schema_file.blocks:
+                self.blocks[config.name] = config
+                self.locations[config.name] = config.location
+
+    def model(self, name):
+        model = self.models.get(name)
+        if model is None:
+            raise KeyError(f'Modelo não encontrado no schema: {name}')
+        return model
+
+    def enum(self, name):
+        enum = self.enums.get(name)
+        if enum is None:
+            raise KeyError(f'Enum não encontrado no schema: {name}')
+        return enum
+
+    def locate(self, name):
+        """'Model', 'Model.campo', 'Enum', 'Enum.VALOR' ou nome de tabela -> Location"""
+        if name in self.locations:
+            return self.locations[name]
+        if name in self.by_table:
+            return self.by_table[name].location
+        raise KeyError(f'Nome não encontrado no schema: {name}')
+
+    def path(self, location):
+        return self.directory / location.file
+
+    @property
+    def errors(self):
+        return [(name, line, message) for name, f in self.files.items() for line, message in f.errors]
+
+    def is_relation(self, field_):
+        return field_.type in self.models
+
+    def _index_relations(self):
+        relations = []
+        for model in self.models.values():
+            for field_ in model.fields.values():
+                if not self.is_relation(field_):
+                    continue
+                attribute = field_.attribute('relation')
+                name = on_delete = on_update = None
+                fields, references = [], []
+                if attribute is not None:
+                    kwargs = attribute.kwargs
+                    name = unquote(attribute.arg('name', 0)) if attribute.arg('name', 0) else None
+                    fields = parse_list(kwargs['fields']) if 'fields' in kwargs else []
+                    references = parse_list(kwargs['references']) if 'references' in kwargs else []
+                    on_delete, on_update = kwargs.get('onDelete'), kwargs.get('onUpdate')
+                relations.append(Relation(model.name, field_.name, field_.type, name, fields, references,
+                                          on_delete, on_update, field_.list, field_.optional))
+        self._relations = relations
+        self._relations_of, self._relations_to = {}, {}
+        for relation in relations:
+            self._relations_of.setdefault(relation.model, []).append(relation)
+            self._relations_to.setdefault(relation.target, []).append(relation)
+
+    @property
+    def relations(self) -> List[Relation]:
+        """Todos os lados de relação declarados (campos cujo tipo é outro modelo)"""
+        if self._relations is None:
+            self._index_relations()
+        return self._relations
+
+    def relations_of(self, model_name):
+        """Relações declaradas no modelo"""
+        if self._relations is None:
+            self._index_relations()
+        return self._relations_of.get(model_name, [])
+
+    def relations_to(self, model_name):
+        """Relações de outros modelos que apontam para este"""
+        if self._relations is None:
+            self._index_relations()
+        return self._relations_to.get(model_name, [])
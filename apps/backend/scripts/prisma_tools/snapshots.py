@@ -0,0 +1,204 @@
+"""
+Codificação compacta do previousData/newData das tabelas *_history
+
+    from prisma_tools.snapshots import SnapshotChain
+
+    chain = SnapshotChain(every=10)
+    for previous, new in rows_of_one_record:          # em ordem de versionNumber
+        step = chain.step(previous, new)              # aceita linhas completas ou já codificadas
+        step.previous, step.new                       # JSON completo da versão
+        step.encoded_previous, step.encoded_new       # o que gravar na linha
+
+Cada registro versionado forma uma cadeia de linhas de histórico. A cada
+`every` versões a linha guarda o JSON completo (âncora); nas demais,
+previousData e newData viram um envelope {"$patch": [...]} com operações
+JSON Patch (RFC 6902: add, remove, replace) sobre o newData da linha
+anterior. Como previousData de uma versão costuma ser o newData da
+anterior, o envelope dele quase sempre é {"$patch": []}.
+
+O formato cabe nas colunas Json existentes, sem migração: uma linha sem
+envelope é completa, então as linhas gravadas pelo backend depois da
+compactação continuam válidas (e viram âncoras até a próxima execução do
+compact-history.py). Um campo só vira envelope se ficar menor que o JSON
+completo. Listas são trocadas inteiras (replace), sem diff por posição.
+
+Reconstruir uma versão exige as linhas desde a âncora anterior; com
+every=1 tudo volta a ser completo (--expand). changedFields não muda.
+"""
+
+import copy
+import json
+from dataclasses import dataclass
+from typing import Any, List
+
+PATCH_KEY = '$patch'
+DEFAULT_SNAPSHOT_EVERY = 10  # Uma âncora (JSON completo) a cada N versões do registro
+
+
+def is_patch(value):
+    """True se o valor é um envelope {"$patch": [...]}"""
+    return isinstance(value, dict) and len(value) == 1 and isinstance(value.get(PATCH_KEY), list)
+
+
+def _escape(key):
+    return key.replace('~', '~0').replace('/', '~1')
+
+
+def _unescape(token):
+    return token.replace('~1', '/').replace('~0', '~')
+
+
+def json_size(value):
+    """Bytes do JSON compacto (aproxima o tamanho no jsonb)"""
+    return len(json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def json_equal(a, b):
+    """Igualdade de JSON sem as coerções do Python (1 == 1.0 == True), inclusive dentro de listas"""
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(json_equal(a[key], b[key]) for key in a)
+    if isinstance(a, list):
+        return len(a) == len(b) and all(map(json_equal, a, b))
+    return a == b
+
+
+def json_diff(old, new, path=''):
+    """Operações JSON Patch que levam old a new (objetos recursivamente; listas e escalares por replace)"""
+    if isinstance(old, dict) and isinstance(new, dict):
+        # Chaves em ordem fixa: documentos reconstruídos (e o jsonb) não preservam a ordem
+        # original, e a mesma diferença precisa gerar o mesmo envelope a cada execução
+        ops = []
+        for key in sorted(old):
+            if key not in new:
+                ops.append({'op': 'remove', 'path': f'{path}/{_escape(key)}'})
+        for key in sorted(new):
+            child = f'{path}/{_escape(key)}'
+            if key not in old:
+                ops.append({'op': 'add', 'path': child, 'value': new[key]})
+            else:
+                ops.extend(json_diff(old[key], new[key], child))
+        return ops
+    if json_equal(old, new):
+        return []
+    return [{'op': 'replace', 'path': path, 'value': new}]
+
+
+def _parent(document, tokens, path):
+    for token in tokens:
+        if isinstance(document, list):
+            document = document[int(token)]
+        elif isinstance(document, dict) and token in document:
+            document = document[token]
+        else:
+            raise ValueError(f'Caminho inexistente no JSON Patch: {path}')
+    return document
+
+
+def apply_patch(document, ops):
+    """Aplica operações JSON Patch (add, remove, replace) a uma cópia do documento"""
+    document = copy.deepcopy(document)
+    for op in ops:
+        path = op['path']
+        if path == '':
+            if op['op'] == 'remove':
+                raise ValueError('JSON Patch não pode remover a raiz')
+            document = copy.deepcopy(op['value'])
+            continue
+        if not path.startswith('/'):
+            raise ValueError(f'Caminho inválido no JSON Patch: {path}')
+        *tokens, last = [_unescape(token) for token in path[1:].split('/')]
+        parent = _parent(document, tokens, path)
+        if isinstance(parent, list):
+            index = len(parent) if last == '-' else int(last)
+            if op['op'] == 'add':
+                parent.insert(index, copy.deepcopy(op['value']))
+            elif op['op'] == 'remove':
+                del parent[index]
+            elif op['op'] == 'replace':
+                parent[index] = copy.deepcopy(op['value'])
+            else:
+                raise ValueError(f"Operação JSON Patch não suportada: {op['op']}")
+        elif isinstance(parent, dict):
+            if op['op'] in ('add', 'replace'):
+                if op['op'] == 'replace' and last not in parent:
+                    raise ValueError(f'Caminho inexistente no JSON Patch: {path}')
+                parent[last] = copy.deepcopy(op['value'])
+            elif op['op'] == 'remove':
+                if last not in parent:
+                    raise ValueError(f'Caminho inexistente no JSON Patch: {path}')
+                del parent[last]
+            else:
+                raise ValueError(f"Operação JSON Patch não suportada: {op['op']}")
+        else:
+            raise ValueError(f'Caminho inexistente no JSON Patch: {path}')
+    return document
+
+
+def decode_value(value, base):
+    """Valor completo de um campo: o próprio valor, ou o envelope aplicado ao newData anterior"""
+    if not is_patch(value):
+        return value
+    if base is None:
+        raise ValueError('Envelope $patch sem versão anterior (cadeia sem âncora)')
+    return apply_patch(base, value[PATCH_KEY])
+
+
+def encode_value(value, base):
+    """Envelope sobre base, se ficar menor que o valor completo (None nunca vira envelope)"""
+    if value is None or base is None:
+        return value
+    envelope = {PATCH_KEY: json_diff(base, value)}
+    return envelope if json_size(envelope) < json_size(value) else value
+
+
+@dataclass
+class ChainStep:
+    position: int  # Posição na cadeia do registro (0 = primeira versão)
+    previous: Any
+    new: Any
+    encoded_previous: Any
+    encoded_new: Any
+
+    @property
+    def anchor(self):
+        """Linha reconstruível sozinha (ponto de partida da leitura de uma versão)"""
+        return not is_patch(self.encoded_previous) and not is_patch(self.encoded_new)
+
+
+class SnapshotChain:
+    """Decodifica e recodifica as linhas de histórico de um registro, em ordem de versão"""
+
+    def __init__(self, every=DEFAULT_SNAPSHOT_EVERY):
+        if every < 1:
+            raise ValueError('every deve ser >= 1')
+        self.every = every
+        self.position = 0
+        self.base = None  # newData completo da linha anterior
+
+    def decode(self, previous, new):
+        """(previousData, newData) completos de uma linha, sem avançar a cadeia"""
+        return decode_value(previous, self.base), decode_value(new, self.base)
+
+    def step(self, previous, new):
+        previous, new = self.decode(previous, new)
+        if self.position % self.every == 0:
+            encoded = (previous, new)
+        else:
+            encoded = (encode_value(previous, self.base), encode_value(new, self.base))
+        step = ChainStep(self.position, previous, new, *encoded)
+        self.position += 1
+        self.base = new
+        return step
+
+
+def decode_chain(rows):
+    """[(previousData, newData)] completos de linhas consecutivas a partir de uma âncora"""
+    chain = SnapshotChain()
+    decoded: List[tuple] = []
+    for previous, new in rows:
+        previous, new = chain.decode(previous, new)
+        chain.base = new
+        decoded.append((previous, new))
+    return decoded
@@ -0,0 +1,280 @@
+"""
+Leitura dos migration.sql (prisma/migrations/*/migration.sql)
+
+    from prisma_tools.sql import MIGRATIONS_DIR, list_migrations, split_statements
+
+    for migration in list_migrations():
+        for statement in split_statements(migration.sql):
+            print(migration.name, statement.line, statement.head)
+
+split_statements separa os comandos por ';' respeitando strings ('...'),
+identificadores ("..."), dollar quotes ($$...$$, $tag$...$tag$) e
+comentários, e guarda a linha onde cada comando começa. block_statements faz
+o mesmo para o corpo de um bloco DO: comandos diretos e os de EXECUTE
+'...' / EXECUTE format('...', ...), na ordem em que aparecem.
+"""
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+from .ddl import quote, sql_literal
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / 'prisma' / 'migrations'
+
+_DOLLAR_TAG_RE = re.compile(r'\$(?:[A-Za-z_]\w*)?\$')
+_EXECUTE_RE = re.compile(r'\bEXECUTE\s+(?!FUNCTION\b|PROCEDURE\b)(format\s*\()?', re.I)
+_LITERAL_START_RE = re.compile(r"\s*E?(?=')", re.I)
+_FORMAT_SPEC_RE = re.compile(r'%(?:(\d+)\$)?([ILs%])')
+# Comando SQL dentro de um bloco plpgsql (depois de BEGIN/THEN/ELSE/LOOP ou no início do trecho)
+_INNER_STATEMENT_RE = re.compile(r'(?:^|\b(?:BEGIN|THEN|ELSE|LOOP)\s+)((?:ALTER\s+(?:TABLE|TYPE|INDEX)|'
+                                 r'CREATE\s+(?:UNIQUE\s+)?INDEX|CREATE\s+(?:UNLOGGED\s+)?TABLE|CREATE\s+TYPE|'
+                                 r'CREATE\s+(?:OR\s+REPLACE\s+)?(?:TRIGGER|FUNCTION)|CREATE\s+EXTENSION|'
+                                 r'DROP\s+(?:INDEX|TABLE|TYPE|TRIGGER|FUNCTION)|COMMENT\s+ON|'
+                                 r'UPDATE|INSERT\s+INTO|DELETE\s+FROM|TRUNCATE)\b)', re.I | re.S)
+_TENANT_LOOP_RE = re.compile(r"tenant_%|\bLOOP\b", re.I)
+
+
+@dataclass
+class SqlStatement:
+    sql: str     # Sem o ';' final e sem comentários iniciais
+    line: int    # 1-based, no arquivo
+    offset: int  # Posição do início do comando no texto
+
+    @property
+    def head(self):
+        """Primeira linha do comando, para relatórios"""
+        return self.sql.split('\n', 1)[0].strip()
+
+
+@dataclass
+class MigrationFile:
+    name: str  # Diretório: <timestamp>_<nome>
+    path: Path
+
+    @property
+    def sql(self):
+        return self.path.read_text(encoding='utf-8')
+
+
+def list_migrations(migrations_dir=MIGRATIONS_DIR):
+    """Migrações em ordem de aplicação (nome do diretório)"""
+    directory = Path(migrations_dir)
+    return [MigrationFile(path.parent.name, path) for path in sorted(directory.glob('*/migration.sql'))]
+
+
+def skip_sql_token(text, i):
+    """Se text[i] abre string, identificador, dollar quote ou comentário, retorna o índice depois dele"""
+    char = text[i]
+    if char in ("'", '"'):
+        j = i + 1
+        while j < len(text):
+            if text[j] == char:
+                if j + 1 < len(text) and text[j + 1] == char:  # '' e "" escapados
+                    j += 2
+                    continue
+                return j + 1
+            j += 1
+        return len(text)
+    if text.startswith('--', i):
+        end = text.find('\n', i)
+        return len(text) if end == -1 else end
+    if text.startswith('/*', i):
+        end = text.find('*/', i + 2)
+        return len(text) if end == -1 else end + 2
+    if char == '$':
+        match = _DOLLAR_TAG_RE.match(text, i)
+        if match and not (i > 0 and (text[i - 1].isalnum() or text[i - 1] == '_')):
+            end = text.find(match.group(0), match.end())
+            return len(text) if end == -1 else end + len(match.group(0))
+    return None
+
+
+def strip_sql_comments(text):
+    """Troca comentários -- e /* */ por espaços (mesmo tamanho: offsets e linhas continuam valendo)"""
+    out, i = [], 0
+    while i < len(text):
+        end = skip_sql_token(text, i)
+        if end is None:
+            out.append(text[i])
+            i += 1
+            continue
+        chunk = text[i:end]
+        if chunk.startswith(('--', '/*')):
+            chunk = ''.join(c if c == '\n' else ' ' for c in chunk)
+        out.append(chunk)
+        i = end
+    return ''.join(out)
+
+
+def split_statements(text) -> List[SqlStatement]:
+    statements, start, i = [], 0, 0
+    code = strip_sql_comments(text)
+    while i <= len(code):
+        if i == len(code) or code[i] == ';':
+            chunk = code[start:i]
+            stripped = chunk.strip()
+            if stripped:
+                leading = len(chunk) - len(chunk.lstrip())
+                statements.append(SqlStatement(stripped, code.count('\n', 0, start + leading) + 1, start + leading))
+            start = i + 1
+            i += 1
+            continue
+        end = skip_sql_token(code, i)
+        i = end if end is not None else i + 1
+    return statements
+
+
+def mask_literals(text):
+    """Troca o conteúdo de strings/dollar quotes/comentários por espaços (mesmo tamanho) para buscar palavras-chave"""
+    out, i = [], 0
+    while i < len(text):
+        end = skip_sql_token(text, i)
+        if end is None:
+            out.append(text[i])
+            i += 1
+        else:
+            out.append(''.join(c if c == '\n' else ' ' for c in text[i:end]))
+            i = end
+    return ''.join(out)
+
+
+def closing_paren(text, start):
+    """Índice logo após o ')' que fecha o '(' em text[start] (strings e comentários respeitados)"""
+    depth, i = 0, start
+    while i < len(text):
+        end = skip_sql_token(text, i)
+        if end is not None:
+            i = end
+            continue
+        if text[i] == '(':
+            depth += 1
+        elif text[i] == ')':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    raise ValueError(f'Parênteses não balanceados: {text[start:start + 80]}')
+
+
+def split_sql_list(text, separator=','):
+    """Divide em separator fora de parênteses, colchetes e strings: colunas de um CREATE TABLE, cláusulas de um ALTER"""
+    parts, depth, start, i = [], 0, 0, 0
+    while i < len(text):
+        end = skip_sql_token(text, i)
+        if end is not None:
+            i = end
+            continue
+        char = text[i]
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(text[start:i].strip())
+            start = i + 1
+        i += 1
+    tail = text[start:].strip()
+    if tail:
+        parts.append(tail)
+    return [part for part in parts if part]
+
+
+def sql_words(text):
+    """
+    Palavras de nível superior com a posição: identificador/literal entre
+    aspas, grupo entre parênteses ou sequência sem espaços
+
+        sql_words('"id" DECIMAL(10,2) NOT NULL') -> [(0, 4, '"id"'), (5, 12, 'DECIMAL'), (12, 18, '(10,2)'), ...]
+    """
+    words, i = [], 0
+    while i < len(text):
+        char = text[i]
+        if char.isspace():
+            i += 1
+            continue
+        if char == '(':
+            end = closing_paren(text, i)
+        else:
+            end = skip_sql_token(text, i)
+            if end is None:
+                end = i
+                while end < len(text) and not text[end].isspace() and text[end] not in '()"\'':
+                    end += 1
+                end = max(end, i + 1)
+        words.append((i, end, text[i:end]))
+        i = end
+    return words
+
+
+def string_value(literal):
+    """"'it''s'" -> "it's" (também E'...' e $$...$$); None se não for literal"""
+    literal = literal.strip()
+    if literal[:2].upper() == "E'":
+        literal = literal[1:]
+    if len(literal) >= 2 and literal[0] == literal[-1] == "'":
+        return literal[1:-1].replace("''", "'")
+    match = _DOLLAR_TAG_RE.match(literal)
+    if match and literal.endswith(match.group(0)) and len(literal) >= 2 * len(match.group(0)):
+        return literal[len(match.group(0)):-len(match.group(0))]
+    return None
+
+
+def expand_format(template, args):
+    """
+    format('ALTER TABLE %I.x ADD VALUE %L', schema_name, 'A') com os argumentos
+    literais substituídos; argumentos dinâmicos (variáveis) ficam como %I / %L
+    """
+    position = 0
+
+    def replace(match):
+        nonlocal position
+        index, kind = match.group(1), match.group(2)
+        if kind == '%':
+            return '%'
+        if index:
+            position = int(index) - 1
+        value = string_value(args[position]) if position < len(args) else None
+        position += 1
+        if value is None:
+            return f'%{kind}'
+        return {'I': quote, 'L': sql_literal, 's': str}[kind](value)
+    return _FORMAT_SPEC_RE.sub(replace, template)
+
+
+def loops_over_tenants(body):
+    """Bloco DO que percorre os schemas tenant_* (FOR schema_name IN ... LOOP)"""
+    return bool(_TENANT_LOOP_RE.search(body))
+
+
+def block_statements(body) -> List[SqlStatement]:
+    """Comandos de um bloco plpgsql (corpo de DO $$ ... $$), na ordem: diretos e de EXECUTE"""
+    masked = mask_literals(body)
+    found = []
+    for match in _EXECUTE_RE.finditer(masked):
+        literal = _LITERAL_START_RE.match(body, match.end())
+        if not literal:
+            continue  # EXECUTE de variável: não dá para saber o comando
+        start = literal.end()
+        end = skip_sql_token(body, start)
+        template = string_value(body[start:end])
+        if match.group(1):
+            close = closing_paren(body, match.end() - 1)
+            args = split_sql_list(body[end:close - 1].lstrip().lstrip(','))
+            template = expand_format(template, args)
+        for statement in split_statements(template):
+            found.append(SqlStatement(statement.sql, body.count('\n', 0, match.start()) + 1, match.start()))
+    for statement in split_statements(body):
+        end = statement.offset + len(statement.sql)
+        inner = _INNER_STATEMENT_RE.search(masked[statement.offset:end])
+        if inner:
+            offset = statement.offset + inner.start(1)
+            found.append(SqlStatement(body[offset:end].strip(), body.count('\n', 0, offset) + 1, offset))
+    return sorted(found, key=lambda statement: statement.offset)
+
+
+def unquote_identifier(name):
+    """'"public"."daily_records"' / '%I.daily_records' -> 'daily_records' (sem schema)"""
+    last = re.split(r'\.(?=(?:[^"]*"[^"]*")*[^"]*$)', name.strip())[-1]
+    return last[1:-1].replace('""', '"') if last.startswith('"') and last.endswith('"') else last
@@ -0,0 +1,231 @@
+"""
+Squash das migrações em um baseline e template de schema para tenants novos
+
+    from prisma_tools.catalog import replay_migrations
+    from prisma_tools.squash import build_template, provision_sql, render_baseline, verify_baseline
+
+    catalog = replay_migrations(role='tenant')
+    sql = render_baseline(catalog)
+    assert not verify_baseline(catalog, sql)        # baseline reproduz a estrutura do histórico
+
+    template = build_template()                     # cacheado pelo conjunto de migrações
+    print(provision_sql('tenant_exemplo_abc123', template))
+
+O baseline é o DDL da estrutura final do replay (catalog.py), no formato do
+prisma migrate (seções -- CreateTable etc.). A verificação offline replaya o
+próprio baseline e compara as duas estruturas; verify_in_database faz o
+mesmo num banco descartável, comparando o pg_dump --schema-only do
+histórico aplicado com o do baseline.
+
+O template é o baseline mais a tabela _prisma_migrations já preenchida com
+todas as migrações (mesmo checksum que o Prisma calcula): um schema criado
+a partir dele é idêntico a um que rodou `prisma migrate deploy` e continua
+recebendo as migrações futuras normalmente. Fica em
+~/.cache/rafa-ilpi/tenant-template, uma versão por conjunto de migrações.
+"""
+
+import difflib
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List
+
+from .catalog import Catalog, replay_migrations, replay_sql
+from .ddl import build_tables, create_partitions_sql, quote, sql_literal
+from .psql import dump_structure, run_psql
+from .schema import Schema
+from .sql import MIGRATIONS_DIR, list_migrations
+
+DEFAULT_TEMPLATE_DIR = Path.home() / '.cache' / 'rafa-ilpi' / 'tenant-template'
+TEMPLATE_VERSION = 2  # Incrementar ao mudar o replay ou a renderização
+
+# Ordem das seções no baseline (funções antes das tabelas: defaults e triggers dependem delas)
+BASELINE_SECTIONS = ('CreateExtension', 'CreateEnum', 'CreateFunction', 'CreateTable', 'CreatePartitions', 'CreateIndex',
+                     'AddForeignKey', 'CreateTrigger', 'Comment')
+
+# Tabela de controle do prisma migrate (igual à que o próprio Prisma cria)
+PRISMA_MIGRATIONS_DDL = '''CREATE TABLE IF NOT EXISTS "_prisma_migrations" (
+    "id" VARCHAR(36) PRIMARY KEY NOT NULL,
+    "checksum" VARCHAR(64) NOT NULL,
+    "finished_at" TIMESTAMPTZ,
+    "migration_name" VARCHAR(255) NOT NULL,
+    "logs" TEXT,
+    "rolled_back_at" TIMESTAMPTZ,
+    "started_at" TIMESTAMPTZ NOT NULL DEFAULT now(),
+    "applied_steps_count" INTEGER NOT NULL DEFAULT 0
+);'''
+
+_TYPE_ALIASES = (('CHARACTER VARYING', 'VARCHAR'), ('TIMESTAMP WITH TIME ZONE', 'TIMESTAMPTZ'),
+                 ('TIMESTAMP WITHOUT TIME ZONE', 'TIMESTAMP'), ('INT4', 'INTEGER'), ('INT8', 'BIGINT'),
+                 ('FLOAT8', 'DOUBLE PRECISION'), ('BOOL', 'BOOLEAN'), ('NUMERIC', 'DECIMAL'), ('INT', 'INTEGER'))
+
+
+# ============================================
+# Baseline
+# ============================================
+def render_baseline(catalog: Catalog, title=None):
+    """DDL que cria do zero a estrutura do catálogo"""
+    sections = {section: [] for section in BASELINE_SECTIONS}
+    sections['CreateExtension'] = list(catalog.extensions.values())
+    sections['CreateEnum'] = [f'CREATE TYPE {quote(name)} AS ENUM ({", ".join(map(sql_literal, values))})'
+                              for name, values in catalog.enums.items()]
+    sections['CreateFunction'] = list(catalog.functions.values())
+    for table in catalog.tables.values():
+        lines = [f'    {column.definition()}' for column in table.columns.values()]
+        inline = [c for c in table.constraints.values() if c.kind != 'foreign']
+        body = ',\n'.join(lines)
+        if inline:
+            body += ',\n\n' + ',\n'.join(f'    CONSTRAINT {quote(c.name)} {c.definition}' for c in inline)
+        partitioning = f' PARTITION BY {table.partition_by}' if table.partition_by else ''
+        sections['CreateTable'].append(f'CREATE TABLE {quote(table.name)} (\n{body}\n){partitioning}')
+        if table.partition_column:
+            sections['CreatePartitions'].append(create_partitions_sql(table.name, table.partition_column).rstrip(';'))
+        sections['AddForeignKey'].extend(f'ALTER TABLE {quote(table.name)} ADD CONSTRAINT {quote(c.name)} '
+                                         f'{c.definition}' for c in table.constraints.values() if c.kind == 'foreign')
+    sections['CreateIndex'] = [index.create() for index in catalog.indexes.values()]
+    sections['CreateTrigger'] = list(catalog.triggers.values())
+    sections['Comment'] = list(catalog.comments.values())
+
+    parts = [f'-- {title}'] if title else []
+    for section in BASELINE_SECTIONS:
+        parts.extend(f'-- {section}\n{sql};' for sql in sections[section])
+    return '\n\n'.join(parts) + '\n'
+
+
+def verify_baseline(catalog: Catalog, sql) -> List[str]:
+    """Diferenças entre a estrutura do histórico e a do baseline replayado (vazio = equivalentes)"""
+    return catalog.differences(replay_sql(sql, catalog.role, 'baseline'))
+
+
+def _normalize_type(sql_type):
+    normalized = ' '.join(sql_type.replace(', ', ',').split())
+    if '"' in normalized:
+        return normalized.split('.')[-1]  # "public"."Gender" -> "Gender"
+    normalized = normalized.upper()
+    for alias, canonical in _TYPE_ALIASES:
+        if normalized == alias or normalized.startswith((alias + '(', alias + '[')):
+            return canonical + normalized[len(alias):]
+    return normalized
+
+
+def schema_drift(catalog: Catalog, schema: Schema) -> List[str]:
+    """O que o histórico de migrações produz e o schema Prisma não declara (e vice-versa)"""
+    expected = build_tables(schema)
+    drift = []
+    for name in sorted(set(expected) - set(catalog.tables)):
+        drift.append(f'tabela {name}: no schema, não nas migrações')
+    for name in sorted(set(catalog.tables) - set(expected)):
+        drift.append(f'tabela {name}: nas migrações, não no schema')
+    for name in sorted(set(expected) & set(catalog.tables)):
+        table, actual = expected[name], catalog.tables[name]
+        if table.partition_by != actual.partition_column:
+            drift.append(f'{name}: particionada por {actual.partition_column or "nada"} nas migrações, '
+                         f'por {table.partition_by or "nada"} no schema')
+        for column in table.columns.values():
+            found = actual.columns.get(column.name)
+            if found is None:
+                drift.append(f'{name}.{column.name}: coluna do schema ausente nas migrações')
+                continue
+            if _normalize_type(found.type) != _normalize_type(column.type):
+                drift.append(f'{name}.{column.name}: tipo {found.type} nas migrações, {column.type} no schema')
+            if found.not_null != column.not_null:
+                drift.append(f'{name}.{column.name}: {"NOT NULL" if found.not_null else "nullable"} nas migrações, '
+                             f'{"NOT NULL" if column.not_null else "nullable"} no schema')
+        for column in actual.columns:
+            if column not in table.columns:
+                drift.append(f'{name}.{column}: coluna nas migrações, não no schema')
+        indexes = {i.name for i in catalog.indexes.values() if i.table == name} | {
+            c.name for c in actual.constraints.values() if c.kind == 'unique'}
+        for index in sorted(set(table.indexes) - indexes):
+            drift.append(f'{name}: índice {index} do schema ausente nas migrações')
+        foreign_keys = {c.name for c in actual.constraints.values() if c.kind == 'foreign'}
+        for foreign_key in sorted(set(table.foreign_keys) - foreign_keys):
+            drift.append(f'{name}: FK {foreign_key} do schema ausente nas migrações')
+    return drift
+
+
+# ============================================
+# Template de schema (provisionamento de tenants)
+# ============================================
+@dataclass
+class TenantTemplate:
+    fingerprint: str
+    role: str
+    migrations: List[str]   # Nomes, em ordem
+    checksums: List[str]    # SHA-256 de cada migration.sql (o mesmo do _prisma_migrations)
+    baseline: str
+
+    def sql(self):
+        """Baseline + _prisma_migrations preenchida (roda com search_path no schema novo)"""
+        rows = ',\n'.join(f"    (gen_random_uuid()::text, {sql_literal(checksum)}, now(), {sql_literal(name)}, 1)"
+                          for name, checksum in zip(self.migrations, self.checksums))
+        bookkeeping = (f'{PRISMA_MIGRATIONS_DDL}\n\n'
+                       f'INSERT INTO "_prisma_migrations" ("id", "checksum", "finished_at", "migration_name", '
+                       f'"applied_steps_count") VALUES\n{rows};\n')
+        return f'{self.baseline}\n-- PrismaMigrations\n{bookkeeping}'
+
+
+def migration_checksum(path):
+    """Checksum que o prisma migrate grava em _prisma_migrations (SHA-256 do arquivo)"""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def build_template(migrations_dir=MIGRATIONS_DIR, cache_dir=DEFAULT_TEMPLATE_DIR, role='tenant'):
+    """TenantTemplate das migrações atuais (do cache se nenhuma migration.sql mudou; cache_dir=None desativa)"""
+    migrations = list_migrations(migrations_dir)
+    checksums = [migration_checksum(m.path) for m in migrations]
+    digest = hashlib.sha256(json.dumps([TEMPLATE_VERSION, role, [m.name for m in migrations], checksums])
+                            .encode('utf-8')).hexdigest()
+    path = Path(cache_dir) / f'{role}-{digest[:16]}.json' if cache_dir else None
+    if path is not None and path.exists():
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return TenantTemplate(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            pass
+
+    catalog = replay_migrations(role, migrations_dir)
+    title = f'Template {role} ({len(migrations)} migrações, até {migrations[-1].name})' if migrations else None
+    template = TenantTemplate(digest, role, [m.name for m in migrations], checksums, render_baseline(catalog, title))
+    if path is not None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+        with open(staging, 'w', encoding='utf-8') as f:
+            json.dump(asdict(template), f, ensure_ascii=False)
+        os.replace(staging, path)
+    return template
+
+
+def provision_sql(schema_name, template: TenantTemplate):
+    """Script psql que cria o schema e toda a estrutura numa transação só"""
+    create = 'CREATE SCHEMA IF NOT EXISTS' if template.role == 'public' else 'CREATE SCHEMA'
+    return (f'-- Schema {schema_name} a partir do template {template.fingerprint[:12]}\n'
+            f'BEGIN;\n{create} {quote(schema_name)};\nSET LOCAL search_path TO {quote(schema_name)};\n\n'
+            f'{template.sql()}\nCOMMIT;\n')
+
+
+# ============================================
+# Verificação num banco real (descartável)
+# ============================================
+def verify_in_database(database_url, baseline, migrations_dir=MIGRATIONS_DIR, role='tenant'):
+    """
+    Aplica o histórico e o baseline em dois schemas de rascunho e compara os
+    pg_dump. Use um banco descartável: blocos DO que percorrem tenant_* também
+    alcançam os outros schemas de tenant que existirem nele.
+    """
+    prefix = 'tenant_squash' if role == 'tenant' else 'squash'
+    history, squashed = f'{prefix}_history', f'{prefix}_baseline'
+    drop = f'DROP SCHEMA IF EXISTS {quote(history)} CASCADE; DROP SCHEMA IF EXISTS {quote(squashed)} CASCADE;'
+    run_psql(database_url, drop)
+    try:
+        run_psql(database_url, f'CREATE SCHEMA {quote(history)};')
+        for migration in list_migrations(migrations_dir):
+            run_psql(database_url, migration.sql, history)
+        run_psql(database_url, f'CREATE SCHEMA {quote(squashed)};')
+        run_psql(database_url, baseline, squashed)
+        return list(difflib.unified_diff(dump_structure(database_url, history), dump_structure(database_url, squashed),
+                                         'histórico', 'baseline', lineterm=''))
+    finally:
+        run_psql(database_url, drop)
@@ -0,0 +1,230 @@
+"""
+Leitura leve de código TypeScript para as análises de queries Prisma e os codemods
+
+Não é um parser de TypeScript: só o suficiente para localizar chamadas
+`<client>.<modelo>.<método>(...)` e ler os objetos literais passados a elas
+(where, orderBy, include...). Comentários são trocados por espaços antes de
+tudo, preservando offsets e números de linha.
+
+Tudo passa pelo mesmo tokenizador (tokenize / iter_tokens): strings,
+template literals (inteiros, com ${...}), comentários e regex literais são
+tokens opacos, então um `"` dentro de /"/g ou de um comentário não desalinha
+os delimitadores.
+"""
+
+import re
+from dataclasses import dataclass
+
+WS, COMMENT, STRING, IDENT, NUMBER, PUNCT, REGEX = 'ws', 'comment', 'string', 'ident', 'number', 'punct', 'regex'
+
+_OPEN = {'(': ')', '[': ']', '{': '}'}
+_CLOSE = set(_OPEN.values())
+_IDENTIFIER_RE = re.compile(r'^[A-Za-z_$][\w$]*$')
+_SIMPLE_RE = re.compile(r'(?P<ws>\s+)|(?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))|(?P<ident>[A-Za-z_$][\w$]*)'
+                        r'|(?P<number>\d[\w.]*)|(?P<punct>\?\.|\.\.\.|=>|===|!==|==|!=|<=|>=|&&|\|\||\?\?|.)', re.S)
+# Depois destes tokens uma '/' começa um regex literal, não uma divisão
+_REGEX_PREFIX = set('(,=:[!&|?{};') | {'return', 'typeof', '=>', '&&', '||', '??', '===', '!==', '==', '!='}
+
+
+@dataclass
+class Token:
+    kind: str
+    text: str
+    start: int
+
+    @property
+    def end(self):
+        return self.start + len(self.text)
+
+    @property
+    def significant(self):
+        return self.kind not in (WS, COMMENT)
+
+
+def _regex_end(text, start):
+    i, in_class = start + 1, False
+    while i < len(text) and text[i] != '\n':
+        char = text[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '/' and not in_class:
+            i += 1
+            while i < len(text) and (text[i].isalnum()):
+                i += 1  # Flags
+            return i
+        i += 1
+    return None
+
+
+def iter_tokens(text, start=0):
+    """Tokens de text a partir de start (a concatenação reproduz o texto)"""
+    i, previous = start, None
+    while i < len(text):
+        char = text[i]
+        token = None
+        if char in '\'"`':
+            token = Token(STRING, text[i:skip_string(text, i)], i)
+        elif char == '/' and not text.startswith(('//', '/*'), i) and (previous is None or previous.text in _REGEX_PREFIX):
+            end = _regex_end(text, i)
+            if end is not None:
+                token = Token(REGEX, text[i:end], i)
+        if token is None:
+            match = _SIMPLE_RE.match(text, i)
+            token = Token(match.lastgroup, match.group(0), i)
+        if token.significant:
+            previous = token
+        yield token
+        i = token.end
+
+
+def tokenize(text):
+    return list(iter_tokens(text))
+
+
+def strip_comments(text):
+    """Troca comentários // e /* */ por espaços (mantém quebras de linha, strings e regex)"""
+    return ''.join(re.sub(r'[^\n]', ' ', token.text) if token.kind == COMMENT else token.text
+                   for token in iter_tokens(text))
+
+
+def skip_string(text, start):
+    """Índice logo após a string que começa em text[start] (', " ou `, com ${...})"""
+    quote, i = text[start], start + 1
+    while i < len(text):
+        char = text[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == quote:
+            return i + 1
+        if quote == '`' and text.startswith('${', i):
+            try:
+                i = balanced(text, i + 1)
+            except ValueError:
+                return len(text)
+            continue
+        i += 1
+    return len(text)
+
+
+def balanced(text, start):
+    """Índice logo após o fechamento do (, [ ou { em text[start]"""
+    stack = []
+    for token in iter_tokens(text, start):
+        if token.kind != PUNCT:
+            continue
+        if token.text in _OPEN:
+            stack.append(_OPEN[token.text])
+        elif token.text in _CLOSE:
+            if not stack or stack.pop() != token.text:
+                raise ValueError(f'Delimitadores não balanceados na posição {token.start}')
+            if not stack:
+                return token.end
+    raise ValueError(f'Delimitador aberto na posição {start} não fecha')
+
+
+def split_top_level(text, separator=','):
+    """Divide text em separator fora de (), [], {}, strings e regex"""
+    parts, depth, start = [], 0, 0
+    for token in iter_tokens(text):
+        if token.kind != PUNCT:
+            continue
+        if token.text in _OPEN:
+            depth += 1
+        elif token.text in _CLOSE:
+            depth -= 1
+        elif token.text == separator and depth == 0:
+            parts.append(text[start:token.start].strip())
+            start = token.end
+    tail = text[start:].strip()
+    if tail:
+        parts.append(tail)
+    return parts
+
+
+def unquote(value):
+    value = value.strip()
+    return value[1:-1] if len(value) >= 2 and value[0] == value[-1] and value[0] in '\'"`' else value
+
+
+def object_entries(literal):
+    """'{ a: 1, b, ...c }' -> [('a', '1'), ('b', 'b'), ('...', 'c')]; None se não for objeto literal"""
+    literal = literal.strip()
+    if not literal.startswith('{') or not literal.endswith('}'):
+        return None
+    entries = []
+    for part in split_top_level(literal[1:-1]):
+        if part.startswith('...'):
+            entries.append(('...', part[3:].strip()))
+            continue
+        pieces = split_top_level(part, ':')
+        key = unquote(pieces[0])
+        if len(pieces) == 1:
+            if _IDENTIFIER_RE.match(key):
+                entries.append((key, key))  # Shorthand
+            continue
+        entries.append((key, part[len(pieces[0]):].lstrip()[1:].strip()))
+    return entries
+
+
+def array_items(literal):
+    literal = literal.strip()
+    if not literal.startswith('[') or not literal.endswith(']'):
+        return None
+    return split_top_level(literal[1:-1])
+
+
+def line_of(text, position):
+    return text.count('\n', 0, position) + 1
+
+
+def find_calls(text, methods):
+    """[(posição, acessor, método, primeiro argumento bruto)] de chamadas `.acessor.método(...)`"""
+    pattern = re.compile(r'\.([A-Za-z_$][\w$]*)\s*\.\s*(' + '|'.join(map(re.escape, methods)) + r')\s*(?:<[^>(]*>)?\s*\(')
+    calls = []
+    for match in pattern.finditer(text):
+        open_paren = match.end() - 1
+        try:
+            end = balanced(text, open_paren)
+        except ValueError:
+            continue
+        arguments = split_top_level(text[open_paren + 1:end - 1])
+        calls.append((match.start(), match.group(1), match.group(2), arguments[0] if arguments else ''))
+    return calls
+
+
+def resolve_object(text, name, before):
+    """Objeto literal atribuído a `name` (const/let) antes da posição `before`, e as
+    atribuições posteriores `name.campo = valor` / `name.campo.op = valor` até ela:
+    (literal, [(campo, valor)]) ou None"""
+    declarations = list(re.finditer(rf'\b(?:const|let|var)\s+{re.escape(name)}\b[^=;]*=\s*', text[:before]))
+    if not declarations:
+        return None
+    declaration = declarations[-1]
+    start = declaration.end()
+    if start >= len(text) or text[start] != '{':
+        return None
+    try:
+        end = balanced(text, start)
+    except ValueError:
+        return None
+    assignments = []
+    pattern = rf'\b{re.escape(name)}(?:\.([A-Za-z_$][\w$]*)|\[\s*[\'"](\w+)[\'"]\s*\])(?:\.(\w+))?\s*=(?!=)\s*'
+    for match in re.finditer(pattern, text[end:before]):
+        value_start = end + match.end()
+        value_end = value_start
+        while value_end < before and text[value_end] not in ';\n':
+            if text[value_end] in _OPEN:
+                value_end = balanced(text, value_end)
+                continue
+            value_end += 1
+        value = text[value_start:value_end].strip()
+        if match.group(3):  # where.campo.gte = x -> campo: { gte: x }
+            value = f'{{ {match.group(3)}: {value} }}'
+        assignments.append((match.group(1) or match.group(2), value))
+    return text[start:end], assignments
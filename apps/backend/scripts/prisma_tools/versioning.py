@@ -0,0 +1,359 @@
+"""
+Gerador declarativo de versionamento (padrão Medication/Allergy/Vaccination)
+
+Para cada modelo X pedido, garante em uma única passada pelo schema:
+
+- em X: versionNumber, createdBy, updatedBy, relações createdByUser /
+  updatedByUser ("XCreatedBy" / "XUpdatedBy"), history XHistory[] e os
+  índices @@index([createdBy]) / @@index([updatedBy]). Um createdBy novo
+  entra opcional (String?): a tabela pode já ter linhas, e a migração não
+  tem de onde tirar o autor delas; tornar obrigatório fica para depois do
+  backfill
+- o modelo XHistory (snapshots previousData/newData, changedFields, auditoria)
+  logo após X, no mesmo arquivo, mapeado para <x>_history
+- as back-relations em Tenant (xHistory) e em User (xsCreated, xsUpdated,
+  xHistory, sob o comentário "Relações de versionamento (X)")
+
+Cada item só é gerado se ainda não existir: rodar de novo não altera nada, e
+modelos já versionados com outros nomes de relação (ex: "VitalSignCreator")
+são respeitados.
+
+Com partitioned=True o XHistory (novo ou existente) é marcado com
+`/// @partitioned(changedAt)`: PK (id, changedAt), exigida pelo PostgreSQL
+em tabelas particionadas, e índice BRIN em changedAt no lugar do B-tree
+(tenantId, changedAt), que não ajuda num schema de um só tenant. O
+generate-migration-sql.py transforma o marcador no DDL particionado e o
+maintain-history-partitions.py cria as partições futuras.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from .ddl import partition_key
+from .edit import INDENT, SchemaEditor, format_field_group
+
+# Campos usados como "criado por" quando o modelo já tem um deles
+CREATOR_CANDIDATES = ('createdBy', 'recordedBy', 'userId')
+AUDIT_ANCHORS = ('createdAt', 'updatedAt', 'deletedAt')
+PARTITION_KEY = 'changedAt'
+PARTITION_DOC = f'/// @partitioned({PARTITION_KEY}): partições mensais (scripts/maintain-history-partitions.py)'
+BRIN_INDEX = f'@@index([{PARTITION_KEY}], type: Brin)'
+
+
+@dataclass
+class VersioningSpec:
+    model: str
+    creator: Optional[str] = None  # Campo "criado por" (padrão: existente em CREATOR_CANDIDATES ou createdBy)
+
+    @classmethod
+    def parse(cls, text):
+        """'Allergy' ou 'Prescription:prescribedBy'"""
+        model, _, creator = text.partition(':')
+        return cls(model.strip(), creator.strip() or None)
+
+
+@dataclass
+class VersioningPlan:
+    """O que foi (ou seria) gerado para um modelo"""
+
+    model: str
+    added: List[str] = field(default_factory=list)
+    skipped: Optional[str] = None
+    warnings: List[str] = field(default_factory=list)
+
+
+def snake_case(name):
+    """'SOSMedication' -> 'sos_medication'"""
+    name = re.sub(r'([A-Z]+)([A-Z][a-z])', r'\1_\2', name)
+    return re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', name).lower()
+
+
+def lower_first(name):
+    """'SOSMedication' -> 'sosMedication', 'Allergy' -> 'allergy'"""
+    match = re.match(r'^([A-Z]+)(?=[A-Z][a-z]|$)', name)
+    if match and len(match.group(1)) > 1:
+        return match.group(1).lower() + name[len(match.group(1)):]
+    return name[0].lower() + name[1:]
+
+
+def pluralize(name):
+    if re.search(r'[^aeiou]y$', name):
+        return name[:-1] + 'ies'
+    if name.endswith(('s', 'x', 'z', 'ch', 'sh')):
+        return name + 'es'
+    return name + 's'
+
+
+def history_model_lines(model_name, id_type, id_attributes, partitioned=False):
+    """Bloco do modelo XHistory, já alinhado como o `prisma format`"""
+    fk = f'{lower_first(model_name)}Id'
+    history = f'{model_name}History'
+    groups = [
+        [
+            'id String @default(uuid()) @db.Uuid' if partitioned else 'id String @id @default(uuid()) @db.Uuid',
+            'tenantId String @db.Uuid',
+            f'{fk} {id_type} {id_attributes}'.rstrip(),
+            'versionNumber Int',
+            'changeType ChangeType',
+            'changeReason String @db.Text',
+        ],
+        [
+            'previousData Json?',
+            'newData Json',
+            'changedFields String[] @default([])',
+        ],
+        [
+            'changedAt DateTime @db.Timestamptz(3)',
+            'changedBy String @db.Uuid',
+            'changedByName String?',
+            'ipAddress String?',
+            'userAgent String?',
+            'metadata Json? @db.JsonB',
+        ],
+        [
+            'tenant Tenant @relation(fields: [tenantId], references: [id], onDelete: Cascade)',
+            f'{lower_first(model_name)} {model_name} @relation(fields: [{fk}], references: [id], onDelete: Cascade)',
+            f'user User @relation("{history}User", fields: [changedBy], references: [id])',
+        ],
+    ]
+    lines = [PARTITION_DOC] if partitioned else []
+    lines.append(f'model {history} {{')
+    for group in groups:
+        lines.extend(format_field_group(group))
+        lines.append('')
+    if partitioned:
+        lines.append(f'{INDENT}@@id([id, {PARTITION_KEY}])')
+    lines.extend([
+        f'{INDENT}@@index([tenantId, {fk}, versionNumber(sort: Desc)])',
+        f'{INDENT}{BRIN_INDEX}' if partitioned else f'{INDENT}@@index([tenantId, changedAt(sort: Desc)])',
+        f'{INDENT}@@index([changedBy])',
+        f'{INDENT}@@map("{snake_case(model_name)}_history")',
+        '}',
+    ])
+    return lines
+
+
+class VersioningGenerator:
+    """Planeja e aplica o versionamento de vários modelos com um único SchemaEditor"""
+
+    def __init__(self, schema, partitioned=False):
+        self.schema = schema
+        self.editor = SchemaEditor(schema)
+        self.partitioned = partitioned
+
+    # -- helpers ------------------------------------------------------------
+    def _relation_on(self, model, column, target='User'):
+        """Relação de `model` para `target` cuja chave estrangeira é `column`"""
+        return next((r for r in self.schema.relations_of(model.name)
+                     if r.target == target and r.fields == [column]), None)
+
+    def _has_back_relation(self, owner, target_type, relation_name):
+        return any(r.target == target_type and r.name == relation_name and r.list
+                   for r in self.schema.relations_of(owner))
+
+    def _creator(self, model, spec):
+        if spec.creator:
+            return spec.creator
+        return next((c for c in CREATOR_CANDIDATES if c in model.fields and self._relation_on(model, c)), 'createdBy')
+
+    def _collection_name(self, model_name):
+        """Nome da lista de X em Tenant (ex: 'allergies'), para derivar os nomes em User"""
+        tenant = self.schema.models.get('Tenant')
+        existing = next((r.field for r in self.schema.relations_of('Tenant')
+                         if r.target == model_name and r.list), None) if tenant else None
+        return existing or pluralize(lower_first(model_name))
+
+    # -- X ------------------------------------------------------------------
+    def _version_model(self, model, spec, plan):
+        block = self.editor.block(model.name)
+        creator = self._creator(model, spec)
+        history = f'{model.name}History'
+
+        def audit_anchor():
+            for name in (creator, *AUDIT_ANCHORS):
+                index = block.field_index(name)
+                if index is not None:
+                    return index
+            relations = block.field_indexes(lambda n, t, a: t.rstrip('[]?') in self.schema.models)
+            return relations[0] if relations else block.closing_index
+
+        if 'versionNumber' not in model.fields:
+            block.insert(audit_anchor(), [f'{INDENT}versionNumber Int @default(1)'])
+            plan.added.append('versionNumber')
+        if creator not in model.fields:
+            index = block.field_index('versionNumber')
+            block.insert(index + 1, [f'{INDENT}{creator} String? @db.Uuid'])  # Linhas existentes não têm autor
+            plan.added.append(creator)
+        if 'updatedBy' not in model.fields:
+            block.insert(block.field_index(creator) + 1, [f'{INDENT}updatedBy String? @db.Uuid'])
+            plan.added.append('updatedBy')
+
+        relation_lines = []
+        creator_relation = self._relation_on(model, creator)
+        updater_relation = self._relation_on(model, 'updatedBy')
+        if creator_relation is None:
+            optional = '?' if creator not in model.fields or model.fields[creator].optional else ''
+            relation_lines.append(f'{INDENT}createdByUser User{optional} @relation("{model.name}CreatedBy", '
+                                  f'fields: [{creator}], references: [id])')
+            plan.added.append('createdByUser')
+        if updater_relation is None:
+            relation_lines.append(f'{INDENT}updatedByUser User? @relation("{model.name}UpdatedBy", '
+                                  f'fields: [updatedBy], references: [id])')
+            plan.added.append('updatedByUser')
+        if not any(r.target == history for r in self.schema.relations_of(model.name)):
+            relation_lines.append(f'{INDENT}history {history}[]')
+            plan.added.append('history')
+        if relation_lines:
+            relations = block.field_indexes(lambda n, t, a: t.rstrip('[]?') in self.schema.models)
+            block.insert(relations[-1] + 1 if relations else block.closing_index, relation_lines)
+
+        index_lines = [f'{INDENT}@@index([{column}])' for column in (creator, 'updatedBy')
+                       if not any(i.columns == [column] for i in model.indexes)]
+        if index_lines:
+            indexes = block.attribute_indexes('index')
+            mapping = block.attribute_indexes('map')
+            if indexes:
+                position = indexes[-1] + 1
+            elif mapping:
+                position = mapping[0]
+            else:
+                position = block.closing_index
+                index_lines = [''] + index_lines
+            block.insert(position, index_lines)
+            plan.added.extend(f'@@index([{column}])' for column in (creator, 'updatedBy')
+                              if f'{INDENT}@@index([{column}])' in index_lines)
+
+        # Nomes efetivos das relações com User (podem já existir com outro nome)
+        return (creator_relation.name if creator_relation else f'{model.name}CreatedBy',
+                updater_relation.name if updater_relation else f'{model.name}UpdatedBy')
+
+    # -- XHistory -----------------------------------------------------------
+    def _history_model(self, model, plan):
+        history = f'{model.name}History'
+        if history in self.schema.models:
+            if self.partitioned:
+                self._partition_history(self.schema.models[history], plan)
+            return
+        id_field = model.field('id') or next(f for f in model.fields.values() if f.has('id'))
+        id_attributes = f'@db.{id_field.db_type}' if id_field.db_type else ''
+        self.editor.append_after(model.name, history_model_lines(model.name, id_field.type, id_attributes,
+                                                                 self.partitioned))
+        plan.added.append(history)
+
+    def _partition_history(self, history, plan):
+        """Marca um XHistory existente como particionado (PK composta e BRIN em changedAt)"""
+        if partition_key(history):
+            return
+        key = history.field(PARTITION_KEY)
+        primary_key = history.primary_key
+        if key is None or key.type != 'DateTime' or key.optional:
+            plan.warnings.append(f'{history.name} sem {PARTITION_KEY} DateTime obrigatório: não particionado')
+            return
+        if primary_key is None or not primary_key.inline or primary_key.columns != ['id']:
+            plan.warnings.append(f'{history.name} sem @id em id: não particionado')
+            return
+        if any(index.kind == 'unique' for index in history.indexes):
+            plan.warnings.append(f'{history.name} tem @unique sem {PARTITION_KEY}: não particionado')
+            return
+        if any(r.owns_foreign_key for r in self.schema.relations_to(history.name)):
+            plan.warnings.append(f'{history.name} é referenciado por outra tabela: não particionado')
+            return
+
+        block = self.editor.block(history.name)
+        id_index = block.field_index('id')
+        block.replace(id_index, re.sub(r'\s+@id(?=\s|$)', '', block.lines[id_index]))
+        time_index = next((i for i in block.attribute_indexes('index')
+                           if re.match(rf'\s*@@index\(\[(tenantId, )?{PARTITION_KEY}\b', block.lines[i])), None)
+        if time_index is not None:
+            block.replace(time_index, f'{INDENT}{BRIN_INDEX}')
+        indexes = block.attribute_indexes('index')
+        mapping = block.attribute_indexes('map')
+        if time_index is None:
+            block.insert(indexes[-1] + 1 if indexes else (mapping[0] if mapping else block.closing_index),
+                         [f'{INDENT}{BRIN_INDEX}'])
+            indexes = block.attribute_indexes('index')
+        position = indexes[0] if indexes else (mapping[0] if mapping else block.closing_index)
+        block.insert(position, [f'{INDENT}@@id([id, {PARTITION_KEY}])'])
+        block.insert(0, [PARTITION_DOC])
+        plan.added.extend([f'{history.name} @partitioned({PARTITION_KEY})', f'@@id([id, {PARTITION_KEY}])', BRIN_INDEX])
+
+    # -- Tenant / User ------------------------------------------------------
+    def _tenant_back_relation(self, model, plan):
+        history = f'{model.name}History'
+        if 'Tenant' not in self.schema.models:
+            return
+        if any(r.target == history for r in self.schema.relations_of('Tenant')):
+            return
+        block = self.editor.block('Tenant')
+        field_name = f'{lower_first(model.name)}History'
+        anchor = next((r.field for r in self.schema.relations_of('Tenant') if r.target == model.name and r.list), None)
+        index = block.field_index(anchor) if anchor else None
+        if index is None:
+            relations = block.field_indexes(lambda n, t, a: t.endswith('[]'))
+            index = relations[-1] if relations else block.closing_index - 1
+        block.insert(index + 1, [f'{INDENT}{field_name} {history}[]'])
+        plan.added.append(f'Tenant.{field_name}')
+
+    def _user_back_relations(self, model, relation_names, plan):
+        if 'User' not in self.schema.models:
+            return
+        history = f'{model.name}History'
+        collection = self._collection_name(model.name)
+        created_name, updated_name = relation_names
+        wanted = [
+            (f'{collection}Created', model.name, created_name),
+            (f'{collection}Updated', model.name, updated_name),
+        ]
+        if history in self.schema.models:
+            # XHistory pré-existente: só liga a back-relation se ele já aponta para User
+            history_relation = next((r for r in self.schema.relations_of(history) if r.target == 'User'), None)
+            if history_relation is not None:
+                wanted.append((f'{lower_first(model.name)}History', history, history_relation.name))
+        else:
+            wanted.append((f'{lower_first(model.name)}History', history, f'{history}User'))
+        lines = [f'{INDENT}{name} {type_}[]' + (f' @relation("{relation}")' if relation else '')
+                 for name, type_, relation in wanted
+                 if not self._has_back_relation('User', type_, relation)]
+        if not lines:
+            return
+
+        block = self.editor.block('User')
+        marker = next((i for i, line in enumerate(block.lines)
+                       if 'Relações de versionamento (User)' in line), None)
+        if marker is None:
+            relations = block.field_indexes(lambda n, t, a: t.rstrip('[]?') in self.schema.models)
+            marker = relations[-1] + 1 if relations else block.closing_index
+            block.insert(marker, ['', f'{INDENT}// Relações de versionamento ({model.name})'] + lines)
+        else:
+            block.insert(marker, [f'{INDENT}// Relações de versionamento ({model.name})'] + lines + [''])
+        plan.added.extend(f'User.{line.split()[0]}' for line in lines)
+
+    # -- API ----------------------------------------------------------------
+    def plan(self, specs):
+        """Acumula as edições de todos os modelos; retorna [VersioningPlan]"""
+        plans = []
+        for spec in specs:
+            plan = VersioningPlan(spec.model)
+            plans.append(plan)
+            model = self.schema.models.get(spec.model)
+            if model is None:
+                plan.skipped = 'modelo não encontrado'
+                continue
+            if model.name.endswith('History') or model.name in ('Tenant', 'User'):
+                plan.skipped = 'modelo não versionável'
+                continue
+            if 'tenantId' not in model.fields:
+                plan.skipped = 'modelo sem tenantId (XHistory é particionado por tenant)'
+                continue
+            relation_names = self._version_model(model, spec, plan)
+            self._history_model(model, plan)
+            self._tenant_back_relation(model, plan)
+            self._user_back_relations(model, relation_names, plan)
+        return plans
+
+    def diff(self):
+        return self.editor.diff()
+
+    def save(self):
+        return self.editor.save()
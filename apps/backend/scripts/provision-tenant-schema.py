@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Cria o schema de um tenant a partir do template (baseline das migrações)
+
+Em vez de `prisma migrate deploy` replayando todas as migrações no schema
+novo, aplica numa única transação o template: o DDL final (squash-migrations)
+mais a _prisma_migrations já preenchida com o checksum de cada migração, de
+modo que o próximo migrate deploy nesse schema só aplique as migrações
+futuras. O template é gerado uma vez por conjunto de migrações e fica em
+~/.cache/rafa-ilpi/tenant-template.
+
+Uso (a partir de apps/backend):
+    python3 scripts/provision-tenant-schema.py tenant_ilpi_exemplo_abc123          # aplica via psql ($DATABASE_URL)
+    python3 scripts/provision-tenant-schema.py tenant_x --database-url postgresql://...
+    python3 scripts/provision-tenant-schema.py tenant_x -o /tmp/tenant_x.sql       # só gera o script
+    python3 scripts/provision-tenant-schema.py --role public public                # banco de teste do zero
+
+O registro do tenant (public.tenants, admin) continua sendo do TenantsService;
+este script substitui só a etapa de migrations do schema.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from prisma_tools.catalog import ROLES
+from prisma_tools.psql import libpq_url, run_psql
+from prisma_tools.sql import MIGRATIONS_DIR
+from prisma_tools.squash import DEFAULT_TEMPLATE_DIR, build_template, provision_sql
+
+SCHEMA_NAME_RE = re.compile(r'^[a-z_][a-z0-9_]{0,62}$')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Cria o schema de um tenant a partir do template das migrações')
+    parser.add_argument('schema', help='Nome do schema (ex: tenant_ilpi_exemplo_abc123)')
+    parser.add_argument('--role', choices=ROLES, default='tenant', help='Papel do schema (padrão: tenant)')
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL'),
+                        help='Banco onde criar o schema (padrão: $DATABASE_URL)')
+    parser.add_argument('-o', '--output', help='Só grava o script SQL neste arquivo ("-" para stdout)')
+    parser.add_argument('--migrations-dir', default=MIGRATIONS_DIR, help=f'Diretório das migrações (padrão: {MIGRATIONS_DIR})')
+    parser.add_argument('--no-cache', action='store_true', help='Regera o template sem usar nem gravar o cache')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not SCHEMA_NAME_RE.match(args.schema):
+        print(f"❌ Nome de schema inválido: {args.schema}", file=sys.stderr)
+        return 1
+    if args.role == 'tenant' and not args.schema.startswith('tenant_'):
+        print(f"⚠️  {args.schema} não começa com tenant_: migrações futuras que percorrem tenant_* vão ignorá-lo",
+              file=sys.stderr)
+
+    started = time.perf_counter()
+    template = build_template(args.migrations_dir, None if args.no_cache else DEFAULT_TEMPLATE_DIR, args.role)
+    sql = provision_sql(args.schema, template)
+    built = time.perf_counter() - started
+
+    if args.output == '-':
+        sys.stdout.write(sql)
+    elif args.output:
+        path = Path(args.output)
+        staging = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+        staging.write_text(sql, encoding='utf-8')
+        os.replace(staging, path)
+        print(f"💾 {path}", file=sys.stderr)
+    else:
+        if not args.database_url:
+            print("❌ Informe --database-url (ou DATABASE_URL) ou use -o para só gerar o script", file=sys.stderr)
+            return 1
+        try:
+            run_psql(libpq_url(args.database_url), sql)
+        except (OSError, subprocess.CalledProcessError) as exc:
+            stderr = getattr(exc, 'stderr', None)
+            print(f"❌ Falha ao criar {args.schema}: {stderr.decode().strip() if stderr else exc}", file=sys.stderr)
+            return 1
+        print(f"✅ Schema {args.schema} criado", file=sys.stderr)
+
+    print(f"📊 template {template.fingerprint[:12]} ({len(template.migrations)} migrações, {built:.1f}s) | "
+          f"total {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
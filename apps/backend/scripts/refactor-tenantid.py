@@ -1,55 +1,28 @@
 #!/usr/bin/env python3
 """
-Script para refatorar referências a tenantId no ResidentsService
-Substitui parâmetros 'tenantId: string' e usos soltos de 'tenantId' por 'this.tenantContext.tenantId'
+Script para refatorar referências a tenantId nos services (TenantContextService)
+
+Antes eram seis regex sobre residents.service.ts; agora é o conjunto de regras
+'tenant-context' do motor de codemods (scripts/codemods), aplicado em um
+passe de tokens por arquivo e em paralelo:
+- remove o parâmetro 'tenantId: string' de métodos privados e usa
+  'this.tenantContext.tenantId' no corpo e nas chamadas
+- remove tenantId do where de modelos do tenant (data/create ficam intactos)
+- tabelas SHARED passam a usar this.prisma
+
+Uso (a partir de apps/backend):
+    python3 scripts/refactor-tenantid.py                                  # src/**/*.service.ts
+    python3 scripts/refactor-tenantid.py src/residents/residents.service.ts
+    python3 scripts/refactor-tenantid.py --dry-run                        # só o diff
+
+Equivale a: python3 scripts/run-codemod.py --ruleset tenant-context [...]
 """
-import re
 
-file_path = 'apps/backend/src/residents/residents.service.ts'
+import os
+import runpy
+import sys
 
-with open(file_path, 'r') as f:
-    content = f.read()
-
-# 1. Remover parâmetro tenantId: string, de métodos privados
-content = re.sub(r'(\w+)\(\s*([^)]*?),?\s*tenantId:\s*string,?\s*([^)]*?)\)', r'\1(\2 \3)', content)
-
-# 2. Substituir where: { tenantId, -> where: {
-content = re.sub(r'where:\s*\{\s*tenantId,', 'where: {', content)
-
-# 3. Substituir where: { id: X, tenantId, -> where: { id: X,
-content = re.sub(r'(where:\s*\{[^}]*?),\s*tenantId,', r'\1,', content)
-
-# 4. Substituir usos soltos de tenantId (não em declarações) por this.tenantContext.tenantId
-# Casos: await this.updateBedStatus(oldBedId, 'Disponível', tenantId);
-content = re.sub(r'([,\(\s])tenantId([,\)\s;])', r'\1this.tenantContext.tenantId\2', content)
-
-# 5. Substituir await this.prisma.tenant.findUnique({ where: { id: tenantId } })
-# (tenant é tabela SHARED, deve usar this.prisma)
-content = re.sub(
-    r'this\.tenantContext\.client\.tenant',
-    'this.prisma.tenant',
-    content
-)
-
-# 6. Remover linhas com apenas tenantId, dentro de where clauses
-lines = content.split('\n')
-output_lines = []
-skip_next_comma = False
-
-for i, line in enumerate(lines):
-    # Se a linha é apenas "tenantId," dentro de um where/data
-    if re.match(r'^\s*tenantId,?\s*$', line):
-        skip_next_comma = True
-        continue
-    output_lines.append(line)
-
-content = '\n'.join(output_lines)
-
-# Salvar
-with open(file_path, 'w') as f:
-    f.write(content)
-
-print("✅ Refatoração automática de tenantId concluída")
-print("⚠️  Revise manualmente:")
-print("   - Adicione 'tenantId: this.tenantContext.tenantId' em creates")
-print("   - Verifique se não quebrou nada")
+if __name__ == '__main__':
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'run-codemod.py')
+    sys.argv = [script, '--ruleset', 'tenant-context', *sys.argv[1:]]
+    runpy.run_path(script, run_name='__main__')
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Aplica um conjunto de regras de codemod (scripts/codemods) aos arquivos do backend
+
+Um passe de tokenização por arquivo, arquivos em paralelo e cache por hash:
+arquivos que o conjunto já deixa inalterados nem são relidos nas próximas
+execuções.
+
+Uso (a partir de apps/backend):
+    python3 scripts/run-codemod.py --list                            # conjuntos disponíveis
+    python3 scripts/run-codemod.py --dry-run                         # diff de src/**/*.service.ts
+    python3 scripts/run-codemod.py src/residents                     # aplica em um módulo
+    python3 scripts/run-codemod.py --check                           # sai com 1 se algo ainda mudaria
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+from codemods import RULESETS, run_codemod
+from codemods.engine import DEFAULT_CACHE_DIR
+
+DEFAULT_PATTERNS = ['src/**/*.service.ts']
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Aplica codemods aos arquivos TypeScript do backend')
+    parser.add_argument('--ruleset', '-r', default='tenant-context', help='Conjunto de regras (padrão: tenant-context)')
+    parser.add_argument('paths', nargs='*', help=f'Arquivos, diretórios ou globs (padrão: {" ".join(DEFAULT_PATTERNS)})')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--dry-run', action='store_true', help='Mostra o diff sem gravar')
+    mode.add_argument('--check', action='store_true', help='Não grava; sai com 1 se algum arquivo mudaria')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count(), help='Processos em paralelo (padrão: CPUs)')
+    parser.add_argument('--no-cache', action='store_true', help='Reprocessa todos os arquivos')
+    parser.add_argument('--list', action='store_true', help='Lista os conjuntos de regras')
+    return parser.parse_args()
+
+
+def expand_directories(paths):
+    return [os.path.join(p, '**', '*.ts') if os.path.isdir(p) else p for p in paths]
+
+
+def main():
+    args = parse_args()
+    if args.list:
+        for name, ruleset_class in sorted(RULESETS.items()):
+            print(f"   {name} (v{ruleset_class.version}): {ruleset_class.description}")
+            for rule in ruleset_class(**ruleset_class.default_options()).rules():
+                print(f"      - {rule.name}: {rule.description}")
+        return 0
+    if args.ruleset not in RULESETS:
+        print(f"❌ Conjunto de regras desconhecido: {args.ruleset} (disponíveis: {', '.join(sorted(RULESETS))})",
+              file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    options = RULESETS[args.ruleset].default_options()
+    dry_run = args.dry_run or args.check
+    results = run_codemod(args.ruleset, expand_directories(args.paths) or DEFAULT_PATTERNS, dry_run=dry_run,
+                          jobs=args.jobs, cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR, options=options)
+    elapsed = time.perf_counter() - started
+    if not results:
+        print("❌ Nenhum arquivo encontrado", file=sys.stderr)
+        return 1
+
+    changed = [r for r in results if r.changed]
+    for result in changed:
+        counts = ', '.join(f"{rule} {count}" for rule, count in sorted(result.counts.items()))
+        if args.dry_run:
+            sys.stdout.write(result.diff)
+        icon = '🔎' if dry_run else '✏️ '
+        print(f"{icon} {result.path} ({counts})", file=sys.stderr)
+        if not result.idempotent:
+            print(f"⚠️  {result.path}: uma segunda passada ainda mudaria o arquivo (revise as regras)", file=sys.stderr)
+    for result in results:
+        if result.error:
+            print(f"❌ {result.path}: {result.error}", file=sys.stderr)
+
+    totals = Counter()
+    for result in changed:
+        totals.update(result.counts)
+    skipped = sum(r.skipped for r in results)
+    verb = 'mudariam' if dry_run else 'alterados'
+    print(f"\n📊 {len(results)} arquivos em {elapsed:.2f}s | {len(changed)} {verb} | {skipped} pulados pelo cache | "
+          + (', '.join(f"{rule}: {count}" for rule, count in sorted(totals.items())) or 'nenhuma edição'),
+          file=sys.stderr)
+    if any(r.error for r in results):
+        return 1
+    return 1 if args.check and changed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
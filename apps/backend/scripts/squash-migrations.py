@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Squash do histórico de migrações em um único DDL de baseline
+
+Replaya offline as migrações de prisma/migrations (inclusive as que depois
+foram revertidas, blocos DO e EXECUTE format) e emite o DDL equivalente à
+estrutura final, verificado replayando o próprio baseline e comparando as
+duas estruturas. Com --verify-db a verificação é feita também num banco
+real: histórico e baseline aplicados em dois schemas e comparados pelo
+pg_dump --schema-only.
+
+O resultado depende do papel: num schema de tenant os comandos em
+"public".x não valem e os blocos que percorrem tenant_* valem (--role).
+Para criar schemas a partir do baseline use provision-tenant-schema.py.
+
+Uso (a partir de apps/backend):
+    python3 scripts/squash-migrations.py > /tmp/baseline.sql            # baseline do schema de tenant
+    python3 scripts/squash-migrations.py --role public -o /tmp/public.sql
+    python3 scripts/squash-migrations.py --drift                         # diferenças histórico x schema Prisma
+    python3 scripts/squash-migrations.py --until 20260124164500          # baseline até uma migração
+    python3 scripts/squash-migrations.py --verify-db postgresql://localhost/descartavel --strict
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from prisma_tools import DEFAULT_CACHE_DIR, SCHEMA_DIR, load_schema
+from prisma_tools.catalog import ROLES, replay_migrations
+from prisma_tools.psql import libpq_url
+from prisma_tools.sql import MIGRATIONS_DIR
+from prisma_tools.squash import render_baseline, schema_drift, verify_baseline, verify_in_database
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Squash das migrações em um DDL de baseline verificado')
+    parser.add_argument('--role', choices=ROLES, default='tenant', help='Schema simulado (padrão: tenant)')
+    parser.add_argument('-o', '--output', help='Grava o baseline neste arquivo (padrão: stdout)')
+    parser.add_argument('--until', help='Só as migrações até esta (nome ou prefixo, inclusive)')
+    parser.add_argument('--migrations-dir', default=MIGRATIONS_DIR, help=f'Diretório das migrações (padrão: {MIGRATIONS_DIR})')
+    parser.add_argument('--drift', action='store_true', help='Compara a estrutura do histórico com o schema Prisma')
+    parser.add_argument('--schema-dir', default=SCHEMA_DIR, help=f'Diretório do schema (padrão: {SCHEMA_DIR})')
+    parser.add_argument('--no-cache', action='store_true', help='Parseia o schema sem cache (com --drift)')
+    parser.add_argument('--verify-db', metavar='URL', help='Verifica também num banco PostgreSQL DESCARTÁVEL (psql/pg_dump)')
+    parser.add_argument('--strict', action='store_true', help='Sai com 1 se houver comando não entendido ou diferença')
+    return parser.parse_args()
+
+
+def write_output(path, sql):
+    path = Path(path)
+    staging = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    staging.write_text(sql, encoding='utf-8')
+    os.replace(staging, path)
+
+
+def main():
+    args = parse_args()
+    started = time.perf_counter()
+    catalog = replay_migrations(args.role, args.migrations_dir, args.until)
+    if not catalog.migrations:
+        print("❌ Nenhuma migração encontrada", file=sys.stderr)
+        return 1
+    title = (f'Baseline ({args.role}) equivalente a {len(catalog.migrations)} migrações: '
+             f'{catalog.migrations[0]} .. {catalog.migrations[-1]}')
+    sql = render_baseline(catalog, title)
+    differences = verify_baseline(catalog, sql)
+    elapsed = time.perf_counter() - started
+
+    if args.output:
+        write_output(args.output, sql)
+        print(f"💾 {args.output}", file=sys.stderr)
+    else:
+        sys.stdout.write(sql)
+
+    for migration, line, statement in catalog.unhandled:
+        print(f"❔ {migration}:{line}  {statement}", file=sys.stderr)
+    for migration, line, note in catalog.notes:
+        print(f"ℹ️  {migration}:{line}  {note}", file=sys.stderr)
+    for difference in differences:
+        print(f"❌ baseline difere do histórico: {difference}", file=sys.stderr)
+
+    problems = len(catalog.unhandled) + len(differences)
+    if args.verify_db:
+        try:
+            diff = verify_in_database(libpq_url(args.verify_db), sql, args.migrations_dir, args.role)
+        except (OSError, subprocess.CalledProcessError) as exc:
+            stderr = getattr(exc, 'stderr', None)
+            print(f"❌ Verificação no banco falhou: {stderr.decode().strip() if stderr else exc}", file=sys.stderr)
+            return 1
+        for line in diff:
+            print(f"   {line}", file=sys.stderr)
+        print(f"{'❌' if diff else '✅'} pg_dump do histórico x baseline: "
+              f"{'diferentes' if diff else 'idênticos'}", file=sys.stderr)
+        problems += bool(diff)
+
+    if args.drift:
+        schema = load_schema(args.schema_dir, cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR)
+        drift = schema_drift(catalog, schema)
+        print(f"\n🔀 Histórico x schema Prisma ({len(drift)})", file=sys.stderr)
+        for item in drift:
+            print(f"   {item}", file=sys.stderr)
+
+    print(f"📊 {len(catalog.migrations)} migrações -> {len(catalog.tables)} tabelas, {len(catalog.indexes)} índices, "
+          f"{len(catalog.enums)} enums, {len(catalog.functions)} funções, {len(catalog.triggers)} triggers | "
+          f"{catalog.data_statements} comandos de dados ignorados | ❔ {len(catalog.unhandled)} não entendidos | "
+          f"{'✅ baseline equivalente' if not differences else f'❌ {len(differences)} diferenças'} "
+          f"({elapsed:.1f}s)", file=sys.stderr)
+    return 1 if args.strict and problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
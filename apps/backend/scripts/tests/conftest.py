@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Os testes importam prisma_tools e codemods como os scripts (a partir de apps/backend/scripts)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,20 @@
+"""O código atual do backend precisa continuar legível pelas ferramentas de scripts/"""
+
+from pathlib import Path
+
+from prisma_tools import load_schema
+from prisma_tools.nplusone import scan_all
+from prisma_tools.queries import SRC_DIR
+from prisma_tools.typescript import tokenize
+
+
+def test_detect_n_plus_one_reads_every_source_file():
+    errors = []
+    scan_all(load_schema(), SRC_DIR, errors=errors)
+    assert errors == []
+
+
+def test_tokenize_round_trips_every_source_file():
+    for path in Path(SRC_DIR).glob('**/*.ts'):
+        text = path.read_text(encoding='utf-8')
+        assert ''.join(token.text for token in tokenize(text)) == text, path
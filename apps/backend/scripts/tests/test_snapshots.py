@@ -0,0 +1,144 @@
+"""Codificação do histórico compactado (prisma_tools.snapshots) e a leitura dela pelo backend"""
+
+import json
+import random
+import re
+from pathlib import Path
+
+import pytest
+
+from prisma_tools import load_schema
+from prisma_tools.compact import history_tables
+from prisma_tools.queries import SRC_DIR
+from prisma_tools.snapshots import SnapshotChain, apply_patch, decode_chain, is_patch, json_diff
+
+# Cadeias de exemplo e sua codificação; o history-snapshot.middleware.spec.ts decodifica o mesmo arquivo
+FIXTURE = Path(__file__).resolve().parent / 'fixtures' / 'history-snapshots.json'
+MIDDLEWARE = Path(SRC_DIR) / 'prisma' / 'middleware' / 'history-snapshot.middleware.ts'
+
+KEYS = ['dose', 'route', 'a/b', 'c~d', '~1', 'e/f~0', '', 'notes']
+
+
+def random_value(rng, depth=0):
+    kind = rng.randrange(8 if depth < 2 else 6)
+    if kind == 0:
+        return None
+    if kind == 1:
+        return rng.choice([True, False])
+    if kind == 2:
+        return rng.randrange(-3, 4)
+    if kind == 3:
+        return rng.choice([0.5, 1.0, 98.6])
+    if kind == 4:
+        return rng.choice(['', 'x', 'Dipirona', 'a/b~c'])
+    if kind == 5:
+        return [rng.randrange(3) for _ in range(rng.randrange(3))]
+    if kind == 6:
+        return [random_value(rng, depth + 1) for _ in range(rng.randrange(3))]
+    return random_document(rng, depth + 1)
+
+
+def random_document(rng, depth=0):
+    return {key: random_value(rng, depth) for key in rng.sample(KEYS, rng.randrange(len(KEYS)))}
+
+
+def mutate(rng, document):
+    document = json.loads(json.dumps(document))
+    for _ in range(rng.randrange(1, 4)):
+        key = rng.choice(KEYS)
+        if key in document and rng.random() < 0.3:
+            del document[key]
+        elif isinstance(document.get(key), dict) and rng.random() < 0.5:
+            document[key] = mutate(rng, document[key])
+        else:
+            document[key] = random_value(rng)
+    return document
+
+
+def random_chain(rng, length):
+    """Linhas (previousData, newData) completas de um registro: a primeira versão sem previousData"""
+    rows, previous = [], None
+    document = random_document(rng)
+    for _ in range(length):
+        rows.append((previous, document))
+        previous, document = document, mutate(rng, document)
+    return rows
+
+
+def encode(rows, every):
+    chain = SnapshotChain(every)
+    return [chain.step(previous, new) for previous, new in rows]
+
+
+def same_json(a, b):
+    """Igualdade estrita de JSON (em Python 1 == 1.0 == True)"""
+    return json.dumps(a, sort_keys=True) == json.dumps(b, sort_keys=True)
+
+
+def test_json_diff_round_trips_escaped_keys_and_types():
+    old = {'a/b': 1, 'c~d': {'~1': True, 'e/f~0': [1, 2]}, 'x': None, 'n': 1}
+    new = {'a/b': 1.0, 'c~d': {'~1': 1, 'e/f~0': [1, 2, 3]}, 'x': None, 'y': None}
+    ops = json_diff(old, new)
+    assert {'op': 'replace', 'path': '/a~1b', 'value': 1.0} in ops
+    assert {'op': 'remove', 'path': '/n'} in ops
+    assert same_json(apply_patch(old, ops), new)
+    assert json_diff(new, new) == []
+    assert apply_patch(old, [{'op': 'replace', 'path': '', 'value': [1]}]) == [1]
+    assert old['c~d']['e/f~0'] == [1, 2]  # apply_patch não altera o original
+
+
+def test_apply_patch_rejects_missing_paths():
+    with pytest.raises(ValueError, match='Caminho inexistente'):
+        apply_patch({'a': 1}, [{'op': 'add', 'path': '/x/y', 'value': 1}])
+    with pytest.raises(ValueError, match='Caminho inexistente'):
+        apply_patch({'a': 1}, [{'op': 'remove', 'path': '/b'}])
+
+
+@pytest.mark.parametrize('every', [1, 2, 3, 10])
+def test_chain_round_trip_and_anchor_spacing(every):
+    rng = random.Random(every)
+    for _ in range(200):
+        rows = random_chain(rng, rng.randrange(1, 15))
+        steps = encode(rows, every)
+        for step, (previous, new) in zip(steps, rows):
+            assert same_json((step.previous, step.new), (previous, new))
+            if step.position % every == 0:
+                assert step.anchor and (step.encoded_previous, step.encoded_new) == (previous, new)
+            assert step.encoded_previous is None if previous is None else True
+        decoded = decode_chain((s.encoded_previous, s.encoded_new) for s in steps)
+        assert same_json(decoded, [list(row) for row in rows])
+
+
+def test_rerun_changes_nothing_and_every_one_expands():
+    rng = random.Random(2024)
+    for _ in range(200):
+        rows = random_chain(rng, rng.randrange(1, 25))
+        encoded = [(s.encoded_previous, s.encoded_new) for s in encode(rows, 5)]
+        again = [(s.encoded_previous, s.encoded_new) for s in encode(encoded, 5)]
+        assert again == encoded
+        expanded = [(s.encoded_previous, s.encoded_new) for s in encode(encoded, 1)]
+        assert not any(is_patch(value) for row in expanded for value in row)
+        assert same_json(expanded, rows)
+
+
+def test_decode_without_anchor_fails():
+    with pytest.raises(ValueError, match='cadeia sem âncora'):
+        decode_chain([(None, {'$patch': []})])
+
+
+def test_fixture_matches_encoder():
+    fixture = json.loads(FIXTURE.read_text(encoding='utf-8'))
+    for chain in fixture['chains']:
+        steps = encode(chain['rows'], fixture['every'])
+        assert [[s.encoded_previous, s.encoded_new] for s in steps] == chain['encoded']
+        assert any(is_patch(value) for row in chain['encoded'] for value in row)
+
+
+def test_middleware_models_match_compacted_tables():
+    text = MIDDLEWARE.read_text(encoding='utf-8')
+    block = text[text.index('SNAPSHOT_HISTORY_MODELS'):]
+    block = block[:block.index('\n};')]
+    models = {model: (table, record) for model, table, record in re.findall(
+        r"(\w+): \{\s*table: '(\w+)',\s*recordField: '(\w+)',?\s*\}", block)}
+    tables = {t.model: (t.table, t.record_column) for t in history_tables(load_schema())}
+    assert models == tables
@@ -0,0 +1,58 @@
+"""Tokenizador de prisma_tools.typescript e o detector de N+1 sobre ele"""
+
+from prisma_tools import load_schema, nplusone
+from prisma_tools.typescript import REGEX, balanced, split_top_level, strip_comments, tokenize
+
+# Regex com aspas dentro de ${...} (quoteIdentifier do history-snapshot.middleware.ts)
+QUOTE_REGEX_IN_TEMPLATE = '''
+function quoteIdentifier(identifier: string): string {
+  return `"${identifier.replace(/"/g, '""')}"`;
+}
+
+export class AllergiesService {
+  async touchAll(ids: string[]) {
+    const sql = `SELECT ${ids.map((id) => id.replace(/'/g, "''")).join(',')}`;
+    for (const id of ids) {
+      await this.tenantContext.client.allergy.findFirst({ where: { id } });
+    }
+    return sql;
+  }
+}
+'''
+
+
+def test_regex_literal_inside_template_expression():
+    start = QUOTE_REGEX_IN_TEMPLATE.index('{')
+    assert QUOTE_REGEX_IN_TEMPLATE[balanced(QUOTE_REGEX_IN_TEMPLATE, start) - 1] == '}'
+    tokens = tokenize(QUOTE_REGEX_IN_TEMPLATE)
+    assert ''.join(token.text for token in tokens) == QUOTE_REGEX_IN_TEMPLATE
+    assert [token.text for token in tokenize('x.replace(/"/g, "")') if token.kind == REGEX] == ['/"/g']
+
+
+def test_comments_and_regex_are_opaque():
+    text = 'f(/[)"]/, a) // ) "\n/* ( */ g(b, `${c}`)'
+    stripped = strip_comments(text)
+    assert len(stripped) == len(text) and '//' not in stripped and '/*' not in stripped
+    assert split_top_level('/,"/g, { a: 1, b: [2, 3] }, "x,y"') == ['/,"/g', '{ a: 1, b: [2, 3] }', '"x,y"']
+
+
+def test_scan_source_with_quote_regex_in_template():
+    findings = nplusone.scan_source(load_schema(), QUOTE_REGEX_IN_TEMPLATE, 'allergies.service.ts')
+    assert [(f.model, f.operation, f.loop) for f in findings] == [('Allergy', 'findFirst', 'for')]
+
+
+def test_scan_all_reports_unparseable_file_and_continues(tmp_path, monkeypatch):
+    (tmp_path / 'a.service.ts').write_text(QUOTE_REGEX_IN_TEMPLATE, encoding='utf-8')
+    (tmp_path / 'b.service.ts').write_text('quebrado', encoding='utf-8')
+    scan_source = nplusone.scan_source
+
+    def failing(schema, text, file_name):
+        if file_name == 'b.service.ts':
+            raise ValueError('Delimitador aberto na posição 0 não fecha')
+        return scan_source(schema, text, file_name)
+
+    monkeypatch.setattr(nplusone, 'scan_source', failing)
+    errors = []
+    findings = nplusone.scan_all(load_schema(), tmp_path, errors=errors)
+    assert [f.file for f in findings] == ['a.service.ts']
+    assert errors == [('b.service.ts', 'Delimitador aberto na posição 0 não fecha')]
@@ -0,0 +1,104 @@
+import { readFileSync } from 'fs';
+import { resolve } from 'path';
+import {
+  applyJsonPatch,
+  decodeHistoryChain,
+  isSnapshotPatch,
+} from './history-snapshot.middleware';
+
+describe('HistorySnapshotMiddleware', () => {
+  describe('isSnapshotPatch', () => {
+    it('deve reconhecer apenas envelopes {"$patch": [...]}', () => {
+      expect(isSnapshotPatch({ $patch: [] })).toBe(true);
+      expect(isSnapshotPatch({ $patch: [], name: 'x' })).toBe(false);
+      expect(isSnapshotPatch({ $patch: 'x' })).toBe(false);
+      expect(isSnapshotPatch(null)).toBe(false);
+      expect(isSnapshotPatch([{ $patch: [] }])).toBe(false);
+    });
+  });
+
+  describe('applyJsonPatch', () => {
+    it('deve aplicar add, remove e replace sem alterar o original', () => {
+      const base = { allergen: 'Dipirona', severity: 'MILD', meta: { a: 1 } };
+
+      const result = applyJsonPatch(base, [
+        { op: 'replace', path: '/severity', value: 'SEVERE' },
+        { op: 'remove', path: '/meta/a' },
+        { op: 'add', path: '/notes', value: 'Edema' },
+      ]);
+
+      expect(result).toEqual({ allergen: 'Dipirona', severity: 'SEVERE', meta: {}, notes: 'Edema' });
+      expect(base).toEqual({ allergen: 'Dipirona', severity: 'MILD', meta: { a: 1 } });
+    });
+
+    it('deve tratar caminhos escapados (~0, ~1) e a raiz', () => {
+      expect(applyJsonPatch({ 'a/b': 1, 'c~d': 2 }, [
+        { op: 'replace', path: '/a~1b', value: 3 },
+        { op: 'remove', path: '/c~0d' },
+      ])).toEqual({ 'a/b': 3 });
+      expect(applyJsonPatch({ a: 1 }, [{ op: 'replace', path: '', value: [1, 2] }])).toEqual([1, 2]);
+    });
+
+    it('deve lançar erro em caminho inexistente', () => {
+      expect(() => applyJsonPatch({ a: 1 }, [{ op: 'add', path: '/x/y', value: 1 }])).toThrow(
+        'Caminho inexistente no JSON Patch: /x/y',
+      );
+    });
+  });
+
+  describe('decodeHistoryChain', () => {
+    it('deve reconstruir as versões a partir da âncora', () => {
+      const rows = decodeHistoryChain([
+        { id: '1', previousData: null, newData: { dose: '1cp', route: 'VO' } },
+        {
+          id: '2',
+          previousData: { $patch: [] },
+          newData: { $patch: [{ op: 'replace', path: '/dose', value: '2cp' }] },
+        },
+        {
+          id: '3',
+          previousData: { $patch: [] },
+          newData: { $patch: [{ op: 'remove', path: '/route' }] },
+        },
+      ]);
+
+      expect(rows.map((row) => row.newData)).toEqual([
+        { dose: '1cp', route: 'VO' },
+        { dose: '2cp', route: 'VO' },
+        { dose: '2cp' },
+      ]);
+      expect(rows[2].previousData).toEqual({ dose: '2cp', route: 'VO' });
+      expect(rows[2].id).toBe('3');
+    });
+
+    it('deve aceitar linhas completas no meio da cadeia (versões novas do backend)', () => {
+      const rows = decodeHistoryChain([
+        { previousData: null, newData: { status: 'A' } },
+        { previousData: { status: 'A' }, newData: { status: 'B' } },
+        { previousData: { $patch: [] }, newData: { $patch: [{ op: 'add', path: '/x', value: 1 }] } },
+      ]);
+
+      expect(rows[2]).toEqual({ previousData: { status: 'B' }, newData: { status: 'B', x: 1 } });
+    });
+
+    it('deve decodificar as cadeias gravadas pelo compact-history.py', () => {
+      // Mesmo arquivo que scripts/tests/test_snapshots.py confere contra prisma_tools/snapshots.py
+      const fixture = JSON.parse(
+        readFileSync(resolve(__dirname, '../../../scripts/tests/fixtures/history-snapshots.json'), 'utf-8'),
+      ) as { chains: { rows: unknown[][]; encoded: unknown[][] }[] };
+
+      for (const chain of fixture.chains) {
+        const rows = decodeHistoryChain(
+          chain.encoded.map(([previousData, newData]) => ({ previousData, newData })),
+        );
+        expect(rows.map((row) => [row.previousData, row.newData])).toEqual(chain.rows);
+      }
+    });
+
+    it('deve lançar erro se a cadeia não começar por uma âncora', () => {
+      expect(() => decodeHistoryChain([{ previousData: null, newData: { $patch: [] } }])).toThrow(
+        'cadeia sem âncora',
+      );
+    });
+  });
+});
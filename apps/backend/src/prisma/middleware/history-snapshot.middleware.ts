@@ -0,0 +1,279 @@
+import { Prisma, PrismaClient } from '@prisma/client';
+
+/**
+ * Leitura do histórico compactado (*History com snapshots + JSON Patch)
+ *
+ * O scripts/compact-history.py reescreve previousData/newData das tabelas de
+ * histórico: a cada K versões de um registro a linha guarda o JSON completo
+ * (âncora); nas demais, os campos viram {"$patch": [...]} com operações
+ * JSON Patch (RFC 6902: add, remove, replace) sobre o newData da linha
+ * anterior. Formato em apps/backend/scripts/prisma_tools/snapshots.py.
+ *
+ * Este middleware devolve sempre o JSON completo: depois de um find* num
+ * modelo de histórico, as linhas com envelope são reconstruídas a partir da
+ * última âncora do registro, com uma única query raw (que não passa pelos
+ * middlewares). Linhas sem envelope não custam nada além da verificação.
+ *
+ * Gravações não mudam: o backend continua criando versões completas, que
+ * viram âncoras até a próxima compactação.
+ *
+ * LIMITAÇÃO: históricos carregados por include/select aninhado em outro
+ * modelo não são expandidos; leia pelo client do modelo *History.
+ */
+
+export const SNAPSHOT_PATCH_KEY = '$patch';
+
+export interface JsonPatchOperation {
+  op: 'add' | 'remove' | 'replace';
+  path: string;
+  value?: unknown;
+}
+
+/**
+ * Tabelas de histórico compactáveis: tabela e chave do registro versionado
+ * (mesma lista de history_tables() em prisma_tools/compact.py)
+ */
+export const SNAPSHOT_HISTORY_MODELS: Record<
+  string,
+  { table: string; recordField: string }
+> = {
+  AllergyHistory: { table: 'allergy_history', recordField: 'allergyId' },
+  ClinicalProfileHistory: { table: 'clinical_profile_history', recordField: 'clinicalProfileId' },
+  ConditionHistory: { table: 'condition_history', recordField: 'conditionId' },
+  DailyRecordHistory: { table: 'daily_record_history', recordField: 'recordId' },
+  DietaryRestrictionHistory: { table: 'dietary_restriction_history', recordField: 'dietaryRestrictionId' },
+  MedicationAdministrationHistory: { table: 'medication_administration_history', recordField: 'administrationId' },
+  MedicationHistory: { table: 'medication_history', recordField: 'medicationId' },
+  PrescriptionHistory: { table: 'prescription_history', recordField: 'prescriptionId' },
+  ResidentAnthropometryHistory: { table: 'resident_anthropometry_history', recordField: 'residentAnthropometryId' },
+  ResidentBloodTypeHistory: { table: 'resident_blood_type_history', recordField: 'residentBloodTypeId' },
+  ResidentDependencyAssessmentHistory: {
+    table: 'resident_dependency_assessment_history',
+    recordField: 'residentDependencyAssessmentId',
+  },
+  ResidentHistory: { table: 'resident_history', recordField: 'residentId' },
+  ShiftHistory: { table: 'shift_history', recordField: 'shiftId' },
+  SOSAdministrationHistory: { table: 'sos_administration_history', recordField: 'administrationId' },
+  SOSMedicationHistory: { table: 'sos_medication_history', recordField: 'sosMedicationId' },
+  UserHistory: { table: 'user_history', recordField: 'userId' },
+  VaccinationHistory: { table: 'vaccination_history', recordField: 'vaccinationId' },
+  VitalSignHistory: { table: 'vital_sign_history', recordField: 'vitalSignId' },
+};
+
+const FIND_ACTIONS = [
+  'findUnique',
+  'findUniqueOrThrow',
+  'findFirst',
+  'findFirstOrThrow',
+  'findMany',
+];
+
+type HistoryRow = Record<string, unknown>;
+
+/**
+ * Verifica se o valor é um envelope {"$patch": [...]}
+ */
+export function isSnapshotPatch(
+  value: unknown,
+): value is { [SNAPSHOT_PATCH_KEY]: JsonPatchOperation[] } {
+  return (
+    typeof value === 'object' &&
+    value !== null &&
+    !Array.isArray(value) &&
+    Object.keys(value).length === 1 &&
+    Array.isArray((value as Record<string, unknown>)[SNAPSHOT_PATCH_KEY])
+  );
+}
+
+function clone<T>(value: T): T {
+  return value === undefined ? value : JSON.parse(JSON.stringify(value));
+}
+
+/**
+ * Aplica operações JSON Patch (add, remove, replace) a uma cópia do documento
+ */
+export function applyJsonPatch(
+  document: unknown,
+  operations: JsonPatchOperation[],
+): unknown {
+  let result = clone(document);
+
+  for (const operation of operations) {
+    if (operation.path === '') {
+      if (operation.op === 'remove') {
+        throw new Error('JSON Patch não pode remover a raiz');
+      }
+      result = clone(operation.value);
+      continue;
+    }
+
+    const tokens = operation.path
+      .slice(1)
+      .split('/')
+      .map((token) => token.replace(/~1/g, '/').replace(/~0/g, '~'));
+    const last = tokens.pop()!;
+
+    let parent: any = result;
+    for (const token of tokens) {
+      if (parent === null || typeof parent !== 'object' || !(token in parent)) {
+        throw new Error(`Caminho inexistente no JSON Patch: ${operation.path}`);
+      }
+      parent = Array.isArray(parent) ? parent[Number(token)] : parent[token];
+    }
+    if (parent === null || typeof parent !== 'object') {
+      throw new Error(`Caminho inexistente no JSON Patch: ${operation.path}`);
+    }
+
+    if (Array.isArray(parent)) {
+      const index = last === '-' ? parent.length : Number(last);
+      if (operation.op === 'add') parent.splice(index, 0, clone(operation.value));
+      else if (operation.op === 'remove') parent.splice(index, 1);
+      else parent[index] = clone(operation.value);
+    } else if (operation.op === 'remove') {
+      delete parent[last];
+    } else {
+      parent[last] = clone(operation.value);
+    }
+  }
+
+  return result;
+}
+
+/**
+ * Reconstrói previousData/newData de linhas consecutivas de um registro,
+ * em ordem de versão, começando por uma âncora
+ */
+export function decodeHistoryChain<
+  T extends { previousData: unknown; newData: unknown },
+>(rows: T[]): T[] {
+  let base: unknown = undefined;
+
+  const decode = (value: unknown) => {
+    if (!isSnapshotPatch(value)) return value;
+    if (base === undefined) {
+      throw new Error('Envelope $patch sem versão anterior (cadeia sem âncora)');
+    }
+    return applyJsonPatch(base, value[SNAPSHOT_PATCH_KEY]);
+  };
+
+  return rows.map((row) => {
+    const decoded = {
+      ...row,
+      previousData: decode(row.previousData),
+      newData: decode(row.newData),
+    };
+    base = decoded.newData;
+    return decoded;
+  });
+}
+
+function quoteIdentifier(identifier: string): string {
+  return `"${identifier.replace(/"/g, '""')}"`;
+}
+
+/**
+ * Busca, de uma vez, as cadeias (desde a última âncora) das linhas pedidas
+ * e devolve o JSON completo de cada uma, por id
+ */
+async function expandRows(
+  client: PrismaClient,
+  config: { table: string; recordField: string },
+  ids: string[],
+): Promise<Map<string, { previousData: unknown; newData: unknown }>> {
+  const table = quoteIdentifier(config.table);
+  const record = quoteIdentifier(config.recordField);
+
+  const rows = await client.$queryRawUnsafe<
+    { id: string; record: string; previousData: unknown; newData: unknown }[]
+  >(
+    `WITH targets AS (
+       SELECT ${record} AS record, min("versionNumber") AS first, max("versionNumber") AS last
+         FROM ${table}
+        WHERE id = ANY($1::uuid[])
+        GROUP BY ${record}
+     ), chains AS (
+       SELECT record, last,
+              (SELECT max(a."versionNumber") FROM ${table} a
+                WHERE a.${record} = targets.record
+                  AND a."versionNumber" <= targets.first
+                  AND a."newData" -> '${SNAPSHOT_PATCH_KEY}' IS NULL
+                  AND a."previousData" -> '${SNAPSHOT_PATCH_KEY}' IS NULL) AS anchor
+         FROM targets
+     )
+     SELECT h.id::text AS id, h.${record}::text AS record, h."previousData", h."newData"
+       FROM ${table} h
+       JOIN chains ON h.${record} = chains.record
+      WHERE h."versionNumber" BETWEEN COALESCE(chains.anchor, 0) AND chains.last
+      ORDER BY h.${record}, h."versionNumber", h.id`,
+    ids,
+  );
+
+  const expanded = new Map<string, { previousData: unknown; newData: unknown }>();
+  let chain: typeof rows = [];
+  const flush = () => {
+    for (const row of decodeHistoryChain(chain)) {
+      expanded.set(row.id, { previousData: row.previousData, newData: row.newData });
+    }
+    chain = [];
+  };
+  for (const row of rows) {
+    if (chain.length > 0 && chain[0].record !== row.record) flush();
+    chain.push(row);
+  }
+  flush();
+
+  return expanded;
+}
+
+/**
+ * Criar middleware de leitura do histórico compactado
+ *
+ * @param client - Client do tenant (as queries raw usam o mesmo search_path)
+ */
+export function createHistorySnapshotMiddleware(
+  client: PrismaClient,
+): Prisma.Middleware {
+  return async (params, next) => {
+    const config = params.model
+      ? SNAPSHOT_HISTORY_MODELS[params.model]
+      : undefined;
+
+    if (!config || !FIND_ACTIONS.includes(params.action)) {
+      return next(params);
+    }
+
+    // Com select explícito, o id é necessário para localizar a cadeia
+    const select = params.args?.select as Record<string, unknown> | undefined;
+    const addedId = !!select && !select.id;
+    if (addedId) {
+      params.args.select = { ...select, id: true };
+    }
+
+    const result = await next(params);
+
+    const rows = (Array.isArray(result) ? result : result ? [result] : []) as HistoryRow[];
+    const encoded = rows.filter(
+      (row) => isSnapshotPatch(row.previousData) || isSnapshotPatch(row.newData),
+    );
+
+    if (encoded.length > 0) {
+      const expanded = await expandRows(
+        client,
+        config,
+        encoded.map((row) => row.id as string),
+      );
+      for (const row of encoded) {
+        const full = expanded.get(row.id as string);
+        if (!full) continue;
+        if ('previousData' in row) row.previousData = full.previousData;
+        if ('newData' in row) row.newData = full.newData;
+      }
+    }
+
+    if (addedId) {
+      for (const row of rows) delete row.id;
+    }
+
+    return result;
+  };
+}
@@ -5,6 +5,7 @@ import { WINSTON_MODULE_PROVIDER } from 'nest-winston';
 import { Logger as WinstonLogger } from 'winston';
 import { createEncryptionMiddleware } from './middleware/encryption.middleware';
 import { createCpfSyncMiddleware } from './middleware/cpf-sync.middleware';
+import { createHistorySnapshotMiddleware } from './middleware/history-snapshot.middleware';
 import { createQueryLoggerMiddleware } from './middleware/query-logger.middleware';
 import { PrismaQueryLoggerMiddleware } from './prisma-query-logger.middleware';
 import {
@@ -146,6 +147,8 @@ export class PrismaService extends PrismaClient implements OnModuleInit, OnModul
       const encryptionKey = this.configService.get<string>('ENCRYPTION_MASTER_KEY')!;
       tenantClient.$use(createEncryptionMiddleware(encryptionKey));
       tenantClient.$use(createCpfSyncMiddleware());
+      // Histórico compactado (scripts/compact-history.py): devolve previousData/newData completos
+      tenantClient.$use(createHistorySnapshotMiddleware(tenantClient));
 
       this.tenantClients.set(schemaName, tenantClient);
     }
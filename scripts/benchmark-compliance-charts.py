@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos gráficos de compliance
+
+Mede, por template, construção da figura, atualização (figura reutilizada) e
+savefig em cada combinação de formato, DPI e tamanho de série, além do
+tempo de inicialização e do pico de memória (RSS). Os resultados são gravados
+em JSON e podem ser comparados com um baseline anterior.
+
+Uso:
+    python3 scripts/benchmark-compliance-charts.py --output bench.json
+    python3 scripts/benchmark-compliance-charts.py --quick --baseline bench.json   # compara
+    python3 scripts/benchmark-compliance-charts.py --templates linha barras --dpi 150 --points 8 1095
+
+Sai com código 1 se alguma medição piorou mais que --threshold em relação ao baseline.
+"""
+
+import argparse
+import sys
+
+from compliance_charts import FORMATS, TEMPLATE_KEYS
+from compliance_charts.benchmark import case_id, compare, load_results, run_benchmarks, save_results
+
+# 8 pontos = jornada de marketing; 1095 = três anos de avaliações diárias
+DEFAULT_POINTS = [8, 90, 365, 1095]
+DEFAULT_DPIS = [100, 300]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark dos gráficos de compliance RDC 502/2021')
+    parser.add_argument('--templates', nargs='+', choices=TEMPLATE_KEYS, default=TEMPLATE_KEYS,
+                        help='Templates medidos (padrão: todos)')
+    parser.add_argument('--format', nargs='+', choices=sorted(FORMATS), default=list(FORMATS), dest='formats',
+                        help='Formatos de saída (padrão: png svg pdf)')
+    parser.add_argument('--dpi', nargs='+', type=int, default=DEFAULT_DPIS, dest='dpis',
+                        help=f'Resoluções (padrão: {" ".join(map(str, DEFAULT_DPIS))})')
+    parser.add_argument('--points', nargs='+', type=int, default=DEFAULT_POINTS,
+                        help=f'Tamanhos de série (padrão: {" ".join(map(str, DEFAULT_POINTS))})')
+    parser.add_argument('--repeats', type=int, default=3, help='Repetições por combinação; usa a mediana (padrão: 3)')
+    parser.add_argument('--quick', action='store_true',
+                        help='Matriz reduzida: png, 100 dpi, séries de 8 e 365 pontos, 1 repetição')
+    parser.add_argument('--output', '-o', help='Arquivo JSON com os resultados')
+    parser.add_argument('--baseline', help='JSON de uma execução anterior para comparação')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='Piora percentual considerada regressão (padrão: 10)')
+    args = parser.parse_args()
+
+    if args.quick:
+        args.formats, args.dpis, args.points, args.repeats = ['png'], [100], [8, 365], 1
+    return args
+
+
+def report_progress(name, measured):
+    if name == 'startup':
+        print(f"🚀 Inicialização: import {measured['import_s']:.2f}s | processo {measured['process_s']:.2f}s")
+        return
+    print(f"📊 {name}: pico de RSS {measured['peakRssMb']:.0f} MB (após import: {measured['baseRssMb']:.0f} MB)")
+    for case in measured['cases']:
+        print(f"   {case_id(case):<32} build {case['build_s'] * 1000:7.1f} ms | "
+              f"update {case['update_s'] * 1000:7.1f} ms | savefig {case['savefig_s'] * 1000:7.1f} ms | "
+              f"{case['bytes'] / 1024:8.0f} KB")
+
+
+def main():
+    args = parse_args()
+
+    results = run_benchmarks(args.templates, args.formats, args.dpis, args.points,
+                             repeats=args.repeats, progress=report_progress)
+
+    if args.output:
+        save_results(results, args.output)
+        print(f"📁 Resultados: {args.output}")
+
+    if args.baseline:
+        regressions = compare(results, load_results(args.baseline), threshold=args.threshold / 100)
+        if not regressions:
+            print(f"✅ Nenhuma regressão acima de {args.threshold:g}% em relação a {args.baseline}")
+            return 0
+        print(f"⚠️  {len(regressions)} regressões acima de {args.threshold:g}% em relação a {args.baseline}:")
+        for name, current, previous, change in regressions:
+            print(f"   {name:<44} {previous:10.3f} -> {current:10.3f} ({change:+.0%})")
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
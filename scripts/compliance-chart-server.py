@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Servidor de renderização dos gráficos de compliance (processo de longa duração)
+
+Mantém matplotlib, estilo e fontes carregados em um pool de workers, para o
+dashboard pedir gráficos sem pagar a inicialização do Python a cada requisição.
+
+Uso:
+    python3 scripts/compliance-chart-server.py --port 8765 --workers 2
+    python3 scripts/compliance-chart-server.py --unix-socket /tmp/compliance-charts.sock
+
+    curl -X POST localhost:8765/render -o linha.svg \\
+         -d '{"template": "linha", "format": "svg", "series": {...}}'
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')  # Sem display: os gráficos só são rasterizados em memória
+
+from compliance_charts import DEFAULT_CACHE_DIR
+from compliance_charts.server import RenderService, make_server
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Servidor de renderização dos gráficos de compliance RDC 502/2021')
+    parser.add_argument('--host', default='127.0.0.1', help='Endereço HTTP (padrão: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Porta HTTP (padrão: 8765)')
+    parser.add_argument('--unix-socket', help='Atende em um socket Unix em vez de TCP')
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1),
+                        help='Processos de renderização (padrão: min(4, CPUs))')
+    parser.add_argument('--queue-size', type=int, default=16,
+                        help='Jobs aguardando além dos que estão em execução; acima disso responde 503 (padrão: 16)')
+    parser.add_argument('--timeout', type=float, default=30.0, help='Tempo máximo por job em segundos (padrão: 30)')
+    parser.add_argument('--cache-dir', type=Path, default=DEFAULT_CACHE_DIR,
+                        help=f'Diretório do cache de renderização (padrão: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--no-cache', action='store_true', help='Não consulta nem alimenta o cache')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Loga cada requisição')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    started = time.perf_counter()
+    service = RenderService(workers=args.workers, queue_size=args.queue_size, timeout=args.timeout,
+                            cache_dir=None if args.no_cache else str(args.cache_dir))
+    service.warm_up()
+    print(f"🔥 {args.workers} workers aquecidos em {time.perf_counter() - started:.1f}s")
+
+    server = make_server(service, host=args.host, port=args.port, unix_socket=args.unix_socket, verbose=args.verbose)
+    where = args.unix_socket or f'http://{args.host}:{args.port}'
+    print(f"🚀 Servidor de gráficos em {where} (fila: {service.capacity} jobs)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Encerrando...")
+    finally:
+        server.server_close()
+        service.shutdown()
+        if args.unix_socket and os.path.exists(args.unix_socket):
+            os.unlink(args.unix_socket)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""
+Gráficos de evolução de compliance RDC 502/2021 (templates reutilizáveis)
+
+Uso como módulo: render_chart_bytes / render_series_bytes retornam os gráficos
+em memória (PNG, SVG ou PDF); render_series grava em disco; write_tenant_report /
+write_combined_report montam relatórios PDF de várias páginas.
+"""
+
+from .cache import DEFAULT_CACHE_DIR, RenderCache, render_cached
+from .render import DEFAULT_DPI, FORMATS, render_chart_bytes, render_series, render_series_bytes
+from .report import ComplianceReport, write_combined_report, write_tenant_report
+from .series import MARKETING_SERIES, ComplianceSeries, iter_series_jsonl
+from .sources import AssessmentRow, group_by_tenant, iter_tenant_series
+from .style import aplicar_estilo
+from .downsample import DOWNSAMPLERS, downsample_indices
+from .templates import TEMPLATE_CLASSES, TEMPLATE_KEYS, ChartTemplate, get_template, set_downsampling
+
+__all__ = [
+    'DEFAULT_CACHE_DIR',
+    'RenderCache',
+    'render_cached',
+    'DOWNSAMPLERS',
+    'downsample_indices',
+    'DEFAULT_DPI',
+    'FORMATS',
+    'render_chart_bytes',
+    'render_series',
+    'render_series_bytes',
+    'ComplianceReport',
+    'write_combined_report',
+    'write_tenant_report',
+    'MARKETING_SERIES',
+    'ComplianceSeries',
+    'iter_series_jsonl',
+    'AssessmentRow',
+    'group_by_tenant',
+    'iter_tenant_series',
+    'aplicar_estilo',
+    'TEMPLATE_CLASSES',
+    'TEMPLATE_KEYS',
+    'ChartTemplate',
+    'get_template',
+    'set_downsampling',
+]
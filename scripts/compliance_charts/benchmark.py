@@ -0,0 +1,212 @@
+"""
+Medições de desempenho dos templates de compliance
+
+Cada template é medido em um processo novo (spawn), para que o pico de RSS
+reportado seja só dele, e cada combinação formato × DPI × tamanho de série
+separa as fases:
+
+- build: primeira preparação da figura (construção + primeira atualização + layout)
+- update: preparação seguinte, já com a figura reutilizada (caso do modo lote)
+- savefig: rasterização/serialização para um buffer em memória
+
+A inicialização (import do matplotlib + pacote + estilo) é medida à parte em
+subprocessos Python limpos, como acontece a cada execução do script.
+"""
+
+import io
+import json
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+
+from .levels import classify_level
+from .series import MARKETING_SERIES, ComplianceSeries
+
+METRICS = ('build_s', 'update_s', 'savefig_s')
+
+_STARTUP_CODE = (
+    'import time; t = time.perf_counter(); '
+    'import matplotlib; matplotlib.use("Agg"); '
+    'import compliance_charts; compliance_charts.aplicar_estilo(); '
+    'print(time.perf_counter() - t)'
+)
+
+
+def synthetic_series(points, seed=0):
+    """
+    Série diária de `points` avaliações (8 pontos = jornada de marketing).
+    Percentuais em passeio aleatório determinístico entre 30% e 100%.
+    """
+    if points == len(MARKETING_SERIES):
+        return MARKETING_SERIES
+    rng = np.random.default_rng(seed + points)
+    walk = np.clip(50 + np.cumsum(rng.normal(0.05, 1.0, points)), 30, 100).round(2)
+    start = datetime(2023, 1, 1)
+    percentages = walk.tolist()
+    return ComplianceSeries(
+        tenant_id=f'bench-{points}',
+        dates=[start + timedelta(days=i) for i in range(points)],
+        percentages=percentages,
+        levels=[classify_level(p) for p in percentages],
+    )
+
+
+def _peak_rss_mb():
+    # ru_maxrss: KiB no Linux, bytes no macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def measure_startup(repeats=5):
+    """Mediana do import + estilo e do processo inteiro, em interpretadores novos"""
+    package_dir = Path(__file__).resolve().parent.parent
+    imports, processes = [], []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        out = subprocess.run([sys.executable, '-c', _STARTUP_CODE], cwd=package_dir,
+                             check=True, capture_output=True, text=True).stdout
+        processes.append(time.perf_counter() - started)
+        imports.append(float(out.strip().splitlines()[-1]))
+    return {'import_s': statistics.median(imports), 'process_s': statistics.median(processes)}
+
+
+def _measure_template(key, formats, dpis, lengths, repeats):
+    """Executado em um processo novo: todas as combinações de um template"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import warnings
+    warnings.filterwarnings('ignore', message='Glyph .* missing from font')
+
+    from .style import aplicar_estilo
+    from .templates import TEMPLATE_CLASSES
+
+    aplicar_estilo()
+    template_cls = next(cls for cls in TEMPLATE_CLASSES if cls.key == key)
+    base_rss = _peak_rss_mb()
+
+    cases = []
+    for points in lengths:
+        series = synthetic_series(points)
+        other = synthetic_series(points, seed=1)
+        for fmt in formats:
+            for dpi in dpis:
+                timings = {metric: [] for metric in METRICS}
+                size = 0
+                for _ in range(repeats):
+                    template = template_cls()
+
+                    started = time.perf_counter()
+                    template.prepare(other)
+                    timings['build_s'].append(time.perf_counter() - started)
+
+                    started = time.perf_counter()
+                    fig = template.prepare(series)
+                    timings['update_s'].append(time.perf_counter() - started)
+
+                    buffer = io.BytesIO()
+                    started = time.perf_counter()
+                    fig.savefig(buffer, dpi=dpi, format=fmt, bbox_inches='tight')
+                    timings['savefig_s'].append(time.perf_counter() - started)
+                    size = buffer.tell()
+                    template.close()
+
+                cases.append({
+                    'template': key,
+                    'format': fmt,
+                    'dpi': dpi,
+                    'points': points,
+                    **{metric: statistics.median(values) for metric, values in timings.items()},
+                    'bytes': size,
+                })
+
+    return {'baseRssMb': base_rss, 'peakRssMb': _peak_rss_mb(), 'cases': cases}
+
+
+def run_benchmarks(keys, formats, dpis, lengths, repeats=3, startup_repeats=5, progress=None):
+    """Executa a matriz completa e retorna o documento de resultados (serializável em JSON)"""
+    import matplotlib
+
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'matplotlib': matplotlib.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'repeats': repeats,
+        },
+        'startup': measure_startup(startup_repeats),
+        'templates': {},
+        'cases': [],
+    }
+    if progress:
+        progress('startup', results['startup'])
+
+    spawn = get_context('spawn')
+    for key in keys:
+        # Um processo por template: o pico de RSS não se acumula entre templates
+        with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+            measured = pool.submit(_measure_template, key, formats, dpis, lengths, repeats).result()
+        results['templates'][key] = {'baseRssMb': measured['baseRssMb'], 'peakRssMb': measured['peakRssMb']}
+        results['cases'].extend(measured['cases'])
+        if progress:
+            progress(key, measured)
+
+    return results
+
+
+def case_id(case):
+    """Ex: 'linha/png/300dpi/8pts'"""
+    return f"{case['template']}/{case['format']}/{case['dpi']}dpi/{case['points']}pts"
+
+
+def compare(results, baseline, threshold=0.10, min_delta_s=0.005):
+    """
+    Compara com um resultado anterior. Retorna [(métrica, atual, baseline, variação)]
+    das medições que pioraram mais que `threshold` (fração) e mais que
+    `min_delta_s` em termos absolutos (ruído em medições de milissegundos).
+    """
+    regressions = []
+
+    def check(name, current, previous, absolute_floor):
+        if previous and current - previous > absolute_floor and (current - previous) / previous > threshold:
+            regressions.append((name, current, previous, (current - previous) / previous))
+
+    for metric, value in results['startup'].items():
+        check(f'startup/{metric}', value, baseline.get('startup', {}).get(metric), min_delta_s)
+
+    for key, memory in results['templates'].items():
+        previous = baseline.get('templates', {}).get(key, {}).get('peakRssMb')
+        check(f'{key}/peakRssMb', memory['peakRssMb'], previous, 1.0)
+
+    previous_cases = {case_id(case): case for case in baseline.get('cases', [])}
+    for case in results['cases']:
+        previous = previous_cases.get(case_id(case))
+        if previous is None:
+            continue
+        for metric in METRICS:
+            check(f'{case_id(case)}/{metric}', case[metric], previous.get(metric), min_delta_s)
+
+    return regressions
+
+
+def load_results(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_results(results, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+        f.write('\n')
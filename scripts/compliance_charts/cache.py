@@ -0,0 +1,189 @@
+"""
+Cache de renderização endereçado por conteúdo
+
+Cada artefato (PNG, SVG ou PDF) é identificado pelo hash de tudo que influencia
+o resultado: a série (datas, percentuais, níveis e marcos), o template (versão
+e configuração de redução de pontos), o formato, o DPI e o estilo ativo (rcParams + versão do matplotlib).
+Se o artefato já existe no cache, ele é apenas ligado/copiado para o destino,
+sem rasterizar de novo.
+
+A identificação do tenant não entra no hash: duas séries idênticas geram a
+mesma imagem e compartilham a entrada.
+
+Como as saídas são hardlinks das entradas (mesmo inode), o uso recente de uma
+entrada (mtime, usado na evicção) aparece também no mtime dos arquivos de
+saída ligados a ela. Pelo mesmo motivo, remover uma entrada cuja saída ainda
+existe não libera disco: a evicção só conta, e só remove por tamanho, as
+entradas sem outros links.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import matplotlib
+
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'rafa-ilpi' / 'compliance-charts'
+
+
+def style_fingerprint():
+    """Hash do estilo ativo (rcParams atuais e versão do matplotlib)"""
+    params = {key: repr(value) for key, value in sorted(matplotlib.rcParams.items())}
+    payload = json.dumps({'matplotlib': matplotlib.__version__, 'rcParams': params}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def series_fingerprint(series):
+    payload = json.dumps({
+        'dates': [d.isoformat() for d in series.dates],
+        'percentages': [float(p) for p in series.percentages],
+        'levels': list(series.levels),
+        'milestones': series.milestones,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class RenderCache:
+    """Armazena artefatos em <root>/<2 primeiros chars>/<hash>.<ext>"""
+
+    def __init__(self, root=DEFAULT_CACHE_DIR):
+        self.root = Path(root)
+        self.hits = 0
+        self.misses = 0
+        self._style = None
+
+    def key_for(self, template, series, dpi, fmt='png'):
+        if self._style is None:
+            # Calculado uma vez por processo, depois de aplicar_estilo()
+            self._style = style_fingerprint()
+        payload = '|'.join([
+            template.signature(),
+            str(dpi),
+            fmt,
+            self._style,
+            series_fingerprint(series),
+        ])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def path_for(self, key, fmt='png'):
+        return self.root / key[:2] / f'{key}.{fmt}'
+
+    def fetch(self, key, output_path, fmt='png'):
+        """Materializa a entrada em output_path; retorna False se não houver entrada"""
+        entry = self.path_for(key, fmt)
+        if not entry.exists():
+            self.misses += 1
+            return False
+        _link_or_copy(entry, Path(output_path))
+        os.utime(entry)  # Marca como usada recentemente (evicção por idade/LRU); vale para as saídas ligadas
+        self.hits += 1
+        return True
+
+    def read(self, key, fmt='png'):
+        """Conteúdo da entrada em memória, ou None se não houver entrada"""
+        entry = self.path_for(key, fmt)
+        try:
+            data = entry.read_bytes()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        os.utime(entry)
+        self.hits += 1
+        return data
+
+    def store(self, key, rendered_path, fmt='png'):
+        """Copia um artefato recém-renderizado para o cache (escrita atômica)"""
+        entry, tmp = self._staging(key, fmt)
+        shutil.copyfile(rendered_path, tmp)
+        os.replace(tmp, entry)  # Workers concorrentes podem gravar a mesma chave
+        return entry
+
+    def store_bytes(self, key, data, fmt='png'):
+        entry, tmp = self._staging(key, fmt)
+        tmp.write_bytes(data)
+        os.replace(tmp, entry)
+        return entry
+
+    def _staging(self, key, fmt):
+        entry = self.path_for(key, fmt)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        return entry, entry.with_name(f'{entry.name}.{os.getpid()}.tmp')
+
+    def entries(self):
+        return [p for p in self.root.glob('*/*') if p.is_file() and not p.name.endswith('.tmp')]
+
+    def evict(self, max_bytes=None, max_age_days=None):
+        """
+        Remove entradas não usadas há mais de max_age_days e, em seguida, as
+        menos recentemente usadas até o cache caber em max_bytes.
+
+        Entradas com hardlinks (st_nlink > 1, ainda publicadas como saída) não
+        ocupam disco além da saída: não contam para max_bytes nem são
+        removidas por tamanho, e a remoção por idade não as soma em bytes
+        liberados. Retorna (entradas removidas, bytes liberados).
+        """
+        if not self.root.exists():
+            return 0, 0
+
+        now = time.time()
+        entries = []
+        for path in self.entries():
+            stat = path.stat()
+            # Só os bytes de entradas sem outros links saem do disco ao removê-las
+            entries.append((stat.st_mtime, stat.st_size if stat.st_nlink == 1 else 0, path))
+        entries.sort()  # Mais antigas primeiro
+
+        removed, freed = 0, 0
+        kept = []
+        for mtime, size, path in entries:
+            if max_age_days is not None and now - mtime > max_age_days * 86400:
+                path.unlink(missing_ok=True)
+                removed, freed = removed + 1, freed + size
+            elif size:
+                kept.append((mtime, size, path))
+
+        if max_bytes is not None:
+            total = sum(size for _, size, _ in kept)
+            for mtime, size, path in kept:
+                if total <= max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                removed, freed = removed + 1, freed + size
+
+        return removed, freed
+
+
+def _link_or_copy(source, target):
+    """Hardlink do cache para o destino (cópia se estiverem em sistemas de arquivos diferentes)"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if target.exists():
+        if os.path.samefile(source, target):
+            return
+        target.unlink()
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+def render_cached(template, series, output_path, dpi=300, cache=None, fmt='png'):
+    """Renderiza via template, reaproveitando o cache quando o artefato já existe"""
+    output_path = Path(output_path)
+    if cache is not None:
+        key = cache.key_for(template, series, dpi, fmt)
+        if cache.fetch(key, output_path, fmt):
+            return output_path
+
+    # O destino pode ser um hardlink de uma entrada do cache: savefig sobrescreveria
+    # a entrada no lugar, então desfaz o link antes de renderizar
+    output_path.unlink(missing_ok=True)
+    template.render(series, output_path, dpi=dpi, fmt=fmt)
+    if cache is None:
+        return output_path
+
+    cache.store(key, output_path, fmt)
+    return output_path
@@ -0,0 +1,85 @@
+"""
+Redução de séries longas antes de plotar
+
+Os templates foram desenhados para poucas avaliações mensais. Com séries
+diárias (ou sinais vitais) de dezenas de milhares de pontos, desenhar cada
+ponto torna a renderização e o arquivo proporcionais ao histórico sem ganho
+visual. Os métodos abaixo escolhem os índices a plotar, preservando a forma:
+
+- lttb: Largest-Triangle-Three-Buckets (Steinarsson, 2013): em cada bucket
+  mantém o ponto que forma o maior triângulo com o anterior e a média do
+  próximo. Preserva picos e tendência.
+- minmax: mínimo e máximo de cada bucket. Preserva exatamente a envoltória
+  (nenhum pico some), com o dobro de pontos por bucket.
+
+Novos métodos podem ser registrados em DOWNSAMPLERS: uma função
+(x, y, max_points) -> índices em ordem crescente, sempre com o primeiro e o
+último ponto.
+"""
+
+import numpy as np
+
+
+def lttb(x, y, max_points):
+    n = len(x)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+
+    # max_points - 2 buckets entre o primeiro e o último ponto (que são sempre mantidos)
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+    indices = np.empty(max_points, dtype=int)
+    indices[0], indices[-1] = 0, n - 1
+
+    a = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        indices[i + 1] = a
+    return indices
+
+
+def minmax(x, y, max_points):
+    n = len(y)
+    if max_points >= n or max_points < 4:
+        return np.arange(n)
+
+    buckets = (max_points - 2) // 2
+    interior = np.arange(1, n - 1)
+    bucket = (interior - 1) * buckets // (n - 2)
+
+    # Ordena por (bucket, valor): o primeiro de cada bucket é o mínimo, o último o máximo
+    order = np.lexsort((y[interior], bucket))
+    sorted_bucket = bucket[order]
+    starts = np.flatnonzero(np.r_[True, sorted_bucket[1:] != sorted_bucket[:-1]])
+    ends = np.r_[starts[1:] - 1, len(order) - 1]
+
+    return np.unique(np.concatenate([[0], interior[order[starts]], interior[order[ends]], [n - 1]]))
+
+
+DOWNSAMPLERS = {
+    'lttb': lttb,
+    'minmax': minmax,
+}
+
+
+def downsample_indices(x, y, max_points, method='lttb'):
+    """
+    Índices dos pontos a plotar. method: nome em DOWNSAMPLERS, uma função com a
+    mesma assinatura, ou None/'none' para manter todos os pontos.
+    """
+    n = len(x)
+    if method in (None, 'none') or not max_points or n <= max_points:
+        return np.arange(n)
+    fn = method if callable(method) else DOWNSAMPLERS[method]
+    return fn(np.asarray(x, dtype=float), np.asarray(y, dtype=float), max_points)
+
+
+def label_positions(count, max_labels):
+    """Posições (entre os pontos plotados) que recebem rótulo: espaçadas, com o primeiro e o último"""
+    if count <= max_labels:
+        return np.arange(count)
+    return np.unique(np.linspace(0, count - 1, max_labels).round().astype(int))
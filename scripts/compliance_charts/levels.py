@@ -0,0 +1,46 @@
+"""
+Limiares de classificação de conformidade (IRREGULAR / PARCIAL / REGULAR)
+
+Fonte única para a legenda dos gráficos e para o motor de pontuação
+(compliance_charts.scoring). Cada entrada é (nível, percentual mínimo), em
+ordem crescente.
+"""
+
+# Limiares da legenda dos gráficos de compliance
+LEVEL_THRESHOLDS = (
+    ('IRREGULAR', 0.0),
+    ('PARCIAL', 60.0),
+    ('REGULAR', 75.0),
+)
+
+# Faixa "ótima" destacada nos gráficos (não é um nível de classificação)
+OTIMO_MIN = 90.0
+
+# Limiares de classifyComplianceLevel em
+# apps/backend/src/compliance-assessments/utils/scoring-calculator.ts
+# (REGULAR: ≥75% | PARCIAL: 50-74% | IRREGULAR: <50%)
+BACKEND_LEVEL_THRESHOLDS = (
+    ('IRREGULAR', 0.0),
+    ('PARCIAL', 50.0),
+    ('REGULAR', 75.0),
+)
+
+
+def classify_level(percentage, thresholds=LEVEL_THRESHOLDS):
+    level = thresholds[0][0]
+    for name, minimum in thresholds:
+        if percentage >= minimum:
+            level = name
+    return level
+
+
+def legend_labels(thresholds=LEVEL_THRESHOLDS):
+    """Ex: {'IRREGULAR': 'IRREGULAR (< 60%)', 'PARCIAL': 'PARCIAL (60-75%)', 'REGULAR': 'REGULAR (75-90%)'}"""
+    labels = {}
+    for i, (name, minimum) in enumerate(thresholds):
+        upper = thresholds[i + 1][1] if i + 1 < len(thresholds) else OTIMO_MIN
+        if i == 0:
+            labels[name] = f'{name} (< {upper:g}%)'
+        else:
+            labels[name] = f'{name} ({minimum:g}-{upper:g}%)'
+    return labels
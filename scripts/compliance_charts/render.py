@@ -0,0 +1,79 @@
+"""
+API de renderização dos templates de compliance
+
+Para uso como módulo (ex: pelo backend ou pelo servidor de renderização):
+
+    from compliance_charts import MARKETING_SERIES, render_chart_bytes
+
+    png = render_chart_bytes('linha', MARKETING_SERIES)                 # PNG 300 dpi
+    svg = render_chart_bytes('dashboard', MARKETING_SERIES, fmt='svg')  # vetorial
+
+Os bytes são gerados em um buffer em memória, sem arquivo temporário, e
+podem ir direto para uma resposta HTTP (FORMATS traz o Content-Type) ou
+para um relatório PDF.
+"""
+
+import io
+
+from .cache import render_cached
+from .templates import TEMPLATE_KEYS, get_template
+
+# Formatos suportados e respectivo Content-Type
+FORMATS = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+    'pdf': 'application/pdf',
+}
+
+DEFAULT_DPI = 300
+
+
+def _check_format(fmt):
+    if fmt not in FORMATS:
+        raise ValueError(f'Formato não suportado: {fmt} (use {", ".join(FORMATS)})')
+
+
+def render_chart_bytes(key, series, fmt='png', dpi=DEFAULT_DPI, cache=None):
+    """
+    Renderiza um template em memória e retorna os bytes no formato pedido.
+    Nos formatos vetoriais (svg, pdf) o DPI só afeta elementos rasterizados.
+    """
+    _check_format(fmt)
+    template = get_template(key)
+
+    if cache is not None:
+        cache_key = cache.key_for(template, series, dpi, fmt)
+        data = cache.read(cache_key, fmt)
+        if data is not None:
+            return data
+
+    buffer = io.BytesIO()
+    template.render(series, buffer, dpi=dpi, fmt=fmt)
+    data = buffer.getvalue()
+
+    if cache is not None:
+        cache.store_bytes(cache_key, data, fmt)
+    return data
+
+
+def render_series_bytes(series, fmt='png', dpi=DEFAULT_DPI, keys=None, cache=None):
+    """Todos os templates (ou os de keys) de uma série: {nome do arquivo: bytes}"""
+    return {
+        get_template(key).output_name(fmt): render_chart_bytes(key, series, fmt=fmt, dpi=dpi, cache=cache)
+        for key in keys or TEMPLATE_KEYS
+    }
+
+
+def render_series(series, output_dir, dpi=DEFAULT_DPI, keys=None, cache=None, fmt='png'):
+    """
+    Renderiza os templates (todos, por padrão) de uma série em output_dir.
+    Com um RenderCache, gráficos cuja entrada não mudou não são rasterizados de novo.
+    """
+    _check_format(fmt)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for key in keys or TEMPLATE_KEYS:
+        template = get_template(key)
+        paths.append(render_cached(template, series, output_dir / template.output_name(fmt),
+                                   dpi=dpi, cache=cache, fmt=fmt))
+    return paths
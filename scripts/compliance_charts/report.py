@@ -0,0 +1,126 @@
+"""
+Relatório PDF de compliance: os cinco gráficos de cada tenant em páginas
+
+Em vez de cinco PNGs de 300 dpi por tenant, cada gráfico vira uma página
+vetorial de um PDF. As páginas são escritas uma a uma (PdfPages), com as
+figuras reutilizadas dos templates, então a memória não cresce com o número
+de tenants, nem no relatório consolidado com todos eles.
+
+    from compliance_charts import write_tenant_report, write_combined_report
+
+    write_tenant_report(series, output_dir)                  # <output_dir>/<tenantId>/relatorio-compliance.pdf
+    write_combined_report(series_iter, 'pacote-rdc502.pdf')  # capa + cinco páginas por tenant
+"""
+
+import os
+from datetime import datetime
+from pathlib import Path
+
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+
+from .style import FOOTER_TEXT, add_footer, mes_ano
+from .templates import TEMPLATE_KEYS, ChartTemplate, get_template
+
+REPORT_FILENAME = 'relatorio-compliance.pdf'
+REPORT_DPI = 150  # Só afeta elementos rasterizados; textos e linhas são vetoriais
+
+
+class CoverPageTemplate(ChartTemplate):
+    """Capa de cada tenant no relatório consolidado"""
+
+    key = 'capa'
+    description = 'Capa do tenant no relatório PDF'
+
+    def build(self):
+        self.fig = Figure(figsize=(14, 8))
+        self.fig.text(0.5, 0.78, 'Relatório de Conformidade RDC 502/2021',
+                      ha='center', fontsize=26, fontweight='bold', color='#1565C0')
+        self.tenant_text = self.fig.text(0.5, 0.64, '', ha='center', fontsize=18, fontweight='bold')
+        self.period_text = self.fig.text(0.5, 0.55, '', ha='center', fontsize=14, color='#424242')
+        self.current_text = self.fig.text(0.5, 0.40, '', ha='center', fontsize=22, fontweight='bold')
+        self.generated_text = self.fig.text(0.5, 0.20, '', ha='center', fontsize=11, color='gray')
+        add_footer(self.fig)
+
+    def update(self, series):
+        first, last = series.dates[0], series.dates[-1]
+        self.tenant_text.set_text(series.meta.get('tenantName') or f'Tenant {series.tenant_id}')
+        self.period_text.set_text(f'{mes_ano(first)} a {mes_ano(last)} · {len(series)} autodiagnósticos')
+        self.current_text.set_text(f'Conformidade atual: {series.percentages[-1]:.1f}% ({series.levels[-1]})')
+        self.generated_text.set_text(f'Gerado em {datetime.now():%d/%m/%Y %H:%M}')
+
+    def layout(self):
+        pass  # Textos posicionados em coordenadas da figura
+
+
+class ComplianceReport:
+    """
+    PDF aberto para escrita em streaming: add(series) acrescenta as páginas de
+    um tenant. Grava em um arquivo temporário e só publica no close(), para que
+    um relatório interrompido não substitua o anterior.
+    """
+
+    def __init__(self, path, keys=None, cover=False, dpi=REPORT_DPI, title=None):
+        self.path = Path(path)
+        # get_template aplica o estilo no processo antes da capa ser construída
+        self.templates = [get_template(key) for key in keys or TEMPLATE_KEYS]
+        self.cover = CoverPageTemplate() if cover else None
+        self.dpi = dpi
+        self.tenants = 0
+        self.pages = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._staging = self.path.with_name(f'.{self.path.name}.{os.getpid()}.tmp')
+        self._pdf = PdfPages(self._staging, metadata={
+            'Title': title or 'Relatório de Conformidade RDC 502/2021',
+            'Author': 'Rafa ILPI',
+            'Subject': 'Evolução de compliance RDC 502/2021',
+            'Creator': FOOTER_TEXT,
+        })
+
+    def _page(self, template, series):
+        # A capa mantém a página inteira; 'tight' a recortaria pelos textos
+        bbox = None if template is self.cover else 'tight'
+        self._pdf.savefig(template.prepare(series), dpi=self.dpi, bbox_inches=bbox)
+        self.pages += 1
+
+    def add(self, series):
+        if self.cover is not None:
+            self._page(self.cover, series)
+        for template in self.templates:
+            self._page(template, series)
+        self.tenants += 1
+
+    def close(self):
+        self._pdf.close()
+        os.replace(self._staging, self.path)
+        return self.path
+
+    def abort(self):
+        self._pdf.close()
+        self._staging.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_tenant_report(series, output_dir, keys=None, dpi=REPORT_DPI):
+    """Relatório de um tenant em output_dir/<tenantId>/relatorio-compliance.pdf"""
+    path = Path(output_dir) / series.tenant_id / REPORT_FILENAME
+    with ComplianceReport(path, keys=keys, dpi=dpi,
+                          title=f'Relatório de Conformidade RDC 502/2021 - {series.tenant_id}') as report:
+        report.add(series)
+    return path
+
+
+def write_combined_report(series_iter, path, keys=None, dpi=REPORT_DPI, cover=True):
+    """Um único PDF com (capa +) os gráficos de todos os tenants; retorna (tenants, páginas)"""
+    with ComplianceReport(path, keys=keys, cover=cover, dpi=dpi) as report:
+        for series in series_iter:
+            report.add(series)
+    return report.tenants, report.pages
@@ -0,0 +1,240 @@
+"""
+Motor vetorizado de pontuação de autodiagnósticos RDC 502/2021
+
+Recalcula, a partir das linhas de compliance_assessment_responses, as colunas
+derivadas de compliance_assessments (questionsAnswered, questionsNA,
+applicableQuestions, totalPointsObtained, totalPointsPossible,
+compliancePercentage, complianceLevel, criticalNonCompliant) para milhões de
+respostas de uma vez, com operações de array NumPy em vez de um laço por linha.
+
+As regras seguem calculateScoring em
+apps/backend/src/compliance-assessments/utils/scoring-calculator.ts:
+- pontuação possível = questões aplicáveis × 3
+- % conformidade = obtidos / possíveis × 100, arredondado em 2 casas
+- não conformidade crítica = questão "C", aplicável, sem resposta ou com < 3 pontos
+
+A classificação usa, por padrão, BACKEND_LEVEL_THRESHOLDS (os de
+classifyComplianceLevel, PARCIAL a partir de 50%) sobre o percentual sem
+arredondar, como o backend: é o que está gravado em complianceLevel, então
+auditoria e backfill batem com a API. LEVEL_THRESHOLDS (legenda dos
+gráficos, PARCIAL a partir de 60%) só deve ser passado para trabalho de
+gráfico.
+"""
+
+import csv
+import json
+from dataclasses import dataclass
+
+import numpy as np
+
+from .levels import BACKEND_LEVEL_THRESHOLDS
+
+MAX_POINTS_PER_QUESTION = 3
+DEFAULT_TOTAL_QUESTIONS = 37
+TRUE_VALUES = {'t', 'true', '1', 'True', 'TRUE'}
+
+
+@dataclass
+class ResponseArrays:
+    """Respostas em formato colunar (uma posição por linha de resposta)"""
+
+    assessment_ids: np.ndarray     # object/str: assessmentId de cada resposta
+    question_numbers: np.ndarray   # int32
+    selected_points: np.ndarray    # float64, NaN quando selectedPoints é NULL
+    not_applicable: np.ndarray     # bool
+    critical: np.ndarray           # bool: criticalityLevel == 'C'
+    question_texts: np.ndarray = None  # object (opcional, para criticalNonCompliant)
+
+    def __len__(self):
+        return len(self.assessment_ids)
+
+
+@dataclass
+class ScoringResult:
+    """Agregados por avaliação, alinhados com assessment_ids"""
+
+    assessment_ids: np.ndarray
+    total_questions: np.ndarray
+    questions_answered: np.ndarray
+    questions_na: np.ndarray
+    applicable_questions: np.ndarray
+    total_points_obtained: np.ndarray
+    total_points_possible: np.ndarray
+    compliance_percentage: np.ndarray
+    compliance_level: np.ndarray
+    critical_count: np.ndarray
+    # Respostas críticas não conformes, ordenadas por avaliação (índices em ResponseArrays)
+    _critical_rows: np.ndarray = None
+    _critical_offsets: np.ndarray = None
+    _responses: ResponseArrays = None
+
+    def __len__(self):
+        return len(self.assessment_ids)
+
+    def critical_non_compliant(self, i):
+        """Lista no formato da coluna criticalNonCompliant para a i-ésima avaliação"""
+        rows = self._critical_rows[self._critical_offsets[i]:self._critical_offsets[i + 1]]
+        texts = self._responses.question_texts
+        return [
+            {
+                'questionNumber': int(self._responses.question_numbers[r]),
+                'questionText': str(texts[r]) if texts is not None and texts[r] is not None else '',
+                'pointsObtained': 0 if np.isnan(self._responses.selected_points[r])
+                else int(self._responses.selected_points[r]),
+            }
+            for r in rows
+        ]
+
+    def row(self, i):
+        """Linha no formato da tabela compliance_assessments"""
+        return {
+            'id': self.assessment_ids[i],
+            'totalQuestions': int(self.total_questions[i]),
+            'questionsAnswered': int(self.questions_answered[i]),
+            'questionsNA': int(self.questions_na[i]),
+            'applicableQuestions': int(self.applicable_questions[i]),
+            'totalPointsObtained': float(self.total_points_obtained[i]),
+            'totalPointsPossible': float(self.total_points_possible[i]),
+            'compliancePercentage': float(self.compliance_percentage[i]),
+            'complianceLevel': str(self.compliance_level[i]),
+            'criticalNonCompliant': self.critical_non_compliant(i),
+        }
+
+
+def classify_levels(percentages, thresholds=BACKEND_LEVEL_THRESHOLDS):
+    """Versão vetorizada de levels.classify_level (por padrão com os limiares do backend, como score)"""
+    names = np.array([name for name, _ in thresholds], dtype=object)
+    minimums = np.array([minimum for _, minimum in thresholds], dtype=float)
+    # Índice do maior limiar <= percentual (limiares em ordem crescente)
+    index = np.searchsorted(minimums, np.asarray(percentages, dtype=float), side='right') - 1
+    return names[np.clip(index, 0, len(names) - 1)]
+
+
+def _round2(values):
+    """Math.round(x * 100) / 100 do JavaScript (meio para cima, não meio-par)"""
+    return np.floor(values * 100 + 0.5) / 100
+
+
+def score(responses, total_questions=None, thresholds=BACKEND_LEVEL_THRESHOLDS):
+    """
+    Calcula os agregados de todas as avaliações presentes em responses.
+
+    total_questions: dict assessmentId -> totalQuestions (coluna da avaliação);
+    avaliações ausentes usam DEFAULT_TOTAL_QUESTIONS (37).
+    """
+    assessment_ids, index = np.unique(responses.assessment_ids, return_inverse=True)
+    n = len(assessment_ids)
+
+    points = responses.selected_points
+    na = responses.not_applicable
+    has_points = ~np.isnan(points)
+    scored = has_points & ~na
+
+    questions_answered = np.bincount(index, weights=has_points | na, minlength=n).astype(np.int64)
+    questions_na = np.bincount(index, weights=na, minlength=n).astype(np.int64)
+    obtained = np.bincount(index, weights=np.where(scored, points, 0.0), minlength=n)
+
+    totals = np.full(n, DEFAULT_TOTAL_QUESTIONS, dtype=np.int64)
+    if total_questions:
+        totals = np.array([total_questions.get(a, DEFAULT_TOTAL_QUESTIONS) for a in assessment_ids], dtype=np.int64)
+
+    applicable = totals - questions_na
+    possible = (applicable * MAX_POINTS_PER_QUESTION).astype(float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percentage = np.where(possible > 0, obtained / possible * 100, 0.0)
+    # O backend classifica o percentual sem arredondar e só grava a coluna arredondada
+    levels = classify_levels(percentage, thresholds)
+
+    # Não conformidades críticas: C, aplicável, sem resposta ou < 3 pontos
+    critical_mask = responses.critical & ~na & (~has_points | (np.nan_to_num(points, nan=0.0) < 3))
+    critical_rows = np.flatnonzero(critical_mask)
+    critical_rows = critical_rows[np.argsort(index[critical_rows], kind='stable')]
+    critical_count = np.bincount(index[critical_rows], minlength=n)
+    critical_offsets = np.concatenate([[0], np.cumsum(critical_count)])
+
+    return ScoringResult(
+        assessment_ids=assessment_ids,
+        total_questions=totals,
+        questions_answered=questions_answered,
+        questions_na=questions_na,
+        applicable_questions=applicable,
+        total_points_obtained=obtained,
+        total_points_possible=possible,
+        compliance_percentage=_round2(percentage),
+        compliance_level=levels,
+        critical_count=critical_count,
+        _critical_rows=critical_rows,
+        _critical_offsets=critical_offsets,
+        _responses=responses,
+    )
+
+
+def load_responses_csv(path, with_texts=True):
+    """
+    Lê uma exportação CSV de compliance_assessment_responses em arrays colunares.
+    Colunas usadas: assessmentId, questionNumber, selectedPoints, isNotApplicable,
+    criticalityLevel e (opcional) questionTextSnapshot.
+    """
+    ids, numbers, points, na, critical, texts = [], [], [], [], [], []
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for raw in csv.DictReader(f):
+            ids.append(raw['assessmentId'])
+            numbers.append(raw['questionNumber'])
+            points.append(raw['selectedPoints'] or 'nan')
+            na.append(raw['isNotApplicable'] in TRUE_VALUES)
+            critical.append(raw['criticalityLevel'] == 'C')
+            if with_texts:
+                texts.append(raw.get('questionTextSnapshot'))
+
+    return ResponseArrays(
+        assessment_ids=np.array(ids, dtype=object),
+        question_numbers=np.array(numbers, dtype=np.int32),
+        selected_points=np.array(points, dtype=np.float64),
+        not_applicable=np.array(na, dtype=bool),
+        critical=np.array(critical, dtype=bool),
+        question_texts=np.array(texts, dtype=object) if with_texts else None,
+    )
+
+
+STORED_COLUMNS = [
+    ('questionsAnswered', 'questions_answered'),
+    ('questionsNA', 'questions_na'),
+    ('applicableQuestions', 'applicable_questions'),
+    ('totalPointsObtained', 'total_points_obtained'),
+    ('totalPointsPossible', 'total_points_possible'),
+    ('compliancePercentage', 'compliance_percentage'),
+]
+
+
+def load_stored_assessments_csv(path):
+    """Exportação de compliance_assessments indexada por id (apenas colunas derivadas)"""
+    stored = {}
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for raw in csv.DictReader(f):
+            stored[raw['id']] = raw
+    return stored
+
+
+def find_drift(result, stored, tolerance=0.01):
+    """
+    Compara os agregados recalculados com os armazenados.
+    Gera (assessmentId, coluna, armazenado, recalculado) para cada divergência.
+    """
+    for i, assessment_id in enumerate(result.assessment_ids):
+        raw = stored.get(assessment_id)
+        if raw is None:
+            continue
+        for column, attr in STORED_COLUMNS:
+            expected = float(getattr(result, attr)[i])
+            actual = float(raw[column]) if raw.get(column) not in (None, '') else None
+            if actual is None or abs(actual - expected) > tolerance:
+                yield assessment_id, column, raw.get(column), expected
+
+        if raw.get('complianceLevel') != result.compliance_level[i]:
+            yield assessment_id, 'complianceLevel', raw.get('complianceLevel'), result.compliance_level[i]
+
+        stored_critical = json.loads(raw['criticalNonCompliant']) if raw.get('criticalNonCompliant') else []
+        stored_numbers = sorted(item['questionNumber'] for item in stored_critical)
+        expected_numbers = sorted(item['questionNumber'] for item in result.critical_non_compliant(i))
+        if stored_numbers != expected_numbers:
+            yield assessment_id, 'criticalNonCompliant', stored_numbers, expected_numbers
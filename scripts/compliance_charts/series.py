@@ -0,0 +1,92 @@
+"""
+Séries de conformidade (uma por tenant) consumidas pelos templates de gráficos
+"""
+
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+
+@dataclass
+class ComplianceSeries:
+    """Histórico de autodiagnósticos de um tenant, em ordem cronológica"""
+
+    tenant_id: str
+    dates: List[datetime]
+    percentages: List[float]
+    levels: List[str]
+    milestones: Optional[str] = None  # Texto livre do painel "Marcos da Jornada"
+    meta: dict = field(default_factory=dict)
+
+    def __post_init__(self):
+        if not (len(self.dates) == len(self.percentages) == len(self.levels)):
+            raise ValueError(
+                f'Série do tenant {self.tenant_id}: dates, percentages e levels '
+                f'precisam ter o mesmo tamanho ({len(self.dates)}, {len(self.percentages)}, {len(self.levels)})'
+            )
+        if not self.dates:
+            raise ValueError(f'Série do tenant {self.tenant_id} está vazia')
+
+    def __len__(self):
+        return len(self.dates)
+
+    @property
+    def months(self):
+        """Duração da jornada em meses (arredondada)"""
+        return round((self.dates[-1] - self.dates[0]).days / 30.44)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Constrói a série a partir de um dict JSON:
+        {"tenantId": "...", "dates": ["2025-05-20", ...], "percentages": [...], "levels": [...]}
+        (tenantName, opcional, vai para meta e aparece na capa do relatório)
+        """
+        return cls(
+            tenant_id=str(data['tenantId']),
+            dates=[datetime.fromisoformat(d) for d in data['dates']],
+            percentages=[float(p) for p in data['percentages']],
+            levels=list(data['levels']),
+            milestones=data.get('milestones'),
+            meta={'tenantName': data['tenantName']} if data.get('tenantName') else {},
+        )
+
+
+def iter_series_jsonl(path) -> Iterator[ComplianceSeries]:
+    """Lê um arquivo JSONL (uma série por linha) sem carregá-lo inteiro na memória"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield ComplianceSeries.from_dict(json.loads(line))
+
+
+# Jornada usada nos materiais de marketing (caso de sucesso Rafa ILPI)
+MARKETING_SERIES = ComplianceSeries(
+    tenant_id='marketing',
+    dates=[
+        datetime(2025, 5, 20),
+        datetime(2025, 6, 22),
+        datetime(2025, 7, 18),
+        datetime(2025, 8, 21),
+        datetime(2025, 9, 19),
+        datetime(2025, 10, 20),
+        datetime(2025, 11, 22),
+        datetime(2026, 1, 20),
+    ],
+    percentages=[55.00, 60.00, 65.00, 70.00, 74.29, 77.86, 80.71, 85.00],
+    levels=['IRREGULAR', 'IRREGULAR', 'PARCIAL', 'PARCIAL', 'PARCIAL', 'PARCIAL', 'REGULAR', 'REGULAR'],
+    milestones="""
+🎯 MARCOS DA JORNADA:
+
+Maio/25:  🔴 Primeira avaliação - Identificados problemas graves em RH e infraestrutura
+Jun/25:   ✅ Regularizados documentos e RT | Iniciada contratação
+Jul/25:   ✅ Equipe completa | Sistema de chamada instalado | Vacinação atualizada
+Ago/25:   ✅ Todos vínculos regularizados | Farmácia adequada
+Set/25:   ✅ Refeitório adequado | POPs atualizados | Projeto protocolado
+Out/25:   ✅ Projeto APROVADO | PAIS completo | Educação permanente iniciada
+Nov/25:   🟢 REGULAR alcançado! Sem não conformidades críticas
+Jan/26:   🏆 85% de conformidade - ILPI modelo de gestão de qualidade
+""",
+)
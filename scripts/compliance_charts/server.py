@@ -0,0 +1,232 @@
+"""
+Servidor de renderização "quente" para os templates de compliance
+
+Importar Python + matplotlib, aplicar o estilo e carregar o cache de fontes
+custa segundos a cada execução do script. O servidor paga esse custo uma vez:
+um pool limitado de processos é aquecido na inicialização (estilo aplicado,
+figuras de todos os templates construídas e um render descartável para
+carregar as fontes) e passa a atender jobs em dezenas de milissegundos.
+
+Protocolo HTTP (em localhost ou em um socket Unix):
+
+    GET  /health     -> {"status": "ok", "workers": 2, "inFlight": 0, "capacity": 18}
+    GET  /templates  -> {"templates": ["linha", ...], "formats": ["png", ...]}
+    POST /render     -> bytes do gráfico (Content-Type conforme o formato)
+         {"template": "linha", "format": "svg", "dpi": 150,
+          "series": {"tenantId": "...", "dates": [...], "percentages": [...], "levels": [...]}}
+
+A fila é limitada: com workers + queue_size jobs em andamento o servidor
+responde 503 (com Retry-After) em vez de acumular requisições sem limite.
+Um job que excede o timeout recebe 504, mas continua ocupando a vaga até o
+worker terminar (um processo em execução não tem como ser cancelado), então
+o limite vale também para jobs lentos. dpi fora de MIN_DPI..MAX_DPI é
+recusado com 400; se um worker morrer (ex: OOM), o pool é recriado.
+"""
+
+import io
+import json
+import os
+import socketserver
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .cache import RenderCache
+from .render import DEFAULT_DPI, FORMATS, render_chart_bytes
+from .series import MARKETING_SERIES, ComplianceSeries
+from .style import aplicar_estilo
+from .templates import TEMPLATE_KEYS, get_template
+
+MAX_BODY_BYTES = 5 * 1024 * 1024
+MIN_DPI, MAX_DPI = 30, 600  # Acima disso um único job pode alocar um canvas de gigabytes
+
+# Estado de cada processo do pool (definido no initializer)
+_worker_cache = None
+
+
+def _warm_worker(cache_dir):
+    """Initializer do pool: estilo, figuras construídas e fontes carregadas"""
+    global _worker_cache
+    aplicar_estilo()
+    _worker_cache = RenderCache(cache_dir) if cache_dir else None
+    for key in TEMPLATE_KEYS:
+        get_template(key).render(MARKETING_SERIES, io.BytesIO(), dpi=30, fmt='png')
+
+
+def _render_job(key, series_data, fmt, dpi):
+    series = ComplianceSeries.from_dict(series_data)
+    return render_chart_bytes(key, series, fmt=fmt, dpi=dpi, cache=_worker_cache)
+
+
+def _noop():
+    return None
+
+
+class RenderService:
+    """Pool de workers aquecidos + controle de admissão da fila"""
+
+    def __init__(self, workers=2, queue_size=16, timeout=30.0, cache_dir=None):
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.timeout = timeout
+        self.cache_dir = cache_dir
+        self.pool = self._new_pool()
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker, initargs=(self.cache_dir,))
+
+    def warm_up(self):
+        """Força a criação e o aquecimento de todos os workers antes de aceitar conexões"""
+        for future in [self.pool.submit(_noop) for _ in range(self.workers)]:
+            future.result()
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def _recycle(self, broken):
+        """Troca o pool quebrado (worker morto) por um novo; os jobs dele já falharam com BrokenProcessPool"""
+        with self._lock:
+            if self.pool is not broken:
+                return  # Outra requisição já recriou
+            self.pool = self._new_pool()
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def render(self, key, series_data, fmt, dpi):
+        """Retorna os bytes do gráfico; None se a fila estiver cheia"""
+        if not self._slots.acquire(blocking=False):
+            return None
+        with self._lock:
+            self._in_flight += 1
+        pool = self.pool
+        try:
+            future = pool.submit(_render_job, key, series_data, fmt, dpi)
+        except BrokenProcessPool:
+            self._release()
+            self._recycle(pool)
+            raise
+        except BaseException:
+            self._release()
+            raise
+        # A vaga só volta quando o job termina de fato (inclusive depois de um timeout)
+        future.add_done_callback(self._release)
+        try:
+            return future.result(timeout=self.timeout)
+        except BrokenProcessPool:
+            self._recycle(pool)
+            raise
+
+    def shutdown(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    server_version = 'RafaComplianceCharts/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    @property
+    def service(self):
+        return self.server.render_service
+
+    def address_string(self):
+        # Em socket Unix client_address é uma string vazia
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, body, content_type='application/json', headers=None):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message, headers=None):
+        self._send(status, {'error': message}, headers=headers)
+
+    def do_GET(self):
+        if self.path == '/health':
+            return self._send(200, {
+                'status': 'ok',
+                'workers': self.service.workers,
+                'inFlight': self.service.in_flight,
+                'capacity': self.service.capacity,
+            })
+        if self.path == '/templates':
+            return self._send(200, {'templates': TEMPLATE_KEYS, 'formats': list(FORMATS)})
+        return self._error(404, f'Rota não encontrada: {self.path}')
+
+    def do_POST(self):
+        if self.path != '/render':
+            return self._error(404, f'Rota não encontrada: {self.path}')
+
+        length = int(self.headers.get('Content-Length') or 0)
+        if length <= 0 or length > MAX_BODY_BYTES:
+            return self._error(413 if length > MAX_BODY_BYTES else 400, 'Corpo da requisição ausente ou grande demais')
+
+        try:
+            job = json.loads(self.rfile.read(length))
+            key = job['template']
+            fmt = job.get('format', 'png')
+            dpi = int(job.get('dpi', DEFAULT_DPI))
+            if not MIN_DPI <= dpi <= MAX_DPI:
+                raise ValueError(f'dpi deve estar entre {MIN_DPI} e {MAX_DPI}')
+            series_data = job['series']
+            ComplianceSeries.from_dict(series_data)  # Valida antes de ocupar um worker
+        except (ValueError, KeyError, TypeError) as exc:
+            return self._error(400, f'Job inválido: {exc}')
+
+        if key not in TEMPLATE_KEYS:
+            return self._error(400, f'Template desconhecido: {key} (disponíveis: {", ".join(TEMPLATE_KEYS)})')
+        if fmt not in FORMATS:
+            return self._error(400, f'Formato não suportado: {fmt} (use {", ".join(FORMATS)})')
+
+        try:
+            data = self.service.render(key, series_data, fmt, dpi)
+        except TimeoutError:
+            return self._error(504, f'Renderização excedeu {self.service.timeout:.0f}s')
+        except BrokenProcessPool:
+            return self._error(503, 'Worker de renderização reiniciado', headers={'Retry-After': '1'})
+        except Exception as exc:  # Erro dentro do worker
+            return self._error(500, f'Falha ao renderizar: {exc}')
+
+        if data is None:
+            return self._error(503, 'Fila de renderização cheia', headers={'Retry-After': '1'})
+        return self._send(200, data, content_type=FORMATS[fmt])
+
+
+class _ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        socketserver.UnixStreamServer.server_bind(self)
+        self.server_name, self.server_port = 'localhost', 0
+
+
+def make_server(service, host='127.0.0.1', port=8765, unix_socket=None, verbose=False):
+    """Servidor HTTP em host:port ou, se unix_socket for informado, no socket Unix"""
+    if unix_socket:
+        if os.path.exists(unix_socket):
+            os.unlink(unix_socket)
+        server = _ThreadingUnixHTTPServer(unix_socket, RenderRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), RenderRequestHandler)
+        server.daemon_threads = True
+    server.render_service = service
+    server.verbose = verbose
+    return server
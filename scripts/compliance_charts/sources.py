@@ -0,0 +1,187 @@
+"""
+Leitura de autodiagnósticos (tabela compliance_assessments) para os gráficos
+
+As linhas têm o formato da tabela: tenantId, assessmentDate, compliancePercentage,
+complianceLevel, status, deletedAt (e, opcionalmente, tenantName, usado na
+capa do relatório; o PostgreSQL o traz de public.tenants). Só entram nos gráficos avaliações COMPLETED
+e não excluídas. Tudo é processado em streaming: as linhas nunca são carregadas
+inteiras na memória, apenas o histórico de um tenant por vez (ou de um bucket
+de tenants, quando a exportação não está ordenada por tenant).
+
+Fontes suportadas:
+- CSV (ex: \\COPY compliance_assessments TO ... WITH CSV HEADER)
+- JSONL (um objeto por linha)
+- PostgreSQL local (um schema por tenant; requer psycopg)
+"""
+
+import csv
+import json
+import os
+import tempfile
+import zlib
+from collections import namedtuple
+from datetime import datetime
+from itertools import groupby
+from pathlib import Path
+
+from .series import ComplianceSeries
+
+AssessmentRow = namedtuple('AssessmentRow', ['tenant_id', 'assessment_date', 'percentage', 'level', 'tenant_name'],
+                           defaults=[None])
+
+COLUMNS = ['tenantId', 'assessmentDate', 'compliancePercentage', 'complianceLevel', 'status', 'deletedAt']
+
+
+def _to_row(raw):
+    """Converte uma linha bruta (dict) em AssessmentRow, ou None se não deve entrar no gráfico"""
+    if raw.get('status') != 'COMPLETED':
+        return None
+    if raw.get('deletedAt') not in (None, ''):
+        return None
+    date = raw['assessmentDate']
+    if not isinstance(date, datetime):
+        date = datetime.fromisoformat(date)
+    return AssessmentRow(
+        tenant_id=str(raw['tenantId']),
+        assessment_date=date,
+        percentage=float(raw['compliancePercentage']),
+        level=raw['complianceLevel'],
+        tenant_name=raw.get('tenantName') or None,
+    )
+
+
+def _filtered(raw_rows):
+    for raw in raw_rows:
+        row = _to_row(raw)
+        if row is not None:
+            yield row
+
+
+def iter_rows_csv(path):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        yield from _filtered(csv.DictReader(f))
+
+
+def iter_rows_jsonl(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from _filtered(json.loads(line) for line in f if line.strip())
+
+
+def iter_rows_file(path):
+    """Escolhe o leitor pela extensão (.csv, .jsonl/.ndjson)"""
+    suffix = Path(path).suffix.lower()
+    if suffix == '.csv':
+        return iter_rows_csv(path)
+    if suffix in ('.jsonl', '.ndjson'):
+        return iter_rows_jsonl(path)
+    raise ValueError(f'Formato de exportação não suportado: {path} (use .csv, .jsonl ou .ndjson)')
+
+
+def iter_rows_postgres(dsn, schemas=None, fetch_size=5000):
+    """
+    Lê compliance_assessments de cada schema de tenant (public.tenants."schemaName").
+
+    Usa cursores nomeados (server-side), então o banco entrega as linhas em lotes
+    de fetch_size. As linhas saem agrupadas por tenant e ordenadas por data.
+    """
+    try:
+        import psycopg
+        from psycopg import sql
+    except ImportError as exc:
+        raise RuntimeError('Leitura direta do PostgreSQL requer psycopg: pip install "psycopg[binary]"') from exc
+
+    with psycopg.connect(dsn) as conn:
+        if schemas is None:
+            with conn.cursor() as cur:
+                cur.execute('SELECT "schemaName" FROM public.tenants WHERE "deletedAt" IS NULL ORDER BY "schemaName"')
+                schemas = [schema for (schema,) in cur.fetchall()]
+
+        query = sql.SQL(
+            'SELECT a."tenantId", a."assessmentDate", a."compliancePercentage", a."complianceLevel", a.status, '
+            'a."deletedAt", t.name '
+            'FROM {}.compliance_assessments a LEFT JOIN public.tenants t ON t.id = a."tenantId" '
+            "WHERE a.status = 'COMPLETED' AND a.\"deletedAt\" IS NULL "
+            'ORDER BY a."tenantId", a."assessmentDate"'
+        )
+        for schema in schemas:
+            with conn.cursor(name=f'compliance_{schema}') as cur:
+                cur.itersize = fetch_size
+                cur.execute(query.format(sql.Identifier(schema)))
+                for values in cur:
+                    yield _to_row(dict(zip([*COLUMNS, 'tenantName'], values)))
+
+
+def _series_from_rows(tenant_id, rows):
+    rows = sorted(rows, key=lambda r: r.assessment_date)
+    name = next((r.tenant_name for r in reversed(rows) if r.tenant_name), None)
+    return ComplianceSeries(
+        tenant_id=tenant_id,
+        dates=[r.assessment_date for r in rows],
+        percentages=[r.percentage for r in rows],
+        levels=[r.level for r in rows],
+        meta={'tenantName': name} if name else {},
+    )
+
+
+def _group_presorted(rows):
+    seen = set()
+    for tenant_id, tenant_rows in groupby(rows, key=lambda r: r.tenant_id):
+        if tenant_id in seen:
+            raise ValueError(
+                f'Exportação não está agrupada por tenant (tenant {tenant_id} reaparece); '
+                'rode sem --presorted para agrupar via buckets em disco'
+            )
+        seen.add(tenant_id)
+        yield _series_from_rows(tenant_id, tenant_rows)
+
+
+def _group_bucketed(rows, buckets):
+    """
+    Agrupamento externo: particiona as linhas em buckets temporários por hash do
+    tenant e agrupa um bucket por vez. A memória fica limitada a ~1/buckets da
+    exportação, e cada tenant cai inteiro em um único bucket.
+    """
+    with tempfile.TemporaryDirectory(prefix='compliance-buckets-') as tmp:
+        paths = [os.path.join(tmp, f'{i:04d}.jsonl') for i in range(buckets)]
+        files = [open(p, 'w', encoding='utf-8') for p in paths]
+        try:
+            for row in rows:
+                bucket = zlib.crc32(row.tenant_id.encode('utf-8')) % buckets
+                files[bucket].write(json.dumps([row.tenant_id, row.assessment_date.isoformat(),
+                                                row.percentage, row.level, row.tenant_name]) + '\n')
+        finally:
+            for f in files:
+                f.close()
+
+        for path in paths:
+            by_tenant = {}
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    tenant_id, date, pct, level, name = json.loads(line)
+                    by_tenant.setdefault(tenant_id, []).append(
+                        AssessmentRow(tenant_id, datetime.fromisoformat(date), pct, level, name))
+            for tenant_id in sorted(by_tenant):
+                yield _series_from_rows(tenant_id, by_tenant.pop(tenant_id))
+
+
+def group_by_tenant(rows, presorted=False, buckets=64):
+    """
+    Agrupa AssessmentRow em uma ComplianceSeries por tenant.
+
+    presorted=True assume as linhas já agrupadas por tenant (caso do PostgreSQL
+    ou de exportações com ORDER BY "tenantId") e mantém só um tenant em memória.
+    """
+    if presorted:
+        return _group_presorted(rows)
+    return _group_bucketed(rows, buckets)
+
+
+def iter_tenant_series(source, presorted=False, buckets=64, schemas=None):
+    """
+    Séries por tenant a partir de um arquivo (.csv/.jsonl) ou DSN do PostgreSQL
+    (postgresql://...).
+    """
+    source = str(source)
+    if source.startswith(('postgresql://', 'postgres://')):
+        return group_by_tenant(iter_rows_postgres(source, schemas=schemas), presorted=True)
+    return group_by_tenant(iter_rows_file(source), presorted=presorted, buckets=buckets)
@@ -0,0 +1,47 @@
+"""
+Estilo visual compartilhado pelos templates de gráficos de compliance
+"""
+
+import matplotlib
+import matplotlib.style
+
+FOOTER_TEXT = '🤖 Powered by Rafa ILPI - Módulo de Compliance RDC 502/2021'
+
+# Cores por nível de conformidade (barras, pizzas)
+LEVEL_COLORS = {
+    'IRREGULAR': '#E57373',  # Vermelho claro
+    'PARCIAL': '#FFB74D',    # Laranja claro
+    'REGULAR': '#81C784',    # Verde claro
+}
+
+LEVEL_EMOJI = {
+    'IRREGULAR': '🔴',
+    'PARCIAL': '🟡',
+    'REGULAR': '🟢',
+}
+
+MESES_PT = ['Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho',
+            'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro']
+
+
+def aplicar_estilo():
+    """Configura o estilo profissional (executado também em cada worker)"""
+    matplotlib.style.use('seaborn-v0_8-darkgrid')
+    matplotlib.rcParams['figure.figsize'] = (14, 8)
+    matplotlib.rcParams['font.size'] = 12
+    matplotlib.rcParams['font.family'] = 'sans-serif'
+
+
+def add_footer(fig):
+    """Adiciona a nota de rodapé padrão no canto inferior direito"""
+    fig.text(0.99, 0.01,
+             FOOTER_TEXT,
+             ha='right',
+             fontsize=10,
+             style='italic',
+             color='gray')
+
+
+def mes_ano(date):
+    """Ex: datetime(2025, 5, 20) -> 'Maio/2025'"""
+    return f'{MESES_PT[date.month - 1]}/{date.year}'
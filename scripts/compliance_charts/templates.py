@@ -0,0 +1,723 @@
+"""
+Templates dos cinco gráficos de evolução de compliance RDC 502/2021
+
+Cada template constrói sua Figure/Axes uma única vez (build) e, a cada tenant,
+apenas atualiza os dados dos artistas já existentes (set_data, alturas das
+barras, textos das anotações). Construir e diagramar a figura é a parte cara
+da renderização; com a reutilização, um lote de milhares de tenants paga esse
+custo uma vez por processo.
+
+Séries longas (ex: avaliações diárias de vários anos) passam por uma etapa de
+redução (compliance_charts.downsample): até max_points pontos nos templates
+de linha e até max_bars barras nos de barras, onde cada barra passa a cobrir
+um período. Os rótulos por ponto/barra são espaçados automaticamente, de modo
+que o tempo de renderização e o tamanho do arquivo não crescem com o histórico.
+"""
+
+from math import ceil, floor
+
+import matplotlib.dates as mdates
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.patches import Patch, Rectangle
+
+from .downsample import DOWNSAMPLERS, downsample_indices, label_positions
+from .levels import legend_labels
+from .style import LEVEL_COLORS, LEVEL_EMOJI, MESES_PT, add_footer, aplicar_estilo, mes_ano
+
+NO_LEVEL_COLOR = '#BDBDBD'
+
+
+class _ArtistPool:
+    """Pool de artistas reutilizáveis: cresce sob demanda e oculta os excedentes"""
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.artists = []
+
+    def take(self, n):
+        while len(self.artists) < n:
+            self.artists.append(self.factory())
+        for i, artist in enumerate(self.artists):
+            artist.set_visible(i < n)
+        return self.artists[:n]
+
+
+def _update_fill(ax, fill, x, y, **kwargs):
+    """Atualiza a área sob a curva (recria apenas em matplotlib < 3.10)"""
+    if hasattr(fill, 'set_data'):
+        fill.set_data(x, y, 0)
+        return fill
+    fill.remove()
+    return ax.fill_between(x, y, **kwargs)
+
+
+def _date_limits(x):
+    """Limites do eixo X com a mesma margem de 5% do autoscale do matplotlib"""
+    lo, hi = float(x.min()), float(x.max())
+    margin = (hi - lo) * 0.05 if hi > lo else 15  # 15 dias para série de um ponto
+    return lo - margin, hi + margin
+
+
+def _bar_limits(n, width):
+    span = (n - 1) + width
+    margin = span * 0.05
+    return -width / 2 - margin, (n - 1) + width / 2 + margin
+
+
+def _first_regular_index(levels):
+    """Índice da primeira avaliação em que o nível REGULAR foi alcançado"""
+    for i, level in enumerate(levels):
+        if level == 'REGULAR' and (i == 0 or levels[i - 1] != 'REGULAR'):
+            return i
+    return None
+
+
+def _month_locator(x):
+    """Um tick por mês até ~2 anos; acima disso, intervalo que mantém ~24 ticks"""
+    months = (x[-1] - x[0]) / 30.44
+    return mdates.MonthLocator(interval=max(1, ceil(months / 24)))
+
+
+def _mes_curto(date):
+    """Ex: datetime(2025, 5, 20) -> 'Mai/25'"""
+    return f'{MESES_PT[date.month - 1][:3]}/{date.strftime("%y")}'
+
+
+class ChartTemplate:
+    """Template reutilizável: build() uma vez, update(series) por tenant"""
+
+    key = ''
+    filename = ''
+    description = ''
+    version = 1  # Incrementar ao mudar o desenho do template (invalida o cache)
+
+    # Redução de séries longas (ver set_downsampling)
+    downsampler = 'lttb'
+    max_points = 1000
+    max_point_labels = 16
+    max_bars = 60  # Acima disso as barras ficam finas demais para ler (vale mesmo com downsampler 'none')
+
+    def __init__(self):
+        self.fig = None
+        self._laid_out = False
+
+    def build(self):
+        raise NotImplementedError
+
+    def update(self, series):
+        raise NotImplementedError
+
+    def layout(self):
+        self.fig.tight_layout()
+
+    def signature(self):
+        """Tudo do template que afeta o resultado (entra na chave do cache)"""
+        return (f'{self.key}|{self.version}|{self.downsampler}:{self.max_points}:'
+                f'{self.max_point_labels}:{self.max_bars}')
+
+    def plot_points(self, series):
+        """
+        (x, y, rotulados) da série já reduzida: x em números de data do matplotlib
+        e as posições, entre os pontos plotados, que recebem marcador e rótulo.
+        """
+        x = mdates.date2num(series.dates)
+        y = np.asarray(series.percentages, dtype=float)
+        keep = downsample_indices(x, y, self.max_points, self.downsampler)
+        if len(keep) < len(x):
+            x, y = x[keep], y[keep]
+        return x, y, label_positions(len(x), self.max_point_labels)
+
+    def bar_points(self, series):
+        """
+        Índices das avaliações que viram barra: todas até max_bars; acima disso,
+        as escolhidas pelo downsampler (lttb se 'none'), sempre com a primeira
+        e a última. Cada barra representa o período desde a barra anterior.
+        """
+        x = mdates.date2num(series.dates)
+        y = np.asarray(series.percentages, dtype=float)
+        method = 'lttb' if self.downsampler in (None, 'none') else self.downsampler
+        return downsample_indices(x, y, self.max_bars, method)
+
+    def prepare(self, series):
+        """Garante a figura construída e atualizada com a série informada"""
+        if self.fig is None:
+            self.build()
+        self.update(series)
+        if not self._laid_out:
+            # A estrutura da figura é idêntica entre tenants: diagrama só uma vez
+            self.layout()
+            self._laid_out = True
+        return self.fig
+
+    def render(self, series, output, dpi=300, fmt=None):
+        """
+        Salva o gráfico em output: caminho ou arquivo binário (ex: io.BytesIO).
+        fmt ('png', 'svg', 'pdf') é obrigatório para buffers; para caminhos,
+        o padrão é a extensão do arquivo.
+        """
+        self.prepare(series).savefig(output, dpi=dpi, format=fmt, bbox_inches='tight')
+        return output
+
+    @classmethod
+    def output_name(cls, fmt='png'):
+        """Nome do arquivo no formato pedido (ex: 01-evolucao-linha-principal.svg)"""
+        return f'{cls.filename.rsplit(".", 1)[0]}.{fmt}'
+
+    def close(self):
+        self.fig = None
+        self._laid_out = False
+
+
+# ============================================
+# GRÁFICO 1: Linha de Evolução Principal
+# ============================================
+class LineChartTemplate(ChartTemplate):
+    key = 'linha'
+    filename = '01-evolucao-linha-principal.png'
+    description = 'Evolução em Linha (Principal)'
+
+    def build(self):
+        self.fig = fig = Figure(figsize=(16, 9))
+        self.ax = ax = fig.subplots()
+        ax.xaxis_date()
+
+        # Linha principal
+        self.line, = ax.plot([], [],
+                             linewidth=4,
+                             marker='o',
+                             markersize=12,
+                             color='#2E7D32',
+                             label='Conformidade RDC 502/2021',
+                             zorder=3)
+
+        # Área preenchida abaixo da linha
+        self.fill_kwargs = dict(alpha=0.3, color='#4CAF50')
+        self.fill = ax.fill_between([0, 1], [0, 0], **self.fill_kwargs)
+
+        # Pontos de dados com valores
+        self.point_labels = _ArtistPool(lambda: ax.annotate(
+            '',
+            xy=(0, 0),
+            xytext=(0, 15),
+            textcoords='offset points',
+            ha='center',
+            fontsize=11,
+            fontweight='bold',
+            bbox=dict(boxstyle='round,pad=0.5', facecolor='white', edgecolor='#2E7D32', linewidth=2)))
+
+        # Linhas de referência para níveis de conformidade
+        ax.axhline(y=50, color='#D32F2F', linestyle='--', linewidth=2, alpha=0.5, label='Mínimo IRREGULAR (50%)')
+        ax.axhline(y=60, color='#F57C00', linestyle='--', linewidth=2, alpha=0.5, label='Mínimo PARCIAL (60%)')
+        ax.axhline(y=75, color='#388E3C', linestyle='--', linewidth=2, alpha=0.5, label='Mínimo REGULAR (75%)')
+        ax.axhline(y=90, color='#1976D2', linestyle='--', linewidth=2, alpha=0.5, label='Mínimo ÓTIMO (90%)')
+
+        # Destaque do momento de alcance REGULAR
+        self.star, = ax.plot([], [],
+                             marker='*',
+                             markersize=30,
+                             color='#FFD700',
+                             markeredgecolor='#F57F17',
+                             markeredgewidth=2,
+                             zorder=4)
+        self.star_label = ax.annotate('🎉 Alcançado nível REGULAR!',
+                                      xy=(0, 0),
+                                      xytext=(30, -40),
+                                      textcoords='offset points',
+                                      fontsize=13,
+                                      fontweight='bold',
+                                      color='#F57F17',
+                                      bbox=dict(boxstyle='round,pad=0.7', facecolor='#FFF9C4', edgecolor='#F57F17', linewidth=2),
+                                      arrowprops=dict(arrowstyle='->', color='#F57F17', lw=2))
+
+        # Configurações do eixo X (locator definido por série em update)
+        ax.xaxis.set_major_formatter(mdates.DateFormatter('%b/%Y'))
+        ax.tick_params(axis='x', labelrotation=45)
+        for label in ax.get_xticklabels():
+            label.set_ha('right')
+
+        # Configurações do eixo Y
+        ax.set_ylabel('Conformidade (%)', fontsize=14, fontweight='bold')
+        ax.set_xlabel('Período de Avaliação', fontsize=14, fontweight='bold')
+
+        # Grade
+        ax.grid(True, alpha=0.3, linestyle='--', linewidth=0.8)
+        ax.set_axisbelow(True)
+
+        # Legenda
+        ax.legend(loc='lower right', fontsize=11, framealpha=0.95, edgecolor='gray')
+
+        add_footer(fig)
+
+    def update(self, series):
+        ax = self.ax
+        x, y, labeled = self.plot_points(series)
+
+        self.line.set_data(x, y)
+        self.line.set_markevery(None if len(labeled) == len(x) else labeled)
+        self.fill = _update_fill(ax, self.fill, x, y, **self.fill_kwargs)
+
+        for annotation, i in zip(self.point_labels.take(len(labeled)), labeled):
+            annotation.xy = (x[i], y[i])
+            annotation.set_text(f'{y[i]:.1f}%')
+
+        regular_index = _first_regular_index(series.levels)
+        self.star.set_visible(regular_index is not None)
+        self.star_label.set_visible(regular_index is not None)
+        if regular_index is not None:
+            star_xy = (mdates.date2num(series.dates[regular_index]), series.percentages[regular_index])
+            self.star.set_data([star_xy[0]], [star_xy[1]])
+            self.star_label.xy = star_xy
+
+        ax.xaxis.set_major_locator(_month_locator(x))
+        ax.set_xlim(*_date_limits(x))
+        ax.set_ylim(min(45, floor(y.min()) - 5), max(95, floor(y.max()) + 10))
+        for label in ax.get_xticklabels():
+            label.set_ha('right')
+
+        # Título
+        ax.set_title('Evolução de Conformidade RDC 502/2021\n'
+                     f'Jornada de {series.months} Meses: '
+                     f'De {series.levels[0]} ({y[0]:.0f}%) para {series.levels[-1]} ({y[-1]:.0f}%)',
+                     fontsize=18,
+                     fontweight='bold',
+                     pad=20)
+
+
+# ============================================
+# GRÁFICO 2: Barras Verticais com Gradiente
+# ============================================
+class BarChartTemplate(ChartTemplate):
+    key = 'barras'
+    filename = '02-evolucao-barras-vertical.png'
+    description = 'Barras Verticais com Gradiente'
+
+    BAR_WIDTH = 0.7
+
+    def build(self):
+        self.fig = fig = Figure(figsize=(16, 9))
+        self.ax = ax = fig.subplots()
+
+        self.bars = _ArtistPool(lambda: ax.add_patch(Rectangle(
+            (0, 0), self.BAR_WIDTH, 0,
+            edgecolor='black',
+            linewidth=2,
+            alpha=0.9)))
+
+        # Valores nas barras
+        self.bar_labels = _ArtistPool(lambda: ax.text(
+            0, 0, '',
+            ha='center', va='bottom',
+            fontsize=11,
+            fontweight='bold'))
+
+        # Setas de evolução entre barras
+        self.diff_labels = _ArtistPool(lambda: ax.annotate(
+            '',
+            xy=(0, 0),
+            fontsize=9,
+            ha='center',
+            color='#1976D2',
+            fontweight='bold',
+            bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.8, edgecolor='#1976D2')))
+
+        # Configurações dos eixos
+        ax.set_ylabel('Conformidade (%)', fontsize=14, fontweight='bold')
+        ax.set_ylim(0, 100)
+
+        # Grade
+        ax.grid(True, axis='y', alpha=0.3, linestyle='--', linewidth=0.8)
+        ax.set_axisbelow(True)
+
+        # Legenda de níveis
+        legend_elements = [
+            Patch(facecolor=LEVEL_COLORS[level], edgecolor='black', label=label)
+            for level, label in legend_labels().items()
+        ]
+        ax.legend(handles=legend_elements, loc='upper left', fontsize=11, framealpha=0.95, edgecolor='gray')
+
+        add_footer(fig)
+
+    def update(self, series):
+        ax = self.ax
+        keep = self.bar_points(series)
+        pcts = [series.percentages[i] for i in keep]
+        levels = [series.levels[i] for i in keep]
+        dates = [series.dates[i] for i in keep]
+        n = len(keep)
+        labeled = label_positions(n, self.max_point_labels)
+
+        for i, (bar, pct, level) in enumerate(zip(self.bars.take(n), pcts, levels)):
+            bar.set_xy((i - self.BAR_WIDTH / 2, 0))
+            bar.set_height(pct)
+            bar.set_facecolor(LEVEL_COLORS.get(level, NO_LEVEL_COLOR))
+
+        for i, label in zip(labeled, self.bar_labels.take(len(labeled))):
+            label.set_position((i, pcts[i] + 1.5))
+            label.set_text(f'{pcts[i]:.1f}%\n{levels[i]}')
+
+        # Setas de evolução só quando todas as barras têm rótulo (senão se sobrepõem)
+        diffs = n - 1 if len(labeled) == n else 0
+        for i, annotation in enumerate(self.diff_labels.take(diffs)):
+            diff = pcts[i+1] - pcts[i]
+            annotation.xy = annotation.xyann = (i + 0.5, (pcts[i] + pcts[i+1]) / 2)
+            annotation.set_text(f'{diff:+.1f}%')
+
+        ax.set_xlim(*_bar_limits(n, self.BAR_WIDTH))
+        ax.set_xticks(labeled)
+        ax.set_xticklabels([dates[i].strftime('%b/%Y') for i in labeled], rotation=45, ha='right')
+
+        # Título
+        ax.set_title('Progresso Mensal de Conformidade\n'
+                     f'Ganho Total: {pcts[-1] - pcts[0]:+.0f} pontos percentuais em {series.months} meses',
+                     fontsize=18,
+                     fontweight='bold',
+                     pad=20)
+
+
+# ============================================
+# GRÁFICO 3: Comparativo Antes x Depois
+# ============================================
+def _pie_geometry(fracs, startangle=90, explode=(0.05, 0), labeldistance=1.1):
+    """Reproduz a geometria de Axes.pie: (centro, theta1, theta2, posição do rótulo) por fatia"""
+    theta1 = startangle / 360
+    geometry = []
+    for frac, expl in zip(fracs, explode):
+        theta2 = theta1 + frac
+        thetam = np.pi * (theta1 + theta2)
+        x, y = expl * np.cos(thetam), expl * np.sin(thetam)
+        label_xy = (x + labeldistance * np.cos(thetam), y + labeldistance * np.sin(thetam))
+        geometry.append(((x, y), 360 * theta1, 360 * theta2, label_xy))
+        theta1 = theta2
+    return geometry
+
+
+class BeforeAfterTemplate(ChartTemplate):
+    key = 'antes-depois'
+    filename = '03-comparativo-antes-depois.png'
+    description = 'Comparativo Antes x Depois (Pizza)'
+
+    def build(self):
+        self.fig = fig = Figure(figsize=(16, 8))
+        self.axes = fig.subplots(1, 2)
+
+        self.pies = []
+        for ax in self.axes:
+            wedges, texts = ax.pie([50, 50],
+                                   labels=['', ''],
+                                   colors=[NO_LEVEL_COLOR, '#EEEEEE'],
+                                   startangle=90,
+                                   explode=(0.05, 0),
+                                   textprops={'fontsize': 14, 'fontweight': 'bold'})
+            self.pies.append((wedges, texts))
+
+        # Título geral
+        self.suptitle = fig.suptitle('', fontsize=20, fontweight='bold', y=0.98)
+
+        # Destaque do ganho
+        self.gain_text = fig.text(0.5, 0.08, '',
+                                  ha='center',
+                                  fontsize=18,
+                                  fontweight='bold',
+                                  color='#1976D2',
+                                  bbox=dict(boxstyle='round,pad=1', facecolor='#E3F2FD', edgecolor='#1976D2', linewidth=3))
+
+        add_footer(fig)
+
+    def layout(self):
+        self.fig.tight_layout(rect=[0, 0.12, 1, 0.95])
+
+    def _update_pie(self, ax, pie, title, date, pct, level):
+        wedges, texts = pie
+        resto = 100 - pct
+        labels = [f'Conforme\n{pct:.1f}%', f'Não Conforme\n{resto:.1f}%']
+        geometry = _pie_geometry([pct / 100, resto / 100])
+        for wedge, text, label, (center, theta1, theta2, (xt, yt)) in zip(wedges, texts, labels, geometry):
+            wedge.set_center(center)
+            wedge.set_theta1(theta1)
+            wedge.set_theta2(theta2)
+            text.set_position((xt, yt))
+            text.set_ha('left' if xt > 0 else 'right')
+            text.set_text(label)
+        wedges[0].set_facecolor(LEVEL_COLORS.get(level, NO_LEVEL_COLOR))
+
+        ax.set_title(f'{title} ({mes_ano(date)})\n{LEVEL_EMOJI.get(level, "")} {level}',
+                     fontsize=16,
+                     fontweight='bold',
+                     pad=20)
+
+    def update(self, series):
+        antes_pct = series.percentages[0]
+        depois_pct = series.percentages[-1]
+        self._update_pie(self.axes[0], self.pies[0], 'ANTES', series.dates[0], antes_pct, series.levels[0])
+        self._update_pie(self.axes[1], self.pies[1], 'DEPOIS', series.dates[-1], depois_pct, series.levels[-1])
+
+        self.suptitle.set_text(f'Transformação em {series.months} Meses\nImpacto do Módulo de Compliance Rafa ILPI')
+        self.gain_text.set_text(f'📈 GANHO: {depois_pct - antes_pct:+.0f} pontos percentuais')
+
+
+# ============================================
+# GRÁFICO 4: Dashboard Executivo
+# ============================================
+def _auto_milestones(series, limit=8):
+    """Marcos gerados a partir das avaliações quando a série não traz texto próprio"""
+    lines = ['', '🎯 MARCOS DA JORNADA:', '']
+    start = max(0, len(series) - limit)
+    for date, pct, level in zip(series.dates[start:], series.percentages[start:], series.levels[start:]):
+        lines.append(f'{_mes_curto(date) + ":":<10}{LEVEL_EMOJI.get(level, "•")} {pct:.1f}% - {level}')
+    return '\n'.join(lines) + '\n'
+
+
+class ExecutiveDashboardTemplate(ChartTemplate):
+    key = 'dashboard'
+    filename = '04-dashboard-executivo.png'
+    description = 'Dashboard Executivo Completo'
+
+    def build(self):
+        self.fig = fig = Figure(figsize=(18, 10))
+        gs = fig.add_gridspec(3, 3, hspace=0.4, wspace=0.3)
+
+        # Painel 1: Gráfico de linha (principal)
+        self.ax1 = ax1 = fig.add_subplot(gs[0:2, 0:2])
+        ax1.xaxis_date()
+        self.line, = ax1.plot([], [],
+                              linewidth=4,
+                              marker='o',
+                              markersize=10,
+                              color='#2E7D32',
+                              label='Evolução Mensal')
+        self.fill_kwargs = dict(alpha=0.2, color='#4CAF50')
+        self.fill = ax1.fill_between([0, 1], [0, 0], **self.fill_kwargs)
+        ax1.axhline(y=75, color='#388E3C', linestyle='--', linewidth=2, alpha=0.5, label='Meta REGULAR (75%)')
+        ax1.set_ylabel('Conformidade (%)', fontsize=12, fontweight='bold')
+        ax1.set_title('Evolução Temporal', fontsize=14, fontweight='bold')
+        ax1.grid(True, alpha=0.3)
+        ax1.legend(fontsize=10)
+        ax1.xaxis.set_major_formatter(mdates.DateFormatter('%b/%y'))
+        ax1.tick_params(axis='x', labelrotation=45)
+
+        # Painel 2: KPIs principais
+        ax2 = fig.add_subplot(gs[0, 2])
+        ax2.axis('off')
+        self.kpi_text = ax2.text(0.1, 0.5, '',
+                                 fontsize=13,
+                                 verticalalignment='center',
+                                 fontfamily='monospace',
+                                 bbox=dict(boxstyle='round,pad=1', facecolor='#E8F5E9', edgecolor='#2E7D32', linewidth=2))
+
+        # Painel 3: Velocímetro (simulado com semi-círculo)
+        ax3 = fig.add_subplot(gs[1, 2])
+        ax3.axis('off')
+        ax3.set_xlim(-1.2, 1.2)
+        ax3.set_ylim(-0.2, 1.2)
+
+        # Arco de fundo
+        for color, start, end in [
+            ('#E57373', 0, 50),
+            ('#FFB74D', 50, 60),
+            ('#FFD54F', 60, 75),
+            ('#81C784', 75, 90),
+            ('#4CAF50', 90, 100)
+        ]:
+            theta_section = np.linspace(np.pi * (1 - start/100), np.pi * (1 - end/100), 20)
+            x = 0.9 * np.cos(theta_section)
+            y = 0.9 * np.sin(theta_section)
+            ax3.fill_between(x, 0, y, alpha=0.7, color=color)
+
+        # Ponteiro
+        self.pointer = ax3.arrow(0, 0, 0, 0.7,
+                                 head_width=0.1, head_length=0.1,
+                                 fc='#D32F2F', ec='#B71C1C',
+                                 linewidth=3)
+
+        # Valor central
+        self.gauge_value = ax3.text(0, -0.15, '',
+                                    ha='center', va='center',
+                                    fontsize=20, fontweight='bold',
+                                    bbox=dict(boxstyle='round,pad=0.5', facecolor='white', edgecolor='#2E7D32', linewidth=2))
+        ax3.text(0, 0.5, 'Nível Atual',
+                 ha='center', va='center',
+                 fontsize=11, style='italic')
+
+        # Painel 4: Marcos da jornada
+        ax4 = fig.add_subplot(gs[2, :])
+        ax4.axis('off')
+        self.milestones_text = ax4.text(0.05, 0.5, '',
+                                        fontsize=10,
+                                        verticalalignment='center',
+                                        fontfamily='monospace',
+                                        bbox=dict(boxstyle='round,pad=0.8', facecolor='#FFF9C4', edgecolor='#F57F17', linewidth=2))
+
+        # Título geral
+        fig.suptitle('Dashboard Executivo - Jornada de Conformidade RDC 502/2021\nCaso de Sucesso: Rafa ILPI',
+                     fontsize=20,
+                     fontweight='bold',
+                     y=0.98)
+
+        add_footer(fig)
+
+    def layout(self):
+        pass  # Layout definido pelo GridSpec
+
+    def update(self, series):
+        x, y, labeled = self.plot_points(series)
+
+        self.line.set_data(x, y)
+        self.line.set_markevery(None if len(labeled) == len(x) else labeled)
+        self.fill = _update_fill(self.ax1, self.fill, x, y, **self.fill_kwargs)
+        top = max(y.max(), 75)
+        self.ax1.set_xlim(*_date_limits(x))
+        self.ax1.set_ylim(-0.05 * top, top * 1.05)
+        for label in self.ax1.get_xticklabels():
+            label.set_ha('right')
+
+        self.kpi_text.set_text(f"""
+📊 INDICADORES CHAVE
+
+🎯 Conformidade Atual
+   {y[-1]:.1f}%
+
+📈 Ganho Total
+   {y[-1] - y[0]:+.0f} p.p.
+
+⏱️ Período
+   {series.months} meses
+
+🏆 Status
+   {series.levels[-1]}
+""")
+
+        angle = np.pi * (1 - y[-1]/100)
+        self.pointer.set_data(dx=0.7 * np.cos(angle), dy=0.7 * np.sin(angle))
+        self.gauge_value.set_text(f'{y[-1]:.1f}%')
+
+        self.milestones_text.set_text(series.milestones or _auto_milestones(series))
+
+
+# ============================================
+# GRÁFICO 5: Ganhos Mensais (Velocidade)
+# ============================================
+class MonthlyGainsTemplate(ChartTemplate):
+    key = 'ganhos'
+    filename = '05-ganhos-mensais.png'
+    description = 'Ganhos Mensais (Velocidade)'
+
+    BAR_WIDTH = 0.8
+
+    def build(self):
+        self.fig = fig = Figure(figsize=(16, 9))
+        self.ax = ax = fig.subplots()
+
+        self.bars = _ArtistPool(lambda: ax.add_patch(Rectangle(
+            (0, 0), self.BAR_WIDTH, 0,
+            edgecolor='black',
+            linewidth=2,
+            alpha=0.9)))
+
+        # Valores nas barras
+        self.bar_labels = _ArtistPool(lambda: ax.text(
+            0, 0, '',
+            ha='center', va='bottom',
+            fontsize=12,
+            fontweight='bold'))
+
+        # Linha de tendência
+        self.trend, = ax.plot([], [], "r--", linewidth=2, alpha=0.7, label='Tendência')
+
+        # Configurações
+        ax.set_ylabel('Ganho Mensal (%)', fontsize=14, fontweight='bold')
+        ax.set_title('Velocidade de Melhoria Mensal\nGanhos Progressivos ao Longo da Jornada',
+                     fontsize=18,
+                     fontweight='bold',
+                     pad=20)
+        ax.grid(True, axis='y', alpha=0.3)
+        ax.legend(fontsize=11)
+
+        add_footer(fig)
+
+    def update(self, series):
+        ax = self.ax
+        keep = self.bar_points(series)
+        pcts = np.asarray(series.percentages, dtype=float)[keep]
+        n = len(keep)
+        labeled = label_positions(n, self.max_point_labels)
+
+        # Ganhos desde a barra anterior (primeiro mês não tem ganho anterior); numa
+        # série reduzida cada barra soma os ganhos mensais do período que cobre
+        monthly_gains = np.concatenate([[0.0], np.diff(pcts)])
+        ax.set_ylabel('Ganho Mensal (%)' if n == len(series) else 'Ganho no Período (%)',
+                      fontsize=14, fontweight='bold')
+
+        # Cores baseadas no tamanho do ganho (primeiro mês em cinza)
+        gain_colors = ['#81C784' if g > 3 else '#FFB74D' for g in monthly_gains]
+        gain_colors[0] = '#E0E0E0'
+
+        for i, (bar, gain, color) in enumerate(zip(self.bars.take(n), monthly_gains, gain_colors)):
+            bar.set_xy((i - self.BAR_WIDTH / 2, 0))
+            bar.set_height(gain)
+            bar.set_facecolor(color)
+
+        for i, label in zip(labeled, self.bar_labels.take(len(labeled))):
+            gain = monthly_gains[i]
+            label.set_visible(gain > 0)
+            label.set_position((i, gain + 0.1))
+            label.set_text(f'+{gain:.1f}%')
+
+        # Linha de tendência (precisa de ao menos dois ganhos)
+        values = monthly_gains
+        if n >= 3:
+            p = np.poly1d(np.polyfit(np.arange(1, n), monthly_gains[1:], 1))
+            trend = np.concatenate([[0.0], p(np.arange(1, n))])
+            self.trend.set_data(np.arange(n), trend)
+            values = np.concatenate([monthly_gains, trend])
+        self.trend.set_visible(n >= 3)
+
+        lo, hi = min(0.0, values.min()), max(0.0, values.max())
+        margin = (hi - lo) * 0.05 or 1
+        ax.set_ylim(lo if lo == 0 else lo - margin, hi + margin)
+        ax.set_xlim(*_bar_limits(n, self.BAR_WIDTH))
+        ax.set_xticks(labeled)
+        ax.set_xticklabels([series.dates[keep[i]].strftime('%b/%Y') for i in labeled], rotation=45, ha='right')
+
+
+TEMPLATE_CLASSES = [
+    LineChartTemplate,
+    BarChartTemplate,
+    BeforeAfterTemplate,
+    ExecutiveDashboardTemplate,
+    MonthlyGainsTemplate,
+]
+
+TEMPLATE_KEYS = [cls.key for cls in TEMPLATE_CLASSES]
+
+
+def set_downsampling(method=None, max_points=None, max_point_labels=None, max_bars=None):
+    """
+    Configura a redução de séries longas em todos os templates do processo.
+    method: nome em DOWNSAMPLERS ou 'none' para plotar todos os pontos (as
+    barras continuam limitadas a max_bars).
+    """
+    if method is not None:
+        if method != 'none' and method not in DOWNSAMPLERS:
+            raise ValueError(f'Método de redução desconhecido: {method} (use {", ".join(DOWNSAMPLERS)} ou none)')
+        ChartTemplate.downsampler = method
+    if max_points is not None:
+        ChartTemplate.max_points = max_points
+    if max_point_labels is not None:
+        ChartTemplate.max_point_labels = max_point_labels
+    if max_bars is not None:
+        ChartTemplate.max_bars = max_bars
+
+# Instâncias por processo: cada worker do pool constrói as figuras uma única vez
+_instances = {}
+
+
+def get_template(key):
+    if not _instances:
+        aplicar_estilo()  # Primeiro uso no processo (ex: módulo importado pelo backend)
+    if key not in _instances:
+        cls = next((c for c in TEMPLATE_CLASSES if c.key == key), None)
+        if cls is None:
+            raise KeyError(f'Template desconhecido: {key} (disponíveis: {", ".join(TEMPLATE_KEYS)})')
+        _instances[key] = cls()
+    return _instances[key]
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Gera dados sintéticos para testes de carga: N tenants × M residentes × anos de registros
+
+Substitui o populate-vital-signs.sql (3 residentes fixos, 30 dias) para
+volumes de produção: vital_signs com distribuições por condição clínica
+(HTA, DM2, ambas, nenhuma), registros diários, históricos de edição e
+autodiagnósticos RDC 502/2021. Reprodutível pela semente; cada tenant vai
+para <saída>/<schemaName>/ com um arquivo por tabela e um load.sql.
+
+Uso:
+    python3 scripts/generate-synthetic-data.py --tenants 20 --residents 200 --years 5 -j 8
+    python3 scripts/generate-synthetic-data.py --tenants 2 --residents 50 --format binary -o /tmp/sintetico
+    python3 scripts/generate-synthetic-data.py --tenants 1 --gzip --seed 7 --end 2025-11-26
+
+Carga de um tenant (schema criado antes, ex: apps/backend/scripts/provision-tenant-schema.py):
+    psql "$DATABASE_URL" -f synthetic-data/<schemaName>/load.sql
+    # ou, no formato CSV: apps/backend/scripts/import-tenant-backup.py synthetic-data/<schemaName> <schemaName>
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from synthetic_data import DEFAULT_END, FORMATS, TABLES, SyntheticConfig, load_questions, write_tenant
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Gera tenants sintéticos prontos para COPY (testes de carga)')
+    parser.add_argument('--tenants', type=int, default=1, help='Número de tenants (padrão: 1)')
+    parser.add_argument('--residents', type=int, default=50, help='Residentes por tenant (padrão: 50)')
+    parser.add_argument('--years', type=float, default=1.0, help='Anos de registros (padrão: 1)')
+    parser.add_argument('--end', type=date.fromisoformat, default=DEFAULT_END,
+                        help=f'Dia seguinte ao último registro, AAAA-MM-DD (padrão: {DEFAULT_END})')
+    parser.add_argument('--readings-per-day', type=int, default=2,
+                        help='Aferições de sinais vitais por residente e dia (padrão: 2, às 08:00 e 20:00)')
+    parser.add_argument('--edit-rate', type=float, default=0.02,
+                        help='Fração de registros editados, que geram *_history (padrão: 0.02)')
+    parser.add_argument('--seed', type=int, default=42, help='Semente (padrão: 42)')
+    parser.add_argument('--password-hash', help='Hash bcrypt para a senha dos usuários (padrão: nenhum login válido)')
+    parser.add_argument('--format', choices=FORMATS, default='csv', help='Formato do COPY (padrão: csv)')
+    parser.add_argument('--gzip', action='store_true', help='Comprime os CSV (.csv.gz)')
+    parser.add_argument('-o', '--output', default='synthetic-data', help='Diretório de saída (padrão: synthetic-data)')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='Tenants gerados em paralelo (padrão: 1)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.tenants < 1 or args.residents < 1 or args.readings_per_day < 1 or args.years <= 0:
+        print("❌ --tenants, --residents, --readings-per-day e --years devem ser positivos", file=sys.stderr)
+        return 1
+    config = SyntheticConfig(tenants=args.tenants, residents=args.residents, years=args.years, end=args.end,
+                             readings_per_day=args.readings_per_day, edit_rate=args.edit_rate, seed=args.seed)
+    if args.password_hash:
+        config.password_hash = args.password_hash
+    questions = load_questions(config)
+    print(f"🧪 {args.tenants} tenants × {args.residents} residentes × {config.days} dias "
+          f"({config.start} a {args.end}) → {args.output} [{args.format}{' gzip' if args.gzip else ''}]")
+
+    started = time.perf_counter()
+    totals = dict.fromkeys(TABLES, 0)
+    written = 0
+
+    def done(result):
+        nonlocal written
+        for table, rows in result.rows.items():
+            totals[table] += rows
+        written += result.bytes
+        print(f"✅ {result.schema_name}: {sum(result.rows.values())} linhas, "
+              f"{result.bytes / (1 << 20):.1f} MB em {result.seconds:.1f}s")
+
+    arguments = (args.output, args.format, args.gzip, questions)
+    if args.jobs <= 1:
+        for index in range(args.tenants):
+            done(write_tenant(config, index, *arguments))
+    else:
+        with ProcessPoolExecutor(max_workers=min(args.jobs, args.tenants)) as pool:
+            futures = [pool.submit(write_tenant, config, index, *arguments) for index in range(args.tenants)]
+            for future in futures:
+                done(future.result())
+
+    elapsed = time.perf_counter() - started
+    rows = sum(totals.values())
+    print()
+    for table, count in totals.items():
+        print(f"   {table}: {count}")
+    print(f"📊 {rows} linhas | {written / (1 << 20):.1f} MB | {rows / elapsed if elapsed else 0:,.0f} linhas/s "
+          f"com {args.jobs} processos ({elapsed:.1f}s)")
+    print(f"👉 Carga: psql \"$DATABASE_URL\" -f {args.output}/<schemaName>/load.sql")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
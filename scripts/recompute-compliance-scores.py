@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Recalcula em lote os agregados de compliance_assessments a partir das respostas
+
+Usos:
+- backfill após mudança de versão das questões: gera um CSV com as colunas
+  derivadas recalculadas, pronto para \\COPY em uma tabela temporária + UPDATE
+- auditoria: compara os valores armazenados com os recalculados e lista as divergências
+
+Uso:
+    python3 scripts/recompute-compliance-scores.py responses.csv \\
+        --assessments compliance_assessments.csv \\
+        --output recomputed.csv --drift drift.csv
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+
+from compliance_charts.levels import BACKEND_LEVEL_THRESHOLDS, LEVEL_THRESHOLDS
+from compliance_charts.scoring import (
+    find_drift,
+    load_responses_csv,
+    load_stored_assessments_csv,
+    score,
+)
+
+THRESHOLDS = {
+    'charts': LEVEL_THRESHOLDS,
+    'backend': BACKEND_LEVEL_THRESHOLDS,
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Recalcula a pontuação de autodiagnósticos RDC 502/2021 em lote')
+    parser.add_argument('responses', help='Exportação CSV de compliance_assessment_responses')
+    parser.add_argument('--assessments',
+                        help='Exportação CSV de compliance_assessments (totalQuestions e valores armazenados)')
+    parser.add_argument('--output', help='CSV com os agregados recalculados (uma linha por avaliação)')
+    parser.add_argument('--drift', help='CSV com as divergências entre armazenado e recalculado')
+    parser.add_argument('--level-thresholds', choices=sorted(THRESHOLDS), default='backend',
+                        help='Limiares de classificação: classifyComplianceLevel do backend (padrão, o que '
+                             'está gravado) ou a legenda dos gráficos (só para trabalho de gráfico)')
+    return parser.parse_args()
+
+
+def write_output(result, path):
+    columns = ['id', 'totalQuestions', 'questionsAnswered', 'questionsNA', 'applicableQuestions',
+               'totalPointsObtained', 'totalPointsPossible', 'compliancePercentage',
+               'complianceLevel', 'criticalNonCompliant']
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        for i in range(len(result)):
+            row = result.row(i)
+            row['criticalNonCompliant'] = json.dumps(row['criticalNonCompliant'], ensure_ascii=False)
+            writer.writerow(row)
+
+
+def main():
+    args = parse_args()
+
+    started = time.perf_counter()
+    responses = load_responses_csv(args.responses)
+    loaded = time.perf_counter()
+
+    stored = load_stored_assessments_csv(args.assessments) if args.assessments else {}
+    total_questions = {a: int(raw['totalQuestions']) for a, raw in stored.items() if raw.get('totalQuestions')}
+
+    result = score(responses, total_questions=total_questions, thresholds=THRESHOLDS[args.level_thresholds])
+    scored = time.perf_counter()
+
+    print(f"✅ {len(responses)} respostas lidas em {loaded - started:.1f}s")
+    print(f"✅ {len(result)} avaliações recalculadas em {scored - loaded:.2f}s")
+
+    if args.output:
+        write_output(result, args.output)
+        print(f"📁 Agregados recalculados: {args.output}")
+
+    if stored:
+        drift = list(find_drift(result, stored))
+        affected = len({assessment_id for assessment_id, *_ in drift})
+        print(f"{'⚠️ ' if drift else '✅'} {affected} avaliações com divergência ({len(drift)} colunas)")
+        if args.drift:
+            with open(args.drift, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['assessmentId', 'column', 'stored', 'recomputed'])
+                writer.writerows(drift)
+            print(f"📁 Divergências: {args.drift}")
+        return 1 if drift else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
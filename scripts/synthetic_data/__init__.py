@@ -0,0 +1,33 @@
+"""
+Dados sintéticos de ILPI para testes de carga (tenants, residentes e anos de registros)
+
+Uso como módulo: generate_tenant produz os blocos de colunas NumPy de um
+tenant por tabela; encode_csv / encode_binary os convertem para COPY;
+write_tenant grava um tenant inteiro em disco com o load.sql.
+"""
+
+from .encoding import Column, encode_binary, encode_csv
+from .generator import DEFAULT_END, TABLES, Block, SyntheticConfig, generate_tenant, load_questions, tenant_schema_name
+from .profiles import CONDITIONS, PROFILES, VitalProfile, sample_vitals
+from .writer import FORMATS, TenantOutput, load_script, write_tenant
+
+__all__ = [
+    'Column',
+    'encode_binary',
+    'encode_csv',
+    'DEFAULT_END',
+    'TABLES',
+    'Block',
+    'SyntheticConfig',
+    'generate_tenant',
+    'load_questions',
+    'tenant_schema_name',
+    'CONDITIONS',
+    'PROFILES',
+    'VitalProfile',
+    'sample_vitals',
+    'FORMATS',
+    'TenantOutput',
+    'load_script',
+    'write_tenant',
+]
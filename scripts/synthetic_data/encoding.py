@@ -0,0 +1,228 @@
+"""
+Codificação vetorizada de colunas NumPy para COPY (CSV ou binário do PostgreSQL)
+
+Cada tabela é uma lista de Column (nome, tipo, array, máscara de NULL). Os
+encoders montam o bloco inteiro com operações de array: nenhuma linha passa
+por um laço Python. O CSV é o de COPY ... WITH (FORMAT csv, HEADER true)
+(NULL = campo vazio sem aspas); o binário é o de COPY ... WITH (FORMAT
+binary): cabeçalho PGCOPY, por linha o número de campos e, por campo, o
+tamanho (-1 = NULL) e os bytes em big-endian.
+
+Tipos aceitos (e o array esperado):
+    uuid         uint8 (n, 16)
+    text, enum   bytes 'S' (sem NUL no meio)
+    jsonb        bytes 'S' com o JSON
+    text[]       bytes 'S' com o literal de array do PostgreSQL ('{a,b}')
+    int4         inteiros
+    float8       floats
+    bool         bool
+    timestamptz  datetime64 (UTC)
+    date         datetime64[D]
+"""
+
+import struct
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+PGCOPY_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('!ii', 0, 0)
+PGCOPY_TRAILER = struct.pack('!h', -1)
+PG_EPOCH = np.datetime64('2000-01-01T00:00:00', 'us')
+PG_EPOCH_DATE = np.datetime64('2000-01-01', 'D')
+TEXT_OID = 25
+
+_HEX = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+_UUID_DASHES = (8, 13, 18, 23)
+_UUID_DIGITS = np.array([i for i in range(36) if i not in _UUID_DASHES])
+
+
+@dataclass
+class Column:
+    name: str
+    kind: str
+    values: np.ndarray
+    null: Optional[np.ndarray] = None  # True onde o valor é NULL
+
+    def __len__(self):
+        return len(self.values)
+
+
+# ============================================
+# Valores
+# ============================================
+def random_uuids(rng, n):
+    """UUIDs v4 (uint8 n×16) tirados do gerador: reprodutíveis pela semente"""
+    raw = rng.integers(0, 256, size=(n, 16), dtype=np.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    return raw
+
+
+def uuid_text(raw):
+    """uint8 n×16 -> 'S36' no formato 8-4-4-4-12"""
+    nibbles = np.empty((len(raw), 32), dtype=np.uint8)
+    nibbles[:, 0::2] = raw >> 4
+    nibbles[:, 1::2] = raw & 0x0F
+    chars = np.full((len(raw), 36), ord('-'), dtype=np.uint8)
+    chars[:, _UUID_DIGITS] = _HEX[nibbles]
+    return np.ascontiguousarray(chars).view('S36').ravel()
+
+
+def digits_text(values, width):
+    """Inteiros não negativos -> 'S<width>' com zeros à esquerda (ex: CPF, HH)"""
+    values = np.asarray(values, dtype=np.int64)
+    powers = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    chars = (values[:, None] // powers % 10 + ord('0')).astype(np.uint8)
+    return np.ascontiguousarray(chars).view(f'S{width}').ravel()
+
+
+def number_text(values, decimals=0):
+    """Números -> 'S' com `decimals` casas (0: inteiro, sem '.0')"""
+    values = np.asarray(values, dtype=float)
+    if decimals == 0:
+        return np.rint(values).astype(np.int64).astype('S')
+    return np.round(values, decimals).astype('S')
+
+
+def concat(*parts):
+    """Concatena arrays/escalares de bytes elemento a elemento"""
+    result = parts[0]
+    for part in parts[1:]:
+        result = np.char.add(result, part)
+    return np.asarray(result)
+
+
+def json_string(values):
+    """Bytes -> literal de string JSON (só escapa aspas e barras: os textos gerados não têm controle)"""
+    escaped = np.char.replace(np.char.replace(values, b'\\', b'\\\\'), b'"', b'\\"')
+    return concat(b'"', escaped, b'"')
+
+
+def json_or_null(text, null):
+    return np.where(null, b'null', text) if null is not None else text
+
+
+# ============================================
+# CSV
+# ============================================
+def _csv_field(column):
+    values, kind = column.values, column.kind
+    if kind == 'uuid':
+        text = uuid_text(values)
+    elif kind in ('text', 'jsonb', 'text[]'):
+        text = concat(b'"', np.char.replace(values, b'"', b'""'), b'"')
+    elif kind == 'enum':
+        text = values
+    elif kind == 'int4':
+        text = np.asarray(values, dtype=np.int64).astype('S')
+    elif kind == 'float8':
+        text = np.asarray(values, dtype=float).astype('S')
+    elif kind == 'bool':
+        text = np.where(values, b't', b'f')
+    elif kind == 'timestamptz':
+        text = concat(np.asarray(values, dtype='datetime64[ms]').astype('S'), b'Z')
+    elif kind == 'date':
+        text = np.asarray(values, dtype='datetime64[D]').astype('S')
+    else:
+        raise ValueError(f'Tipo de coluna desconhecido: {kind}')
+    if column.null is not None:
+        text = np.where(column.null, b'', text)
+    return text
+
+
+def encode_csv(columns, header=True):
+    """Bloco CSV (bytes) com as linhas das colunas; cabeçalho opcional"""
+    lines = _csv_field(columns[0])
+    for column in columns[1:]:
+        lines = concat(lines, b',', _csv_field(column))
+    body = b'\n'.join(lines.tolist()) + b'\n' if len(lines) else b''
+    if header:
+        body = (','.join(c.name for c in columns) + '\n').encode() + body
+    return body
+
+
+# ============================================
+# Binário
+# ============================================
+def _variable(values, lengths):
+    """Bytes de um array 'S' sem o preenchimento: (concatenação, tamanhos)"""
+    width = values.dtype.itemsize
+    if width == 0 or not len(values):
+        return np.zeros(0, dtype=np.uint8), lengths
+    matrix = np.ascontiguousarray(values).view(np.uint8).reshape(len(values), width)
+    return matrix[np.arange(width) < lengths[:, None]], lengths
+
+
+def _text_array_binary(literals):
+    """Literais '{a,b}' -> formato binário de text[] (poucos valores distintos: codifica cada um uma vez)"""
+    unique, inverse = np.unique(literals, return_inverse=True)
+    encoded = []
+    for literal in unique.tolist():
+        items = [item.encode() for item in literal.decode()[1:-1].split(',') if item]
+        if not items:
+            encoded.append(struct.pack('!iii', 0, 0, TEXT_OID))
+            continue
+        parts = [struct.pack('!iiiii', 1, 0, TEXT_OID, len(items), 1)]
+        parts += [struct.pack('!i', len(item)) + item for item in items]
+        encoded.append(b''.join(parts))
+    lengths = np.array([len(e) for e in encoded], dtype=np.int64)[inverse]
+    table = np.array(encoded, dtype=f'S{max(len(e) for e in encoded)}')
+    return _variable(table[inverse], lengths)
+
+
+def _binary_field(column):
+    """(bytes concatenados dos valores não nulos, tamanho por linha com -1 nos NULL)"""
+    values, kind, n = column.values, column.kind, len(column)
+    if kind == 'uuid':
+        flat, lengths = np.ascontiguousarray(values).ravel(), np.full(n, 16, dtype=np.int64)
+    elif kind == 'int4':
+        flat, lengths = np.asarray(values).astype('>i4').view(np.uint8), np.full(n, 4, dtype=np.int64)
+    elif kind == 'float8':
+        flat, lengths = np.asarray(values, dtype=float).astype('>f8').view(np.uint8), np.full(n, 8, dtype=np.int64)
+    elif kind == 'bool':
+        flat, lengths = np.asarray(values, dtype=np.uint8), np.ones(n, dtype=np.int64)
+    elif kind == 'timestamptz':
+        micros = (np.asarray(values).astype('datetime64[us]') - PG_EPOCH).astype(np.int64)
+        flat, lengths = micros.astype('>i8').view(np.uint8), np.full(n, 8, dtype=np.int64)
+    elif kind == 'date':
+        days = (np.asarray(values).astype('datetime64[D]') - PG_EPOCH_DATE).astype(np.int64)
+        flat, lengths = days.astype('>i4').view(np.uint8), np.full(n, 4, dtype=np.int64)
+    elif kind in ('text', 'enum'):
+        flat, lengths = _variable(values, np.char.str_len(values).astype(np.int64))
+    elif kind == 'jsonb':
+        prefixed = concat(b'\x01', values)  # Versão 1 do formato binário de jsonb
+        flat, lengths = _variable(prefixed, np.char.str_len(values).astype(np.int64) + 1)
+    elif kind == 'text[]':
+        flat, lengths = _text_array_binary(values)
+    else:
+        raise ValueError(f'Tipo de coluna desconhecido: {kind}')
+    if column.null is not None and column.null.any():
+        keep = np.repeat(~column.null, lengths)
+        flat, lengths = flat[keep], np.where(column.null, -1, lengths)
+    return flat, lengths
+
+
+def encode_binary(columns, header=True, trailer=True):
+    """Bloco no formato binário do COPY; header/trailer só no primeiro/último bloco do arquivo"""
+    n = len(columns[0])
+    fields = [_binary_field(column) for column in columns]
+    sizes = np.full(n, 2, dtype=np.int64)
+    for _, lengths in fields:
+        sizes += 4 + np.maximum(lengths, 0)
+    starts = np.cumsum(sizes) - sizes
+    out = np.empty(int(sizes.sum()), dtype=np.uint8)
+
+    count = np.frombuffer(struct.pack('!h', len(columns)), dtype=np.uint8)
+    out[starts[:, None] + np.arange(2)] = count
+    position = starts + 2
+    for flat, lengths in fields:
+        out[position[:, None] + np.arange(4)] = lengths.astype('>i4').view(np.uint8).reshape(n, 4)
+        present = lengths > 0
+        sized = lengths[present]
+        if len(sized):
+            begin = np.repeat(position[present] + 4, sized)
+            offsets = np.arange(int(sized.sum())) - np.repeat(np.cumsum(sized) - sized, sized)
+            out[begin + offsets] = flat
+        position = position + 4 + np.maximum(lengths, 0)
+    return (PGCOPY_HEADER if header else b'') + out.tobytes() + (PGCOPY_TRAILER if trailer else b'')
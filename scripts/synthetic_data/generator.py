@@ -0,0 +1,529 @@
+"""
+Gerador de tenants sintéticos: N tenants × M residentes × anos de registros
+
+    config = SyntheticConfig(tenants=20, residents=200, years=5, seed=42)
+    for block in generate_tenant(config, 0):      # blocos de colunas NumPy por tabela
+        out[block.table].write(encode_csv(block.columns, header=...))
+
+Gera, por tenant, a linha de tenants do schema, equipe (users), residentes
+com condição clínica (profiles.py), vital_signs (readings_per_day por dia
+desde a admissão), daily_records (um MONITORAMENTO por aferição mais a
+rotina de alimentação, hidratação e higiene), as edições em
+vital_sign_history / daily_record_history (edit_rate) e autodiagnósticos
+RDC 502/2021 trimestrais com as 37 respostas e os agregados calculados pelo
+compliance_charts.scoring (limiares do backend).
+
+Determinístico: cada tenant e cada bloco de BLOCK_RESIDENTS residentes tem
+seu próprio gerador derivado de (seed, tenant, bloco), então a saída não
+depende da ordem nem do número de processos. Horários locais em
+America/Sao_Paulo (UTC-3, sem horário de verão desde 2019); timestamps em UTC.
+"""
+
+import json
+import math
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+from compliance_charts.levels import BACKEND_LEVEL_THRESHOLDS
+from compliance_charts.scoring import MAX_POINTS_PER_QUESTION, ResponseArrays, score
+
+from .encoding import Column, concat, digits_text, json_or_null, json_string, number_text, random_uuids, uuid_text
+from .profiles import CONDITIONS, assign_conditions, sample_vitals
+
+DEFAULT_END = date(2026, 1, 1)  # Fixo: a mesma semente gera sempre os mesmos dados
+BLOCK_RESIDENTS = 16  # Residentes por bloco de geração (e por gerador aleatório derivado)
+UTC_OFFSET_MINUTES = -180  # America/Sao_Paulo
+QUESTIONS_PATH = Path(__file__).resolve().parents[2] / 'apps' / 'backend' / 'prisma' / 'seeds' / 'data' / 'rdc-502-2021.json'
+# Não corresponde a nenhuma senha: usuários sintéticos não fazem login (use --password-hash)
+PLACEHOLDER_HASH = '$2b$10$sintetico.sem.login.sintetico.sem.login.sintetico.x'
+
+# Ordem de carga (FKs)
+TABLES = ('tenants', 'users', 'residents', 'vital_signs', 'vital_sign_history', 'daily_records',
+          'daily_record_history', 'compliance_assessments', 'compliance_assessment_responses')
+
+FIRST_NAMES_F = ('Maria', 'Ana', 'Francisca', 'Antônia', 'Adriana', 'Juliana', 'Márcia', 'Fernanda', 'Patrícia',
+                 'Aline', 'Sandra', 'Camila', 'Tereza', 'Helena', 'Lúcia', 'Rita', 'Luzia', 'Aparecida', 'Irene',
+                 'Conceição', 'Benedita', 'Rosa', 'Joana', 'Sebastiana')
+FIRST_NAMES_M = ('José', 'João', 'Antônio', 'Francisco', 'Carlos', 'Paulo', 'Pedro', 'Lucas', 'Luiz', 'Marcos',
+                 'Luís', 'Gabriel', 'Rafael', 'Daniel', 'Raimundo', 'Sebastião', 'Geraldo', 'Manoel', 'Benedito',
+                 'Joaquim', 'Severino', 'Osvaldo')
+SURNAMES = ('Silva', 'Santos', 'Oliveira', 'Souza', 'Rodrigues', 'Ferreira', 'Alves', 'Pereira', 'Lima', 'Gomes',
+            'Costa', 'Ribeiro', 'Martins', 'Carvalho', 'Almeida', 'Lopes', 'Soares', 'Fernandes', 'Vieira',
+            'Barbosa', 'Rocha', 'Dias', 'Nascimento', 'Andrade', 'Moreira', 'Nunes', 'Marques', 'Machado',
+            'Mendes', 'Freitas', 'Cardoso', 'Ramos', 'Gonçalves', 'Santana', 'Teixeira', 'Assunção')
+
+# Rotina diária além do MONITORAMENTO: (tipo, minuto local, [(JSON de data, peso)])
+_MEALS = (('Total', 0.62), ('Parcial', 0.30), ('Recusou', 0.08))
+_DRINKS = (('150ml', 'Água', 0.3), ('200ml', 'Água', 0.4), ('200ml', 'Suco', 0.2), ('250ml', 'Chá', 0.1))
+DAILY_ROUTINE = tuple(
+    [('ALIMENTACAO', minute, [(json.dumps({'refeicao': meal, 'aceitacao': acceptance}, ensure_ascii=False), weight)
+                              for acceptance, weight in _MEALS])
+     for meal, minute in (('Café da manhã', 450), ('Almoço', 690), ('Jantar', 1080))]
+    + [('HIDRATACAO', minute, [(json.dumps({'quantidade': amount, 'tipo': kind}, ensure_ascii=False), weight)
+                               for amount, kind, weight in _DRINKS])
+       for minute in (600, 930)]
+    + [('HIGIENE', 540, [(json.dumps({'tipo': 'Banho', 'auxilio': aid}, ensure_ascii=False), weight)
+                         for aid, weight in (('Independente', 0.2), ('Parcial', 0.45), ('Total', 0.35))])]
+)
+VITAL_EDIT_REASONS = ('Correção de digitação', 'Valor aferido novamente', 'Aparelho recalibrado')
+RECORD_EDIT_NOTES = ('Complemento de informação', 'Registro revisado pela enfermagem', 'Observação adicionada')
+
+
+@dataclass
+class SyntheticConfig:
+    tenants: int = 1
+    residents: int = 50
+    years: float = 1.0
+    end: date = DEFAULT_END  # Exclusivo
+    readings_per_day: int = 2
+    edit_rate: float = 0.02  # Fração de vital_signs e daily_records editados (viram *_history)
+    assessments_per_year: int = 4
+    seed: int = 42
+    password_hash: str = PLACEHOLDER_HASH
+    questions_path: Path = QUESTIONS_PATH
+
+    @property
+    def days(self):
+        return max(1, int(round(self.years * 365.25)))
+
+    @property
+    def start(self):
+        return np.datetime64(self.end, 'D') - self.days
+
+
+@dataclass
+class Block:
+    table: str
+    columns: List[Column] = field(default_factory=list)
+
+    def __len__(self):
+        return len(self.columns[0]) if self.columns else 0
+
+
+def _rng(config, *path):
+    return np.random.default_rng(np.random.SeedSequence([config.seed, *path]))
+
+
+def _bytes(values):
+    return np.array([v.encode() for v in values])
+
+
+def _choose(rng, options, n):
+    return np.array([o.encode() for o in options])[rng.integers(0, len(options), n)]
+
+
+def _cpf(numbers):
+    """CPFs válidos (dígitos verificadores) a partir de números de 9 dígitos"""
+    digits = numbers[:, None] // 10 ** np.arange(8, -1, -1) % 10
+    first = (digits * np.arange(10, 1, -1)).sum(axis=1) * 10 % 11 % 10
+    second = (np.column_stack([digits, first]) * np.arange(11, 1, -1)).sum(axis=1) * 10 % 11 % 10
+    return digits_text(numbers * 100 + first * 10 + second, 11)
+
+
+def _hhmm(minutes):
+    return concat(digits_text(minutes // 60, 2), b':', digits_text(minutes % 60, 2))
+
+
+def _iso(timestamps):
+    return concat(timestamps.astype('datetime64[ms]').astype('S'), b'Z')
+
+
+def _null_if_nan(values):
+    return np.isnan(values)
+
+
+# ============================================
+# Questões RDC 502/2021
+# ============================================
+@dataclass
+class QuestionSet:
+    version_id: np.ndarray  # uint8 (1, 16)
+    ids: np.ndarray  # uint8 (q, 16)
+    numbers: np.ndarray
+    texts: np.ndarray  # 'S'
+    critical: np.ndarray  # bool
+    max_points: np.ndarray
+    has_na: np.ndarray  # bool
+    option_texts: np.ndarray  # 'S' (q, max_points + 1): texto da opção com k pontos
+
+
+def load_questions(config):
+    with open(config.questions_path, 'r', encoding='utf-8') as f:
+        questions = json.load(f)['questions']
+    rng = _rng(config, 2 ** 31 - 1)  # Mesmos IDs de versão/questões em todos os tenants
+    version_id = random_uuids(rng, 1)
+    ids = random_uuids(rng, len(questions))
+    max_points = np.array([max(o['points'] for o in q['responseOptions'] if not o['isNA']) for q in questions])
+    texts = np.full((len(questions), int(max_points.max()) + 1), b'', dtype=object)
+    for i, question in enumerate(questions):
+        for option in question['responseOptions']:
+            if not option['isNA']:
+                texts[i, option['points']] = option['text'].encode()
+    return QuestionSet(
+        version_id=version_id,
+        ids=ids,
+        numbers=np.array([q['questionNumber'] for q in questions]),
+        texts=_bytes([q['questionText'] for q in questions]),
+        critical=np.array([q['criticalityLevel'] == 'C' for q in questions]),
+        max_points=max_points,
+        has_na=np.array([any(o['isNA'] for o in q['responseOptions']) for q in questions]),
+        option_texts=texts.astype('S'),
+    )
+
+
+# ============================================
+# Tenant
+# ============================================
+@dataclass
+class TenantData:
+    """Identificadores do tenant usados por todos os blocos"""
+    index: int
+    id: np.ndarray  # uint8 (1, 16)
+    schema_name: str
+    user_ids: np.ndarray
+    user_names: np.ndarray
+    resident_ids: np.ndarray
+    conditions: np.ndarray
+    admission_day: np.ndarray  # Dia (desde config.start) da admissão; negativo = antes do período
+
+
+def tenant_schema_name(config, index):
+    suffix = _rng(config, index, 0).integers(0, 16 ** 6)
+    return f'tenant_sintetico_{index + 1:04d}_{suffix:06x}'
+
+
+def _tenant_blocks(config, index):
+    rng = _rng(config, index, 0)
+    rng.integers(0, 16 ** 6)  # Sufixo do schema (tenant_schema_name)
+    schema_name = tenant_schema_name(config, index)
+    start = config.start.astype('datetime64[ms]')
+    tenant_id = random_uuids(rng, 1)
+    slug = f'ilpi-sintetica-{index + 1:04d}'
+
+    tenants = Block('tenants', [
+        Column('id', 'uuid', tenant_id),
+        Column('name', 'text', _bytes([f'ILPI Sintética {index + 1:04d}'])),
+        Column('slug', 'text', _bytes([slug])),
+        Column('email', 'text', _bytes([f'contato@{slug}.sintetico.local'])),
+        Column('status', 'enum', np.array([b'ACTIVE'])),
+        Column('schemaName', 'text', _bytes([schema_name])),
+        Column('createdAt', 'timestamptz', np.array([start])),
+        Column('updatedAt', 'timestamptz', np.array([start])),
+    ])
+
+    n_users = max(3, math.ceil(config.residents / 8))
+    user_ids = random_uuids(rng, n_users)
+    female = rng.random(n_users) < 0.8
+    first = np.where(female, _choose(rng, FIRST_NAMES_F, n_users), _choose(rng, FIRST_NAMES_M, n_users))
+    user_names = concat(first, b' ', _choose(rng, SURNAMES, n_users))
+    numbers = digits_text(np.arange(1, n_users + 1), 3)
+    users = Block('users', [
+        Column('id', 'uuid', user_ids),
+        Column('tenantId', 'uuid', np.repeat(tenant_id, n_users, axis=0)),
+        Column('name', 'text', user_names),
+        Column('email', 'text', concat(b'usuario', numbers, f'@{slug}.sintetico.local'.encode())),
+        Column('password', 'text', np.full(n_users, config.password_hash.encode())),
+        Column('role', 'text', np.where(np.arange(n_users) == 0, b'ADMIN', b'USER')),
+        Column('createdAt', 'timestamptz', np.full(n_users, start)),
+        Column('updatedAt', 'timestamptz', np.full(n_users, start)),
+    ])
+
+    n = config.residents
+    resident_ids = random_uuids(rng, n)
+    conditions = assign_conditions(rng, n)
+    # 70% já moravam na ILPI no início do período; os demais chegam ao longo dele
+    veteran = rng.random(n) < 0.7
+    admission_day = np.where(veteran, -rng.integers(30, 3650, n), rng.integers(0, config.days, n))
+    admission = config.start + admission_day
+    birth = admission - (rng.normal(80, 7, n).clip(60, 104) * 365.25).astype(int)
+    female = rng.random(n) < 0.68  # Maioria feminina, como nas ILPIs
+    first = np.where(female, _choose(rng, FIRST_NAMES_F, n), _choose(rng, FIRST_NAMES_M, n))
+    full_name = concat(first, b' ', _choose(rng, SURNAMES, n), b' ', _choose(rng, SURNAMES, n))
+    # Único no tenant (@@unique([tenantId, cpf])): índice × primo, deslocado por tenant
+    cpf_base = (np.arange(n, dtype=np.int64) * 7919 + int(rng.integers(0, 10 ** 9))) % 10 ** 9
+    created = np.maximum(admission, config.start).astype('datetime64[ms]')
+    residents = Block('residents', [
+        Column('id', 'uuid', resident_ids),
+        Column('tenantId', 'uuid', np.repeat(tenant_id, n, axis=0)),
+        Column('fullName', 'text', full_name),
+        Column('cpf', 'text', _cpf(cpf_base)),
+        Column('gender', 'enum', np.where(female, b'FEMININO', b'MASCULINO')),
+        Column('birthDate', 'date', birth),
+        Column('admissionDate', 'date', admission),
+        Column('admissionReason', 'text', _bytes([CONDITIONS[c] for c in conditions])),
+        Column('createdAt', 'timestamptz', created),
+        Column('updatedAt', 'timestamptz', created),
+        Column('createdBy', 'uuid', np.repeat(user_ids[:1], n, axis=0)),
+    ])
+    data = TenantData(index, tenant_id, schema_name, user_ids, user_names, resident_ids, conditions, admission_day)
+    return data, [tenants, users, residents]
+
+
+# ============================================
+# Sinais vitais, registros diários e histórico
+# ============================================
+def _vital_json(values, versions, timestamps):
+    parts = [b'{']
+    for i, name in enumerate(('systolicBloodPressure', 'diastolicBloodPressure', 'temperature', 'heartRate',
+                              'oxygenSaturation', 'bloodGlucose')):
+        number = number_text(np.nan_to_num(values[name]), 1 if name == 'temperature' else 0)
+        parts += [f'{"," if i else ""}"{name}":'.encode(), json_or_null(number, np.isnan(values[name]))]
+    parts += [b',"timestamp":"', _iso(timestamps), b'","versionNumber":', number_text(versions), b'}']
+    return concat(*parts)
+
+
+def _resident_blocks(config, tenant, block_index, first, last):
+    rng = _rng(config, tenant.index, 1, block_index)
+    count = last - first
+    days, per_day = config.days, config.readings_per_day
+    minutes = (np.array([480]) if per_day == 1 else np.linspace(480, 1200, per_day)).astype(int)
+    vitals = sample_vitals(rng, tenant.conditions[first:last], days, per_day, minutes < 720)
+
+    # Aferições a partir da admissão de cada residente
+    valid = np.broadcast_to((np.arange(days)[None, :] >= tenant.admission_day[first:last, None])[:, :, None],
+                            (count, days, per_day))
+    r, d, k = np.nonzero(valid)
+    n = len(r)
+    values = {name: array[r, d, k] for name, array in vitals.items()}
+    local_minutes = np.clip(minutes[k] + np.rint(rng.normal(0, 12, n)).astype(int), 0, 1439)
+    day = config.start + d
+    timestamp = (day.astype('datetime64[m]') + (local_minutes - UTC_OFFSET_MINUTES)).astype('datetime64[ms]')
+    created = timestamp + rng.integers(60_000, 20 * 60_000, n).astype('timedelta64[ms]')
+
+    n_users = len(tenant.user_ids)
+    user = 1 + rng.integers(0, n_users - 1, n)
+    tenant_ids = np.repeat(tenant.id, n, axis=0)
+    resident_ids = tenant.resident_ids[first:last][r]
+    ids = random_uuids(rng, n)
+
+    # Edições: a sistólica é corrigida e vira versão 2 (vital_sign_history)
+    edited = (rng.random(n) < config.edit_rate) & ~np.isnan(values['systolicBloodPressure'])
+    e = np.flatnonzero(edited)
+    editor = 1 + rng.integers(0, n_users - 1, len(e))
+    edited_at = created[e] + rng.integers(10 * 60_000, 12 * 3_600_000, len(e)).astype('timedelta64[ms]')
+    before = {name: array[e] for name, array in values.items()}
+    values['systolicBloodPressure'][e] += rng.choice([-10, -5, 5, 10], len(e))
+    after = {name: array[e] for name, array in values.items()}
+    versions = np.where(edited, 2, 1)
+    updated_by = np.zeros((n, 16), dtype=np.uint8)
+    updated_by[e] = tenant.user_ids[editor]
+    updated_at = created.copy()
+    updated_at[e] = edited_at
+
+    def vital(name, kind='float8'):
+        array = values[name]
+        return Column(name, kind, np.nan_to_num(array).astype(np.int32) if kind == 'int4' else array, np.isnan(array))
+
+    yield Block('vital_signs', [
+        Column('id', 'uuid', ids),
+        Column('tenantId', 'uuid', tenant_ids),
+        Column('residentId', 'uuid', resident_ids),
+        Column('userId', 'uuid', tenant.user_ids[user]),
+        Column('timestamp', 'timestamptz', timestamp),
+        vital('systolicBloodPressure'),
+        vital('diastolicBloodPressure'),
+        vital('temperature'),
+        vital('heartRate', 'int4'),
+        vital('oxygenSaturation'),
+        vital('bloodGlucose'),
+        Column('versionNumber', 'int4', versions),
+        Column('createdBy', 'uuid', tenant.user_ids[user]),
+        Column('updatedBy', 'uuid', updated_by, ~edited),
+        Column('createdAt', 'timestamptz', created),
+        Column('updatedAt', 'timestamptz', updated_at),
+    ])
+    yield Block('vital_sign_history', [
+        Column('id', 'uuid', random_uuids(rng, len(e))),
+        Column('tenantId', 'uuid', tenant_ids[e]),
+        Column('vitalSignId', 'uuid', ids[e]),
+        Column('versionNumber', 'int4', np.full(len(e), 2)),
+        Column('changeType', 'enum', np.full(len(e), b'UPDATE')),
+        Column('changeReason', 'text', _choose(rng, VITAL_EDIT_REASONS, len(e))),
+        Column('previousData', 'jsonb', _vital_json(before, np.ones(len(e), dtype=int), timestamp[e])),
+        Column('newData', 'jsonb', _vital_json(after, np.full(len(e), 2), timestamp[e])),
+        Column('changedFields', 'text[]', np.full(len(e), b'{systolicBloodPressure}')),
+        Column('changedAt', 'timestamptz', edited_at),
+        Column('changedBy', 'uuid', tenant.user_ids[editor]),
+    ])
+
+    # MONITORAMENTO: os mesmos valores, no formato texto do formulário
+    pressure_missing = np.isnan(values['systolicBloodPressure'])
+    pieces = [b'{']
+    fields = (('pressaoArterial', None), ('temperatura', 'temperature'), ('frequenciaCardiaca', 'heartRate'),
+              ('saturacaoO2', 'oxygenSaturation'), ('glicemia', 'bloodGlucose'))
+    for name, source in fields:
+        if source is None:
+            text = concat(number_text(np.nan_to_num(values['systolicBloodPressure'])), b'/',
+                          number_text(np.nan_to_num(values['diastolicBloodPressure'])))
+            missing = pressure_missing
+        else:
+            text = number_text(np.nan_to_num(values[source]), 1 if source == 'temperature' else 0)
+            missing = np.isnan(values[source])
+        pieces.append(np.where(missing, b'', concat(f'"{name}":"'.encode(), text, b'",')))
+    monitoring = np.char.rstrip(concat(*pieces), b',')
+    monitoring = concat(monitoring, b'}')
+
+    # Rotina: cada item do dia, nos dias válidos
+    rr, dd = np.nonzero(valid[:, :, 0])
+    items = len(DAILY_ROUTINE)
+    routine_r, routine_d = np.repeat(rr, items), np.repeat(dd, items)
+    slot = np.tile(np.arange(items), len(rr))
+    routine_type = np.array([t.encode() for t, _, _ in DAILY_ROUTINE])[slot]
+    routine_minutes = np.array([m for _, m, _ in DAILY_ROUTINE])[slot] + rng.integers(-15, 16, len(slot))
+    routine_data = np.empty(len(slot), dtype=object)
+    for i, (_, _, variants) in enumerate(DAILY_ROUTINE):
+        where = slot == i
+        weights = np.array([w for _, w in variants])
+        routine_data[where] = np.array([v.encode() for v, _ in variants], dtype=object)[
+            rng.choice(len(variants), int(where.sum()), p=weights / weights.sum())]
+
+    record_r = np.concatenate([r, routine_r])
+    record_day = config.start + np.concatenate([d, routine_d])
+    record_minutes = np.concatenate([local_minutes, routine_minutes])
+    m = len(record_r)
+    record_user = np.concatenate([user, 1 + rng.integers(0, n_users - 1, len(slot))])
+    record_created = np.concatenate([
+        created,
+        (record_day[n:].astype('datetime64[m]') + (routine_minutes - UTC_OFFSET_MINUTES)).astype('datetime64[ms]'),
+    ])
+    record_type = np.concatenate([np.full(n, b'MONITORAMENTO'), routine_type])
+    record_data = np.concatenate([monitoring.astype(object), routine_data]).astype('S')
+    record_ids = random_uuids(rng, m)
+    record_time = _hhmm(record_minutes)
+    recorded_by = tenant.user_names[record_user]
+
+    # Edições: nota acrescentada (daily_record_history guarda o retrato anterior)
+    e = np.flatnonzero(rng.random(m) < config.edit_rate)
+    editor = 1 + rng.integers(0, n_users - 1, len(e))
+    edited_at = record_created[e] + rng.integers(10 * 60_000, 24 * 3_600_000, len(e)).astype('timedelta64[ms]')
+    note = _choose(rng, RECORD_EDIT_NOTES, len(e))
+    notes_null = np.ones(m, dtype=bool)
+    notes_null[e] = False
+    notes = np.full(m, b'', dtype=note.dtype if len(e) else 'S1')
+    notes[e] = note
+    updated_at = record_created.copy()
+    updated_at[e] = edited_at
+
+    def snapshot(notes_json, updated):
+        return concat(b'{"type":"', record_type[e], b'","date":"', _iso(record_day[e].astype('datetime64[ms]')),
+                      b'","time":"', record_time[e], b'","data":', record_data[e], b',"recordedBy":',
+                      json_string(recorded_by[e]), b',"notes":', notes_json, b',"updatedAt":"', _iso(updated), b'"}')
+
+    yield Block('daily_records', [
+        Column('id', 'uuid', record_ids),
+        Column('tenantId', 'uuid', np.repeat(tenant.id, m, axis=0)),
+        Column('residentId', 'uuid', tenant.resident_ids[first:last][record_r]),
+        Column('type', 'enum', record_type),
+        Column('date', 'date', record_day),
+        Column('time', 'text', record_time),
+        Column('data', 'jsonb', record_data),
+        Column('recordedBy', 'text', recorded_by),
+        Column('userId', 'uuid', tenant.user_ids[record_user]),
+        Column('notes', 'text', notes, notes_null),
+        Column('createdAt', 'timestamptz', record_created),
+        Column('updatedAt', 'timestamptz', updated_at),
+    ])
+    yield Block('daily_record_history', [
+        Column('id', 'uuid', random_uuids(rng, len(e))),
+        Column('recordId', 'uuid', record_ids[e]),
+        Column('tenantId', 'uuid', np.repeat(tenant.id, len(e), axis=0)),
+        Column('versionNumber', 'int4', np.ones(len(e), dtype=int)),
+        Column('previousData', 'jsonb', snapshot(np.full(len(e), b'null'), record_created[e])),
+        Column('newData', 'jsonb', snapshot(json_string(note), edited_at)),
+        Column('changedFields', 'jsonb', np.full(len(e), b'["notes"]')),
+        Column('changeType', 'text', np.full(len(e), b'UPDATE')),
+        Column('changeReason', 'text', note),
+        Column('changedBy', 'uuid', tenant.user_ids[editor]),
+        Column('changedByName', 'text', tenant.user_names[editor]),
+        Column('changedAt', 'timestamptz', edited_at),
+    ])
+
+
+# ============================================
+# Autodiagnósticos RDC 502/2021
+# ============================================
+def _compliance_blocks(config, tenant, questions):
+    rng = _rng(config, tenant.index, 2)
+    count = max(1, int(round(config.years * config.assessments_per_year)))
+    spacing = config.days / count
+    day_offset = (np.arange(count) * spacing + rng.uniform(0, spacing * 0.5, count)).astype(int)
+    assessed_at = ((config.start + day_offset).astype('datetime64[m]')
+                   + rng.integers(540, 1080, count) - UTC_OFFSET_MINUTES).astype('datetime64[ms]')
+    ids = random_uuids(rng, count)
+    id_text = uuid_text(ids).astype(str)
+
+    # Qualidade do tenant melhora com o tempo; cada questão tem sua dificuldade
+    q = len(questions.numbers)
+    quality = rng.beta(5, 3) + 0.05 * day_offset / 365.25
+    difficulty = rng.normal(0, 0.15, q)
+    level = np.clip(quality[:, None] - difficulty[None, :] + rng.normal(0, 0.12, (count, q)), 0, 1)
+    # 3 pontos = conforme (MAX_POINTS_PER_QUESTION); 4 e 5 só em parte das questões já conformes
+    points = np.rint(level * MAX_POINTS_PER_QUESTION).astype(int)
+    excellence = (points == MAX_POINTS_PER_QUESTION) & (rng.random((count, q)) < 0.25)
+    points = np.minimum(points + excellence * rng.integers(1, 3, (count, q)), questions.max_points[None, :])
+    not_applicable = questions.has_na[None, :] & (rng.random((count, q)) < 0.08)
+
+    a = np.repeat(np.arange(count), q)
+    question = np.tile(np.arange(q), count)
+    flat_points = points.ravel()
+    flat_na = not_applicable.ravel()
+    result = score(ResponseArrays(
+        assessment_ids=id_text[a],
+        question_numbers=questions.numbers[question],
+        selected_points=np.where(flat_na, np.nan, flat_points).astype(float),
+        not_applicable=flat_na,
+        critical=questions.critical[question],
+        question_texts=np.char.decode(questions.texts[question], 'utf-8').astype(object),
+    ), thresholds=BACKEND_LEVEL_THRESHOLDS)
+    order = np.searchsorted(result.assessment_ids, id_text)
+    critical = _bytes([json.dumps(result.critical_non_compliant(i), ensure_ascii=False) for i in order])
+
+    performer = np.repeat(tenant.user_ids[:1], count, axis=0)
+    yield Block('compliance_assessments', [
+        Column('id', 'uuid', ids),
+        Column('tenantId', 'uuid', np.repeat(tenant.id, count, axis=0)),
+        Column('versionId', 'uuid', np.repeat(questions.version_id, count, axis=0)),
+        Column('assessmentDate', 'timestamptz', assessed_at),
+        Column('performedBy', 'uuid', performer),
+        Column('status', 'text', np.full(count, b'COMPLETED')),
+        Column('totalQuestions', 'int4', result.total_questions[order]),
+        Column('questionsAnswered', 'int4', result.questions_answered[order]),
+        Column('questionsNA', 'int4', result.questions_na[order]),
+        Column('applicableQuestions', 'int4', result.applicable_questions[order]),
+        Column('totalPointsObtained', 'float8', result.total_points_obtained[order]),
+        Column('totalPointsPossible', 'float8', result.total_points_possible[order]),
+        Column('compliancePercentage', 'float8', result.compliance_percentage[order]),
+        Column('complianceLevel', 'text', result.compliance_level[order].astype(str).astype('S')),
+        Column('criticalNonCompliant', 'jsonb', critical),
+        Column('createdAt', 'timestamptz', assessed_at),
+        Column('updatedAt', 'timestamptz', assessed_at),
+    ])
+    answered_at = np.repeat(assessed_at, q)
+    yield Block('compliance_assessment_responses', [
+        Column('id', 'uuid', random_uuids(rng, count * q)),
+        Column('tenantId', 'uuid', np.repeat(tenant.id, count * q, axis=0)),
+        Column('assessmentId', 'uuid', ids[a]),
+        Column('questionId', 'uuid', questions.ids[question]),
+        Column('questionNumber', 'int4', questions.numbers[question]),
+        Column('selectedPoints', 'int4', flat_points, flat_na),
+        Column('selectedText', 'text', questions.option_texts[question, flat_points], flat_na),
+        Column('isNotApplicable', 'bool', flat_na),
+        Column('questionTextSnapshot', 'text', questions.texts[question]),
+        Column('criticalityLevel', 'text', np.where(questions.critical[question], b'C', b'NC')),
+        Column('createdAt', 'timestamptz', answered_at),
+        Column('updatedAt', 'timestamptz', answered_at),
+    ])
+
+
+def generate_tenant(config, index, questions=None):
+    """Blocos (Block) do tenant `index`, na ordem de TABLES dentro de cada grupo"""
+    questions = questions or load_questions(config)
+    tenant, blocks = _tenant_blocks(config, index)
+    yield from blocks
+    yield from _compliance_blocks(config, tenant, questions)
+    for block_index, first in enumerate(range(0, config.residents, BLOCK_RESIDENTS)):
+        yield from _resident_blocks(config, tenant, block_index, first, min(first + BLOCK_RESIDENTS, config.residents))
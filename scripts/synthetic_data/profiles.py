@@ -0,0 +1,120 @@
+"""
+Distribuições de sinais vitais por condição clínica (residentes de ILPI)
+
+Cada residente tem uma condição (sem HTA/DM2, HTA, DM2 ou ambas) e um
+valor basal próprio por sinal (média da condição + variação entre pessoas);
+cada aferição soma a variação do dia a dia, o pico matinal da pressão na
+HTA e os episódios febris (infecções de alguns dias, que também sobem a FC
+e derrubam a SpO₂). A glicemia é log-normal, aferida em toda leitura nos
+diabéticos e só de vez em quando nos demais, com hipoglicemias raras nos
+DM2. Os parâmetros são aproximações clínicas para testes de carga e de
+alertas, não estatística epidemiológica.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+CONDITIONS = ('NENHUMA', 'HTA', 'DM2', 'HTA_DM2')
+CONDITION_WEIGHTS = (0.30, 0.45, 0.07, 0.18)  # Prevalência aproximada em ILPIs
+
+
+@dataclass(frozen=True)
+class VitalProfile:
+    systolic: tuple  # (média, dp entre residentes, dp entre aferições)
+    diastolic: tuple
+    morning_surge: float  # mmHg somados à sistólica nas aferições da manhã
+    glucose_median: float
+    glucose_spread: float  # sigma do log
+    glucose_measured: float  # Probabilidade de aferir glicemia numa leitura
+    hypoglycemia_rate: float  # Probabilidade de hipoglicemia por leitura aferida
+
+
+PROFILES = {
+    'NENHUMA': VitalProfile((124, 8, 7), (76, 5, 5), 2, 95, 0.10, 0.05, 0.0),
+    'HTA': VitalProfile((142, 12, 10), (84, 7, 6), 8, 100, 0.12, 0.10, 0.0),
+    'DM2': VitalProfile((128, 9, 8), (77, 5, 5), 3, 155, 0.28, 0.90, 0.004),
+    'HTA_DM2': VitalProfile((146, 13, 11), (85, 7, 6), 9, 165, 0.30, 0.90, 0.006),
+}
+
+FEVER_EPISODES_PER_YEAR = 1.2
+MISSING_RATE = 0.02  # Sinal não aferido numa leitura (fica NULL)
+
+
+def assign_conditions(rng, n):
+    """Índice em CONDITIONS de cada residente"""
+    return rng.choice(len(CONDITIONS), size=n, p=CONDITION_WEIGHTS)
+
+
+def fever_curve(rng, residents, days):
+    """°C somados por residente e dia (episódios de 2 a 6 dias, de 0,8 a 2,2 °C)"""
+    fever = np.zeros((residents, days))
+    counts = rng.poisson(FEVER_EPISODES_PER_YEAR * days / 365.25, size=residents)
+    total = int(counts.sum())
+    if not total:
+        return fever
+    owner = np.repeat(np.arange(residents), counts)
+    start = rng.integers(0, days, size=total)
+    duration = rng.integers(2, 7, size=total)
+    amplitude = rng.uniform(0.8, 2.2, size=total)
+    offsets = np.arange(int(duration.sum())) - np.repeat(np.cumsum(duration) - duration, duration)
+    day = np.repeat(start, duration) + offsets
+    # Curva em triângulo: sobe até a metade do episódio e cai
+    shape = 1 - np.abs(offsets / np.repeat(duration, duration) * 2 - 1) * 0.6
+    inside = day < days
+    np.add.at(fever, (np.repeat(owner, duration)[inside], day[inside]),
+              (np.repeat(amplitude, duration) * shape)[inside])
+    return fever
+
+
+def sample_vitals(rng, conditions, days, readings_per_day, morning):
+    """Sinais de residents × days × readings_per_day aferições
+
+    conditions: índice da condição por residente; morning: bool por leitura
+    do dia (aferições da manhã). Retorna dict de arrays (residentes, dias,
+    leituras) com NaN nos sinais não aferidos.
+    """
+    residents = len(conditions)
+    shape = (residents, days, readings_per_day)
+    profiles = [PROFILES[CONDITIONS[c]] for c in conditions]
+
+    def per_resident(getter):
+        return np.array([getter(p) for p in profiles], dtype=float)[:, None, None]
+
+    sys_mean, sys_between, sys_within = (per_resident(lambda p, i=i: p.systolic[i]) for i in range(3))
+    dia_mean, dia_between, dia_within = (per_resident(lambda p, i=i: p.diastolic[i]) for i in range(3))
+    fever = fever_curve(rng, residents, days)[:, :, None]
+
+    systolic_base = sys_mean + sys_between * rng.standard_normal((residents, 1, 1))
+    systolic = (systolic_base + sys_within * rng.standard_normal(shape)
+                + per_resident(lambda p: p.morning_surge) * morning[None, None, :] - 3 * fever)
+    diastolic = (dia_mean + dia_between * rng.standard_normal((residents, 1, 1))
+                 + 0.45 * (systolic - systolic_base) + dia_within * rng.standard_normal(shape))
+
+    temperature = 36.4 + 0.15 * rng.standard_normal((residents, 1, 1)) + 0.2 * rng.standard_normal(shape) + fever
+    heart_rate = 74 + 6 * rng.standard_normal((residents, 1, 1)) + 5 * rng.standard_normal(shape) + 9 * fever
+    saturation = 96.5 + 0.8 * rng.standard_normal((residents, 1, 1)) + 0.9 * rng.standard_normal(shape) - 1.6 * fever
+
+    median = per_resident(lambda p: p.glucose_median) * np.exp(0.08 * rng.standard_normal((residents, 1, 1)))
+    glucose = median * np.exp(per_resident(lambda p: p.glucose_spread) * rng.standard_normal(shape))
+    hypo = rng.random(shape) < per_resident(lambda p: p.hypoglycemia_rate)
+    glucose = np.where(hypo, rng.uniform(42, 69, shape), glucose)
+    glucose_missing = rng.random(shape) >= per_resident(lambda p: p.glucose_measured)
+
+    vitals = {
+        'systolicBloodPressure': np.rint(np.clip(systolic, 70, 240)),
+        'diastolicBloodPressure': np.rint(np.clip(diastolic, 40, 140)),
+        'temperature': np.round(np.clip(temperature, 34.5, 41.5), 1),
+        'heartRate': np.rint(np.clip(heart_rate, 35, 180)),
+        'oxygenSaturation': np.rint(np.clip(saturation, 75, 100)),
+        'bloodGlucose': np.rint(np.clip(glucose, 35, 600)),
+    }
+    for name, values in vitals.items():
+        missing = rng.random(shape) < MISSING_RATE
+        if name == 'bloodGlucose':
+            missing |= glucose_missing
+        # PA é aferida junto: sistólica e diastólica somem juntas
+        if name == 'diastolicBloodPressure':
+            missing = np.isnan(vitals['systolicBloodPressure'])
+        values[missing] = np.nan
+    return vitals
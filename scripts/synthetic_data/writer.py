@@ -0,0 +1,111 @@
+"""
+Gravação dos tenants sintéticos em arquivos prontos para COPY
+
+Um diretório por tenant (<saída>/<schemaName>/) com um arquivo por tabela,
+prefixado pela ordem de carga: 01_tenants.csv(.gz) ... no formato CSV (o
+mesmo que o import-tenant-backup.py lê) ou 01_tenants.pgcopy no binário do
+COPY. Em ambos vai um load.sql com os \\copy na ordem das FKs:
+
+    psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -f <saída>/<schemaName>/load.sql
+
+Os arquivos são gravados em .tmp e renomeados no fim: um tenant
+interrompido não deixa arquivo pela metade com o nome final.
+"""
+
+import gzip
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .encoding import PGCOPY_TRAILER, encode_binary, encode_csv
+from .generator import TABLES, generate_tenant, load_questions, tenant_schema_name
+
+FORMATS = ('csv', 'binary')
+
+
+@dataclass
+class TenantOutput:
+    schema_name: str
+    directory: Path
+    rows: dict = field(default_factory=dict)  # tabela -> linhas
+    columns: dict = field(default_factory=dict)  # tabela -> nomes das colunas
+    bytes: int = 0
+    seconds: float = 0.0
+
+
+def table_file(table, fmt, compress=False):
+    number = TABLES.index(table) + 1
+    if fmt == 'binary':
+        return f'{number:02d}_{table}.pgcopy'
+    return f'{number:02d}_{table}.csv' + ('.gz' if compress else '')
+
+
+def load_script(schema_name, directory, columns, fmt, compress=False):
+    """load.sql do tenant: só carrega, o schema já deve existir (ex: provision-tenant-schema.py)
+
+    columns: tabela -> nomes das colunas geradas (as demais ficam no DEFAULT/NULL).
+    """
+    options = '(FORMAT binary)' if fmt == 'binary' else '(FORMAT csv, HEADER true)'
+    lines = [
+        f'-- Dados sintéticos de {schema_name} (scripts/generate-synthetic-data.py)',
+        '\\set ON_ERROR_STOP on',
+        'BEGIN;',
+        f'SET LOCAL search_path TO "{schema_name}";',
+    ]
+    for table in TABLES:
+        name = Path(directory).resolve() / table_file(table, fmt, compress)
+        source = f"PROGRAM 'gzip -dc {name}'" if compress else f"'{name}'"
+        names = ', '.join(f'"{c}"' for c in columns[table])
+        lines.append(f'\\copy "{schema_name}"."{table}" ({names}) FROM {source} {options}')
+    lines.append('COMMIT;')
+    return '\n'.join(lines) + '\n'
+
+
+def write_tenant(config, index, output, fmt='csv', compress=False, questions=None):
+    """Gera e grava o tenant `index`; retorna TenantOutput com as contagens"""
+    if fmt not in FORMATS:
+        raise ValueError(f'Formato desconhecido: {fmt} (use {", ".join(FORMATS)})')
+    compress = compress and fmt == 'csv'  # O binário do COPY sai sem compressão
+    started = time.perf_counter()
+    result = TenantOutput(tenant_schema_name(config, index), Path(output) / tenant_schema_name(config, index))
+    result.directory.mkdir(parents=True, exist_ok=True)
+
+    files, staging = {}, {}
+    try:
+        for table in TABLES:
+            path = result.directory / table_file(table, fmt, compress)
+            staging[table] = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+            raw = open(staging[table], 'wb')
+            files[table] = gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6, mtime=0) if compress else raw
+            result.rows[table] = 0
+        for block in generate_tenant(config, index, questions or load_questions(config)):
+            f = files[block.table]
+            if fmt == 'binary':
+                data = encode_binary(block.columns, header=f.tell() == 0, trailer=False)
+            else:
+                data = encode_csv(block.columns, header=f.tell() == 0)
+            f.write(data)
+            result.columns.setdefault(block.table, [c.name for c in block.columns])
+            result.rows[block.table] += len(block)
+        if fmt == 'binary':
+            for f in files.values():
+                f.write(PGCOPY_TRAILER)
+    except BaseException:
+        for path in staging.values():
+            path.unlink(missing_ok=True)
+        raise
+    finally:
+        for f in files.values():
+            raw = f.fileobj if isinstance(f, gzip.GzipFile) else None
+            f.close()
+            if raw is not None:
+                raw.close()
+
+    for table, path in staging.items():
+        final = result.directory / table_file(table, fmt, compress)
+        os.replace(path, final)
+        result.bytes += final.stat().st_size
+    (result.directory / 'load.sql').write_text(load_script(result.schema_name, result.directory, result.columns, fmt, compress), encoding='utf-8')
+    result.seconds = time.perf_counter() - started
+    return result
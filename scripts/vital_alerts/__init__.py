@@ -0,0 +1,31 @@
+"""
+Backtest dos limiares de alerta de sinais vitais (VitalSignAlert)
+
+Uso como módulo: load_readings carrega vital_signs em arrays colunares;
+Backtest.run aplica conjuntos de limiares (BACKEND_THRESHOLDS e candidatos
+de load_candidates) e retorna o volume de alertas por tenant, tipo,
+severidade e prioridade de cada um.
+"""
+
+from .backtest import Backtest, BacktestResult
+from .readings import DEFAULT_CACHE_DIR, VITAL_COLUMNS, Readings, load_csv, load_postgres, load_readings
+from .thresholds import ALERT_TYPES, BACKEND_THRESHOLDS, SEVERITIES, Band, ThresholdSet, VitalRule, load_candidates, priority
+
+__all__ = [
+    'Backtest',
+    'BacktestResult',
+    'DEFAULT_CACHE_DIR',
+    'VITAL_COLUMNS',
+    'Readings',
+    'load_csv',
+    'load_postgres',
+    'load_readings',
+    'ALERT_TYPES',
+    'BACKEND_THRESHOLDS',
+    'SEVERITIES',
+    'Band',
+    'ThresholdSet',
+    'VitalRule',
+    'load_candidates',
+    'priority',
+]
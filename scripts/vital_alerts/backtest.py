@@ -0,0 +1,149 @@
+"""
+Backtest de limiares de alerta sobre o histórico de vital_signs
+
+    readings, _ = load_readings('vital_signs.csv')
+    backtest = Backtest(readings)
+    for result in backtest.run([BACKEND_THRESHOLDS, *load_candidates('candidatos.json')]):
+        print(result.name, result.total, result.by_priority())
+
+Cada conjunto de limiares é aplicado a todas as aferições de uma vez, com
+as mesmas regras de detectAndNotifyAnomalies (um alerta por sinal e
+aferição: CRITICAL tem precedência sobre WARNING). As contagens saem por
+tenant × tipo × severidade; a prioridade é derivada (priority()).
+
+As comparações (coluna, limite, lado) são memorizadas no Backtest: entre
+candidatos que mudam poucos limites, só as comparações novas são
+recalculadas.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from .thresholds import ALERT_TYPES, SEVERITIES, priority
+
+MS_PER_DAY = 86_400_000
+
+
+@dataclass
+class BacktestResult:
+    name: str
+    tenant_ids: np.ndarray
+    counts: np.ndarray  # int64 (tenants, ALERT_TYPES, SEVERITIES)
+    flagged: np.ndarray  # int64 por tenant: aferições com ao menos um alerta
+    readings: np.ndarray  # int64 por tenant
+    resident_days: np.ndarray  # int64 por tenant: (residente, dia) com aferição
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def by_severity(self):
+        return {severity: int(self.counts[:, :, i].sum()) for i, severity in enumerate(SEVERITIES)}
+
+    def by_type(self):
+        return {alert_type: int(self.counts[:, i, :].sum()) for i, alert_type in enumerate(ALERT_TYPES)}
+
+    def by_priority(self):
+        totals = {}
+        for t, alert_type in enumerate(ALERT_TYPES):
+            for s, severity in enumerate(SEVERITIES):
+                level = priority(severity, alert_type)
+                totals[level] = totals.get(level, 0) + int(self.counts[:, t, s].sum())
+        return dict(sorted(totals.items(), reverse=True))
+
+    def per_resident_day(self, tenant=None):
+        """Alertas por residente-dia (no total ou de um tenant)"""
+        if tenant is None:
+            days, alerts = self.resident_days.sum(), self.total
+        else:
+            days, alerts = self.resident_days[tenant], self.counts[tenant].sum()
+        return float(alerts / days) if days else 0.0
+
+    def rows(self):
+        """(tenantId, tipo, severidade, prioridade, alertas) de cada combinação com alerta"""
+        for tenant, t, s in zip(*np.nonzero(self.counts)):
+            yield (self.tenant_ids[tenant], ALERT_TYPES[t], SEVERITIES[s], priority(SEVERITIES[s], ALERT_TYPES[t]),
+                   int(self.counts[tenant, t, s]))
+
+
+class Backtest:
+    def __init__(self, readings):
+        self.readings = readings
+        self.tenants = len(readings.tenant_ids)
+        self._masks = {}
+        self.readings_per_tenant = np.bincount(readings.tenant, minlength=self.tenants).astype(np.int64)
+        day = readings.timestamp.astype(np.int64) // MS_PER_DAY
+        first = day.min() if len(day) else 0
+        pairs = np.unique(readings.resident.astype(np.int64) * (int(day.max() - first) + 1 if len(day) else 1)
+                          + (day - first), return_index=True)[1]
+        self.resident_days = np.bincount(readings.tenant[pairs], minlength=self.tenants).astype(np.int64)
+
+    def _beyond(self, column, value, side, inclusive):
+        """Máscara memorizada de valores além do limite (NaN nunca dispara)"""
+        if value is None:
+            return None
+        key = (column, float(value), side, inclusive)
+        mask = self._masks.get(key)
+        if mask is None:
+            values = self.readings.values[column]
+            limit = np.float32(value)
+            if side == 'high':
+                mask = values >= limit if inclusive else values > limit
+            else:
+                mask = values <= limit if inclusive else values < limit
+            self._masks[key] = mask
+        return mask
+
+    def _outside(self, rule, severity):
+        """Aferições em que alguma coluna da regra sai da faixa da severidade"""
+        fired = np.zeros(len(self.readings), dtype=bool)
+        for column in rule.columns:
+            band = rule.band(severity, column)
+            for mask in (self._beyond(column, band.low, 'low', band.low_inclusive),
+                         self._beyond(column, band.high, 'high', band.high_inclusive)):
+                if mask is not None:
+                    fired |= mask
+        return fired
+
+    def evaluate(self, thresholds):
+        types, severities = len(ALERT_TYPES), len(SEVERITIES)
+        codes = self.readings.tenant.astype(np.int64) * types * severities
+        counts = np.zeros(self.tenants * types * severities, dtype=np.int64)
+        flagged = np.zeros(len(self.readings), dtype=bool)
+
+        for rule in thresholds.rules:
+            critical = self._outside(rule, 'CRITICAL')
+            warning = self._outside(rule, 'WARNING') & ~critical
+            # _HIGH quando alguma coluna chega ao limite alto de atenção (isHighPressure no backend)
+            high = np.zeros(len(self.readings), dtype=bool)
+            if rule.high_type is not None:
+                for column in rule.columns:
+                    band = rule.band('WARNING', column)
+                    mask = self._beyond(column, band.high, 'high', band.high_inclusive)
+                    if mask is not None:
+                        high |= mask
+            for severity, fired in (('CRITICAL', critical), ('WARNING', warning)):
+                if not fired.any():
+                    continue
+                flagged |= fired
+                s = SEVERITIES.index(severity)
+                for alert_type, side in ((rule.high_type, high), (rule.low_type, ~high)):
+                    if alert_type is None:
+                        continue
+                    selected = fired & side
+                    offset = ALERT_TYPES.index(alert_type) * severities + s
+                    counts += np.bincount(codes[selected] + offset, minlength=len(counts))
+
+        return BacktestResult(
+            name=thresholds.name,
+            tenant_ids=self.readings.tenant_ids,
+            counts=counts.reshape(self.tenants, types, severities),
+            flagged=np.bincount(self.readings.tenant[flagged], minlength=self.tenants).astype(np.int64),
+            readings=self.readings_per_tenant,
+            resident_days=self.resident_days,
+        )
+
+    def run(self, candidates):
+        for thresholds in candidates:
+            yield self.evaluate(thresholds)
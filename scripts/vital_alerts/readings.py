@@ -0,0 +1,249 @@
+"""
+Leitura de vital_signs em arrays colunares (uma posição por aferição)
+
+Só as colunas que os alertas usam: tenant, residente, timestamp e os seis
+sinais (NaN = não aferido). Aferições excluídas (deletedAt) ficam de fora.
+
+Fontes suportadas:
+- CSV, opcionalmente .gz (ex: \\COPY vital_signs TO ... WITH CSV HEADER, as
+  partes do export-tenant-backup.py ou o 04_vital_signs.csv do
+  generate-synthetic-data.py); vários arquivos são concatenados
+- PostgreSQL (um schema por tenant; requer psycopg)
+
+Ler CSV é a parte lenta; load_readings guarda os arrays em .npz no cache
+(~/.cache/rafa-ilpi/vital-alerts), indexado por caminho, tamanho e mtime
+dos arquivos, e as execuções seguintes carregam em segundos.
+"""
+
+import csv
+import gzip
+import hashlib
+import json
+import os
+import warnings
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'rafa-ilpi' / 'vital-alerts'
+CACHE_VERSION = 1  # Mudar quando o formato do .npz mudar
+
+VITAL_COLUMNS = ('systolicBloodPressure', 'diastolicBloodPressure', 'temperature', 'heartRate', 'oxygenSaturation',
+                 'bloodGlucose')
+ID_COLUMNS = ('tenantId', 'residentId', 'timestamp')
+
+
+@dataclass
+class Readings:
+    tenant_ids: np.ndarray  # str, um por tenant (índice = código)
+    tenant: np.ndarray  # int32, código do tenant por aferição
+    resident: np.ndarray  # int32, código do residente por aferição
+    timestamp: np.ndarray  # datetime64[ms] (UTC)
+    values: Dict[str, np.ndarray] = field(default_factory=dict)  # coluna -> float32 (NaN = não aferido)
+
+    def __len__(self):
+        return len(self.tenant)
+
+    @property
+    def residents(self):
+        return len(np.unique(self.resident))
+
+    def select(self, mask):
+        return Readings(self.tenant_ids, self.tenant[mask], self.resident[mask], self.timestamp[mask],
+                        {column: values[mask] for column, values in self.values.items()})
+
+    def between(self, since=None, until=None):
+        """Aferições com since <= timestamp < until (datas/datetimes; None = sem limite)"""
+        mask = np.ones(len(self), dtype=bool)
+        if since is not None:
+            mask &= self.timestamp >= np.datetime64(since, 'ms')
+        if until is not None:
+            mask &= self.timestamp < np.datetime64(until, 'ms')
+        return self if mask.all() else self.select(mask)
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+        with open(staging, 'wb') as f:
+            np.savez(f, tenant_ids=self.tenant_ids.astype(str), tenant=self.tenant, resident=self.resident,
+                     timestamp=self.timestamp.astype(np.int64), **{f'v_{c}': v for c, v in self.values.items()})
+        os.replace(staging, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(
+                tenant_ids=data['tenant_ids'].astype(object),
+                tenant=data['tenant'],
+                resident=data['resident'],
+                timestamp=data['timestamp'].astype('datetime64[ms]'),
+                values={c: data[f'v_{c}'] for c in VITAL_COLUMNS},
+            )
+
+
+CHUNK_ROWS = 500_000  # Linhas convertidas por vez (limita a memória das listas de strings)
+_UTC_SUFFIXES = ('Z', '+00:00', '+00')  # Fusos que o NumPy recebe sem conversão
+
+
+class _Builder:
+    """Acumula blocos de aferições (colunas) e numera tenants e residentes"""
+
+    def __init__(self):
+        self.tenants, self.residents = {}, {}
+        self.tenant, self.resident, self.timestamp = [], [], []
+        self.values = {column: [] for column in VITAL_COLUMNS}
+
+    @staticmethod
+    def _codes(ids, registry):
+        return np.fromiter((registry.setdefault(i, len(registry)) for i in ids), dtype=np.int32, count=len(ids))
+
+    def add(self, tenant_ids, resident_ids, timestamps, values):
+        """Um bloco: ids (sequências de str), timestamps (datetime64[ms]) e coluna -> valores"""
+        self.tenant.append(self._codes(tenant_ids, self.tenants))
+        self.resident.append(self._codes(resident_ids, self.residents))
+        self.timestamp.append(timestamps)
+        for column in VITAL_COLUMNS:
+            self.values[column].append(np.asarray(values[column], dtype=np.float32))
+
+    def build(self):
+        def joined(parts, dtype):
+            return np.concatenate(parts) if parts else np.zeros(0, dtype=dtype)
+
+        return Readings(
+            tenant_ids=np.array(list(self.tenants), dtype=object),
+            tenant=joined(self.tenant, np.int32),
+            resident=joined(self.resident, np.int32),
+            timestamp=joined(self.timestamp, 'datetime64[ms]'),
+            values={column: joined(parts, np.float32) for column, parts in self.values.items()},
+        )
+
+
+def _epoch_ms(value):
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)  # timestamptz exportado sem fuso já vem em UTC
+    return int(value.timestamp() * 1000)
+
+
+def _strip_utc(text):
+    for suffix in _UTC_SUFFIXES:
+        if text.endswith(suffix):
+            return text[:-len(suffix)]
+    return text
+
+
+def parse_timestamps(texts):
+    """Strings ISO 8601 -> datetime64[ms] em UTC
+
+    O caso comum (UTC: sufixo Z/+00 do Prisma ou do COPY com TimeZone=UTC,
+    ou sem fuso) é convertido pelo NumPy de uma vez; com outros fusos, cai
+    no datetime.fromisoformat linha a linha.
+    """
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')  # O NumPy só avisa (depreciado) ao receber fuso
+            return np.array([_strip_utc(t) for t in texts], dtype='datetime64[ms]')
+    except (ValueError, Warning):
+        return np.array([_epoch_ms(t) for t in texts], dtype=np.int64).astype('datetime64[ms]')
+
+
+def _open_text(path):
+    if str(path).endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    return open(path, 'r', encoding='utf-8', newline='')
+
+
+def _numbers(texts):
+    return np.array([float(t) if t else np.nan for t in texts], dtype=np.float32)
+
+
+def load_csv(paths):
+    """Readings de uma ou mais exportações CSV de vital_signs"""
+    builder = _Builder()
+    for path in [paths] if isinstance(paths, (str, Path)) else paths:
+        with _open_text(path) as f:
+            reader = csv.reader(f)
+            header = next(reader, None) or []
+            missing = [c for c in (*ID_COLUMNS, *VITAL_COLUMNS) if c not in header]
+            if missing:
+                raise ValueError(f'{path}: colunas ausentes: {", ".join(missing)}')
+            index = {c: header.index(c) for c in (*ID_COLUMNS, *VITAL_COLUMNS)}
+            deleted = header.index('deletedAt') if 'deletedAt' in header else None
+            while True:
+                rows = list(islice(reader, CHUNK_ROWS))
+                if not rows:
+                    break
+                if deleted is not None:
+                    rows = [row for row in rows if not row[deleted]]
+                    if not rows:
+                        continue
+                columns = list(zip(*rows))
+                builder.add(columns[index['tenantId']], columns[index['residentId']],
+                            parse_timestamps(columns[index['timestamp']]),
+                            {c: _numbers(columns[index[c]]) for c in VITAL_COLUMNS})
+    return builder.build()
+
+
+def load_postgres(dsn, schemas=None, fetch_size=20000):
+    """Readings de <schema>.vital_signs de cada tenant (public.tenants."schemaName")"""
+    try:
+        import psycopg
+        from psycopg import sql
+    except ImportError as exc:
+        raise RuntimeError('Leitura direta do PostgreSQL requer psycopg: pip install "psycopg[binary]"') from exc
+
+    builder = _Builder()
+    with psycopg.connect(dsn) as conn:
+        if schemas is None:
+            with conn.cursor() as cur:
+                cur.execute('SELECT "schemaName" FROM public.tenants WHERE "deletedAt" IS NULL ORDER BY "schemaName"')
+                schemas = [schema for (schema,) in cur.fetchall()]
+
+        columns = sql.SQL(', ').join(sql.Identifier(c) for c in (*ID_COLUMNS, *VITAL_COLUMNS))
+        for schema in schemas:
+            query = sql.SQL('SELECT {} FROM {}.vital_signs WHERE "deletedAt" IS NULL').format(
+                columns, sql.Identifier(schema))
+            with conn.cursor(name=f'vital_signs_{schema}') as cur:
+                cur.execute(query)
+                while True:
+                    rows = cur.fetchmany(fetch_size)
+                    if not rows:
+                        break
+                    tenant_ids, resident_ids, timestamps, *values = zip(*rows)
+                    builder.add([str(t) for t in tenant_ids], [str(r) for r in resident_ids],
+                                np.array([_epoch_ms(t) for t in timestamps], dtype=np.int64).astype('datetime64[ms]'),
+                                {c: np.array(v, dtype=float) for c, v in zip(VITAL_COLUMNS, values)})
+    return builder.build()
+
+
+def _cache_key(paths):
+    files = []
+    for path in sorted(Path(p).resolve() for p in paths):
+        stat = path.stat()
+        files.append([str(path), stat.st_size, stat.st_mtime_ns])
+    payload = json.dumps({'version': CACHE_VERSION, 'files': files})
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def load_readings(sources, schemas=None, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Readings de arquivos CSV ou de um DSN do PostgreSQL (postgresql://...).
+    CSV passam pelo cache em cache_dir (None desliga); retorna (readings, veio_do_cache).
+    """
+    sources = [str(s) for s in ([sources] if isinstance(sources, (str, Path)) else sources)]
+    if len(sources) == 1 and sources[0].startswith(('postgresql://', 'postgres://')):
+        return load_postgres(sources[0], schemas=schemas), False
+    if cache_dir is None:
+        return load_csv(sources), False
+    entry = Path(cache_dir) / f'{_cache_key(sources)}.npz'
+    if entry.exists():
+        return Readings.load(entry), True
+    readings = load_csv(sources)
+    readings.save(entry)
+    return readings, False
@@ -0,0 +1,163 @@
+"""
+Limiares dos alertas de sinais vitais (VitalSignAlert) e conjuntos candidatos
+
+BACKEND_THRESHOLDS reproduz as regras escritas inline no método privado
+detectAndNotifyAnomalies de apps/backend/src/vital-signs/vital-signs.service.ts:
+por sinal, um alerta CRITICAL se algum valor sai da faixa crítica, senão
+WARNING se sai da faixa de atenção. O tipo é _HIGH se alguma coluna chega
+ao limite alto de atenção (como isHighPressure no backend), senão _LOW.
+priority() reproduz calculatePriority de vital-sign-alerts.service.ts.
+
+Candidatos vêm de um JSON com uma lista de conjuntos; cada um só precisa
+trazer o que muda em relação ao backend (limites omitidos ficam iguais):
+
+    [{"name": "pa-170", "pressure": {"critical": {"systolic": [80, 170]}}},
+     {"name": "spo2-88", "oxygen": {"critical": {"oxygenSaturation": [88, null]}}}]
+
+Cada faixa é [mínimo, máximo]; null desliga o lado. Comparações seguem o
+backend: abaixo do mínimo (<) ou a partir do máximo (>=), salvo onde a
+regra original usa ≤ ou > (low_inclusive / high_inclusive).
+"""
+
+import json
+from dataclasses import dataclass, replace
+from typing import Dict, Optional, Tuple
+
+SEVERITIES = ('WARNING', 'CRITICAL')
+
+ALERT_TYPES = ('PRESSURE_HIGH', 'PRESSURE_LOW', 'GLUCOSE_HIGH', 'GLUCOSE_LOW', 'TEMPERATURE_HIGH', 'TEMPERATURE_LOW',
+               'OXYGEN_LOW', 'HEART_RATE_HIGH', 'HEART_RATE_LOW')
+
+# Aliases das colunas de vital_signs aceitos nos JSON de candidatos
+COLUMN_ALIASES = {
+    'systolic': 'systolicBloodPressure',
+    'diastolic': 'diastolicBloodPressure',
+}
+
+
+@dataclass(frozen=True)
+class Band:
+    """Faixa aceitável de uma coluna: fora dela dispara o alerta"""
+    low: Optional[float] = None
+    high: Optional[float] = None
+    low_inclusive: bool = False  # True: dispara em valor <= low (senão < low)
+    high_inclusive: bool = True  # True: dispara em valor >= high (senão > high)
+
+    def describe(self):
+        parts = []
+        if self.low is not None:
+            parts.append(f"{'≤' if self.low_inclusive else '<'}{self.low:g}")
+        if self.high is not None:
+            parts.append(f"{'≥' if self.high_inclusive else '>'}{self.high:g}")
+        return ' ou '.join(parts) or '-'
+
+
+@dataclass(frozen=True)
+class VitalRule:
+    """Regra de um sinal: colunas avaliadas juntas e faixas por severidade"""
+    key: str
+    high_type: Optional[str]
+    low_type: Optional[str]
+    critical: Dict[str, Band]  # coluna -> faixa crítica
+    warning: Dict[str, Band]  # coluna -> faixa de atenção
+
+    @property
+    def columns(self):
+        return tuple(dict.fromkeys([*self.critical, *self.warning]))
+
+    def band(self, severity, column):
+        return (self.critical if severity == 'CRITICAL' else self.warning).get(column, Band())
+
+    def describe(self, severity):
+        bands = self.critical if severity == 'CRITICAL' else self.warning
+        return ' | '.join(f'{column} {band.describe()}' for column, band in bands.items())
+
+
+@dataclass(frozen=True)
+class ThresholdSet:
+    name: str
+    rules: Tuple[VitalRule, ...]
+
+    def rule(self, key):
+        for rule in self.rules:
+            if rule.key == key:
+                return rule
+        raise KeyError(f'Sinal desconhecido: {key} (use {", ".join(r.key for r in self.rules)})')
+
+    def with_overrides(self, name, overrides):
+        """Cópia com as faixas do JSON de candidato ({sinal: {severidade: {coluna: [min, max]}}})"""
+        rules = {rule.key: rule for rule in self.rules}
+        for key, severities in overrides.items():
+            rule = self.rule(key)
+            for severity, columns in severities.items():
+                field = severity.lower()
+                if field not in ('critical', 'warning'):
+                    raise ValueError(f'{name}: severidade desconhecida em {key}: {severity} (use critical ou warning)')
+                bands = dict(getattr(rule, field))
+                for column, limits in columns.items():
+                    column = COLUMN_ALIASES.get(column, column)
+                    if column not in rule.columns:
+                        raise ValueError(f'{name}: {key} não avalia a coluna {column} ({", ".join(rule.columns)})')
+                    low, high = limits
+                    bands[column] = replace(bands.get(column, Band()), low=low, high=high)
+                rule = replace(rule, **{field: bands})
+            rules[key] = rule
+        return ThresholdSet(name, tuple(rules.values()))
+
+
+def priority(severity, alert_type):
+    """calculatePriority de vital-sign-alerts.service.ts"""
+    if severity == 'CRITICAL':
+        # Hipoglicemia e hipóxia são as mais urgentes
+        return 5 if alert_type in ('GLUCOSE_LOW', 'OXYGEN_LOW') else 4
+    if severity == 'WARNING':
+        return 2
+    return 1
+
+
+# Limiares atuais de detectAndNotifyAnomalies (vital-signs.service.ts, inline no método)
+BACKEND_THRESHOLDS = ThresholdSet('backend', (
+    VitalRule(
+        'pressure', 'PRESSURE_HIGH', 'PRESSURE_LOW',
+        critical={'systolicBloodPressure': Band(80, 160), 'diastolicBloodPressure': Band(50, 100)},
+        warning={'systolicBloodPressure': Band(90, 140, low_inclusive=True), 'diastolicBloodPressure': Band(60, 90)},
+    ),
+    VitalRule(
+        'glucose', 'GLUCOSE_HIGH', 'GLUCOSE_LOW',
+        critical={'bloodGlucose': Band(60, 250)},
+        warning={'bloodGlucose': Band(70, 180)},
+    ),
+    VitalRule(
+        'temperature', 'TEMPERATURE_HIGH', 'TEMPERATURE_LOW',
+        critical={'temperature': Band(35, 39)},
+        warning={'temperature': Band(35.5, 38)},
+    ),
+    VitalRule(
+        'oxygen', None, 'OXYGEN_LOW',
+        critical={'oxygenSaturation': Band(90, None)},
+        warning={'oxygenSaturation': Band(92, None)},
+    ),
+    VitalRule(
+        'heart_rate', 'HEART_RATE_HIGH', 'HEART_RATE_LOW',
+        critical={'heartRate': Band(50, 120, high_inclusive=False)},
+        warning={'heartRate': Band(60, 100, high_inclusive=False)},
+    ),
+))
+
+
+def load_candidates(path, base=BACKEND_THRESHOLDS):
+    """Conjuntos candidatos de um arquivo JSON (lista, ou objeto {nome: overrides})"""
+    with open(path, 'r', encoding='utf-8') as f:
+        raw = json.load(f)
+    if isinstance(raw, dict):
+        raw = [{'name': name, **overrides} for name, overrides in raw.items()]
+    candidates = []
+    for i, entry in enumerate(raw):
+        entry = dict(entry)
+        name = str(entry.pop('name', f'candidato-{i + 1}'))
+        candidates.append(base.with_overrides(name, entry))
+    names = [c.name for c in candidates]
+    duplicated = sorted({n for n in names if names.count(n) > 1})
+    if duplicated or base.name in names:
+        raise ValueError(f'Nomes de candidatos repetidos: {", ".join(duplicated or [base.name])}')
+    return candidates